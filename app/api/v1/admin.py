@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Any
 from pydantic import BaseModel
 
 from app.core.database import get_db
+from app.core.async_database import get_async_db
 from app.core.security import verify_token
 from app.models.user import User
 from app.models.organization import Organization, OrganizationStatus, OrgMemberRole
@@ -27,6 +29,21 @@ from app.services.task_actual_service import TaskActualService
 router = APIRouter()
 
 
+async def _get_organization_or_404(db: AsyncSession, organization_id: str) -> Organization:
+    result = await db.execute(select(Organization).where(Organization.id == organization_id))
+    org = result.scalar_one_or_none()
+    if not org:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "success": False,
+                "message": "Organization not found",
+                "error_code": "ORG_NOT_FOUND"
+            }
+        )
+    return org
+
+
 @router.post(
     "/organizations/approve-all",
     response_model=BaseResponse[dict],
@@ -36,23 +53,22 @@ router = APIRouter()
 )
 async def approve_all_pending_organizations(
     current_user: User = Depends(get_current_super_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Approve all pending (NOT_STARTED) organizations.
     """
-    from app.models.organization import OrganizationStatus
-    
     # Update all NOT_STARTED and IN_PROGRESS organizations to ACTIVE
     # Using bulk update for efficiency
-    result = db.query(Organization).filter(
-        Organization.status.in_([OrganizationStatus.NOT_STARTED, OrganizationStatus.IN_PROGRESS])
-    ).update(
-        {Organization.status: OrganizationStatus.ACTIVE},
-        synchronize_session=False
+    update_result = await db.execute(
+        update(Organization)
+        .where(Organization.status.in_([OrganizationStatus.NOT_STARTED, OrganizationStatus.IN_PROGRESS]))
+        .values(status=OrganizationStatus.ACTIVE)
+        .execution_options(synchronize_session=False)
     )
+    result = update_result.rowcount
     
-    db.commit()
+    await db.commit()
     
     return {
         "success": True,
@@ -71,27 +87,18 @@ async def approve_all_pending_organizations(
 async def approve_organization(
     organization_id: str,
     current_user: User = Depends(get_current_super_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Approve an organization.
     """
     # 1. Get Organization
-    org = db.query(Organization).filter(Organization.id == organization_id).first()
-    if not org:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail={
-                "success": False,
-                "message": "Organization not found",
-                "error_code": "ORG_NOT_FOUND"
-            }
-        )
+    org = await _get_organization_or_404(db, organization_id)
     
     # 2. Approve - set status to ACTIVE
     org.status = OrganizationStatus.ACTIVE
-    db.commit()
-    db.refresh(org)
+    await db.commit()
+    await db.refresh(org)
 
     # 3. Clear Cache (Stub for now)
     # redis_client.delete(f"permissions:{organization_id}")
@@ -116,34 +123,25 @@ async def approve_organization(
 async def reject_organization(
     organization_id: str,
     current_user: User = Depends(get_current_super_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Reject an organization.
     """
     # 1. Get Organization
-    org = db.query(Organization).filter(Organization.id == organization_id).first()
-    if not org:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail={
-                "success": False,
-                "message": "Organization not found",
-                "error_code": "ORG_NOT_FOUND"
-            }
-        )
+    org = await _get_organization_or_404(db, organization_id)
     
     # 2. Reject - set status to REJECTED (using NOT_STARTED as fallback if DB enum issues occur)
     try:
         org.status = OrganizationStatus.REJECTED
-        db.commit()
+        await db.commit()
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         # Fallback to NOT_STARTED if REJECTED is not in DB enum
         org.status = OrganizationStatus.NOT_STARTED
-        db.commit()
+        await db.commit()
     
-    db.refresh(org)
+    await db.refresh(org)
 
     return {
         "success": True,
@@ -165,29 +163,20 @@ async def reject_organization(
 async def suspend_organization(
     organization_id: str,
     current_user: User = Depends(get_current_super_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Suspend an organization.
     """
     # 1. Get Organization
-    org = db.query(Organization).filter(Organization.id == organization_id).first()
-    if not org:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail={
-                "success": False,
-                "message": "Organization not found",
-                "error_code": "ORG_NOT_FOUND"
-            }
-        )
+    org = await _get_organization_or_404(db, organization_id)
     
     # 2. Suspend - set status to SUSPENDED
     try:
         org.status = OrganizationStatus.SUSPENDED
-        db.commit()
+        await db.commit()
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail={
@@ -197,7 +186,7 @@ async def suspend_organization(
             }
         )
     
-    db.refresh(org)
+    await db.refresh(org)
 
     return {
         "success": True,
@@ -221,19 +210,19 @@ async def list_organizations(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
     current_user: User = Depends(get_current_super_admin),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     List organizations with optional filters.
     """
-    query = db.query(Organization)
+    query = select(Organization)
     
     if org_status:
-        query = query.filter(Organization.status == org_status)
+        query = query.where(Organization.status == org_status)
         
-    total = query.count()
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
     offset = (page - 1) * limit
-    orgs = query.offset(offset).limit(limit).all()
+    orgs = (await db.execute(query.offset(offset).limit(limit))).scalars().all()
     
     return {
         "success": True,
@@ -262,7 +251,7 @@ async def list_organizations(
     summary="List all queries",
     description="List all queries across the platform with filtering and pagination. Only accessible by Super Admins."
 )
-async def list_all_queries(
+def list_all_queries(
     farming_organization_id: Optional[UUID] = Query(None),
     fsp_organization_id: Optional[UUID] = Query(None),
     status: Optional[QueryStatus] = Query(None),
@@ -305,12 +294,13 @@ async def list_all_queries(
     summary="List all schedules",
     description="List all schedules across the platform with filtering and pagination. Only accessible by Super Admins."
 )
-async def list_all_schedules(
+def list_all_schedules(
     crop_id: Optional[UUID] = Query(None),
     fsp_id: Optional[UUID] = Query(None),
     status_filter: Optional[str] = Query(None, alias="status"),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (takes precedence over page)"),
     current_user: User = Depends(get_current_super_admin),
     db: Session = Depends(get_db)
 ) -> Any:
@@ -318,13 +308,14 @@ async def list_all_schedules(
     List schedules with platform-wide visibility.
     """
     service = ScheduleService(db)
-    schedules, total = service.get_schedules(
+    schedules, total, next_cursor = service.get_schedules(
         user=current_user,
         crop_id=crop_id,
         fsp_id=fsp_id,
         status=status_filter,
         page=page,
-        limit=limit
+        limit=limit,
+        cursor=cursor
     )
     
     return {
@@ -335,7 +326,8 @@ async def list_all_schedules(
             "total": total,
             "page": page,
             "limit": limit,
-            "total_pages": (total + limit - 1) // limit
+            "total_pages": (total + limit - 1) // limit,
+            "next_cursor": next_cursor
         }
     }
 
@@ -347,7 +339,7 @@ async def list_all_schedules(
     summary="List all task actuals",
     description="List all task actuals across the platform with filtering and pagination. Only accessible by Super Admins."
 )
-async def list_all_task_actuals(
+def list_all_task_actuals(
     schedule_id: Optional[UUID] = Query(None),
     crop_id: Optional[UUID] = Query(None),
     is_planned: Optional[bool] = Query(None),
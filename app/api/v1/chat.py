@@ -1,13 +1,18 @@
 """
 Chat API endpoints for Uzhathunai v2.0.
 """
+import asyncio
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, status, Query, WebSocket
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
+from app.core.database import get_db, run_then_release_db
 from app.core.auth import get_current_active_user
+from app.core.exceptions import NotFoundError, PermissionError
+from app.core.logging import get_logger
+from app.core.realtime import realtime_hub
+from app.core.security import verify_token
 from app.models.user import User
 from app.schemas.response import BaseResponse
 from app.schemas.chat import (
@@ -15,12 +20,18 @@ from app.schemas.chat import (
     ChatChannelResponse,
     ChatMessageCreate,
     ChatMessageResponse,
-    ChatMessageListResponse
+    ChatMessageListResponse,
+    ChatMessageSyncResponse
 )
-from app.services.chat_service import ChatService
+from app.services.chat_service import ChatService, chat_topic
 from app.models.enums import ChatContextType
 
 router = APIRouter()
+logger = get_logger(__name__)
+
+# Close codes sent to WebSocket clients
+WS_POLICY_VIOLATION = 1008
+WS_TRY_AGAIN_LATER = 1013
 
 
 @router.post(
@@ -130,12 +141,13 @@ def get_messages(
     channel_id: UUID,
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous (newer) page"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Get messages."""
+    """Get messages, newest first; next_cursor fetches older messages."""
     service = ChatService(db)
-    messages, total = service.get_messages(channel_id, current_user.id, page, limit)
+    messages, total, next_cursor = service.get_messages(channel_id, current_user.id, page, limit, cursor=cursor)
     
     return {
         "success": True,
@@ -145,6 +157,125 @@ def get_messages(
             "total": total,
             "page": page,
             "limit": limit,
-            "total_pages": (total + limit - 1) // limit
+            "total_pages": (total + limit - 1) // limit,
+            "next_cursor": next_cursor
         }
     }
+
+
+@router.get(
+    "/channels/{channel_id}/messages/since",
+    response_model=BaseResponse[ChatMessageSyncResponse],
+    status_code=status.HTTP_200_OK,
+    summary="Get messages since",
+    description="Get messages sent after a given message, oldest first (resume after reconnecting)"
+)
+def get_messages_since(
+    channel_id: UUID,
+    message_id: UUID = Query(..., description="Last message the client received"),
+    limit: int = Query(100, ge=1, le=500),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get messages after message_id; repeat with the last item while has_more is true."""
+    service = ChatService(db)
+    messages, has_more = service.get_messages_since(channel_id, current_user.id, message_id, limit)
+    
+    return {
+        "success": True,
+        "message": "Messages retrieved successfully",
+        "data": {
+            "items": messages,
+            "has_more": has_more
+        }
+    }
+
+
+def _open_channel_stream(db: Session, token: str, channel_id: UUID, since: Optional[UUID], limit: int):
+    """
+    Authenticate a WebSocket client and load the messages it missed.
+    
+    Returns:
+        Tuple of (user ID, missed messages serialized oldest first, whether more were missed)
+    """
+    payload = verify_token(token, token_type="access")
+    user = db.query(User).filter(User.id == payload.get("sub")).first() if payload else None
+    if not user or not user.is_active:
+        raise PermissionError("Invalid or expired token", "INVALID_TOKEN")
+    
+    service = ChatService(db)
+    service.ensure_channel_access(channel_id, user.id)
+    
+    missed, has_more = [], False
+    if since:
+        messages, has_more = service.get_messages_since(channel_id, user.id, since, limit)
+        missed = [ChatMessageResponse.model_validate(m).model_dump(mode="json") for m in messages]
+    return user.id, missed, has_more
+
+
+@router.websocket("/channels/{channel_id}/ws")
+async def channel_stream(
+    websocket: WebSocket,
+    channel_id: UUID,
+    token: str = Query(..., description="Access token (browsers cannot set headers on WebSockets)"),
+    since: Optional[UUID] = Query(None, description="Last message the client received, to replay missed messages"),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream new messages of a channel.
+    
+    Access is checked once when connecting. Server frames are JSON:
+    {"type": "message", "data": ChatMessageResponse}, {"type": "pong"} in
+    reply to a "ping" text frame, and {"type": "resync"} when the client
+    missed more messages than are replayed or fell behind; it should then
+    fetch /messages/since and reconnect.
+    """
+    # Subscribe before loading missed messages so none fall in between
+    subscription = realtime_hub.subscribe(chat_topic(channel_id))
+    try:
+        try:
+            user_id, missed, has_more = await run_then_release_db(
+                db, _open_channel_stream, db, token, channel_id, since, 100
+            )
+        except (PermissionError, NotFoundError) as e:
+            await websocket.close(code=WS_POLICY_VIOLATION, reason=e.error_code)
+            return
+        
+        await websocket.accept()
+        for message in missed:
+            await websocket.send_json({"type": "message", "data": message})
+        if has_more:
+            await websocket.send_json({"type": "resync"})
+        
+        logger.info(
+            "Chat stream opened",
+            extra={"channel_id": str(channel_id), "user_id": str(user_id)}
+        )
+        
+        seen = {message["id"] for message in missed}
+        
+        async def forward():
+            while True:
+                event = await subscription.get()
+                if event is None:
+                    await websocket.send_json({"type": "resync"})
+                    await websocket.close(code=WS_TRY_AGAIN_LATER)
+                    return
+                if event["data"]["id"] not in seen:
+                    await websocket.send_json(event)
+        
+        async def receive():
+            while True:
+                if await websocket.receive_text() == "ping":
+                    await websocket.send_json({"type": "pong"})
+        
+        tasks = [asyncio.create_task(forward()), asyncio.create_task(receive())]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Disconnects surface here as task exceptions
+            await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        subscription.close()
@@ -220,6 +220,7 @@ def admin_update_crop_type(
 
     db.commit()
     db.refresh(crop_type)
+    CropDataService.invalidate_cache()
 
     final_trans = next((t for t in crop_type.translations if t.language_code == language), None)
     return {
@@ -262,6 +263,7 @@ def admin_delete_crop_type(
 
     crop_type.is_active = False
     db.commit()
+    CropDataService.invalidate_cache()
 
     return {
         "success": True,
@@ -347,6 +349,7 @@ def admin_seed_default_crop_types(
             created_types += 1
 
         db.commit()
+        CropDataService.invalidate_cache()
         return {
             "success": True,
             "message": "Default crop types seeded successfully",
@@ -447,6 +450,7 @@ def admin_update_crop_year(
 
     if not data.dry_run and updated:
         db.commit()
+        CropDataService.invalidate_cache()
 
     return {
         "success": True,
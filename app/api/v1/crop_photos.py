@@ -22,7 +22,7 @@ router = APIRouter()
 
 
 @router.post("/crops/{crop_id}/photos", response_model=BaseResponse[CropPhotoResponse], status_code=201)
-async def upload_crop_photo(
+def upload_crop_photo(
     crop_id: UUID,
     file: UploadFile = File(..., description="Photo file (JPEG, PNG)"),
     caption: Optional[str] = Form(None, description="Photo caption"),
@@ -39,7 +39,8 @@ async def upload_crop_photo(
     - **photo_date**: Optional date when photo was taken (YYYY-MM-DD format)
     
     Accepts JPEG and PNG images.
-    File is stored in S3 or local storage depending on configuration.
+    The photo is compressed off the request thread and stored in S3 or
+    local storage depending on configuration.
     """
     service = CropPhotoService(db)
     
@@ -59,19 +60,14 @@ async def upload_crop_photo(
                 error_code="INVALID_DATE_FORMAT"
             )
     
-    # Create upload data
-    from app.schemas.crop import CropPhotoUpload
-    upload_data = CropPhotoUpload(
+    photo = service.upload_photo_file(
+        crop_id=crop_id,
+        org_id=org_id,
+        file_data=file.file,
+        filename=file.filename,
         caption=caption,
-        photo_date=parsed_photo_date
-    )
-    
-    photo = await service.upload_photo(
-        crop_id,
-        org_id,
-        file,
-        upload_data,
-        current_user.id
+        photo_date=parsed_photo_date,
+        user_id=current_user.id
     )
     return {
         "success": True,
@@ -6,13 +6,14 @@ Provides endpoints for audit creation, retrieval, and structure queries.
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
-import io
 from fastapi import APIRouter, Depends, Query, Path, HTTPException, status, Request, UploadFile, File, Form, Body, BackgroundTasks
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
 
 from app.core.auth import get_current_active_user
 from app.core.database import get_db
 from app.core.logging import get_logger
+from app.core.debug_trace import get_debug_trace
 from app.models.user import User
 from app.models.enums import AuditStatus
 from app.schemas.audit import (
@@ -54,6 +55,7 @@ from app.schemas.audit import (
     AuditRecommendationResponse
 )
 from app.services.audit_service import AuditService
+from app.services.audit_structure_cache import accepts_gzip, audit_structure_cache, etag_matches
 from app.services.response_service import ResponseService
 from app.services.photo_service import PhotoService
 from app.services.workflow_service import WorkflowService
@@ -61,12 +63,13 @@ from app.services.review_service import ReviewService
 from app.services.remote_audit_service import RemoteAuditService
 from app.services.finalization_service import FinalizationService
 from app.services.sharing_service import SharingService
-from app.services.report_service import ReportService
+from app.services.report_service import ReportService, invalidate_report
 from app.services.audit_report_service import AuditReportService
 from app.schemas.response import BaseResponse
 
 router = APIRouter()
 logger = get_logger(__name__)
+trace = get_debug_trace("audit.api")
 
 
 @router.post(
@@ -139,6 +142,7 @@ def get_audits(
     created_by: Optional[str] = Query(None, description="Filter by creator (UUID or 'ME')"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (takes precedence over page)"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
@@ -178,7 +182,7 @@ def get_audits(
             pass
 
     service = AuditService(db)
-    audits, total = service.get_audits(
+    audits, total, next_cursor = service.get_audits(
         fsp_organization_id=actual_fsp_id,
         farming_organization_id=farming_organization_id,
         crop_id=crop_id,
@@ -187,7 +191,8 @@ def get_audits(
         assigned_to_user_id=current_user.id if assigned_to == 'ME' else UUID(assigned_to) if assigned_to else None,
         created_by_user_id=current_user.id if created_by == 'ME' else UUID(created_by) if created_by else None,
         page=page,
-        limit=limit
+        limit=limit,
+        cursor=cursor
     )
 
     return {
@@ -198,7 +203,8 @@ def get_audits(
             "total": total,
             "page": page,
             "limit": limit,
-            "total_pages": (total + limit - 1) // limit if total > 0 else 0
+            "total_pages": (total + limit - 1) // limit if total > 0 else 0,
+            "next_cursor": next_cursor
         }
     }
 
@@ -333,14 +339,25 @@ def delete_audit(
     return None
 
 
+def _render_audit_structure(structure: dict) -> bytes:
+    """Serialize an audit structure in the standard response envelope."""
+    return BaseResponse[AuditStructureResponse](
+        success=True,
+        message="Audit structure retrieved successfully",
+        data=structure
+    ).model_dump_json().encode("utf-8")
+
+
 @router.get(
     "/audits/{audit_id}/structure",
     response_model=BaseResponse[AuditStructureResponse],
+    responses={304: {"description": "Structure unchanged since the ETag in If-None-Match"}},
     summary="Get audit structure",
     description="Get complete audit structure with sections and parameters from snapshots"
 )
 def get_audit_structure(
     audit_id: UUID,
+    request: Request,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
@@ -356,6 +373,10 @@ def get_audit_structure(
     This endpoint is useful for rendering the audit form with all
     necessary configuration data.
     
+    The serialized structure is cached per structure version and sent with
+    a strong ETag; clients revalidate with If-None-Match and get 304 while
+    it is unchanged. Clients sending Accept-Encoding: gzip get a gzip body.
+    
     **Requirements: 7.1**
     """
     logger.info(
@@ -367,13 +388,24 @@ def get_audit_structure(
     )
 
     service = AuditService(db)
-    structure = service.get_audit_structure(audit_id)
+    payload = audit_structure_cache.get(
+        service,
+        audit_id,
+        render=_render_audit_structure,
+        accept_gzip=accepts_gzip(request.headers.get("accept-encoding"))
+    )
 
-    return {
-        "success": True,
-        "message": "Audit structure retrieved successfully",
-        "data": structure
+    headers = {
+        "ETag": payload.etag,
+        "Cache-Control": "private, no-cache",
+        "Vary": "Accept-Encoding"
     }
+    if etag_matches(request.headers.get("if-none-match"), payload):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if payload.content_encoding:
+        headers["Content-Encoding"] = payload.content_encoding
+    return Response(content=payload.body, media_type="application/json", headers=headers)
 
 
 # Removed duplicate get_audit_report (moved to reports.py)
@@ -591,15 +623,15 @@ async def save_audit_responses(
     Save multiple responses to audit parameters.
     Uses generic Request object to bypass validation caching issues and provide deep debugging.
     """
-    print(f"DEBUG: [SimpleSave] Entered async endpoint for audit {audit_id}", flush=True)
+    trace("save_responses_started", audit_id=str(audit_id))
     
     try:
         # 1. Read Raw Body
         body_bytes = await request.body()
-        print(f"DEBUG: [SimpleSave] Raw body length: {len(body_bytes)} bytes", flush=True)
+        trace("save_responses_body", audit_id=str(audit_id), body_bytes=len(body_bytes))
         
         if len(body_bytes) == 0:
-             print("DEBUG: [SimpleSave] Empty body received!", flush=True)
+             trace("save_responses_empty_body", audit_id=str(audit_id))
              return {
                 "success": False,
                 "message": "Empty request body",
@@ -608,7 +640,6 @@ async def save_audit_responses(
 
         # 2. Parse JSON
         json_data = await request.json()
-        print(f"DEBUG: [SimpleSave] JSON parsed, type: {type(json_data)}", flush=True)
         
         # 3. Manual Validation / Reconstruction
         # Expecting List[Dict] directly
@@ -617,17 +648,20 @@ async def save_audit_responses(
         elif isinstance(json_data, dict) and "responses" in json_data:
             responses_data = json_data["responses"]
         else:
-            print(f"DEBUG: [SimpleSave] Unexpected format: {json_data}", flush=True)
+            logger.warning(
+                "Unexpected save responses payload format",
+                extra={"audit_id": str(audit_id), "payload_type": type(json_data).__name__}
+            )
             responses_data = []
 
-        print(f"DEBUG: [SimpleSave] Processing {len(responses_data)} items", flush=True)
+        trace("save_responses_parsed", audit_id=str(audit_id), items=len(responses_data))
 
         # Convert to Pydantic models manually to ensure valid data for service
         pydantic_responses = []
         for item in responses_data:
             # Hotfix: Client sending photos in response_date
             if "response_date" in item and isinstance(item["response_date"], list):
-                print(f"DEBUG: [SimpleSave] Found list in response_date (len={len(item['response_date'])}), moving to evidence_urls", flush=True)
+                trace("evidence_in_response_date", count=len(item["response_date"]))
                 if not item.get("evidence_urls"):
                     item["evidence_urls"] = item["response_date"]
                 else:
@@ -642,7 +676,7 @@ async def save_audit_responses(
                 isinstance(item["response_options"][0], str) and 
                 "/" in item["response_options"][0]):
                 
-                print(f"DEBUG: [SimpleSave] Found paths in response_options (len={len(item['response_options'])}), moving to evidence_urls", flush=True)
+                trace("evidence_in_response_options", count=len(item["response_options"]))
                 if not item.get("evidence_urls"):
                     item["evidence_urls"] = item["response_options"]
                 else:
@@ -651,25 +685,20 @@ async def save_audit_responses(
 
             # Hotfix: Client sending photos in response_numeric
             if "response_numeric" in item and isinstance(item["response_numeric"], list):
-                print(f"DEBUG: [SimpleSave] Found list in response_numeric (len={len(item['response_numeric'])}), moving to evidence_urls", flush=True)
+                trace("evidence_in_response_numeric", count=len(item["response_numeric"]))
                 if not item.get("evidence_urls"):
                     item["evidence_urls"] = item["response_numeric"]
                 else:
                     item["evidence_urls"].extend(item["response_numeric"])
                 item["response_numeric"] = None
 
-            if "response_boolean" in item:
-                 print(f"DEBUG: [SimpleSave] Item {item.get('audit_parameter_instance_id')} has response_boolean={item['response_boolean']}", flush=True)
-
             pydantic_responses.append(ResponseSubmit(**item))
 
         # 4. Service Call (in threadpool)
-        print("DEBUG: [SimpleSave] Initialising ResponseService", flush=True)
         service = ResponseService(db)
         
         bulk_data = ResponseBulkSubmit(responses=pydantic_responses)
         
-        print("DEBUG: [SimpleSave] Awaiting service.submit_bulk_responses in threadpool", flush=True)
         t_start = datetime.now()
         
         # run_in_threadpool is essential for async def calling sync DB code
@@ -681,7 +710,7 @@ async def save_audit_responses(
         )
         
         duration = (datetime.now() - t_start).total_seconds()
-        print(f"DEBUG: [SimpleSave] Service call completed in {duration}s", flush=True)
+        trace("save_responses_completed", audit_id=str(audit_id), duration_s=duration)
 
         return {
             "success": True,
@@ -692,7 +721,6 @@ async def save_audit_responses(
             }
         }
     except Exception as e:
-        print(f"ERROR: [SimpleSave] Failed: {e}", flush=True)
         logger.error(f"Save responses failed: {e}", exc_info=True)
         raise
 
@@ -745,7 +773,7 @@ def get_audit_responses(
     summary="Upload photo for audit response",
     description="Upload a photo for an audit response with validation and compression"
 )
-async def upload_photo(
+def upload_photo(
     audit_id: UUID,
     response_id: UUID,
     file: UploadFile = File(..., description="Photo file (JPEG/PNG, max 10MB)"),
@@ -760,7 +788,7 @@ async def upload_photo(
     - Validates photo count against min_photos/max_photos from parameter_metadata
     - Validates file size (max 10MB)
     - Validates file format (JPEG, PNG)
-    - Compresses image to reduce size
+    - Compresses image to reduce size (off the request thread)
     - Uploads to storage (S3 or local)
     - Creates photo record
     
@@ -778,14 +806,11 @@ async def upload_photo(
 
     service = PhotoService(db)
     
-    # Read file data
-    file_data = await file.read()
-    
     # Upload photo
     photo = service.upload_photo(
         audit_id=audit_id,
         response_id=response_id,
-        file_data=io.BytesIO(file_data),
+        file_data=file.file,
         filename=file.filename,
         caption=caption,
         user_id=current_user.id
@@ -798,6 +823,60 @@ async def upload_photo(
     }
 
 
+@router.post(
+    "/audits/{audit_id}/responses/{response_id}/photos/bulk",
+    response_model=BaseResponse[PhotoListResponse],
+    status_code=status.HTTP_201_CREATED,
+    summary="Upload several photos for audit response",
+    description="Upload several photos for an audit response in one request; all are stored or none"
+)
+def upload_photos_bulk(
+    audit_id: UUID,
+    response_id: UUID,
+    files: List[UploadFile] = File(..., description="Photo files (JPEG/PNG, max 10MB each)"),
+    captions: Optional[List[str]] = Form(None, description="Optional captions, in file order"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Upload several photos for an audit response.
+    
+    Applies the same validation as the single upload to every file, checks
+    max_photos against the whole batch and compresses the photos in
+    parallel. If any photo fails, none is stored.
+    
+    **Requirements: 9.1, 18.3**
+    """
+    logger.info(
+        "Uploading photos via API",
+        extra={
+            "user_id": str(current_user.id),
+            "audit_id": str(audit_id),
+            "response_id": str(response_id),
+            "file_count": len(files)
+        }
+    )
+
+    service = PhotoService(db)
+    
+    photos = service.upload_photos(
+        audit_id=audit_id,
+        response_id=response_id,
+        files=[(file.file, file.filename) for file in files],
+        captions=captions,
+        user_id=current_user.id
+    )
+
+    return {
+        "success": True,
+        "message": f"{len(photos)} photos uploaded successfully",
+        "data": {
+            "items": photos,
+            "total": len(photos)
+        }
+    }
+
+
 @router.post(
     "/audits/{audit_id}/evidence",
     response_model=BaseResponse[PhotoUploadResponse],
@@ -805,7 +884,7 @@ async def upload_photo(
     summary="Upload evidence photo",
     description="Upload a photo as evidence for an audit (not yet linked to a response)"
 )
-async def upload_evidence(
+def upload_evidence(
     audit_id: UUID,
     file: UploadFile = File(..., description="Photo file (JPEG/PNG, max 10MB)"),
     caption: Optional[str] = Form(None, description="Optional photo caption"),
@@ -831,13 +910,10 @@ async def upload_evidence(
 
     service = PhotoService(db)
     
-    # Read file data
-    file_data = await file.read()
-    
     # Upload photo
     photo = service.upload_evidence(
         audit_id=audit_id,
-        file_data=io.BytesIO(file_data),
+        file_data=file.file,
         filename=file.filename,
         caption=caption,
         user_id=current_user.id
@@ -1097,10 +1173,10 @@ def create_audit_recommendation(
         created_by=current_user.id
     )
     
-    print(f"DEBUG: [StandaloneRec] Committing recommendation for audit {audit_id}", flush=True)
     db.add(recommendation)
+    invalidate_report(db, audit_id)
     db.commit()
-    print(f"DEBUG: [StandaloneRec] Committed recommendation for audit {audit_id}", flush=True)
+    trace("recommendation_committed", audit_id=str(audit_id))
     db.refresh(recommendation)
     
     return {
@@ -1138,6 +1214,7 @@ def delete_audit_recommendation(
         )
         
     db.delete(rec)
+    invalidate_report(db, audit_id)
     db.commit()
     
     return None
@@ -1227,7 +1304,6 @@ async def transition_audit_status(
     
     **Requirements: 10.1, 18.3**
     """
-    print(f"DEBUG: [AsyncTransition] Entered endpoint for audit {audit_id}", flush=True)
     logger.info(
         "Transitioning audit status via API",
         extra={
@@ -1248,7 +1324,6 @@ async def transition_audit_status(
             details={"status": data.to_status}
         )
 
-    print(f"DEBUG: [AsyncTransition] Calling WorkflowService.transition_status for audit {audit_id} to {target_status}")
     service = WorkflowService(db)
     
     # Use run_in_threadpool to unblock event loop during heavy transition logic (emails, PDF, etc.)
@@ -1260,7 +1335,7 @@ async def transition_audit_status(
         user_id=current_user.id
     )
     duration = (datetime.now() - t_start).total_seconds()
-    print(f"DEBUG: [AsyncTransition] Transition completed in {duration}s", flush=True)
+    trace("transition_completed", audit_id=str(audit_id), to_status=target_status.value, duration_s=duration)
 
     return {
         "success": True,
@@ -1495,6 +1570,7 @@ def update_review(
     
     review.reviewed_by = current_user.id
     review.reviewed_at = datetime.utcnow()
+    invalidate_report(db, audit_id)
 
     db.commit()
     db.refresh(review)
@@ -1550,6 +1626,7 @@ def flag_response(
     review.is_flagged_for_report = data.is_flagged
     review.reviewed_by = current_user.id
     review.reviewed_at = datetime.utcnow()
+    invalidate_report(db, audit_id)
 
     db.commit()
     db.refresh(review)
@@ -1828,7 +1905,6 @@ def create_schedule_recommendation(
         user_id=current_user.id
     )
     
-    print(f"DEBUG: [ScheduleRec] Recommendation object created, about to return", flush=True)
     return {
         "success": True,
         "message": "Recommendation created successfully",
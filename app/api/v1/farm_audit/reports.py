@@ -12,12 +12,14 @@ from fastapi import APIRouter, Depends, Query
 from fastapi.responses import Response
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.auth import get_current_active_user
 
 from app.services.report_service import ReportService
 from app.services.pdf_service import PDFService
 from app.services.audit_report_service import AuditReportService
+from app.services.report_render_service import ReportRenderService
 
 from app.core.audit_permissions import check_audit_permission
 from app.models.audit import Audit
@@ -25,9 +27,8 @@ from app.models.user import User
 from app.core.exceptions import PermissionError, NotFoundError
 from app.schemas.response import BaseResponse
 from app.schemas.audit import AuditReportResponse
-from app.schemas.audit_report import AuditReportCreate, PDFGenerateRequest
+from app.schemas.audit_report import AuditReportCreate, PDFGenerateRequest, ReportJobResponse
 from fastapi import UploadFile, File
-import io
 
 router = APIRouter()
 
@@ -161,7 +162,7 @@ def save_audit_report(
 
 
 @router.post("/audits/{audit_id}/report/upload-image")
-async def upload_report_image(
+def upload_report_image(
     audit_id: UUID,
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_active_user),
@@ -175,11 +176,10 @@ async def upload_report_image(
     verify_audit_access(db, current_user, audit_id, "write")
     
     service = AuditReportService(db)
-    file_data = await file.read()
     
     image_url = service.upload_report_image(
         audit_id=audit_id,
-        file_data=io.BytesIO(file_data),
+        file_data=file.file,
         filename=file.filename,
         user_id=current_user.id
     )
@@ -225,22 +225,22 @@ def get_audit_report_pdf(
     Generates formatted PDF report with organization branding
     and proper section formatting.
     
+    Served from storage when the audit is unchanged since the last render;
+    otherwise rendered in the render pool while the request waits. Prefer
+    the render job endpoints below for large audits.
+    
     Requirements: 18.8
     """
     # Check permissions
     verify_audit_access(db, current_user, audit_id, "read")
     
-    # Generate PDF
-    report_service = ReportService(db)
-    pdf_service = PDFService(report_service)
-    pdf_bytes = pdf_service.generate_pdf(audit_id, language)
-    
-    # Get audit number for filename
-    report = report_service.generate_report(audit_id, language)
-    audit_number = report.get("audit_details", {}).get("audit_number", "audit")
-    filename = f"{audit_number}_report.pdf"
+    pdf_bytes, filename = ReportRenderService(db).get_or_render(audit_id, language)
     
     # Return PDF as download
+    return _pdf_download(pdf_bytes, filename)
+
+
+def _pdf_download(pdf_bytes: bytes, filename: str) -> Response:
     return Response(
         content=pdf_bytes,
         media_type="application/pdf",
@@ -249,3 +249,80 @@ def get_audit_report_pdf(
         }
     )
 
+
+def _job_data(audit_id: UUID, job: Dict[str, Any]) -> Dict[str, Any]:
+    data = dict(job)
+    data.pop("artifact_key", None)
+    if job["status"] == "READY":
+        data["download_url"] = f"{settings.API_V1_STR}/farm-audit/audits/{audit_id}/report/pdf/jobs/{job['job_id']}/download"
+    return data
+
+
+@router.post(
+    "/audits/{audit_id}/report/pdf/jobs",
+    response_model=BaseResponse[ReportJobResponse],
+    status_code=202,
+    summary="Start report PDF rendering",
+    description="Queue background rendering of the audit report PDF; READY at once if the audit is unchanged"
+)
+def create_report_pdf_job(
+    audit_id: UUID,
+    language: str = Query("en", description="Language code (en, ta, ml)"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Enqueue a report PDF render and return the job to poll.
+    """
+    verify_audit_access(db, current_user, audit_id, "read")
+
+    job = ReportRenderService(db).enqueue(audit_id, language)
+
+    return {
+        "success": True,
+        "message": "Report PDF job queued" if job["status"] != "READY" else "Report PDF ready",
+        "data": _job_data(audit_id, job)
+    }
+
+
+@router.get(
+    "/audits/{audit_id}/report/pdf/jobs/{job_id}",
+    response_model=BaseResponse[ReportJobResponse],
+    summary="Get report PDF job",
+    description="Poll a report PDF render job"
+)
+def get_report_pdf_job(
+    audit_id: UUID,
+    job_id: str,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the status of a report PDF render job.
+    """
+    verify_audit_access(db, current_user, audit_id, "read")
+
+    job = ReportRenderService(db).get_job(audit_id, job_id)
+
+    return {
+        "success": True,
+        "message": "Report PDF job retrieved successfully",
+        "data": _job_data(audit_id, job)
+    }
+
+
+@router.get("/audits/{audit_id}/report/pdf/jobs/{job_id}/download")
+def download_report_pdf_job(
+    audit_id: UUID,
+    job_id: str,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+) -> Response:
+    """
+    Download the PDF of a finished render job (409 while it is not READY).
+    """
+    verify_audit_access(db, current_user, audit_id, "read")
+
+    pdf_bytes, filename = ReportRenderService(db).download(audit_id, job_id)
+
+    return _pdf_download(pdf_bytes, filename)
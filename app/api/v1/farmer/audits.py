@@ -29,6 +29,7 @@ def list_farmer_audits(
     status: Optional[str] = Query("SHARED", description="Filter by status"),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (takes precedence over page)"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
@@ -77,11 +78,12 @@ def list_farmer_audits(
             pass
 
     service = AuditService(db)
-    audits, total = service.get_audits(
+    audits, total, next_cursor = service.get_audits(
         farming_organization_id=farming_org_id,
         status=status_enum,
         page=page,
-        limit=limit
+        limit=limit,
+        cursor=cursor
     )
     
     # Process items to include 'has_report' and 'compliance_score' 
@@ -102,7 +104,8 @@ def list_farmer_audits(
             "total": total,
             "page": page,
             "limit": limit,
-            "total_pages": (total + limit - 1) // limit if total > 0 else 0
+            "total_pages": (total + limit - 1) // limit if total > 0 else 0,
+            "next_cursor": next_cursor
         }
     }
 
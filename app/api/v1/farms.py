@@ -1,7 +1,7 @@
 """
 Farms API endpoints for Uzhathunai v2.0.
 """
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
@@ -56,12 +56,16 @@ def get_farms(
     is_active: bool = Query(None, description="Filter by active status"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (takes precedence over page)"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
 
     """
     Get farms for the current user's organization with pagination.
+    
+    Pass the returned next_cursor as cursor to fetch the next page at
+    constant cost; page numbers keep working.
     """
     service = FarmService(db)
     
@@ -71,7 +75,7 @@ def get_farms(
     # 2. Validation
     validate_organization_type(org_id, OrganizationType.FARMING, db)
     
-    farms, total = service.get_farms(org_id, is_active, page, limit)
+    farms, total, next_cursor = service.get_farms(org_id, is_active, page, limit, cursor=cursor)
 
     
     return {
@@ -82,7 +86,8 @@ def get_farms(
             "total": total,
             "page": page,
             "limit": limit,
-            "total_pages": (total + limit - 1) // limit
+            "total_pages": (total + limit - 1) // limit,
+            "next_cursor": next_cursor
         }
     }
 
@@ -21,6 +21,7 @@ from app.schemas.fsp_service import (
     FSPOrganizationApprovalResponse,
     FSPApprovalReviewRequest,
     FSPServiceListingPaginatedResponse,
+    FSPServiceListingNearbyResponse,
     FSPOrganizationApprovalPaginatedResponse
 )
 from app.schemas.response import BaseResponse
@@ -236,6 +237,67 @@ def delete_service_listing(
 
 # FSP Marketplace Endpoints
 
+@router.get(
+    "/fsp-marketplace/services/nearby",
+    response_model=BaseResponse[FSPServiceListingNearbyResponse],
+    status_code=status.HTTP_200_OK,
+    summary="Find nearby FSP services",
+    description="Get marketplace service listings ranked by distance from a farm or point"
+)
+def get_nearby_marketplace_services(
+    farm_id: Optional[UUID] = Query(None, description="Search around this farm's location"),
+    lat: Optional[float] = Query(None, ge=-90, le=90, description="Origin latitude (when no farm_id)"),
+    lon: Optional[float] = Query(None, ge=-180, le=180, description="Origin longitude (when no farm_id)"),
+    radius_km: Optional[float] = Query(None, gt=0, le=1000, description="Maximum distance in km"),
+    service_type: Optional[UUID] = Query(None, description="Filter by master service ID"),
+    within_coverage: bool = Query(True, description="Only providers whose coverage reaches the origin"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Find FSP marketplace service listings nearest to a farm or point.
+    
+    Returns only ACTIVE listings from ACTIVE or IN_PROGRESS FSP organizations
+    that have a service area, nearest first.
+    
+    **Origin:** either **farm_id** (a farm of the user's organization) or **lat** and **lon**
+    
+    **Filters:**
+    - **radius_km**: Maximum distance from the origin
+    - **service_type**: Master service ID
+    - **within_coverage**: Only providers whose coverage radius reaches the origin (default: true)
+    
+    **Returns:**
+    - **items**: Service listings with **distance_km**
+    - **limit**: Items per page
+    - **next_cursor**: Pass as **cursor** to get the next page (null on the last page)
+    """
+    service = FSPServiceService(db)
+    listings, next_cursor = service.get_nearby_service_listings(
+        user_id=current_user.id,
+        lat=lat,
+        lon=lon,
+        farm_id=farm_id,
+        radius_km=radius_km,
+        service_type=service_type,
+        within_coverage=within_coverage,
+        cursor=cursor,
+        limit=limit
+    )
+    
+    return {
+        "success": True,
+        "message": "Nearby marketplace services retrieved successfully",
+        "data": {
+            "items": listings,
+            "limit": limit,
+            "next_cursor": next_cursor
+        }
+    }
+
+
 @router.get(
     "/fsp-marketplace/services",
     response_model=BaseResponse[FSPServiceListingPaginatedResponse],
@@ -250,6 +312,7 @@ def get_marketplace_services(
     pricing_model: Optional[str] = Query(None, description="Filter by pricing model"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (takes precedence over page)"),
     db: Session = Depends(get_db)
 ):
     """
@@ -264,22 +327,25 @@ def get_marketplace_services(
     - **pricing_model**: PER_HOUR, PER_DAY, PER_ACRE, FIXED, CUSTOM
     - **page**: Page number (default: 1)
     - **limit**: Items per page (default: 20, max: 100)
+    - **cursor**: next_cursor of the previous page; constant cost at any depth
     
     **Returns:**
     - **items**: List of service listings
-    - **total**: Total count
+    - **total**: Total count (may lag new listings by a few seconds)
     - **page**: Current page
     - **limit**: Items per page
     - **total_pages**: Total pages
+    - **next_cursor**: Pass as **cursor** to get the next page (null on the last page)
     """
     service = FSPServiceService(db)
-    listings, total = service.get_service_listings(
+    listings, total, next_cursor = service.get_service_listings(
         fsp_organization_id=fsp_organization_id,
         service_type=service_type,
         district=district,
         pricing_model=pricing_model,
         page=page,
-        limit=limit
+        limit=limit,
+        cursor=cursor
     )
     
     return {
@@ -290,7 +356,8 @@ def get_marketplace_services(
             "total": total,
             "page": page,
             "limit": limit,
-            "total_pages": (total + limit - 1) // limit
+            "total_pages": (total + limit - 1) // limit,
+            "next_cursor": next_cursor
         }
     }
 
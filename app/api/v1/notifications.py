@@ -2,17 +2,21 @@
 Notification endpoints for user notifications.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+import json
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Dict, List
+from typing import Any, AsyncIterator, Dict, Optional
 from uuid import UUID
-from datetime import datetime
 
 from app.core.auth import get_current_active_user
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_db, run_then_release_db
+from app.core.realtime import Subscription, realtime_hub
 from app.models.user import User
-from app.models.notification import Notification
 from app.core.logging import get_logger
+from app.schemas.notification import NotificationResponse
+from app.services.notification_service import NotificationService, notification_topic
 
 router = APIRouter()
 logger = get_logger(__name__)
@@ -22,10 +26,14 @@ logger = get_logger(__name__)
 def get_notifications(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
-    unread_only: bool = False
+    unread_only: bool = False,
+    limit: int = Query(50, ge=1, le=200, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page")
 ) -> Dict:
     """
-    Get all notifications for the current user.
+    Get notifications for the current user, newest first.
+    
+    Returns one page; pass next_cursor as cursor for older notifications.
     """
     logger.info(
         "Fetching notifications",
@@ -35,33 +43,17 @@ def get_notifications(
         }
     )
     
-    query = db.query(Notification).filter(Notification.user_id == current_user.id)
-    
-    if unread_only:
-        query = query.filter(Notification.is_read == False)
-    
-    notifications = query.order_by(Notification.created_at.desc()).all()
-    
-    result = []
-    for notif in notifications:
-        result.append({
-            "id": str(notif.id),
-            "organization_id": str(notif.organization_id) if notif.organization_id else None,
-            "notification_type": notif.notification_type,
-            "type": notif.type,
-            "title": notif.title,
-            "message": notif.message,
-            "reference_type": notif.reference_type,
-            "reference_id": str(notif.reference_id) if notif.reference_id else None,
-            "data": notif.data,
-            "is_read": notif.is_read,
-            "created_at": notif.created_at.isoformat(),
-            "read_at": notif.read_at.isoformat() if notif.read_at else None
-        })
+    page = NotificationService(db).get_notifications(
+        current_user.id, unread_only=unread_only, cursor=cursor, limit=limit
+    )
+    result = [
+        NotificationResponse.model_validate(n).model_dump(mode="json") for n in page.items
+    ]
     
     return {
         "success": True,
         "data": result,
+        "next_cursor": page.next_cursor,
         "error_code": None
     }
 
@@ -75,17 +67,7 @@ def mark_notification_as_read(
     """
     Mark a notification as read.
     """
-    notification = db.query(Notification).filter(
-        Notification.id == notification_id,
-        Notification.user_id == current_user.id
-    ).first()
-    
-    if not notification:
-        raise HTTPException(status_code=404, detail="Notification not found")
-    
-    notification.is_read = True
-    notification.read_at = datetime.utcnow()
-    db.commit()
+    NotificationService(db).mark_as_read(notification_id, current_user.id)
     
     return {
         "success": True,
@@ -110,9 +92,90 @@ def get_unread_notification_count(
         }
     )
     
-    count = db.query(Notification).filter(
-        Notification.user_id == current_user.id,
-        Notification.is_read == False
-    ).count()
+    count = NotificationService(db).get_unread_count(current_user.id)
     
     return {'count': count}
+
+
+@router.post("/read-all")
+def mark_all_notifications_as_read(
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+) -> Dict:
+    """
+    Mark all unread notifications of the current user as read.
+    """
+    count = NotificationService(db).mark_all_read(current_user.id)
+    
+    return {
+        "success": True,
+        "message": f"{count} notifications marked as read",
+        "count": count,
+        "error_code": None
+    }
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _notification_events(
+    request: Request,
+    subscription: Subscription,
+    unread_count: int
+) -> AsyncIterator[str]:
+    """Stream the current unread count, then every event of the subscription."""
+    try:
+        yield _sse("unread", {"type": "unread", "count": unread_count})
+        while True:
+            event = await subscription.get(timeout=settings.NOTIFICATION_STREAM_KEEPALIVE)
+            if subscription.overflowed:
+                yield _sse("resync", {"type": "resync"})
+                return
+            if event is None:
+                if await request.is_disconnected():
+                    return
+                # Comment line: keeps proxies from timing out an idle stream
+                yield ": keepalive\n\n"
+                continue
+            yield _sse(event["type"], event)
+    finally:
+        subscription.close()
+
+
+@router.get("/stream")
+async def notification_stream(
+    request: Request,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+) -> StreamingResponse:
+    """
+    Stream the current user's notifications as Server-Sent Events.
+    
+    Replaces polling /unread-count. Events, each with a JSON data line:
+    "unread" ({"count"}) on connect and whenever notifications are read,
+    "notification" ({"data": notification, "unread_count"}) for each new
+    notification, and "resync" when the client fell behind; it should then
+    refetch the list and reconnect. Comment lines are sent as keepalives.
+    """
+    # Subscribe before reading the count so no change falls in between
+    subscription = realtime_hub.subscribe(notification_topic(current_user.id))
+    try:
+        unread_count = await run_then_release_db(
+            db, NotificationService(db).get_unread_count, current_user.id
+        )
+    except Exception:
+        subscription.close()
+        raise
+    
+    logger.info(
+        "Notification stream opened",
+        extra={"user_id": str(current_user.id)}
+    )
+    
+    return StreamingResponse(
+        _notification_events(request, subscription, unread_count),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -5,7 +5,6 @@ Endpoints for query management, responses, and schedule change proposals.
 """
 from typing import Optional
 from uuid import UUID
-import io
 from fastapi import APIRouter, Depends, Query as QueryParam, File, UploadFile, Form
 from sqlalchemy.orm import Session
 
@@ -265,7 +264,7 @@ def upload_query_photo(
 
 
 @router.post("/responses/{response_id}/photos", response_model=QueryPhotoResponse, status_code=201)
-async def upload_response_photo(
+def upload_response_photo(
     response_id: UUID,
     file: UploadFile = File(..., description="Photo file"),
     caption: Optional[str] = Form(None),
@@ -279,12 +278,9 @@ async def upload_response_photo(
     """
     service = QueryResponseService(db)
     
-    # Read file data
-    file_data = await file.read()
-    
     photo = service.upload_response_photo(
         response_id=response_id,
-        file_data=io.BytesIO(file_data),
+        file_data=file.file,
         filename=file.filename,
         user_id=current_user.id,
         caption=caption
@@ -17,6 +17,8 @@ from app.services.schedule_service import ScheduleService
 from app.services.schedule_task_service import ScheduleTaskService
 from app.schemas.schedule import (
     ScheduleFromTemplateCreate,
+    ScheduleBulkFromTemplateCreate,
+    ScheduleBulkDeployResponse,
     ScheduleFromScratchCreate,
     ScheduleCopyRequest,
     ScheduleTaskCreate,
@@ -54,6 +56,34 @@ def create_schedule_from_template(
     return schedule
 
 
+@router.post("/from-template/bulk", response_model=ScheduleBulkDeployResponse)
+def deploy_schedule_template(
+    data: ScheduleBulkFromTemplateCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create schedules from one template for many crops in one transaction.
+    
+    Crops that cannot be deployed are reported with an error code in their
+    result instead of failing the whole batch.
+    """
+    service = ScheduleService(db)
+    results = service.deploy_template(
+        template_id=data.template_id,
+        name=data.name,
+        targets=data.crops,
+        user=current_user
+    )
+    created = sum(1 for result in results if result.get("schedule_id"))
+    return ScheduleBulkDeployResponse(
+        template_id=data.template_id,
+        created=created,
+        failed=len(results) - created,
+        results=results
+    )
+
+
 @router.post("/from-scratch", response_model=ScheduleResponse)
 def create_schedule_from_scratch(
     data: ScheduleFromScratchCreate,
@@ -107,6 +137,7 @@ def get_schedules(
     status: Optional[str] = Query(None, description="Filter by status (ACTIVE, CANCELLED)"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (takes precedence over page)"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
@@ -116,13 +147,14 @@ def get_schedules(
     Returns paginated list of schedules.
     """
     service = ScheduleService(db)
-    schedules, total = service.get_schedules(
+    schedules, total, next_cursor = service.get_schedules(
         user=current_user,
         crop_id=crop_id,
         fsp_id=fsp_id,
         status=status,
         page=page,
-        limit=limit
+        limit=limit,
+        cursor=cursor
     )
     
     return {
@@ -130,7 +162,8 @@ def get_schedules(
         "total": total,
         "page": page,
         "limit": limit,
-        "total_pages": (total + limit - 1) // limit
+        "total_pages": (total + limit - 1) // limit,
+        "next_cursor": next_cursor
     }
 
 
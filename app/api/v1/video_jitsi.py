@@ -1,6 +1,9 @@
 """
 Jitsi Meet video calling API endpoints.
 Simplified video session management using Jitsi Meet rooms.
+
+Handlers are plain `def`: they use the synchronous session and ChatService,
+so FastAPI runs them in its threadpool instead of on the event loop.
 """
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
@@ -43,7 +46,7 @@ def generate_jitsi_room_name(work_order_id: UUID) -> str:
     return f"agro-{short_hash}-{timestamp}"
 
 @router.post("/schedule", status_code=status.HTTP_201_CREATED)
-async def schedule_meeting(
+def schedule_meeting(
     request: ScheduleMeetingRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -110,7 +113,8 @@ async def schedule_meeting(
     
     # 5. Create notification for recipient
     try:
-        from app.models.notification import Notification
+        from app.services.notification_service import NotificationService
+        from app.models.enums import NotificationType
         
         print(f"[DEBUG] Starting notification creation for video call")
         
@@ -152,30 +156,23 @@ async def schedule_meeting(
         
         print(f"[DEBUG] Found {len(recipient_members)} recipient members")
         
-        # Create notification for each recipient
-        for member in recipient_members:
-            print(f"[DEBUG] Creating notification for user: {member.user_id}")
-            notification = Notification(
-                user_id=member.user_id,
-                organization_id=recipient_org_id,
-                notification_type='ALERT',
-                type='VIDEO_CALL',
-                title='Video Call Invitation',
-                message=f'{caller_name} has started a video consultation. Join now!',
-                reference_type='WORK_ORDER',
-                reference_id=work_order.id,
-                data={
-                    'session_id': str(video_session.id),
-                    'join_url': join_url,
-                    'room_name': room_name,
-                    'work_order_id': str(work_order.id),
-                    'caller_name': caller_name
-                },
-                is_read=False
-            )
-            db.add(notification)
-        
-        db.commit()
+        NotificationService(db).notify(
+            [member.user_id for member in recipient_members],
+            title='Video Call Invitation',
+            message=f'{caller_name} has started a video consultation. Join now!',
+            notification_type=NotificationType.ALERT,
+            type='VIDEO_CALL',
+            organization_id=recipient_org_id,
+            reference_type='WORK_ORDER',
+            reference_id=work_order.id,
+            data={
+                'session_id': str(video_session.id),
+                'join_url': join_url,
+                'room_name': room_name,
+                'work_order_id': str(work_order.id),
+                'caller_name': caller_name
+            }
+        )
         print(f"[DEBUG] Successfully created {len(recipient_members)} notifications")
     except Exception as e:
         # Non-blocking - log but don't fail the meeting creation
@@ -238,7 +235,7 @@ async def schedule_meeting(
     }
 
 @router.get("/{session_id}/join-url")
-async def get_join_url(
+def get_join_url(
     session_id: UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -283,7 +280,7 @@ async def get_join_url(
     }
 
 @router.get("/my-active-calls")
-async def get_my_active_calls(
+def get_my_active_calls(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -343,7 +340,7 @@ async def get_my_active_calls(
     }
 
 @router.get("/history")
-async def get_video_history(
+def get_video_history(
     limit: int = 3,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -419,7 +416,7 @@ async def get_video_history(
     }
 
 @router.patch("/sessions/{session_id}/end")
-async def end_session(
+def end_session(
     session_id: UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -2,7 +2,6 @@
 Work Order API endpoints for Uzhathunai v2.0.
 Handles work order CRUD operations, acceptance workflow, and scope management.
 """
-import io
 from typing import Optional, List
 from uuid import UUID
 from fastapi import APIRouter, Depends, status, Query, UploadFile, File
@@ -612,7 +611,7 @@ def toggle_work_order_access(
     summary="Upload work order completion proof",
     description="Upload a photo as proof of work completion"
 )
-async def upload_work_order_proof(
+def upload_work_order_proof(
     work_order_id: UUID,
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_active_user),
@@ -623,13 +622,10 @@ async def upload_work_order_proof(
     """
     service = WorkOrderService(db)
     
-    # Read file data
-    file_data = await file.read()
-    
     # Upload proof
     file_url = service.upload_completion_proof(
         work_order_id=work_order_id,
-        file_data=io.BytesIO(file_data),
+        file_data=file.file,
         filename=file.filename,
         user_id=current_user.id
     )
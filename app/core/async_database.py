@@ -0,0 +1,129 @@
+"""
+Async database session management for Uzhathunai v2.0.
+
+Async endpoints must not run synchronous SQLAlchemy work on the event loop
+thread: every blocking round trip stalls all other requests on the worker.
+They either depend on get_async_db (SQLAlchemy asyncio over asyncpg) or are
+declared as plain `def` so FastAPI runs them in its threadpool.
+
+The async engine is created lazily so the application still imports when
+asyncpg is not installed (scripts, migrations, sync-only tooling).
+"""
+import asyncio
+import warnings
+from typing import AsyncGenerator, Callable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.core.metrics import install_pool_metrics
+from app.core.query_profiler import install_query_profiler
+
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+
+
+def to_async_url(database_url: str) -> str:
+    """Convert a sync PostgreSQL URL (psycopg2) to its asyncpg equivalent."""
+    url = make_url(database_url)
+    if url.get_backend_name() == "postgresql":
+        url = url.set(drivername="postgresql+asyncpg")
+    return url.render_as_string(hide_password=False)
+
+
+def get_async_engine() -> AsyncEngine:
+    """Get the process-wide async engine, creating it on first use."""
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            to_async_url(settings.DATABASE_URL),
+            pool_size=settings.DATABASE_POOL_SIZE,
+            max_overflow=settings.DATABASE_MAX_OVERFLOW,
+            pool_pre_ping=True,
+            echo=settings.SQL_DEBUG
+        )
+        install_query_profiler(_async_engine.sync_engine)
+        install_pool_metrics(_async_engine.sync_engine, "async")
+    return _async_engine
+
+
+def get_async_session_factory() -> async_sessionmaker:
+    """Get the async session factory bound to the async engine."""
+    global _async_session_factory
+    if _async_session_factory is None:
+        # Objects stay usable after commit; expired attributes cannot lazy-load in async code
+        _async_session_factory = async_sessionmaker(
+            bind=get_async_engine(),
+            class_=AsyncSession,
+            autoflush=False,
+            expire_on_commit=False
+        )
+    return _async_session_factory
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to get an async database session.
+    """
+    async with get_async_session_factory()() as db:
+        yield db
+
+
+async def dispose_async_engine() -> None:
+    """Close pooled async connections (called on application shutdown)."""
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    _async_engine = None
+    _async_session_factory = None
+
+
+# ----------------------------------------------------------------------
+# Event loop guard
+# ----------------------------------------------------------------------
+
+class SyncDBOnEventLoopWarning(RuntimeWarning):
+    """A synchronous database call was made on the event loop thread."""
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def install_event_loop_guard(
+    engine: Engine,
+    on_violation: Optional[Callable[[str], None]] = None
+) -> Callable[[], None]:
+    """
+    Report synchronous statements executed on a thread running an event loop.
+
+    Async engines are exempt: their statements run on the loop by design.
+    By default a SyncDBOnEventLoopWarning is emitted, so test runs can turn
+    violations into failures with `-W error::app.core.async_database.SyncDBOnEventLoopWarning`.
+
+    Args:
+        engine: Sync engine to watch
+        on_violation: Called with the SQL statement instead of warning
+
+    Returns:
+        Function removing the guard
+    """
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if conn.dialect.is_async or not _on_event_loop():
+            return
+        if on_violation is not None:
+            on_violation(statement)
+        else:
+            warnings.warn(
+                f"Synchronous database call on the event loop thread: {statement[:200]}",
+                SyncDBOnEventLoopWarning
+            )
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    return lambda: event.remove(engine, "before_cursor_execute", before_cursor_execute)
@@ -1,8 +1,12 @@
 """
 Redis-based caching service for reference data.
 """
+import asyncio
 import json
-from typing import Optional, List, Dict, Any
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any, Hashable, Tuple
 from datetime import timedelta
 import structlog
 
@@ -14,14 +18,21 @@ except ImportError:
     REDIS_AVAILABLE = False
 
 from app.core.config import settings
+from app.core.metrics import record_cache_lookup
 
 logger = structlog.get_logger()
 
+# Keys fetched per SCAN step and deleted per UNLINK call
+SCAN_BATCH_SIZE = 500
+
 class CacheService:
     """Redis-based caching service."""
     
     def __init__(self):
         """Initialize Redis connection."""
+        self._namespace_stats: Dict[str, List[int]] = {}
+        self._stats_lock = threading.Lock()
+        
         if not REDIS_AVAILABLE:
             logger.warning("Redis module not available. Caching will be disabled.")
             self.redis_client = None
@@ -58,19 +69,29 @@ class CacheService:
         key_parts = [settings.CACHE_PREFIX, prefix] + list(args)
         return ":".join(key_parts)
     
-    def get(self, key: str) -> Optional[Any]:
-        """Get value from cache."""
+    def get(self, key: str, namespace: Optional[str] = None) -> Optional[Any]:
+        """
+        Get value from cache.
+        
+        Args:
+            key: Cache key
+            namespace: Namespace whose hit/miss counters record this lookup
+        """
         if not self.redis_client:
             return None
         
         try:
             value = self.redis_client.get(key)
-            if value:
-                return json.loads(value)
-            return None
+            result = json.loads(value) if value else None
         except Exception as e:
             logger.error(f"Cache get error: {e}")
-            return None
+            result = None
+        
+        if namespace:
+            self._record_lookup(namespace, result is not None)
+        else:
+            record_cache_lookup("redis", self._key_family(key), result is not None)
+        return result
     
     def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
         """Set value in cache with optional TTL."""
@@ -99,18 +120,150 @@ class CacheService:
             return False
     
     def delete_pattern(self, pattern: str) -> int:
-        """Delete all keys matching pattern."""
+        """
+        Delete all keys matching pattern.
+        
+        Walks the keyspace incrementally with SCAN and UNLINKs in batches, so
+        Redis is never blocked. Prefer invalidate_namespace for cache entries.
+        """
         if not self.redis_client:
             return 0
         
+        deleted = 0
         try:
-            keys = self.redis_client.keys(pattern)
-            if keys:
-                return self.redis_client.delete(*keys)
-            return 0
+            batch = []
+            for key in self.redis_client.scan_iter(match=pattern, count=SCAN_BATCH_SIZE):
+                batch.append(key)
+                if len(batch) >= SCAN_BATCH_SIZE:
+                    deleted += self.redis_client.unlink(*batch)
+                    batch = []
+            if batch:
+                deleted += self.redis_client.unlink(*batch)
+            return deleted
         except Exception as e:
             logger.error(f"Cache delete pattern error: {e}")
+            return deleted
+    
+    # Versioned namespaces
+    #
+    # Keys of a namespace (e.g. "crops:org:<id>") embed the namespace's
+    # generation: <prefix>:<namespace>:v<generation>:<parts>. Invalidating a
+    # namespace is a single INCR; entries of older generations are never read
+    # again and are removed by their TTL or by sweep_stale_namespaces().
+    
+    def _namespace_version_key(self, namespace: str) -> str:
+        return self._get_key("nsver", namespace)
+    
+    def namespace_version(self, namespace: str) -> int:
+        """Get the current generation of a namespace."""
+        if not self.redis_client:
+            return 0
+        
+        try:
+            return int(self.redis_client.get(self._namespace_version_key(namespace)) or 0)
+        except Exception as e:
+            logger.error(f"Cache namespace version error: {e}")
+            return 0
+    
+    def namespaced_key(self, namespace: str, *args: str) -> str:
+        """Generate a cache key bound to the namespace's current generation."""
+        return self._get_key(namespace, f"v{self.namespace_version(namespace)}", *args)
+    
+    def get_namespaced(self, namespace: str, *args: str) -> Optional[Any]:
+        """Get value of a namespaced key, recording a hit or miss for the namespace."""
+        return self.get(self.namespaced_key(namespace, *args), namespace=namespace)
+    
+    def set_namespaced(self, namespace: str, *args: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """Set value of a namespaced key."""
+        return self.set(self.namespaced_key(namespace, *args), value, ttl)
+    
+    def invalidate_namespace(self, namespace: str) -> int:
+        """
+        Invalidate every entry of a namespace by bumping its generation.
+        
+        Returns:
+            New generation (0 when caching is disabled)
+        """
+        if not self.redis_client:
             return 0
+        
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.incr(self._namespace_version_key(namespace))
+            pipe.sadd(self._get_key("nsdirty"), namespace)
+            version, _ = pipe.execute()
+            return int(version)
+        except Exception as e:
+            logger.error(f"Cache namespace invalidation error: {e}")
+            return 0
+    
+    def sweep_stale_namespaces(self, max_namespaces: int = 100) -> int:
+        """
+        Delete entries of superseded namespace generations.
+        
+        Pops invalidated namespaces from the dirty set (so concurrent sweepers
+        never process the same one) and SCANs each for keys whose generation
+        is not current.
+        
+        Returns:
+            Number of keys deleted
+        """
+        if not self.redis_client:
+            return 0
+        
+        deleted = 0
+        try:
+            namespaces = self.redis_client.spop(self._get_key("nsdirty"), max_namespaces) or []
+            for namespace in namespaces:
+                base = self._get_key(namespace, "")
+                current = f"v{self.namespace_version(namespace)}"
+                batch = []
+                for key in self.redis_client.scan_iter(match=f"{base}v*", count=SCAN_BATCH_SIZE):
+                    if key[len(base):].split(":", 1)[0] != current:
+                        batch.append(key)
+                    if len(batch) >= SCAN_BATCH_SIZE:
+                        deleted += self.redis_client.unlink(*batch)
+                        batch = []
+                if batch:
+                    deleted += self.redis_client.unlink(*batch)
+        except Exception as e:
+            logger.error(f"Cache namespace sweep error: {e}")
+        
+        if deleted:
+            logger.info("Swept stale cache namespaces", deleted_keys=deleted)
+        return deleted
+    
+    @staticmethod
+    def _namespace_family(namespace: str) -> str:
+        """Group namespaces by their leading segment ("crops:org:<id>" -> "crops")."""
+        return namespace.split(":", 1)[0]
+    
+    @staticmethod
+    def _key_family(key: str) -> str:
+        """Get the family of a plain key ("<prefix>:crops:..." -> "crops")."""
+        parts = key.split(":", 2)
+        return parts[1] if len(parts) > 1 else key
+    
+    def _record_lookup(self, namespace: str, hit: bool) -> None:
+        family = self._namespace_family(namespace)
+        record_cache_lookup("redis", family, hit)
+        with self._stats_lock:
+            counters = self._namespace_stats.setdefault(family, [0, 0])
+            counters[0 if hit else 1] += 1
+    
+    def get_namespace_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-namespace hit/miss counters of this process."""
+        with self._stats_lock:
+            snapshot = {family: tuple(counters) for family, counters in self._namespace_stats.items()}
+        
+        return {
+            family: {
+                "hits": hits,
+                "misses": misses,
+                "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None
+            }
+            for family, (hits, misses) in snapshot.items()
+        }
     
     def exists(self, key: str) -> bool:
         """Check if key exists in cache."""
@@ -124,6 +277,73 @@ class CacheService:
             return False
 
 
+class LocalLRUCache:
+    """
+    Bounded, thread-safe in-process LRU cache with optional per-entry TTL.
+    
+    Used for small, hot lookups (e.g. translated names) where a Redis round
+    trip per lookup would cost more than the lookup itself.
+    """
+    
+    def __init__(self, maxsize: int = 1024, ttl: Optional[int] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get value for key, or default if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[int] = None) -> None:
+        """Set value for key, evicting the least recently used entry when full."""
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def delete(self, key: Hashable) -> bool:
+        """Delete key from cache."""
+        with self._lock:
+            return self._data.pop(key, None) is not None
+    
+    def delete_where(self, predicate) -> int:
+        """Delete all keys for which predicate(key) is true."""
+        with self._lock:
+            keys = [key for key in self._data if predicate(key)]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+    
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+    
+    def __len__(self) -> int:
+        return len(self._data)
+
+
 class ReferenceDataCache:
     """Specialized caching for reference data with language support."""
     
@@ -131,10 +351,13 @@ class ReferenceDataCache:
         self.cache = cache_service
         self.default_ttl = 300  # 5 minutes
     
+    CATEGORIES_NAMESPACE = "reference_categories"
+    DATA_NAMESPACE = "reference_data"
+    
     def get_categories_key(self, language: str, active_only: bool) -> str:
         """Generate cache key for categories."""
-        return self.cache._get_key(
-            "reference_categories",
+        return self.cache.namespaced_key(
+            self.CATEGORIES_NAMESPACE,
             language,
             "active" if active_only else "all"
         )
@@ -143,8 +366,8 @@ class ReferenceDataCache:
                      search: Optional[str] = None, page: int = 1, limit: int = 50) -> str:
         """Generate cache key for reference data."""
         search_key = f"search_{search}" if search else "no_search"
-        return self.cache._get_key(
-            "reference_data",
+        return self.cache.namespaced_key(
+            self.DATA_NAMESPACE,
             category_code,
             language,
             "active" if active_only else "all",
@@ -156,7 +379,7 @@ class ReferenceDataCache:
     def get_categories(self, language: str, active_only: bool) -> Optional[List[Dict[str, Any]]]:
         """Get cached categories."""
         key = self.get_categories_key(language, active_only)
-        cached_data = self.cache.get(key)
+        cached_data = self.cache.get(key, namespace=self.CATEGORIES_NAMESPACE)
         
         if cached_data:
             logger.info(
@@ -198,7 +421,7 @@ class ReferenceDataCache:
                           limit: int = 50) -> Optional[Dict[str, Any]]:
         """Get cached reference data."""
         key = self.get_data_key(category_code, language, active_only, search, page, limit)
-        cached_data = self.cache.get(key)
+        cached_data = self.cache.get(key, namespace=self.DATA_NAMESPACE)
         
         if cached_data:
             logger.info(
@@ -250,43 +473,45 @@ class ReferenceDataCache:
     
     def invalidate_categories(self) -> int:
         """Invalidate all cached categories."""
-        pattern = self.cache._get_key("reference_categories", "*")
-        deleted = self.cache.delete_pattern(pattern)
+        version = self.cache.invalidate_namespace(self.CATEGORIES_NAMESPACE)
         
         logger.info(
             "Categories cache invalidated",
-            deleted_keys=deleted,
-            pattern=pattern
+            namespace=self.CATEGORIES_NAMESPACE,
+            version=version
         )
         
-        return deleted
+        return version
     
     def invalidate_category_data(self, category_code: str) -> int:
-        """Invalidate cached data for specific category."""
-        pattern = self.cache._get_key("reference_data", category_code, "*")
-        deleted = self.cache.delete_pattern(pattern)
+        """
+        Invalidate cached data for specific category.
+        
+        Reference data shares one namespace, so this drops every category;
+        edits are rare and a single INCR beats scanning for the category's keys.
+        """
+        version = self.cache.invalidate_namespace(self.DATA_NAMESPACE)
         
         logger.info(
             "Category data cache invalidated",
             category_code=category_code,
-            deleted_keys=deleted,
-            pattern=pattern
+            namespace=self.DATA_NAMESPACE,
+            version=version
         )
         
-        return deleted
+        return version
     
     def invalidate_all_reference_data(self) -> int:
         """Invalidate all cached reference data."""
-        pattern = self.cache._get_key("reference_data", "*")
-        deleted = self.cache.delete_pattern(pattern)
+        version = self.cache.invalidate_namespace(self.DATA_NAMESPACE)
         
         logger.info(
             "All reference data cache invalidated",
-            deleted_keys=deleted,
-            pattern=pattern
+            namespace=self.DATA_NAMESPACE,
+            version=version
         )
         
-        return deleted
+        return version
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
@@ -296,30 +521,34 @@ class ReferenceDataCache:
         try:
             info = self.cache.redis_client.info()
             
-            # Count reference data keys
-            categories_pattern = self.cache._get_key("reference_categories", "*")
-            data_pattern = self.cache._get_key("reference_data", "*")
-            
-            categories_keys = len(self.cache.redis_client.keys(categories_pattern))
-            data_keys = len(self.cache.redis_client.keys(data_pattern))
-            
             return {
                 "status": "enabled",
                 "redis_version": info.get("redis_version"),
                 "used_memory": info.get("used_memory_human"),
                 "connected_clients": info.get("connected_clients"),
                 "total_commands_processed": info.get("total_commands_processed"),
-                "reference_data_keys": {
-                    "categories": categories_keys,
-                    "data": data_keys,
-                    "total": categories_keys + data_keys
-                }
+                "total_keys": self.cache.redis_client.dbsize(),
+                "namespace_versions": {
+                    self.CATEGORIES_NAMESPACE: self.cache.namespace_version(self.CATEGORIES_NAMESPACE),
+                    self.DATA_NAMESPACE: self.cache.namespace_version(self.DATA_NAMESPACE)
+                },
+                "namespaces": self.cache.get_namespace_stats()
             }
         except Exception as e:
             logger.error(f"Error getting cache stats: {e}")
             return {"status": "error", "error": str(e)}
 
 
+async def run_namespace_sweeper(cache: CacheService, interval: int) -> None:
+    """Periodically delete superseded namespace generations off the event loop."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(cache.sweep_stale_namespaces)
+        except Exception as e:
+            logger.error(f"Cache namespace sweeper error: {e}")
+
+
 # Global cache instances
 cache_service = CacheService()
 reference_data_cache = ReferenceDataCache(cache_service)
\ No newline at end of file
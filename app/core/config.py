@@ -41,6 +41,25 @@ class Settings(BaseSettings):
     REDIS_URL: str = "redis://localhost:6379/0"
     REDIS_CACHE_TTL: int = 3600
     CACHE_PREFIX: str = "uzhathunai"
+    CACHE_SWEEP_INTERVAL_SECONDS: int = 300  # 0 disables the stale namespace sweeper
+    DASHBOARD_SNAPSHOT_MAX_AGE: int = 300  # Max staleness (seconds) of BFF dashboard snapshots
+    RBAC_MATRIX_VERSION_CHECK_SECONDS: float = 2.0  # How often workers re-check permission matrix versions
+    RBAC_MATRIX_CACHE_TTL: int = 300  # Max age (seconds) of a cached permission matrix, even without a version bump
+    TEMPLATE_SNAPSHOT_CACHE_TTL: int = 300  # Max age (seconds) of memoized template snapshots; 0 disables
+    TEMPLATE_SNAPSHOT_CACHE_SIZE: int = 256
+    AUDIT_STRUCTURE_CACHE_TTL: int = 900  # Max age (seconds) of cached serialized audit structures
+    AUDIT_STRUCTURE_CACHE_SIZE: int = 128
+    PDF_RENDER_WORKERS: int = 2  # Processes rendering report PDFs
+    PDF_RENDER_TIMEOUT: int = 120  # Seconds before a queued render is considered lost
+    REPORT_JOB_TTL: int = 86400  # How long report render jobs stay pollable
+    IMAGE_PROCESS_WORKERS: int = 2  # Processes compressing uploaded photos; 0 processes them inline
+    IMAGE_PROCESS_TIMEOUT: int = 30  # Seconds to wait for one photo to be processed
+    PAGINATION_TOTAL_CACHE_TTL: int = 30  # Max age (seconds) of cached list totals
+    FSP_ACCESS_CACHE_TTL: int = 30  # Max age (seconds) of cached FSP work order access decisions
+    CHAT_ACCESS_CACHE_TTL: int = 60  # Max age (seconds) of cached chat channel access checks
+    REALTIME_QUEUE_SIZE: int = 100  # Events buffered per WebSocket/SSE subscriber before it is dropped
+    NOTIFICATION_UNREAD_TTL: int = 3600  # Max age (seconds) of a Redis unread counter before it is recounted
+    NOTIFICATION_STREAM_KEEPALIVE: int = 15  # Seconds between SSE keepalive comments on the notification stream
     
     # CORS
     CORS_ORIGINS: str = "http://localhost:3000,http://localhost:8000,http://localhost:8081,http://localhost:8082,http://localhost:19006"
@@ -73,10 +92,18 @@ class Settings(BaseSettings):
     AWS_SECRET_ACCESS_KEY: Optional[str] = None
     AWS_REGION_NAME: str = "ap-south-1"
     AWS_S3_BUCKET: str = "uzhathunai-platform-uploads-2026"
+    AWS_S3_ENDPOINT_URL: Optional[str] = None  # S3-compatible endpoint (MinIO, local stand-ins)
+    S3_MAX_POOL_CONNECTIONS: int = 20  # Connections held by the shared S3 client
     
     # Logging
     LOG_LEVEL: str = "INFO"
     SQL_DEBUG: bool = False
+    QUERY_PROFILER_ENABLED: bool = True  # Per-request SQL statement counting
+    QUERY_PROFILER_TOP_N: int = 3  # Slowest statements kept per request
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0  # Statements slower than this are logged
+    SLOW_QUERY_EXPLAIN: bool = True  # Include the EXPLAIN plan in slow query logs
+    DEBUG_TRACE_ENABLED: bool = False  # Emit sampled debug trace events (app/core/debug_trace.py)
+    DEBUG_TRACE_SAMPLE_RATE: float = 0.01  # Fraction of requests traced when enabled
     
     class Config:
         env_file = ".env"
@@ -1,11 +1,17 @@
 """
 Database configuration and session management for Uzhathunai v2.0.
 """
+from typing import Any, Callable, TypeVar
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 from sqlalchemy.pool import QueuePool
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import settings
+from app.core.debug_trace import get_debug_trace
+from app.core.metrics import install_pool_metrics
+from app.core.query_profiler import install_query_profiler
 
 # Create database engine
 engine = create_engine(
@@ -16,6 +22,8 @@ engine = create_engine(
     pool_pre_ping=True,
     echo=settings.SQL_DEBUG
 )
+install_query_profiler(engine)
+install_pool_metrics(engine, "sync")
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -23,6 +31,10 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Create base class for models
 Base = declarative_base()
 
+trace = get_debug_trace("db.session")
+
+T = TypeVar("T")
+
 
 def get_db():
     """
@@ -30,7 +42,21 @@ def get_db():
     """
     db = SessionLocal()
     try:
-        print(f"DEBUG: get_db session created {id(db)}", flush=True)
+        trace("session_created", session_id=id(db))
         yield db
     finally:
         db.close()
+
+
+async def run_then_release_db(db: Session, fn: Callable[..., T], *args: Any) -> T:
+    """
+    Run a streaming endpoint's setup in the threadpool, then close its session.
+    
+    get_db only closes the session once the response is done, which for a
+    WebSocket or SSE stream would hold a pooled connection for the whole
+    stream. The session is closed even if fn raises.
+    """
+    try:
+        return await run_in_threadpool(fn, *args)
+    finally:
+        db.close()
@@ -0,0 +1,104 @@
+"""
+Sampled debug tracing for Uzhathunai v2.0.
+
+Replaces ad-hoc print(..., flush=True) diagnostics on hot paths. Tracing is
+off by default (DEBUG_TRACE_ENABLED); when enabled only a fraction of
+requests (DEBUG_TRACE_SAMPLE_RATE) emit events. Events go through the
+structlog pipeline to a logging QueueHandler, and a background
+QueueListener does the actual stdout writes, so callers never block on I/O.
+
+Usage:
+    trace = get_debug_trace("audit.responses")
+    trace("bulk_submit", audit_id=str(audit_id), items=len(items))
+"""
+import atexit
+import contextvars
+import logging
+import queue
+import random
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+import structlog
+
+from app.core.config import settings
+
+_LOGGER_NAME = "debug_trace"
+
+# Sampling decision of the current request (None = not decided yet)
+_sampled: contextvars.ContextVar[Optional[bool]] = contextvars.ContextVar("debug_trace_sampled", default=None)
+
+_listener: Optional[QueueListener] = None
+_listener_lock = threading.Lock()
+_logger = None
+
+
+def _get_logger():
+    """Create the queue-backed logger and start its listener on first use."""
+    global _listener, _logger
+    if _logger is not None:
+        return _logger
+
+    with _listener_lock:
+        if _logger is None:
+            log_queue: queue.Queue = queue.Queue(-1)
+            stdlib_logger = logging.getLogger(_LOGGER_NAME)
+            stdlib_logger.addHandler(QueueHandler(log_queue))
+            stdlib_logger.setLevel(logging.DEBUG)
+            stdlib_logger.propagate = False
+
+            stream_handler = logging.StreamHandler(sys.stdout)
+            stream_handler.setFormatter(logging.Formatter("%(message)s"))
+            _listener = QueueListener(log_queue, stream_handler)
+            _listener.start()
+            atexit.register(stop_debug_trace)
+
+            _logger = structlog.wrap_logger(stdlib_logger, wrapper_class=structlog.stdlib.BoundLogger)
+    return _logger
+
+
+def stop_debug_trace() -> None:
+    """Flush queued events and stop the background writer."""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def trace_sampled() -> bool:
+    """Whether the current request emits debug events (decided once per context)."""
+    if not settings.DEBUG_TRACE_ENABLED:
+        return False
+
+    sampled = _sampled.get()
+    if sampled is None:
+        sampled = random.random() < settings.DEBUG_TRACE_SAMPLE_RATE
+        _sampled.set(sampled)
+    return sampled
+
+
+class DebugTrace:
+    """Debug event emitter for one channel (a module or code path)."""
+
+    def __init__(self, channel: str):
+        self.channel = channel
+
+    def __call__(self, event: str, **fields: Any) -> None:
+        """Emit an event if tracing is enabled and this request is sampled."""
+        if not trace_sampled():
+            return
+        _get_logger().debug(event, channel=self.channel, **fields)
+
+
+_traces: Dict[str, DebugTrace] = {}
+
+
+def get_debug_trace(channel: str) -> DebugTrace:
+    """Get the debug trace emitter for a channel."""
+    trace = _traces.get(channel)
+    if trace is None:
+        trace = _traces.setdefault(channel, DebugTrace(channel))
+    return trace
@@ -0,0 +1,165 @@
+"""
+Prometheus metrics for Uzhathunai v2.0.
+
+Exposes request latency by route template, database pool utilisation,
+cache lookups and business operation counters on /metrics.
+
+Multi-worker deployments (uvicorn --workers N, gunicorn) must point the
+PROMETHEUS_MULTIPROC_DIR environment variable at an empty, writable
+directory before the workers start; every worker then writes its samples
+there and /metrics aggregates them regardless of which worker serves it.
+"""
+import os
+from typing import Dict, Optional, Sequence, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+# ----------------------------------------------------------------------
+# HTTP
+# ----------------------------------------------------------------------
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests handled",
+    ["method", "route", "status"]
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+HTTP_REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements issued per HTTP request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 250)
+)
+
+# ----------------------------------------------------------------------
+# Database pool
+# ----------------------------------------------------------------------
+
+DB_POOL_SIZE = Gauge(
+    "db_pool_size", "Configured connection pool size", ["engine"], multiprocess_mode="livesum"
+)
+# Overflow in use is max(db_pool_checked_out - db_pool_size, 0)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connections currently checked out", ["engine"], multiprocess_mode="livesum"
+)
+
+# ----------------------------------------------------------------------
+# Cache
+# ----------------------------------------------------------------------
+
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "Cache lookups by tier, namespace family and result",
+    ["tier", "namespace", "result"]
+)
+
+# ----------------------------------------------------------------------
+# Business operations (MetricsCollector)
+# ----------------------------------------------------------------------
+
+# Operation name -> label names; every call site passes a subset of these tags
+OPERATIONS: Dict[str, Sequence[str]] = {
+    "organization.created": ("type", "status"),
+    "work_order.created": ("status",),
+    "work_order.accepted": ("status",),
+    "work_order.status_updated": ("old_status", "new_status", "status"),
+    "work_order_scope.added": ("status",),
+    "work_order_scope.permissions_updated": ("status",),
+}
+
+_operation_counters: Dict[str, Counter] = {
+    name: Counter(f"{name.replace('.', '_')}_total", f"Count of {name} operations", labels)
+    for name, labels in OPERATIONS.items()
+}
+
+
+class MetricsCollector:
+    """Records business operation counters."""
+
+    @staticmethod
+    def increment(metric_name: str, tags: Optional[dict] = None):
+        """
+        Increment an operation counter.
+
+        Args:
+            metric_name: Operation name declared in OPERATIONS
+            tags: Label values; missing labels are recorded as empty, extra tags are ignored
+        """
+        counter = _operation_counters.get(metric_name)
+        if counter is None:
+            logger.warning("Unknown metric", extra={"metric": metric_name})
+            return
+
+        tags = tags or {}
+        counter.labels(*[str(tags.get(label, "")) for label in OPERATIONS[metric_name]]).inc()
+
+
+# ----------------------------------------------------------------------
+# Helpers
+# ----------------------------------------------------------------------
+
+def route_label(scope: dict) -> str:
+    """Get the route template of a handled request (bounded label cardinality)."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def observe_request(method: str, route: str, status_code: int, duration: float, db_queries: int) -> None:
+    """Record one handled HTTP request."""
+    HTTP_REQUESTS.labels(method, route, str(status_code)).inc()
+    HTTP_REQUEST_DURATION.labels(method, route).observe(duration)
+    HTTP_REQUEST_DB_QUERIES.labels(method, route).observe(db_queries)
+
+
+def record_cache_lookup(tier: str, namespace: str, hit: bool) -> None:
+    CACHE_LOOKUPS.labels(tier, namespace, "hit" if hit else "miss").inc()
+
+
+def install_pool_metrics(engine: Engine, name: str) -> None:
+    """Track the pool utilisation of an engine through its checkout/checkin events."""
+    size = getattr(engine.pool, "size", None)
+    if callable(size):
+        DB_POOL_SIZE.labels(name).set(size())
+
+    # The pool's own counters are updated after these events fire, so count here
+    checked_out = DB_POOL_CHECKED_OUT.labels(name)
+    event.listen(engine, "checkout", lambda *args: checked_out.inc())
+    event.listen(engine, "checkin", lambda *args: checked_out.dec())
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Render all metrics, aggregated across workers in multiprocess mode."""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """Drop this worker's live gauges (called on shutdown in multiprocess mode)."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,209 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+OFFSET pagination makes the database produce and discard every row in
+front of the requested page, so deep pages get slower the further a client
+scrolls. paginate() orders by a sort column plus the primary key and
+continues after the last row of the previous page instead, which an index
+on (sort column, id) serves at the same cost on every page. The last
+row's (sort value, id) is handed to clients as an opaque cursor.
+
+Page numbers keep working through OFFSET for existing clients. Totals are
+exact by default; a list whose clients tolerate a briefly stale total can
+cache it for PAGINATION_TOTAL_CACHE_TTL seconds per filter set (and should
+call invalidate_totals on its writes), or skip it.
+"""
+import base64
+import binascii
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Generic, List, Optional, Sequence, TypeVar
+from uuid import UUID
+
+from sqlalchemy import literal, tuple_
+from sqlalchemy.orm import Query
+
+from app.core.config import settings
+from app.core.exceptions import ValidationError
+from app.core.tiered_cache import TieredCache, tiered_cache
+
+T = TypeVar("T")
+
+TOTAL_EXACT = "exact"
+TOTAL_CACHED = "cached"
+
+
+@dataclass
+class Page(Generic[T]):
+    """One page of a list."""
+    items: List[T]
+    total: Optional[int]
+    next_cursor: Optional[str]
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, UUID):
+        return {"u": str(value)}
+    if isinstance(value, Decimal):
+        return {"n": str(value)}
+    if isinstance(value, Enum):
+        return value.name
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    raise TypeError(f"Cannot encode {type(value).__name__} in a cursor")
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        (tag, raw), = value.items()
+        if tag == "dt":
+            return datetime.fromisoformat(raw)
+        if tag == "d":
+            return date.fromisoformat(raw)
+        if tag == "u":
+            return UUID(raw)
+        if tag == "n":
+            return Decimal(raw)
+        raise ValueError(f"Unknown cursor value tag {tag}")
+    return value
+
+
+def encode_cursor(name: str, values: Sequence[Any]) -> str:
+    """
+    Encode the sort key of the last row of a page as an opaque cursor.
+
+    Args:
+        name: Name of the list and ordering; a cursor is only accepted by the same name
+        values: Sort key values (sort column value(s) then id)
+    """
+    payload = json.dumps({"k": name, "v": [_encode_value(v) for v in values]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(name: str, cursor: str, size: int = 2) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor for the same list.
+
+    Raises:
+        ValidationError: If the cursor is malformed or belongs to another list or ordering
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if payload["k"] != name or len(payload["v"]) != size:
+            raise ValueError("cursor does not belong to this list")
+        return [_decode_value(v) for v in payload["v"]]
+    except (ValueError, TypeError, KeyError, AttributeError, binascii.Error):
+        raise ValidationError(
+            message="Invalid cursor",
+            error_code="INVALID_CURSOR"
+        )
+
+
+def _total_key(query: Query) -> str:
+    """Digest of a query's SQL and parameters, identifying its filter set."""
+    compiled = query.order_by(None).enable_eagerloads(False).statement.compile()
+    params = sorted((k, repr(v)) for k, v in compiled.params.items())
+    return hashlib.sha1(f"{compiled}|{params}".encode()).hexdigest()
+
+
+def count_total(query: Query, name: str, mode: Optional[str] = TOTAL_EXACT, cache: Optional[TieredCache] = None) -> Optional[int]:
+    """
+    Count the rows of a list query.
+
+    Args:
+        query: Filtered list query
+        name: List name (cache namespace list_total:<name>)
+        mode: TOTAL_EXACT counts every time, TOTAL_CACHED reuses a count of the
+            same filters for PAGINATION_TOTAL_CACHE_TTL seconds, None skips counting
+    """
+    if mode is None:
+        return None
+    if mode == TOTAL_EXACT or settings.PAGINATION_TOTAL_CACHE_TTL <= 0:
+        return query.order_by(None).count()
+    return (cache or tiered_cache).get_or_compute(
+        f"list_total:{name}",
+        [_total_key(query)],
+        lambda: query.order_by(None).count(),
+        ttl=settings.PAGINATION_TOTAL_CACHE_TTL
+    )
+
+
+def invalidate_totals(name: str, cache: Optional[TieredCache] = None) -> None:
+    """Drop the cached totals of a list after rows were added or removed."""
+    (cache or tiered_cache).invalidate(f"list_total:{name}")
+
+
+def paginate(
+    query: Query,
+    sort: Any,
+    id_column: Any,
+    name: str,
+    cursor: Optional[str] = None,
+    page: int = 1,
+    limit: int = 20,
+    descending: bool = True,
+    total: Optional[str] = TOTAL_EXACT,
+    key: Optional[Callable[[Any], Sequence[Any]]] = None
+) -> Page:
+    """
+    Get one page of a list query, by cursor or by page number.
+
+    Rows are ordered by (sort, id_column), both descending or both ascending.
+    The sort column must not be NULL for listed rows. With a cursor the
+    page continues after the cursor's row; without one, page numbers use
+    OFFSET. Either way the result carries the cursor of the following page.
+
+    Args:
+        query: Filtered list query (eager-load options are kept)
+        sort: Sort column or expression
+        id_column: Unique tie-breaker column, normally the primary key
+        name: List name, used to reject cursors of other lists and for the total cache
+        cursor: next_cursor of the previous page
+        page: Page number (1-indexed) when no cursor is given
+        limit: Items per page
+        descending: Newest first (default) or ascending order
+        total: TOTAL_EXACT, TOTAL_CACHED or None (see count_total)
+        key: Gets (sort value, id) from a result row; defaults to the
+            attributes named like the two columns
+
+    Raises:
+        ValidationError: If the cursor is invalid
+    """
+    columns = (sort, id_column)
+    total_count = count_total(query, name, total)
+
+    if descending:
+        query = query.order_by(None).order_by(sort.desc(), id_column.desc())
+    else:
+        query = query.order_by(None).order_by(sort.asc(), id_column.asc())
+
+    if cursor:
+        values = decode_cursor(name, cursor)
+        after = tuple_(*[literal(v, type_=c.type) for v, c in zip(values, columns)])
+        query = query.filter(tuple_(*columns) < after if descending else tuple_(*columns) > after)
+    elif page > 1:
+        query = query.offset((page - 1) * limit)
+
+    rows = query.limit(limit + 1).all()
+    items = rows[:limit]
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        values = key(last) if key else (getattr(last, sort.key), getattr(last, id_column.key))
+        next_cursor = encode_cursor(name, values)
+
+    return Page(items=items, total=total_count, next_cursor=next_cursor)
@@ -0,0 +1,78 @@
+"""
+Process pools for CPU-bound work (PDF rendering, image processing).
+
+Each pool is created on first use with the spawn start method, replaced
+once if a worker process dies, and stopped with every other pool by
+shutdown_process_pools() on application shutdown.
+"""
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, List, Optional
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+_pools: List["LazyProcessPool"] = []
+_pools_lock = threading.Lock()
+
+
+class LazyProcessPool:
+    """A process pool created on first use and registered for shutdown."""
+
+    def __init__(self, name: str, max_workers: Callable[[], int]):
+        """
+        Args:
+            name: Pool name used in log messages
+            max_workers: Returns the worker count when the pool is created
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        with _pools_lock:
+            _pools.append(self)
+
+    def executor(self) -> ProcessPoolExecutor:
+        """The pool's executor, created on first use."""
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a multi-threaded server process is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers(),
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def submit(self, fn, *args) -> Future:
+        """Submit a call, replacing the pool once if a worker died."""
+        executor = self.executor()
+        try:
+            return executor.submit(fn, *args)
+        except BrokenProcessPool:
+            logger.warning(f"{self.name} process pool broken, restarting it")
+            self.reset(executor)
+            return self.executor().submit(fn, *args)
+
+    def reset(self, broken: Optional[ProcessPoolExecutor] = None) -> None:
+        """Drop a broken executor so the next call creates a new one."""
+        with self._lock:
+            if broken is None or self._executor is broken:
+                self._executor = None
+
+    def shutdown(self) -> None:
+        """Stop the pool's processes without waiting for queued work."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_process_pools() -> None:
+    """Stop every process pool (application shutdown)."""
+    with _pools_lock:
+        pools = list(_pools)
+    for pool in pools:
+        pool.shutdown()
@@ -0,0 +1,185 @@
+"""
+Per-request SQL instrumentation for Uzhathunai v2.0.
+
+SQLAlchemy engine events count the statements issued while handling a
+request, accumulate their DB time and keep the slowest ones. Statements
+slower than SLOW_QUERY_THRESHOLD_MS are logged together with their EXPLAIN
+plan so N+1 patterns and missing indexes show up in the logs.
+
+The statistics of the current request live in a context variable, which
+FastAPI's threadpool and the middleware task both inherit.
+"""
+import contextvars
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+_START_KEY = "query_profiler_start"
+_EXPLAINABLE = ("select", "with")
+
+
+class QueryStats:
+    """Statement count, DB time and slowest statements of one profiled scope."""
+
+    def __init__(self, top_n: Optional[int] = None, keep_statements: bool = False):
+        self.count = 0
+        self.total_ms = 0.0
+        self.top_n = settings.QUERY_PROFILER_TOP_N if top_n is None else top_n
+        self.slowest: List[Tuple[float, str]] = []
+        self.statements: Optional[List[str]] = [] if keep_statements else None
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total_ms += duration_ms
+            if self.statements is not None:
+                self.statements.append(statement)
+            if self.top_n:
+                self.slowest.append((duration_ms, statement))
+                self.slowest.sort(key=lambda item: item[0], reverse=True)
+                del self.slowest[self.top_n:]
+
+    def summary(self) -> Dict[str, Any]:
+        """Get the statistics in a log-friendly form."""
+        return {
+            "db_queries": self.count,
+            "db_time_ms": round(self.total_ms, 2),
+            "slowest_queries": [
+                {"duration_ms": round(duration, 2), "statement": " ".join(statement.split())[:300]}
+                for duration, statement in self.slowest
+            ]
+        }
+
+
+_request_stats: contextvars.ContextVar[Optional[QueryStats]] = contextvars.ContextVar(
+    "request_query_stats", default=None
+)
+# Scopes that count statements on any thread (see count_queries)
+_collectors: Set[QueryStats] = set()
+_instrumented: "weakref.WeakSet[Engine]" = weakref.WeakSet()
+
+
+@contextmanager
+def profile_queries(top_n: Optional[int] = None) -> Iterator[QueryStats]:
+    """Collect statistics for statements issued in the current context (one request)."""
+    stats = QueryStats(top_n=top_n)
+    token = _request_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _request_stats.reset(token)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryStats]:
+    """
+    Collect statistics for every statement issued while the block runs.
+
+    Unlike profile_queries this is not tied to the calling context, so it
+    also sees statements executed by a TestClient's server thread.
+    """
+    stats = QueryStats(keep_statements=True)
+    _collectors.add(stats)
+    try:
+        yield stats
+    finally:
+        _collectors.discard(stats)
+
+
+def _current_stats() -> Optional[QueryStats]:
+    stats = _request_stats.get()
+    if stats is not None:
+        return stats
+
+    # Async engines run statements in a greenlet, which starts with an empty
+    # context; read the variable from the greenlet of the awaiting task instead
+    try:
+        from greenlet import getcurrent
+    except ImportError:
+        return None
+    parent = getcurrent().parent
+    while parent is not None:
+        context = parent.gr_context
+        if context is not None and context.get(_request_stats) is not None:
+            return context.get(_request_stats)
+        parent = parent.parent
+    return None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get(_START_KEY)
+    if not starts:
+        return
+    duration_ms = (time.perf_counter() - starts.pop()) * 1000
+
+    stats = _current_stats()
+    if stats is not None:
+        stats.record(statement, duration_ms)
+    for collector in list(_collectors):
+        collector.record(statement, duration_ms)
+
+    if duration_ms >= settings.SLOW_QUERY_THRESHOLD_MS:
+        _log_slow_query(conn, statement, parameters, duration_ms, executemany)
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get(_START_KEY):
+        conn.info[_START_KEY].pop()
+
+
+def _explain(conn, statement: str, parameters: Any) -> Optional[List[str]]:
+    """Get the plan of a just-executed read statement on a separate raw cursor."""
+    if conn.dialect.name != "postgresql" or not statement.lstrip().lower().startswith(_EXPLAINABLE):
+        return None
+
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(f"EXPLAIN {statement}", parameters)
+        return [row[0] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def _log_slow_query(conn, statement: str, parameters: Any, duration_ms: float, executemany: bool) -> None:
+    plan = None
+    if settings.SLOW_QUERY_EXPLAIN and not executemany:
+        try:
+            plan = _explain(conn, statement, parameters)
+        except Exception as e:
+            logger.warning(f"Failed to EXPLAIN slow query: {e}")
+
+    logger.warning(
+        "Slow query",
+        extra={
+            "duration_ms": f"{duration_ms:.2f}",
+            "statement": " ".join(statement.split())[:1000],
+            "plan": plan
+        }
+    )
+
+
+def install_query_profiler(engine: Engine) -> None:
+    """Attach the profiling hooks to a sync engine (use AsyncEngine.sync_engine for async)."""
+    if not settings.QUERY_PROFILER_ENABLED or engine in _instrumented:
+        return
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+    _instrumented.add(engine)
@@ -0,0 +1,177 @@
+"""
+Real-time event fan-out for Uzhathunai v2.0.
+
+Events are published to Redis pub/sub under a topic (e.g. one chat
+channel), so every worker receives them. Each process runs a single
+listener thread, pattern-subscribed to all realtime topics, that hands
+events to the asyncio queues of its local subscribers (WebSocket or SSE
+connections) instead of opening a Redis connection per client. Without
+Redis, events reach subscribers of the publishing process only.
+"""
+import asyncio
+import json
+import threading
+from typing import Any, Dict, Optional, Set
+
+import structlog
+from fastapi.encoders import jsonable_encoder
+
+from app.core.cache import CacheService, cache_service
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+
+class Subscription:
+    """A subscriber's queue of events for one topic."""
+
+    def __init__(self, hub: "RealtimeHub", topic: str, loop: asyncio.AbstractEventLoop, maxsize: int):
+        self.hub = hub
+        self.topic = topic
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        # Set when events were dropped because the subscriber fell behind
+        self.overflowed = False
+
+    def _deliver(self, event: Dict[str, Any]) -> None:
+        """Queue an event (runs on the subscriber's event loop)."""
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            logger.warning("Realtime subscriber fell behind, dropping it", topic=self.topic)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Wait for the next event.
+
+        Returns:
+            The event, or None on timeout or once the subscriber overflowed
+            (it should then resume from its last seen event and resubscribe)
+        """
+        if self.overflowed:
+            return None
+        try:
+            event = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        return None if self.overflowed else event
+
+    def close(self) -> None:
+        """Stop receiving events."""
+        self.hub.unsubscribe(self)
+
+
+class RealtimeHub:
+    """Topic pub/sub over Redis with one listener thread per process."""
+
+    def __init__(self, redis_cache: CacheService, queue_size: Optional[int] = None):
+        self.redis_cache = redis_cache
+        self.queue_size = queue_size or settings.REALTIME_QUEUE_SIZE
+        self.prefix = redis_cache._get_key("realtime")
+
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._listener: Optional[threading.Thread] = None
+        self._listener_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def publish(self, topic: str, event: Dict[str, Any]) -> None:
+        """Publish an event to every subscriber of a topic, in all workers."""
+        data = json.dumps(jsonable_encoder(event))
+
+        redis_client = self.redis_cache.redis_client
+        if redis_client:
+            try:
+                redis_client.publish(f"{self.prefix}:{topic}", data)
+                return
+            except Exception as e:
+                logger.error(f"Realtime publish error: {e}", topic=topic)
+        self._dispatch(topic, data)
+
+    def subscribe(self, topic: str) -> Subscription:
+        """Subscribe the running event loop to a topic."""
+        subscription = Subscription(self, topic, asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(topic, set()).add(subscription)
+        self._ensure_listener()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.topic)
+            if subscribers:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.topic]
+
+    def subscriber_count(self, topic: Optional[str] = None) -> int:
+        """Number of local subscribers of a topic, or of all topics."""
+        with self._lock:
+            if topic is not None:
+                return len(self._subscribers.get(topic, ()))
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def _dispatch(self, topic: str, data: str) -> None:
+        """Hand a published event to the local subscribers of its topic."""
+        with self._lock:
+            subscribers = list(self._subscribers.get(topic, ()))
+        if not subscribers:
+            return
+
+        event = json.loads(data)
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._deliver, event)
+            except RuntimeError:
+                # Event loop already closed
+                self.unsubscribe(subscription)
+
+    def _ensure_listener(self) -> None:
+        """Start the pub/sub listener lazily so it runs in each (forked) worker."""
+        if self._listener is not None or not self.redis_cache.redis_client:
+            return
+
+        with self._listener_lock:
+            if self._listener is None:
+                self._stop.clear()
+                self._listener = threading.Thread(
+                    target=self._listen, name="realtime-listener", daemon=True
+                )
+                self._listener.start()
+
+    def _listen(self) -> None:
+        pattern = f"{self.prefix}:*"
+        while not self._stop.is_set():
+            pubsub = None
+            try:
+                pubsub = self.redis_cache.redis_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(pattern)
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "pmessage":
+                        self._dispatch(message["channel"][len(self.prefix) + 1:], message["data"])
+            except Exception as e:
+                # Subscribers resume from their last seen event after reconnecting
+                logger.warning(f"Realtime listener error: {e}")
+                self._stop.wait(1.0)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+    def stop(self) -> None:
+        """Stop the pub/sub listener (application shutdown)."""
+        self._stop.set()
+        with self._listener_lock:
+            listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.join(timeout=2.0)
+
+
+# Global hub shared by all connections in this process
+realtime_hub = RealtimeHub(cache_service)
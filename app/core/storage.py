@@ -0,0 +1,169 @@
+"""
+Object storage for uploaded media and generated artifacts.
+
+Files go to S3 when AWS credentials are configured and under UPLOAD_DIR
+otherwise. All S3 access shares one client (boto3 clients are thread-safe
+and keep a connection pool), created on first use; AWS_S3_ENDPOINT_URL
+points it at an S3-compatible server such as MinIO or a local stand-in.
+"""
+import io
+import os
+import shutil
+import threading
+import uuid
+from typing import BinaryIO, Optional, Union
+
+import boto3
+from boto3.exceptions import S3UploadFailedError
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+
+from app.core.config import settings
+from app.core.exceptions import ServiceError
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+_s3_client = None
+_s3_lock = threading.Lock()
+
+
+def get_s3_client():
+    """The shared S3 client, created on first use."""
+    global _s3_client
+    with _s3_lock:
+        if _s3_client is None:
+            _s3_client = boto3.client(
+                's3',
+                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                region_name=settings.AWS_REGION_NAME,
+                endpoint_url=settings.AWS_S3_ENDPOINT_URL,
+                config=Config(
+                    max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+                    retries={"max_attempts": 3, "mode": "standard"}
+                )
+            )
+        return _s3_client
+
+
+class MediaStorage:
+    """Stores files in S3 when configured and under a local directory otherwise."""
+
+    def __init__(self, root: Optional[str] = None, s3_client=None, bucket: Optional[str] = None):
+        """
+        Args:
+            root: Local directory (defaults to UPLOAD_DIR)
+            s3_client: S3 client to use instead of the shared one; forces S3
+            bucket: S3 bucket (defaults to AWS_S3_BUCKET)
+        """
+        self._root = root
+        self._s3_client = s3_client
+        self._bucket = bucket
+
+    @property
+    def uses_s3(self) -> bool:
+        return self._s3_client is not None or bool(settings.AWS_ACCESS_KEY_ID and settings.AWS_SECRET_ACCESS_KEY)
+
+    @property
+    def bucket(self) -> str:
+        return self._bucket or settings.AWS_S3_BUCKET
+
+    def _client(self):
+        return self._s3_client or get_s3_client()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._root or settings.UPLOAD_DIR, key)
+
+    def url(self, key: str) -> str:
+        """Public URL of a stored file."""
+        if not self.uses_s3:
+            # Served by the /uploads static mount
+            return f"/uploads/{key}"
+        if settings.AWS_S3_ENDPOINT_URL:
+            return f"{settings.AWS_S3_ENDPOINT_URL.rstrip('/')}/{self.bucket}/{key}"
+        return f"https://{self.bucket}.s3.{settings.AWS_REGION_NAME}.amazonaws.com/{key}"
+
+    def put(self, key: str, data: Union[bytes, BinaryIO], content_type: str) -> str:
+        """
+        Store a file, streaming file objects instead of reading them whole.
+
+        Args:
+            key: Storage key
+            data: File bytes or a readable binary file object
+            content_type: MIME type recorded with the object
+
+        Returns:
+            File URL
+
+        Raises:
+            ServiceError: If the write fails
+        """
+        fileobj = io.BytesIO(data) if isinstance(data, (bytes, bytearray)) else data
+        try:
+            if self.uses_s3:
+                self._client().upload_fileobj(
+                    fileobj,
+                    self.bucket,
+                    key,
+                    ExtraArgs={"ContentType": content_type}
+                )
+            else:
+                path = self._path(key)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # Write then rename so readers never see a partial file
+                tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+                try:
+                    with open(tmp_path, 'wb') as f:
+                        shutil.copyfileobj(fileobj, f)
+                    os.replace(tmp_path, path)
+                finally:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+        except (ClientError, BotoCoreError, S3UploadFailedError, OSError) as e:
+            logger.error(f"Storage upload failed: {e}", extra={"file_key": key}, exc_info=True)
+            raise ServiceError(
+                message="Failed to upload file to storage",
+                error_code="STORAGE_UPLOAD_FAILED",
+                details={"error": str(e)}
+            )
+        return self.url(key)
+
+    def exists(self, key: str) -> bool:
+        """Whether a file is stored under key."""
+        if not self.uses_s3:
+            return os.path.exists(self._path(key))
+        try:
+            self._client().head_object(Bucket=self.bucket, Key=key)
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise ServiceError(
+                message="Failed to read storage",
+                error_code="STORAGE_READ_FAILED",
+                details={"error": str(e)}
+            )
+
+    def load(self, key: str) -> bytes:
+        """Read the file stored under key."""
+        if self.uses_s3:
+            obj = self._client().get_object(Bucket=self.bucket, Key=key)
+            return obj["Body"].read()
+        with open(self._path(key), 'rb') as f:
+            return f.read()
+
+    def delete(self, key: Optional[str]) -> None:
+        """Delete a stored file; failures are logged, not raised."""
+        if not key:
+            return
+        try:
+            if self.uses_s3:
+                self._client().delete_object(Bucket=self.bucket, Key=key)
+            elif os.path.exists(self._path(key)):
+                os.remove(self._path(key))
+        except (ClientError, BotoCoreError, OSError) as e:
+            logger.error(f"Failed to delete file {key} from storage: {e}", exc_info=True)
+
+
+media_storage = MediaStorage()
@@ -0,0 +1,309 @@
+"""
+Two-tier cache for Uzhathunai v2.0.
+
+A bounded in-process LRU/TTL tier sits in front of the Redis-backed
+CacheService. Invalidations bump the namespace generation in Redis and are
+fanned out over Redis pub/sub so every worker drops its local entries.
+Recomputes are single-flight: one thread per process, and one process per
+key across workers (Redis SET NX lock), rebuilds a missing entry while the
+others wait for its result.
+"""
+import functools
+import inspect
+import threading
+import time
+import typing
+import uuid
+from enum import Enum
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence
+
+import structlog
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.core.cache import CacheService, LocalLRUCache, cache_service
+from app.core.metrics import record_cache_lookup
+
+logger = structlog.get_logger()
+
+# Deletes the lock only if it still holds our token
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class _Flight:
+    """An in-progress recompute that other threads of this process wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class TieredCache:
+    """In-process LRU tier over Redis with pub/sub invalidation and single-flight recompute."""
+
+    def __init__(
+        self,
+        redis_cache: CacheService,
+        local_maxsize: int = 4096,
+        local_ttl: int = 60,
+        lock_ttl: float = 10.0,
+        lock_wait: float = 5.0,
+        poll_interval: float = 0.05
+    ):
+        self.redis_cache = redis_cache
+        self.local = LocalLRUCache(maxsize=local_maxsize, ttl=local_ttl)
+        self.local_ttl = local_ttl
+        self.lock_ttl = lock_ttl
+        self.lock_wait = lock_wait
+        self.poll_interval = poll_interval
+        self.channel = redis_cache._get_key("cache", "invalidate")
+
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._flights_lock = threading.Lock()
+        # Bumped on every invalidation so results computed before it are not stored locally
+        self._epochs: Dict[str, int] = {}
+        self._listener: Optional[threading.Thread] = None
+        self._listener_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def get_or_compute(
+        self,
+        namespace: str,
+        key_parts: Sequence[str],
+        compute: Callable[[], Any],
+        ttl: int,
+        encode: Callable[[Any], Any] = lambda value: value,
+        decode: Callable[[Any], Any] = lambda data: data
+    ) -> Any:
+        """
+        Get a cached value, computing and storing it on a miss.
+
+        Args:
+            namespace: Invalidation namespace
+            key_parts: Key parts identifying the entry within the namespace
+            compute: Function producing the value on a miss
+            ttl: Redis TTL in seconds (the local tier keeps entries at most local_ttl)
+            encode: Converts the value to JSON-serializable data for Redis
+            decode: Converts data read from Redis back to the value
+        """
+        self._ensure_listener()
+        local_key = (namespace, tuple(key_parts))
+
+        value = self.local.get(local_key, _MISSING)
+        record_cache_lookup("local", self.redis_cache._namespace_family(namespace), value is not _MISSING)
+        if value is not _MISSING:
+            return value
+
+        # One thread per process recomputes; the rest wait for its result
+        with self._flights_lock:
+            flight = self._flights.get(local_key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[local_key] = flight
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            epoch = self._epochs.get(namespace, 0)
+            flight.value = self._load(namespace, key_parts, compute, ttl, encode, decode)
+            if self._epochs.get(namespace, 0) == epoch:
+                self.local.set(local_key, flight.value, ttl=min(ttl, self.local_ttl))
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._flights_lock:
+                self._flights.pop(local_key, None)
+            flight.done.set()
+
+    def _load(
+        self,
+        namespace: str,
+        key_parts: Sequence[str],
+        compute: Callable[[], Any],
+        ttl: int,
+        encode: Callable[[Any], Any],
+        decode: Callable[[Any], Any]
+    ) -> Any:
+        """Read through Redis, holding a cross-worker lock while recomputing."""
+        redis_client = self.redis_cache.redis_client
+        if not redis_client:
+            return compute()
+
+        key = self.redis_cache.namespaced_key(namespace, *key_parts)
+        data = self.redis_cache.get(key, namespace=namespace)
+        if data is not None:
+            return decode(data)
+
+        lock_key = f"{key}:lock"
+        token = uuid.uuid4().hex
+        try:
+            locked = redis_client.set(lock_key, token, nx=True, px=int(self.lock_ttl * 1000))
+        except Exception as e:
+            logger.error(f"Cache lock error: {e}")
+            locked = False
+
+        if not locked:
+            # Another worker is recomputing: wait for its result, then fall back to computing
+            deadline = time.monotonic() + self.lock_wait
+            while time.monotonic() < deadline:
+                time.sleep(self.poll_interval)
+                data = self.redis_cache.get(key)
+                if data is not None:
+                    return decode(data)
+            logger.warning("Cache lock wait timed out", key=key)
+            return compute()
+
+        try:
+            value = compute()
+            self.redis_cache.set(key, encode(value), ttl)
+            return value
+        finally:
+            try:
+                redis_client.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+            except Exception as e:
+                logger.error(f"Cache lock release error: {e}")
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+
+    def invalidate(self, namespace: str) -> None:
+        """Invalidate a namespace in Redis and in the local tier of every worker."""
+        self._drop_local(namespace)
+        self.redis_cache.invalidate_namespace(namespace)
+
+        redis_client = self.redis_cache.redis_client
+        if redis_client:
+            try:
+                redis_client.publish(self.channel, namespace)
+            except Exception as e:
+                logger.error(f"Cache invalidation publish error: {e}")
+
+    def _drop_local(self, namespace: str) -> None:
+        self._epochs[namespace] = self._epochs.get(namespace, 0) + 1
+        self.local.delete_where(lambda key: key[0] == namespace)
+
+    def _ensure_listener(self) -> None:
+        """Start the pub/sub listener lazily so it runs in each (forked) worker."""
+        if self._listener is not None or not self.redis_cache.redis_client:
+            return
+
+        with self._listener_lock:
+            if self._listener is None:
+                self._listener = threading.Thread(
+                    target=self._listen, name="cache-invalidation-listener", daemon=True
+                )
+                self._listener.start()
+
+    def _listen(self) -> None:
+        while not self._stop.is_set():
+            pubsub = None
+            try:
+                pubsub = self.redis_cache.redis_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "message":
+                        self._drop_local(message["data"])
+            except Exception as e:
+                # Messages may have been missed while disconnected
+                logger.warning(f"Cache invalidation listener error: {e}")
+                self.local.clear()
+                self._stop.wait(1.0)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+    def stop(self) -> None:
+        """Stop the pub/sub listener."""
+        self._stop.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get local tier counters of this process."""
+        return {
+            "local_entries": len(self.local),
+            "local_hits": self.local.hits,
+            "local_misses": self.local.misses
+        }
+
+
+_MISSING = object()
+
+
+def _key_part(value: Any) -> str:
+    if isinstance(value, Enum):
+        return str(value.value)
+    return "none" if value is None else str(value)
+
+
+# Global two-tier cache shared by all requests in this process
+tiered_cache = TieredCache(cache_service)
+
+
+def cached(namespace: str, ttl: int = 300, cache: Optional[TieredCache] = None):
+    """
+    Cache a service method's result in the two-tier cache.
+
+    The key is built from the call arguments (excluding self). Results are
+    stored in Redis as JSON and rebuilt from the return annotation, so
+    methods returning Pydantic models (or lists of them) work unchanged.
+    Exceptions are not cached.
+
+    Usage:
+        @cached("measurement_units", ttl=3600)
+        def get_unit_by_id(self, unit_id: UUID, language: str = "en") -> MeasurementUnitResponse:
+            ...
+
+        MeasurementUnitService.get_unit_by_id.invalidate()
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        try:
+            return_type = typing.get_type_hints(func).get("return")
+        except Exception:
+            return_type = None
+        adapter = TypeAdapter(return_type) if return_type is not None else None
+
+        def decode(data: Any) -> Any:
+            return adapter.validate_python(data) if adapter else data
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key_parts = [func.__name__] + [
+                _key_part(value) for name, value in bound.arguments.items() if name != "self"
+            ]
+            return (cache or tiered_cache).get_or_compute(
+                namespace,
+                key_parts,
+                lambda: func(*args, **kwargs),
+                ttl,
+                encode=jsonable_encoder,
+                decode=decode
+            )
+
+        wrapper.invalidate = lambda: (cache or tiered_cache).invalidate(namespace)
+        return wrapper
+
+    return decorator
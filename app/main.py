@@ -4,15 +4,22 @@ Triggered reload at 2026-02-13
 """
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.exceptions import RequestValidationError
 from contextlib import asynccontextmanager
+import asyncio
 import time
 import uuid
 
 from app.core.config import settings
 from app.core.logging import configure_logging, log_application_startup, log_application_shutdown, get_logger
 from app.core.database import engine, Base
+from app.core.async_database import dispose_async_engine
+from app.core.query_profiler import profile_queries
+from app.core.metrics import mark_process_dead, observe_request, render_metrics, route_label
+from app.core.cache import cache_service, run_namespace_sweeper
+from app.core.realtime import realtime_hub
+from app.core.process_pool import shutdown_process_pools
 
 logger = get_logger(__name__)
 
@@ -25,9 +32,21 @@ async def lifespan(app: FastAPI):
     log_application_startup()
     logger.info("Database connection established")
     
+    sweeper = None
+    if cache_service.redis_client and settings.CACHE_SWEEP_INTERVAL_SECONDS:
+        sweeper = asyncio.create_task(
+            run_namespace_sweeper(cache_service, settings.CACHE_SWEEP_INTERVAL_SECONDS)
+        )
+    
     yield
     
     # Shutdown
+    if sweeper:
+        sweeper.cancel()
+    shutdown_process_pools()
+    realtime_hub.stop()
+    await dispose_async_engine()
+    mark_process_dead()
     log_application_shutdown()
     logger.info("Application shutdown complete")
 
@@ -66,7 +85,7 @@ app.add_middleware(
 # Request ID and logging middleware
 @app.middleware("http")
 async def logging_middleware(request: Request, call_next):
-    """Add request ID, logging, and timing to all requests."""
+    """Add request ID, logging, timing and SQL statistics to all requests."""
     request_id = str(uuid.uuid4())[:8]
     request.state.request_id = request_id
     
@@ -85,44 +104,58 @@ async def logging_middleware(request: Request, call_next):
     
     # Remove blocking debug print
 
-    try:
-        response = await call_next(request)
-        # Remove blocking debug print
-        process_time = (time.time() - start_time) * 1000
-        
-        # Log request completion
-        logger.info(
-            "Request completed",
-            extra={
-                "request_id": request_id,
-                "method": request.method,
-                "path": str(request.url.path),
-                "status_code": response.status_code,
-                "duration_ms": f"{process_time:.2f}"
-            }
-        )
-        
-        response.headers["X-Request-ID"] = request_id
-        response.headers["X-Process-Time"] = f"{process_time:.2f}ms"
-        
-        return response
-        
-    except Exception as e:
-        process_time = (time.time() - start_time) * 1000
-        
-        # Log request failure
-        logger.error(
-            "Request failed",
-            extra={
-                "request_id": request_id,
-                "method": request.method,
-                "path": str(request.url.path),
-                "duration_ms": f"{process_time:.2f}",
-                "error": str(e)
-            },
-            exc_info=True
-        )
-        raise
+    with profile_queries() as query_stats:
+        try:
+            response = await call_next(request)
+            # Remove blocking debug print
+            process_time = (time.time() - start_time) * 1000
+            
+            # Log request completion
+            logger.info(
+                "Request completed",
+                extra={
+                    "request_id": request_id,
+                    "method": request.method,
+                    "path": str(request.url.path),
+                    "status_code": response.status_code,
+                    "duration_ms": f"{process_time:.2f}",
+                    **query_stats.summary()
+                }
+            )
+            
+            response.headers["X-Request-ID"] = request_id
+            response.headers["X-Process-Time"] = f"{process_time:.2f}ms"
+            response.headers["X-DB-Query-Count"] = str(query_stats.count)
+            response.headers["X-DB-Time"] = f"{query_stats.total_ms:.2f}ms"
+            
+            observe_request(
+                request.method, route_label(request.scope), response.status_code,
+                process_time / 1000, query_stats.count
+            )
+            
+            return response
+            
+        except Exception as e:
+            process_time = (time.time() - start_time) * 1000
+            
+            # Log request failure
+            logger.error(
+                "Request failed",
+                extra={
+                    "request_id": request_id,
+                    "method": request.method,
+                    "path": str(request.url.path),
+                    "duration_ms": f"{process_time:.2f}",
+                    "error": str(e),
+                    **query_stats.summary()
+                },
+                exc_info=True
+            )
+            observe_request(
+                request.method, route_label(request.scope), 500,
+                process_time / 1000, query_stats.count
+            )
+            raise
 
 
 # Exception handlers
@@ -300,6 +333,14 @@ async def health_check():
     }
 
 
+# Prometheus metrics endpoint
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint."""
+    content, content_type = render_metrics()
+    return Response(content=content, media_type=content_type)
+
+
 # Root endpoint
 @app.get("/", tags=["Root"])
 async def root():
@@ -321,6 +362,10 @@ async def test_suspend():
 from app.api.v1 import api_router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+# Keep BFF dashboard snapshots in sync with committed changes
+from app.services.dashboard_snapshot_service import register_snapshot_invalidation
+register_snapshot_invalidation()
+
 
 if __name__ == "__main__":
     import uvicorn
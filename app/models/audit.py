@@ -50,6 +50,11 @@ class Audit(Base):
     assigned_to_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     analyst_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     has_report = Column(Boolean, default=False)
+    # Denormalized progress counters (migration 020); NULL means not yet computed
+    parameter_count = Column(Integer, nullable=True)
+    answered_count = Column(Integer, nullable=True)
+    # Bumped by review, finalize and share transitions; keys rendered report PDFs (migration 024)
+    report_version = Column(Integer, default=0, server_default="0", nullable=False)
 
 
     # Relationships
@@ -104,7 +109,10 @@ class AuditParameterInstance(Base):
     parameter_id = Column(UUID(as_uuid=True), ForeignKey("parameters.id"), nullable=False)
     sort_order = Column(Integer, default=0, nullable=False)
     is_required = Column(Boolean, default=False, nullable=False)
-    parameter_snapshot = Column(JSONB, nullable=True)
+    # Snapshot stored on the row (instances created before migration 023);
+    # newer instances reference a shared ParameterSnapshotBlob instead
+    parameter_snapshot_inline = Column("parameter_snapshot", JSONB, nullable=True)
+    parameter_snapshot_hash = Column(String(64), ForeignKey("parameter_snapshot_blobs.hash"), nullable=True)
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
     created_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
     updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -114,11 +122,44 @@ class AuditParameterInstance(Base):
     template_section = relationship("TemplateSection", foreign_keys=[template_section_id])
     parameter = relationship("Parameter", foreign_keys=[parameter_id])
     creator = relationship("User", foreign_keys=[created_by])
+    snapshot_blob = relationship("ParameterSnapshotBlob", lazy="selectin")
+
+    @property
+    def parameter_snapshot(self):
+        """Parameter configuration snapshot, whether stored inline or shared."""
+        if self.parameter_snapshot_hash is not None and self.snapshot_blob is not None:
+            return self.snapshot_blob.snapshot
+        return self.parameter_snapshot_inline
+
+    @parameter_snapshot.setter
+    def parameter_snapshot(self, value):
+        self.parameter_snapshot_inline = value
 
     def __repr__(self):
         return f"<AuditParameterInstance(id={self.id}, audit_id={self.audit_id}, parameter_id={self.parameter_id})>"
 
 
+class ParameterSnapshotBlob(Base):
+    """
+    Parameter snapshot shared by audit parameter instances.
+    
+    Audits created from the same template version carry identical parameter
+    snapshots, so each distinct snapshot is stored once, keyed by the SHA-256
+    of its canonical JSON without volatile keys such as snapshot_date (see
+    snapshot_content_hash).
+    
+    Added by migration 023.
+    """
+    __tablename__ = "parameter_snapshot_blobs"
+
+    hash = Column(String(64), primary_key=True)
+    snapshot = Column(JSONB, nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<ParameterSnapshotBlob(hash={self.hash})>"
+
+
 class AuditResponse(Base):
     """
     Audit response model - Auditor responses to audit parameters.
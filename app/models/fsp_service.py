@@ -4,14 +4,15 @@ FSP Service models for Uzhathunai v2.0.
 Models match database schema exactly from 001_uzhathunai_ddl.sql:
 - MasterService (lines 295-305)
 - MasterServiceTranslation (lines 307-318)
-- FSPServiceListing (lines 1070-1090)
+- FSPServiceListing (lines 1070-1090, service area from migration 021)
 - FSPApprovalDocument (new table for FSP approval workflow)
 """
 from datetime import datetime
-from sqlalchemy import Column, String, Text, DateTime, Integer, Numeric, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, Text, DateTime, Integer, Numeric, ForeignKey, Index, Enum as SQLEnum, text
 from sqlalchemy.dialects.postgresql import UUID, ARRAY, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from geoalchemy2 import Geography
 import uuid
 
 from app.core.database import Base
@@ -100,6 +101,10 @@ class FSPServiceListing(Base):
     description = Column(Text)
     service_area_districts = Column(ARRAY(Text))  # PostgreSQL array of districts
     
+    # Precomputed service area for proximity search (migration 021)
+    service_center = Column(Geography(geometry_type='POINT', srid=4326, spatial_index=False))
+    service_radius_km = Column(Numeric(8, 2))  # NULL = no coverage limit
+    
     # Pricing information
     pricing_model = Column(String(50))  # PER_HOUR, PER_DAY, PER_ACRE, FIXED, CUSTOM
     pricing_variants = Column(JSONB, default=[])  # Detailed pricing options
@@ -121,6 +126,14 @@ class FSPServiceListing(Base):
     creator = relationship("User", foreign_keys=[created_by])
     updater = relationship("User", foreign_keys=[updated_by])
     
+    # Indexes
+    __table_args__ = (
+        Index(
+            'idx_fsp_listings_service_center', 'service_center',
+            postgresql_using='gist', postgresql_where=text("status = 'ACTIVE'")
+        ),
+    )
+    
     # Computed properties for response serialization
     @property
     def service_code(self) -> str:
@@ -164,6 +164,7 @@ class AuditListResponse(BaseModel):
     page: int
     limit: int
     total_pages: int
+    next_cursor: Optional[str] = None
 
 
 # Response Submission Schemas
@@ -50,3 +50,18 @@ class PDFGenerateResponse(BaseModel):
     """Schema for PDF generation response"""
     pdf_url: str
     expires_at: Optional[datetime] = None
+
+
+class ReportJobResponse(BaseModel):
+    """Schema for a background report PDF render job"""
+    job_id: str
+    audit_id: UUID
+    language: str
+    content_version: int = Field(..., description="Audit report_version the PDF is rendered from")
+    status: str = Field(..., description="QUEUED, READY or FAILED")
+    filename: str
+    size_bytes: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+    download_url: Optional[str] = Field(None, description="Set once the PDF is ready")
@@ -85,3 +85,10 @@ class ChatMessageListResponse(BaseModel):
     page: int
     limit: int
     total_pages: int
+    next_cursor: Optional[str] = None
+
+
+class ChatMessageSyncResponse(BaseModel):
+    """Schema for messages sent after a given message (oldest first)."""
+    items: List[ChatMessageResponse]
+    has_more: bool
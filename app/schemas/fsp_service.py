@@ -8,6 +8,7 @@ from datetime import datetime
 from uuid import UUID
 from pydantic import BaseModel, Field, validator
 from app.models.enums import ServiceStatus, OrganizationStatus
+from app.schemas.farm import GeoJSONPoint
 
 
 class MasterServiceTranslationResponse(BaseModel):
@@ -65,6 +66,9 @@ class FSPServiceListingCreate(BaseModel):
     pricing_variants: Optional[List[PricingVariant]] = []
     base_price: Optional[float] = Field(None, ge=0)
     currency: str = Field(default='INR', max_length=10)
+    # Service area for proximity search; derived from service_area_districts when omitted
+    service_center: Optional[GeoJSONPoint] = None
+    service_radius_km: Optional[float] = Field(None, gt=0, le=1000)
     
     @validator('title')
     def validate_title(cls, v):
@@ -93,6 +97,8 @@ class FSPServiceListingUpdate(BaseModel):
     base_price: Optional[float] = Field(None, ge=0)
     currency: Optional[str] = Field(None, max_length=10)
     status: Optional[ServiceStatus] = None
+    service_center: Optional[GeoJSONPoint] = None
+    service_radius_km: Optional[float] = Field(None, gt=0, le=1000)
     
     @validator('title')
     def validate_title(cls, v):
@@ -133,6 +139,9 @@ class FSPServiceListingResponse(BaseModel):
     service_name: Optional[str]
     service_description: Optional[str]
     pricing_unit: Optional[str]
+    service_radius_km: Optional[float] = None
+    # Set by nearby search only
+    distance_km: Optional[float] = None
     
     @validator('id', 'fsp_organization_id', 'service_id', 'created_by', 'updated_by', pre=True)
     def convert_uuid_to_str(cls, v):
@@ -262,6 +271,14 @@ class FSPServiceListingPaginatedResponse(BaseModel):
     page: int
     limit: int
     total_pages: int
+    next_cursor: Optional[str] = None
+
+
+class FSPServiceListingNearbyResponse(BaseModel):
+    """Schema for nearby service listing response (keyset paginated by distance)."""
+    items: List[FSPServiceListingResponse]
+    limit: int
+    next_cursor: Optional[str] = None
 
 
 class FSPOrganizationApprovalPaginatedResponse(BaseModel):
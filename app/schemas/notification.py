@@ -0,0 +1,33 @@
+"""
+Notification schemas for Uzhathunai v2.0.
+"""
+from typing import Any, Dict, Optional
+from datetime import datetime
+from pydantic import BaseModel, validator
+
+from app.models.enums import NotificationType
+
+
+class NotificationResponse(BaseModel):
+    """Schema for notification response."""
+    id: str
+    organization_id: Optional[str]
+    notification_type: NotificationType
+    type: Optional[str]
+    title: str
+    message: str
+    reference_type: Optional[str]
+    reference_id: Optional[str]
+    data: Optional[Dict[str, Any]]
+    is_read: bool
+    created_at: datetime
+    read_at: Optional[datetime]
+
+    @validator('id', 'organization_id', 'reference_id', pre=True)
+    def convert_uuid_to_str(cls, v):
+        if v is not None:
+            return str(v)
+        return v
+
+    class Config:
+        from_attributes = True
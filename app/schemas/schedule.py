@@ -70,6 +70,51 @@ class ScheduleFromTemplateCreate(BaseModel):
         }
 
 
+class ScheduleDeploymentTarget(BaseModel):
+    """One crop of a bulk template deployment."""
+    crop_id: UUID = Field(..., description="Target crop ID")
+    name: Optional[str] = Field(None, min_length=1, max_length=200, description="Schedule name (defaults to the batch name)")
+    template_parameters: Dict[str, Any] = Field(..., description="Template parameters for this crop (start_date, area, plant_count)")
+
+
+class ScheduleBulkFromTemplateCreate(BaseModel):
+    """Schema for creating schedules from one template for many crops."""
+    template_id: UUID = Field(..., description="Schedule template ID")
+    name: str = Field(..., min_length=1, max_length=200, description="Schedule name for crops without their own")
+    crops: List[ScheduleDeploymentTarget] = Field(..., min_length=1, max_length=500, description="Crops and their parameters")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "template_id": "123e4567-e89b-12d3-a456-426614174001",
+                "name": "Kharif 2026 Tomato Schedule",
+                "crops": [
+                    {
+                        "crop_id": "123e4567-e89b-12d3-a456-426614174000",
+                        "template_parameters": {"start_date": "2026-06-15", "total_acres": 2.5}
+                    }
+                ]
+            }
+        }
+
+
+class ScheduleDeploymentResult(BaseModel):
+    """Outcome of one crop of a bulk template deployment."""
+    crop_id: UUID
+    schedule_id: Optional[UUID] = None
+    tasks_count: int = 0
+    error_code: Optional[str] = None
+    message: Optional[str] = None
+
+
+class ScheduleBulkDeployResponse(BaseModel):
+    """Schema for bulk template deployment response."""
+    template_id: UUID
+    created: int
+    failed: int
+    results: List[ScheduleDeploymentResult]
+
+
 class ScheduleTaskCreate(BaseModel):
     """
     Schema for creating schedule task.
@@ -370,4 +415,5 @@ class PaginatedScheduleResponse(BaseModel):
     page: int
     limit: int
     total_pages: int
+    next_cursor: Optional[str] = None
 
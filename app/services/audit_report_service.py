@@ -5,25 +5,32 @@ from datetime import datetime
 from sqlalchemy.orm import Session
 from sqlalchemy.dialects.postgresql import insert
 import os
-import io
 from PIL import Image
 
 from app.models.audit_report import AuditReport
 from app.models.audit import Audit
 from app.core.exceptions import NotFoundError, ValidationError, PermissionError, ServiceError
 from app.core.logging import get_logger
+from app.core.storage import MediaStorage, media_storage
+from app.services.media_pipeline import ImageSpec, compress_image
 
 logger = get_logger(__name__)
 
 class AuditReportService:
     """Service for managing rich text audit reports."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, storage: Optional[MediaStorage] = None):
         self.db = db
+        self.storage = storage or media_storage
         self.max_file_size = 5 * 1024 * 1024  # 5MB
         self.allowed_formats = ['JPEG', 'PNG', 'JPG', 'WEBP']
         self.compressed_max_width = 1200
         self.compression_quality = 80
+        self.image_spec = ImageSpec(
+            max_width=self.compressed_max_width,
+            quality=self.compression_quality,
+            optimize=False
+        )
 
     def save_report(
         self,
@@ -171,33 +178,10 @@ class AuditReportService:
         file_data.seek(0)
 
     def _compress_image(self, file_data: BinaryIO) -> bytes:
-        """Compress image."""
-        try:
-            image = Image.open(file_data)
-            if image.mode == 'RGBA':
-                image = image.convert('RGB')
-                
-            if image.width > self.compressed_max_width:
-                ratio = self.compressed_max_width / image.width
-                image = image.resize((self.compressed_max_width, int(image.height * ratio)), Image.Resampling.LANCZOS)
-                
-            output = io.BytesIO()
-            image.save(output, format='JPEG', quality=self.compression_quality)
-            output.seek(0)
-            return output.read()
-        except Exception as e:
-            logger.error(f"Compression failed: {e}")
-            file_data.seek(0)
-            return file_data.read()
+        """Compress image (in the media pipeline's process pool)."""
+        file_data.seek(0)
+        return compress_image(file_data.read(), self.image_spec).data
 
     def _upload_to_storage(self, file_data: bytes, file_key: str) -> str:
-        """Upload to storage (Local mock)."""
-        # Mimic PhotoService implementation
-        upload_dir = "uploads"
-        file_path = os.path.join(upload_dir, file_key)
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        
-        with open(file_path, 'wb') as f:
-            f.write(file_data)
-            
-        return f"/uploads/{file_key}"
+        """Upload to storage (S3 or local)."""
+        return self.storage.put(file_key, file_data, 'image/jpeg')
@@ -6,18 +6,22 @@ Handles audit creation with snapshot generation, audit number generation,
 and farming organization derivation from crops.
 """
 
+import csv
+import io
+import uuid
 from typing import List, Tuple, Optional, Dict, Any
 from uuid import UUID
 from decimal import Decimal
 from datetime import datetime, date
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, extract, cast, Integer
+from sqlalchemy import and_, or_, func, extract, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import joinedload
-from sqlalchemy.exc import IntegrityError
 
 from app.core.logging import get_logger
-from app.core.exceptions import NotFoundError, ValidationError, PermissionError, ConflictError
-from app.models.audit import Audit, AuditParameterInstance, AuditIssue, AuditResponse, AuditRecommendation, AuditReview, AuditResponsePhoto
+from app.core.exceptions import NotFoundError, ValidationError, PermissionError
+from app.core.pagination import paginate
+from app.models.audit import Audit, AuditParameterInstance, ParameterSnapshotBlob, AuditIssue, AuditResponse, AuditRecommendation, AuditReview, AuditResponsePhoto
 from app.models.schedule import ScheduleChangeLog
 from app.models.template import Template, TemplateSection, TemplateParameter
 from app.models.crop import Crop
@@ -26,10 +30,14 @@ from app.models.farm import Farm
 from app.models.organization import Organization
 from app.models.user import User
 from app.models.enums import AuditStatus, SyncStatus, ScheduleChangeTrigger
-from app.services.snapshot_service import SnapshotService
+from app.services.numbering_service import AUDIT, NumberingService
+from app.services.snapshot_service import SnapshotService, snapshot_content, snapshot_content_hash
 
 logger = get_logger(__name__)
 
+# Templates with at least this many parameters are materialized with COPY
+COPY_INSTANCES_THRESHOLD = 2000
+
 
 class AuditService:
     """
@@ -125,60 +133,29 @@ class AuditService:
             audit_date = date.today()
 
         # Create audit
-        # Retry logic for audit_number collision (unique constraint)
-        max_retries = 3
-        retry_count = 0
-        last_error = None
-
-        while retry_count < max_retries:
-            try:
-                # Generate unique audit number (if it's not the first try, regenerate)
-                if retry_count > 0:
-                    audit_number = self._generate_audit_number()
-                
-                audit = Audit(
-                    fsp_organization_id=fsp_organization_id,
-                    farming_organization_id=farming_organization_id,
-                    work_order_id=work_order_id,
-                    crop_id=crop_id,
-                    template_id=template_id,
-                    audit_number=audit_number,
-                    name=name,
-                    status=AuditStatus.PENDING if assigned_to else AuditStatus.DRAFT,
-                    template_snapshot=template_snapshot,
-                    audit_date=audit_date,
-                    sync_status=SyncStatus.PENDING_SYNC,
-                    created_by=user_id,
-                    assigned_to_user_id=assigned_to
-                )
+        # The numbering counter never hands out a number twice, so no collision retry is needed
+        audit = Audit(
+            fsp_organization_id=fsp_organization_id,
+            farming_organization_id=farming_organization_id,
+            work_order_id=work_order_id,
+            crop_id=crop_id,
+            template_id=template_id,
+            audit_number=audit_number,
+            name=name,
+            status=AuditStatus.PENDING if assigned_to else AuditStatus.DRAFT,
+            template_snapshot=template_snapshot,
+            audit_date=audit_date,
+            sync_status=SyncStatus.PENDING_SYNC,
+            created_by=user_id,
+            assigned_to_user_id=assigned_to
+        )
 
-                self.db.add(audit)
-                self.db.flush()
-                
-                # If flush succeeds, break the retry loop
-                break
-            except IntegrityError as e:
-                self.db.rollback()
-                retry_count += 1
-                last_error = e
-                logger.warning(
-                    "Audit number collision detected, retrying",
-                    extra={
-                        "audit_number": audit_number,
-                        "retry_count": retry_count,
-                        "error": str(e)
-                    }
-                )
-                if retry_count >= max_retries:
-                    logger.error("Max retries reached for audit creation", extra={"error": str(e)})
-                    raise ConflictError(
-                        message="Could not generate a unique audit number after multiple attempts",
-                        error_code="AUDIT_NUMBER_COLLISION",
-                        details={"audit_number": audit_number}
-                    )
-            except Exception as e:
-                self.db.rollback()
-                raise e
+        try:
+            self.db.add(audit)
+            self.db.flush()
+        except Exception:
+            self.db.rollback()
+            raise
 
         # Create audit_parameter_instances
         self._create_parameter_instances(audit, template_snapshot, user_id)
@@ -192,7 +169,7 @@ class AuditService:
                 "audit_id": str(audit.id),
                 "audit_number": audit_number,
                 "farming_organization_id": str(farming_organization_id),
-                "parameter_instances_count": len(audit.parameter_instances)
+                "parameter_instances_count": audit.parameter_count
             }
         )
 
@@ -258,43 +235,13 @@ class AuditService:
         """
         Generate unique audit number in format AUD-YYYY-NNNN.
         
-        Uses the highest existing number for the year to determine the next one.
-        NNNN is a sequential number within the year, zero-padded to 4 digits.
+        NNNN is a sequential number within the year, zero-padded to 4 digits,
+        allocated from the audit number counter (see NumberingService).
         
         Returns:
             Unique audit number string
         """
-        current_year = datetime.now().year
-
-        # Format prefix to search for: "AUD-2026-"
-        prefix = f"AUD-{current_year}-"
-
-        # Get the highest audit number used this year
-        # We extract the last 4 characters and cast to integer for comparison
-        max_num = self.db.query(
-            func.max(cast(func.substring(Audit.audit_number, len(prefix) + 1, 4), Integer))
-        ).filter(
-            Audit.audit_number.like(f"{prefix}%")
-        ).scalar()
-
-        # Generate next number (max + 1)
-        next_number = (max_num or 0) + 1
-
-        # Format as AUD-YYYY-NNNN
-        audit_number = f"AUD-{current_year}-{next_number:04d}"
-
-        # Double check if number already exists (race condition protection)
-        # This is a fast check before attempting insertion
-        while self.db.query(Audit).filter(Audit.audit_number == audit_number).first():
-            next_number += 1
-            audit_number = f"AUD-{current_year}-{next_number:04d}"
-
-        logger.info(
-            "Audit number generated",
-            extra={"audit_number": audit_number, "year": current_year, "max_found": max_num}
-        )
-
-        return audit_number
+        return NumberingService(self.db).next_number(AUDIT)
 
     def _create_parameter_instances(
         self,
@@ -305,11 +252,14 @@ class AuditService:
         """
         Create audit_parameter_instances from template snapshot.
         
-        Creates an instance for each parameter in the template with a complete
-        parameter snapshot.
+        Creates an instance for each parameter in the template. Template
+        sections are resolved in one query, each distinct parameter snapshot
+        is stored once in parameter_snapshot_blobs (content hashed), and the
+        instances are written with one multi-row INSERT, or COPY for very
+        large templates.
         
         Args:
-            audit: Audit instance
+            audit: Audit instance (already flushed)
             template_snapshot: Complete template snapshot
             user_id: ID of the user creating the audit
         """
@@ -318,20 +268,22 @@ class AuditService:
             extra={"audit_id": str(audit.id)}
         )
 
-        instance_count = 0
-
-        for section in template_snapshot.get("sections", []):
+        sections = template_snapshot.get("sections", [])
+        section_ids = [UUID(section["section_id"]) for section in sections]
+        template_section_ids = dict(
+            self.db.query(TemplateSection.section_id, TemplateSection.id).filter(
+                TemplateSection.template_id == audit.template_id,
+                TemplateSection.section_id.in_(section_ids)
+            ).all()
+        ) if section_ids else {}
+
+        rows = []
+        snapshots = {}
+        for section in sections:
             section_id = UUID(section["section_id"])
+            template_section_id = template_section_ids.get(section_id)
 
-            # Get template_section_id
-            template_section = self.db.query(TemplateSection).filter(
-                and_(
-                    TemplateSection.template_id == audit.template_id,
-                    TemplateSection.section_id == section_id
-                )
-            ).first()
-
-            if not template_section:
+            if not template_section_id:
                 logger.warning(
                     "Template section not found",
                     extra={
@@ -342,31 +294,103 @@ class AuditService:
                 continue
 
             for parameter in section.get("parameters", []):
-                parameter_id = UUID(parameter["parameter_id"])
-                parameter_snapshot = parameter["parameter_snapshot"]
-
-                # Create audit parameter instance
-                instance = AuditParameterInstance(
-                    audit_id=audit.id,
-                    template_section_id=template_section.id,
-                    parameter_id=parameter_id,
-                    sort_order=parameter["sort_order"],
-                    is_required=parameter["is_required"],
-                    parameter_snapshot=parameter_snapshot,
-                    created_by=user_id
-                )
-
-                self.db.add(instance)
-                instance_count += 1
+                # Stored without snapshot_date so audits taken at different times share blobs
+                parameter_snapshot = snapshot_content(parameter["parameter_snapshot"])
+                snapshot_hash = snapshot_content_hash(parameter_snapshot)
+                snapshots.setdefault(snapshot_hash, parameter_snapshot)
+
+                rows.append({
+                    "id": uuid.uuid4(),
+                    "audit_id": audit.id,
+                    "template_section_id": template_section_id,
+                    "parameter_id": UUID(parameter["parameter_id"]),
+                    "sort_order": parameter["sort_order"],
+                    "is_required": parameter["is_required"],
+                    "parameter_snapshot_hash": snapshot_hash,
+                    "created_by": user_id
+                })
+
+        new_snapshots = self._store_parameter_snapshots(snapshots)
+
+        if len(rows) >= COPY_INSTANCES_THRESHOLD and self._copy_parameter_instances(rows):
+            method = "copy"
+        elif rows:
+            self.db.execute(insert(AuditParameterInstance), rows)
+            method = "insert"
+        else:
+            method = None
+
+        # Initialise denormalized progress counters
+        audit.parameter_count = len(rows)
+        audit.answered_count = 0
 
         logger.info(
             "Parameter instances created",
             extra={
                 "audit_id": str(audit.id),
-                "instance_count": instance_count
+                "instance_count": len(rows),
+                "distinct_snapshots": len(snapshots),
+                "new_snapshots": new_snapshots,
+                "method": method
             }
         )
 
+    def _store_parameter_snapshots(self, snapshots: Dict[str, Dict[str, Any]]) -> int:
+        """
+        Store the snapshots not yet in parameter_snapshot_blobs.
+        
+        Args:
+            snapshots: Parameter snapshots keyed by content hash
+            
+        Returns:
+            Number of snapshots that were not stored yet
+        """
+        if not snapshots:
+            return 0
+
+        existing = set(self.db.scalars(
+            select(ParameterSnapshotBlob.hash).where(ParameterSnapshotBlob.hash.in_(list(snapshots)))
+        ))
+        missing = [
+            {"hash": snapshot_hash, "snapshot": snapshot}
+            for snapshot_hash, snapshot in snapshots.items()
+            if snapshot_hash not in existing
+        ]
+        if missing:
+            # A concurrent audit from the same template may insert the same blobs
+            self.db.execute(
+                pg_insert(ParameterSnapshotBlob).values(missing).on_conflict_do_nothing(index_elements=["hash"])
+            )
+        return len(missing)
+
+    def _copy_parameter_instances(self, rows: List[Dict[str, Any]]) -> bool:
+        """
+        Write instances with COPY on the session's connection.
+        
+        Returns:
+            False if the database driver does not support COPY (caller inserts instead)
+        """
+        cursor = self.db.connection().connection.cursor()
+        if not hasattr(cursor, "copy_expert"):
+            cursor.close()
+            return False
+
+        columns = list(rows[0])
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow(["" if row[column] is None else row[column] for column in columns])
+        buffer.seek(0)
+
+        try:
+            cursor.copy_expert(
+                f"COPY audit_parameter_instances ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+        finally:
+            cursor.close()
+        return True
+
     def get_audit(self, audit_id: UUID) -> Audit:
         """
         Get audit by ID.
@@ -393,7 +417,7 @@ class AuditService:
             )
         
         # Calculate and attach progress
-        audit.progress = self._calculate_progress(audit_id)
+        self._attach_progress([audit])
         
         return audit
 
@@ -454,31 +478,75 @@ class AuditService:
         
         return audit
 
+    @staticmethod
+    def _progress_percentage(answered: int, total: int) -> float:
+        """Convert answered/total counts into a rounded percentage capped at 100."""
+        if not total:
+            return 0.0
+        progress = (answered / total) * 100.0
+        return round(min(progress, 100.0), 1)
+
     def _calculate_progress(self, audit_id: UUID) -> float:
         """
         Calculate audit completion progress.
         
-        Progress is defined as the percentage of mandatory parameters that have responses.
-        If no mandatory parameters exist, uses total parameters.
+        Progress is defined as the percentage of parameter instances that have responses
+        ("answered / total").
         """
-        # Get all instances
-        instances = self.db.query(AuditParameterInstance).filter(
-            AuditParameterInstance.audit_id == audit_id
-        ).all()
+        return self._calculate_progress_bulk([audit_id]).get(audit_id, 0.0)
+
+    def _calculate_progress_bulk(self, audit_ids: List[UUID]) -> Dict[UUID, float]:
+        """
+        Calculate progress for many audits with a single grouped aggregate.
         
-        if not instances:
-            return 0.0
+        Instance and response counts are computed as correlated subqueries in one
+        statement, so the cost is one round trip regardless of page size or the
+        number of parameters per audit.
+        
+        Args:
+            audit_ids: Audit IDs to calculate progress for
             
-        # Get response count
-        response_count = self.db.query(AuditResponse).filter(
-            AuditResponse.audit_id == audit_id
-        ).count()
+        Returns:
+            Mapping of audit_id -> progress percentage
+        """
+        if not audit_ids:
+            return {}
+
+        instance_count = select(func.count(AuditParameterInstance.id)).where(
+            AuditParameterInstance.audit_id == Audit.id
+        ).correlate(Audit).scalar_subquery()
+
+        response_count = select(func.count(AuditResponse.id)).where(
+            AuditResponse.audit_id == Audit.id
+        ).correlate(Audit).scalar_subquery()
+
+        rows = self.db.query(Audit.id, instance_count, response_count).filter(
+            Audit.id.in_(audit_ids)
+        ).all()
+
+        return {
+            audit_id: self._progress_percentage(answered, total)
+            for audit_id, total, answered in rows
+        }
+
+    def _attach_progress(self, audits: List[Audit]) -> None:
+        """
+        Attach a `progress` attribute to each audit.
         
-        # Simple progress: responses / total instances
-        # A more sophisticated version would only count mandatory or specific types
-        # but this matches the "answered / total" logic requested.
-        progress = (response_count / len(instances)) * 100.0
-        return round(min(progress, 100.0), 1)
+        Uses the denormalized parameter_count/answered_count counters when they are
+        populated and falls back to one grouped aggregate for the remaining audits.
+        """
+        missing = []
+        for audit in audits:
+            if audit.parameter_count is not None and audit.answered_count is not None:
+                audit.progress = self._progress_percentage(audit.answered_count, audit.parameter_count)
+            else:
+                missing.append(audit)
+
+        if missing:
+            progress_map = self._calculate_progress_bulk([audit.id for audit in missing])
+            for audit in missing:
+                audit.progress = progress_map.get(audit.id, 0.0)
 
     def delete_audit(
         self,
@@ -519,10 +587,11 @@ class AuditService:
         analyst_user_id: Optional[UUID] = None,
         work_order_id: Optional[UUID] = None,
         page: int = 1,
-        limit: int = 20
-    ) -> Tuple[List[Audit], int]:
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Audit], int, Optional[str]]:
         """
-        Get audits with filtering and pagination.
+        Get audits with filtering and keyset (or page number) pagination.
         
         Args:
             fsp_organization_id: Filter by FSP organization
@@ -531,41 +600,19 @@ class AuditService:
             status: Filter by status
             assigned_to_user_id: Filter by assigned user
             created_by_user_id: Filter by creator
-            page: Page number (1-indexed)
+            page: Page number (1-indexed), when no cursor is given
             limit: Items per page
+            cursor: next_cursor of the previous page
             
         Returns:
-            Tuple of (audits list, total count)
+            Tuple of (audits list, total count, next page cursor or None)
         """
-        logger.info(f"DEBUG: [S1] Entering get_audits. farming_org_id={farming_organization_id}")
         query = self.db.query(Audit)
-        
-        # DEBUG: Dump all audits in DB to see what org IDs they have
-        all_audits = self.db.query(Audit).limit(10).all()
-        print(f"!!! DEBUG: Total audits in DB (limit 10): {len(all_audits)}", flush=True)
-        for idx, a in enumerate(all_audits):
-            print(f"!!! DEBUG: Audit[{idx}]: id={a.id}, farming_org={a.farming_organization_id}, status={a.status}", flush=True)
-
-        # DEBUG: System-wide check
-        all_count = self.db.query(func.count(Audit.id)).scalar()
-        logger.info(f"DEBUG: [S2] Total audits in DB (any org): {all_count}")
-        if all_count > 0:
-            sample = self.db.query(Audit).limit(3).all()
-            for s in sample:
-                logger.info(f"DEBUG: [S3] Sample Audit: id={s.id}, farming_org={s.farming_organization_id}, status={s.status}")
 
         # Apply filters
         if fsp_organization_id:
             query = query.filter(Audit.fsp_organization_id == fsp_organization_id)
         if farming_organization_id:
-            # DEBUG: print statements bypass logging config
-            print(f"!!! DEBUG: [S1] Entering get_audits for org: {farming_organization_id}", flush=True)
-            temp_all = self.db.query(Audit).filter(Audit.farming_organization_id == farming_organization_id).all()
-            print(f"!!! DEBUG: [S2] Total audits for org {farming_organization_id} (ignoring status): {len(temp_all)}", flush=True)
-            for a in temp_all:
-                print(f"!!! DEBUG: [S3] Audit {a.id} status: {a.status}", flush=True)
-                
-            # BROAD FILTER: Show all audits for farmer during debugging
             query = query.filter(Audit.farming_organization_id == farming_organization_id)
         if crop_id:
             query = query.filter(Audit.crop_id == crop_id)
@@ -587,20 +634,31 @@ class AuditService:
             joinedload(Audit.fsp_organization)
         )
 
-        # Get total count
-        total = query.count()
-        logger.info(f"DEBUG: get_audits called with farming_org_id={farming_organization_id}, fsp_org_id={fsp_organization_id}, status={status}")
-        logger.info(f"DEBUG: Found {total} audits matching criteria")
+        result = paginate(
+            query,
+            Audit.created_at,
+            Audit.id,
+            name="audits",
+            cursor=cursor,
+            page=page,
+            limit=limit
+        )
+        audits, total = result.items, result.total
 
-        # Apply pagination
-        offset = (page - 1) * limit
-        audits = query.order_by(Audit.created_at.desc()).offset(offset).limit(limit).all()
+        # Attach progress for the whole page (counters, or one grouped aggregate)
+        self._attach_progress(audits)
 
-        # Calculate progress for each audit
-        for audit in audits:
-            audit.progress = self._calculate_progress(audit.id)
+        logger.info(
+            "Audits retrieved",
+            extra={
+                "fsp_organization_id": str(fsp_organization_id) if fsp_organization_id else None,
+                "farming_organization_id": str(farming_organization_id) if farming_organization_id else None,
+                "total": total,
+                "page": page
+            }
+        )
 
-        return audits, total
+        return audits, total, result.next_cursor
 
     def get_audit_structure(self, audit_id: UUID) -> Dict[str, Any]:
         """
@@ -664,27 +722,66 @@ class AuditService:
 
         # Build sections from template snapshot
         if audit.template_snapshot:
+            # Resolve template_section_id of every snapshot section at once
+            template_section_ids = {
+                str(section_id): str(template_section_id)
+                for template_section_id, section_id in self.db.query(
+                    TemplateSection.id, TemplateSection.section_id
+                ).filter(TemplateSection.template_id == audit.template_id).all()
+            }
+
             for section in audit.template_snapshot.get("sections", []):
                 section_id = section.get("section_id")
-                # Find template_section_id for this section
-                template_section = self.db.query(TemplateSection).filter(
-                    and_(
-                        TemplateSection.template_id == audit.template_id,
-                        TemplateSection.section_id == UUID(section_id)
-                    )
-                ).first()
-
-                if template_section:
+                template_section_id = template_section_ids.get(section_id)
+
+                if template_section_id:
                     section_data = {
                         "section_id": section_id,
                         "code": section.get("code"),
                         "translations": section.get("translations", {}),
-                        "parameters": sections_map.get(str(template_section.id), [])
+                        "parameters": sections_map.get(template_section_id, [])
                     }
                     structure["sections"].append(section_data)
 
         return structure
 
+    def get_audit_structure_version(self, audit_id: UUID) -> Tuple[Any, ...]:
+        """
+        Get the version of an audit's structure without building it.
+        
+        The structure only changes with the audit's header fields (number,
+        name, status) or its parameter instance set, so those identify it.
+        Costs one grouped query.
+        
+        Args:
+            audit_id: UUID of the audit
+            
+        Returns:
+            Hashable version tuple
+            
+        Raises:
+            NotFoundError: If audit not found
+        """
+        row = self.db.query(
+            Audit.audit_number,
+            Audit.name,
+            Audit.status,
+            func.count(AuditParameterInstance.id),
+            func.max(AuditParameterInstance.updated_at)
+        ).outerjoin(
+            AuditParameterInstance, AuditParameterInstance.audit_id == Audit.id
+        ).filter(Audit.id == audit_id).group_by(Audit.id).first()
+
+        if not row:
+            raise NotFoundError(
+                message=f"Audit {audit_id} not found",
+                error_code="AUDIT_NOT_FOUND",
+                details={"audit_id": str(audit_id)}
+            )
+
+        audit_number, name, status, instance_count, instances_updated_at = row
+        return (str(audit_id), audit_number, name, status.value, instance_count, instances_updated_at)
+
     def get_audit_report(self, audit_id: UUID) -> Dict[str, Any]:
         """
         Get comprehensive audit report with stats.
@@ -784,12 +881,13 @@ class AuditService:
             AuditReview.audit_response.has(AuditResponse.audit_id == audit_id)
         ).all()
 
+        # Instances were loaded above; look them up instead of querying per review
+        instances_by_id = {instance.id: instance for instance in instances}
+
         flagged_responses_data = []
         for review in flagged_reviews:
             resp = review.audit_response
-            param_instance = self.db.query(AuditParameterInstance).filter(
-                AuditParameterInstance.id == resp.audit_parameter_instance_id
-            ).first()
+            param_instance = instances_by_id.get(resp.audit_parameter_instance_id)
             
             param_name = "Unknown Parameter"
             param_type = "TEXT"
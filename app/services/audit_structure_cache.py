@@ -0,0 +1,134 @@
+"""
+Audit structure payload cache for Uzhathunai v2.0.
+
+The audit structure is assembled from immutable snapshots, so it only
+changes with the audit's header fields or its parameter instance set
+(AuditService.get_audit_structure_version). Serialized payloads are kept
+per version together with a strong ETag (SHA-256 of the JSON body) and a
+lazily built gzip variant, so repeat fetches from the field apps cost one
+small query and, with If-None-Match, send no body at all.
+"""
+import gzip
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+from uuid import UUID
+
+from app.core.cache import LocalLRUCache
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.services.audit_service import AuditService
+
+logger = get_logger(__name__)
+
+# Bodies smaller than this are not worth a gzip round on the client
+GZIP_MIN_BYTES = 1024
+
+
+@dataclass(frozen=True)
+class StructurePayload:
+    """A serialized audit structure ready to be sent."""
+    etag: str
+    body: bytes
+    content_encoding: Optional[str] = None
+
+
+class _Entry:
+    """Cached body of one structure version; the gzip variant is built on first request."""
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.digest = hashlib.sha256(body).hexdigest()
+        self.gzip_body: Optional[bytes] = None
+
+    def gzipped(self) -> bytes:
+        if self.gzip_body is None:
+            # mtime=0 keeps the compressed bytes identical for identical bodies
+            self.gzip_body = gzip.compress(self.body, compresslevel=6, mtime=0)
+        return self.gzip_body
+
+
+class AuditStructureCache:
+    """Process-local cache of serialized audit structures keyed by structure version."""
+
+    def __init__(self, maxsize: Optional[int] = None, ttl: Optional[int] = None):
+        self._entries = LocalLRUCache(
+            maxsize=maxsize if maxsize is not None else settings.AUDIT_STRUCTURE_CACHE_SIZE,
+            ttl=ttl if ttl is not None else settings.AUDIT_STRUCTURE_CACHE_TTL
+        )
+
+    def get(
+        self,
+        service: AuditService,
+        audit_id: UUID,
+        render: Callable[[Dict[str, Any]], bytes],
+        accept_gzip: bool = False
+    ) -> StructurePayload:
+        """
+        Get the serialized structure of an audit, building it on a miss.
+
+        Args:
+            service: AuditService bound to the request's session
+            audit_id: UUID of the audit
+            render: Serializes the structure dict to the response body
+            accept_gzip: Whether the client accepts a gzip-encoded body
+
+        Raises:
+            NotFoundError: If audit not found
+        """
+        version = service.get_audit_structure_version(audit_id)
+        entry = self._entries.get(version)
+        if entry is None:
+            entry = _Entry(render(service.get_audit_structure(audit_id)))
+            self._entries.set(version, entry)
+            logger.info(
+                "Audit structure cached",
+                extra={"audit_id": str(audit_id), "bytes": len(entry.body)}
+            )
+
+        if accept_gzip and len(entry.body) >= GZIP_MIN_BYTES:
+            # Representations differ in bytes, so each encoding has its own strong ETag
+            return StructurePayload(etag=f'"{entry.digest}-gzip"', body=entry.gzipped(), content_encoding="gzip")
+        return StructurePayload(etag=f'"{entry.digest}"', body=entry.body)
+
+    def clear(self) -> None:
+        """Drop all cached structures."""
+        self._entries.clear()
+
+
+def etag_matches(if_none_match: Optional[str], payload: StructurePayload) -> bool:
+    """
+    Evaluate If-None-Match against a payload (weak comparison, RFC 9110).
+
+    Tags of either encoding match, since both carry the same structure.
+    """
+    if not if_none_match:
+        return False
+    digest = payload.etag.strip('"').removesuffix("-gzip")
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        tag = tag.removeprefix("W/").strip('"').removesuffix("-gzip")
+        if tag == digest:
+            return True
+    return False
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Whether an Accept-Encoding header allows gzip (q=0 refuses it)."""
+    for coding in (accept_encoding or "").split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() not in ("gzip", "*"):
+            continue
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                return float(quality[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+audit_structure_cache = AuditStructureCache()
@@ -4,20 +4,39 @@ Chat service for Uzhathunai v2.0.
 from typing import List, Optional, Tuple
 from uuid import UUID
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import tuple_
 from datetime import datetime
 
 from app.models.chat import ChatChannel, ChatChannelMember, ChatMessage
 from app.models.organization import Organization, OrgMember, OrgMemberRole
 from app.models.rbac import Role
 from app.models.enums import ChatContextType, MessageType, MemberStatus
-from app.schemas.chat import ChatChannelCreate, ChatMessageCreate
+from app.schemas.chat import ChatChannelCreate, ChatMessageCreate, ChatMessageResponse
+from app.core.config import settings
 from app.core.logging import get_logger
 from app.core.exceptions import NotFoundError, PermissionError, ValidationError
+from app.core.pagination import paginate
+from app.core.realtime import realtime_hub
+from app.core.tiered_cache import tiered_cache
 
 logger = get_logger(__name__)
 
 
+def chat_topic(channel_id: UUID) -> str:
+    """Realtime topic carrying new messages of a channel."""
+    return f"chat:{channel_id}"
+
+
+def chat_access_namespace(user_id: UUID) -> str:
+    """Cache namespace of a user's granted channel access."""
+    return f"chat_access:{user_id}"
+
+
+def invalidate_chat_access(user_id: UUID) -> None:
+    """Drop a user's cached channel access after their memberships or roles change."""
+    tiered_cache.invalidate(chat_access_namespace(user_id))
+
+
 class ChatService:
     """Service for In-App Chat."""
     
@@ -168,6 +187,12 @@ class ChatService:
         
         self.db.commit()
         self.db.refresh(msg)
+        
+        # Push to connected clients of every worker
+        realtime_hub.publish(chat_topic(channel_id), {
+            "type": "message",
+            "data": ChatMessageResponse.model_validate(msg).model_dump(mode="json")
+        })
         return msg
 
     def repair_channel_membership(self, channel_id: UUID, user_id: UUID) -> bool:
@@ -296,16 +321,27 @@ class ChatService:
             
         return False
 
-    def get_messages(
-        self,
-        channel_id: UUID,
-        user_id: UUID,
-        page: int = 1,
-        limit: int = 50
-    ) -> Tuple[List[ChatMessage], int]:
+    def ensure_channel_access(self, channel_id: UUID, user_id: UUID) -> None:
         """
-        Get messages for a channel.
+        Verify the user belongs to an organization that is a member of the channel.
+        
+        A missing membership triggers repair_channel_membership first. Granted
+        access is cached per user for CHAT_ACCESS_CACHE_TTL seconds, so polling
+        and connected clients do not re-run the membership join; member
+        changes drop it through invalidate_chat_access.
+        
+        Raises:
+            PermissionError: If the user has no access to the channel
         """
+        tiered_cache.get_or_compute(
+            chat_access_namespace(user_id),
+            [str(channel_id)],
+            lambda: self._check_channel_access(channel_id, user_id),
+            ttl=settings.CHAT_ACCESS_CACHE_TTL
+        )
+    
+    def _check_channel_access(self, channel_id: UUID, user_id: UUID) -> bool:
+        """Run the membership check (and repair), raising PermissionError on denial."""
         # logger.info(f"DEBUG: Checking access for user {user_id} to channel {channel_id}")
         
         # Helper debugging - commented out to reduce noise unless needed
@@ -347,15 +383,78 @@ class ChatService:
                 logger.error(f"access_control: Repair failed or not applicable.")
                 raise PermissionError("Access denied", "PERMISSION_DENIED")
             # --- SELF HEALING END ---
+        
+        return True
+
+    def get_messages(
+        self,
+        channel_id: UUID,
+        user_id: UUID,
+        page: int = 1,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[ChatMessage], int, Optional[str]]:
+        """
+        Get messages for a channel, newest first.
+        
+        Returns:
+            Tuple of (messages, total count, cursor of the older page or None)
+        """
+        self.ensure_channel_access(channel_id, user_id)
             
         query = self.db.query(ChatMessage).filter(
             ChatMessage.channel_id == channel_id
         )
         
-        total = query.count()
+        result = paginate(
+            query,
+            ChatMessage.created_at,
+            ChatMessage.id,
+            name="chat_messages",
+            cursor=cursor,
+            page=page,
+            limit=limit
+        )
         
-        messages = query.order_by(
-            desc(ChatMessage.created_at)
-        ).offset((page - 1) * limit).limit(limit).all()
+        return result.items, result.total, result.next_cursor
+    
+    def get_messages_since(
+        self,
+        channel_id: UUID,
+        user_id: UUID,
+        message_id: UUID,
+        limit: int = 100
+    ) -> Tuple[List[ChatMessage], bool]:
+        """
+        Get messages sent after a given message, oldest first.
+        
+        Used by clients to catch up after reconnecting, from the last message
+        they received.
+        
+        Returns:
+            Tuple of (messages, whether more messages follow)
+        
+        Raises:
+            NotFoundError: If the message does not belong to the channel
+        """
+        self.ensure_channel_access(channel_id, user_id)
+        
+        anchor = self.db.query(ChatMessage.created_at, ChatMessage.id).filter(
+            ChatMessage.id == message_id,
+            ChatMessage.channel_id == channel_id
+        ).first()
+        if not anchor:
+            raise NotFoundError(
+                message=f"Message {message_id} not found in channel",
+                error_code="MESSAGE_NOT_FOUND",
+                details={"message_id": str(message_id)}
+            )
+        
+        messages = self.db.query(ChatMessage).filter(
+            ChatMessage.channel_id == channel_id,
+            tuple_(ChatMessage.created_at, ChatMessage.id) > tuple_(anchor.created_at, anchor.id)
+        ).order_by(
+            ChatMessage.created_at.asc(), ChatMessage.id.asc()
+        ).limit(limit + 1).all()
         
-        return messages, total
+        return messages[:limit], len(messages) > limit
@@ -10,6 +10,7 @@ from sqlalchemy import func
 
 from app.core.logging import get_logger
 from app.core.exceptions import NotFoundError
+from app.core.tiered_cache import cached, tiered_cache
 from app.models.crop import Crop
 from app.models.crop_data import (
     CropCategory, CropCategoryTranslation,
@@ -24,6 +25,10 @@ from app.schemas.crop_data import (
 
 logger = get_logger(__name__)
 
+# Crop hierarchy is admin-maintained and rarely changes
+CACHE_NAMESPACE = "crop_data"
+CACHE_TTL = 3600
+
 
 class CropDataService:
     """Service for crop hierarchy operations (categories, types, varieties)."""
@@ -31,6 +36,12 @@ class CropDataService:
     def __init__(self, db: Session):
         self.db = db
     
+    @staticmethod
+    def invalidate_cache() -> None:
+        """Drop cached crop hierarchy lookups in every worker. Call after commit."""
+        tiered_cache.invalidate(CACHE_NAMESPACE)
+    
+    @cached(CACHE_NAMESPACE, ttl=CACHE_TTL)
     def get_crop_categories(self, language: str = "en") -> List[CropCategoryResponse]:
         """
         Get all crop categories with translations.
@@ -82,6 +93,7 @@ class CropDataService:
         
         return result
     
+    @cached(CACHE_NAMESPACE, ttl=CACHE_TTL)
     def get_crop_types_by_category(
         self, 
         category_id: Optional[UUID] = None, 
@@ -140,6 +152,7 @@ class CropDataService:
         
         return result
     
+    @cached(CACHE_NAMESPACE, ttl=CACHE_TTL)
     def get_crop_varieties_by_type(
         self, 
         type_id: Optional[UUID] = None, 
@@ -199,6 +212,7 @@ class CropDataService:
         
         return result
     
+    @cached(CACHE_NAMESPACE, ttl=CACHE_TTL)
     def get_variety_by_id(
         self, 
         variety_id: UUID, 
@@ -302,6 +316,7 @@ class CropDataService:
         
         return metadata
     
+    @cached(CACHE_NAMESPACE, ttl=CACHE_TTL)
     def get_category_by_id(
         self, 
         category_id: UUID, 
@@ -364,6 +379,7 @@ class CropDataService:
             description=translation.description if translation else None
         )
     
+    @cached(CACHE_NAMESPACE, ttl=CACHE_TTL)
     def get_type_by_id(
         self, 
         type_id: UUID, 
@@ -513,6 +529,7 @@ class CropDataService:
         self.db.add(translation)
         self.db.commit()
         self.db.refresh(crop_type)
+        self.invalidate_cache()
 
         logger.info(
             "Created custom crop type",
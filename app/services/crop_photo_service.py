@@ -1,13 +1,19 @@
 """
 Crop Photo service for managing crop lifecycle photos.
 """
-from typing import List, Optional
-from uuid import UUID
+import os
+from datetime import date, datetime
+from typing import BinaryIO, List, Optional
+from uuid import UUID, uuid4
+from PIL import Image
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import and_
 
+from app.core.config import settings
 from app.core.logging import get_logger
 from app.core.exceptions import NotFoundError, ValidationError
+from app.core.storage import MediaStorage, media_storage
+from app.services.media_pipeline import ImageSpec, compress_image
 from app.models.crop import Crop, CropLifecyclePhoto, CropYield, CropYieldPhoto
 from app.models.plot import Plot
 from app.models.farm import Farm
@@ -19,8 +25,11 @@ logger = get_logger(__name__)
 class CropPhotoService:
     """Service for crop photo operations."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, storage: Optional[MediaStorage] = None):
         self.db = db
+        self.storage = storage or media_storage
+        self.allowed_formats = ['JPEG', 'PNG']
+        self.image_spec = ImageSpec(max_width=1024, quality=70)
     
     def upload_photo(
         self,
@@ -94,6 +103,107 @@ class CropPhotoService:
         
         return self._to_response(photo)
     
+    def upload_photo_file(
+        self,
+        crop_id: UUID,
+        org_id: UUID,
+        file_data: BinaryIO,
+        filename: str,
+        caption: Optional[str],
+        photo_date: Optional[date],
+        user_id: UUID
+    ) -> CropPhotoResponse:
+        """
+        Compress and store an uploaded photo file, then record it for the crop.
+        
+        Args:
+            crop_id: Crop ID
+            org_id: Organization ID
+            file_data: Uploaded file
+            filename: Original filename
+            caption: Optional caption
+            photo_date: Optional date the photo was taken
+            user_id: User ID uploading the photo
+            
+        Returns:
+            Created photo
+            
+        Raises:
+            NotFoundError: If crop not found
+            ValidationError: If the file is not a supported image
+            ServiceError: If storing the file fails
+        """
+        crop_exists = (
+            self.db.query(Crop.id)
+            .join(Plot)
+            .join(Farm)
+            .filter(
+                and_(
+                    Crop.id == crop_id,
+                    Farm.organization_id == org_id
+                )
+            )
+            .first()
+        )
+        
+        if not crop_exists:
+            raise NotFoundError(
+                message=f"Crop {crop_id} not found",
+                error_code="CROP_NOT_FOUND",
+                details={"crop_id": str(crop_id)}
+            )
+        
+        data = self._read_image(file_data)
+        image = compress_image(data, self.image_spec)
+        
+        timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
+        ext = os.path.splitext(filename or '')[1] or '.jpg'
+        file_key = f"crops/{crop_id}/photos/{timestamp}_{uuid4().hex[:8]}{ext}"
+        file_url = self.storage.put(file_key, image.data, image.content_type)
+        
+        try:
+            return self.upload_photo(
+                crop_id,
+                CropPhotoUpload(file_url=file_url, file_key=file_key, caption=caption, photo_date=photo_date),
+                org_id,
+                user_id
+            )
+        except Exception:
+            self.db.rollback()
+            self.storage.delete(file_key)
+            raise
+    
+    def _read_image(self, file_data: BinaryIO) -> bytes:
+        """Read an uploaded image after checking its size and format."""
+        file_data.seek(0, 2)
+        file_size = file_data.tell()
+        file_data.seek(0)
+        
+        if file_size > settings.MAX_UPLOAD_SIZE:
+            raise ValidationError(
+                message=f"File size exceeds maximum {settings.MAX_UPLOAD_SIZE / 1024 / 1024}MB",
+                error_code="FILE_TOO_LARGE",
+                details={"max_size_mb": settings.MAX_UPLOAD_SIZE / 1024 / 1024}
+            )
+        
+        try:
+            image_format = Image.open(file_data).format
+        except Exception as e:
+            raise ValidationError(
+                message="Invalid image file",
+                error_code="INVALID_IMAGE",
+                details={"error": str(e)}
+            )
+        if image_format not in self.allowed_formats:
+            raise ValidationError(
+                message=f"Invalid file format. Allowed: {', '.join(self.allowed_formats)}",
+                error_code="INVALID_FILE_FORMAT",
+                details={"allowed_formats": self.allowed_formats}
+            )
+        
+        file_data.seek(0)
+        return file_data.read()
+    
     def get_photos_by_crop(
         self,
         crop_id: UUID,
@@ -613,13 +613,11 @@ class CropService:
             plot_id: Optional plot ID
         """
         # Invalidate all crop list caches for this organization
-        pattern = f"crops:org:{org_id}:*"
-        self.cache.delete_pattern(pattern)
+        self.cache.invalidate_namespace(f"crops:org:{org_id}")
         
         # If plot_id provided, also invalidate plot-specific caches
         if plot_id:
-            pattern = f"crops:plot:{plot_id}:*"
-            self.cache.delete_pattern(pattern)
+            self.cache.invalidate_namespace(f"crops:plot:{plot_id}")
         
         logger.debug(
             "Invalidated crop cache",
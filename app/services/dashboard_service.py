@@ -5,7 +5,7 @@ Implements BFF pattern for optimized dashboard loading.
 
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_, or_
-from typing import Dict, List, Any, Tuple
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from uuid import UUID
 from datetime import datetime, timedelta
 
@@ -33,16 +33,46 @@ from app.models.enums import (
     CropLifecycle,
     OrganizationType
 )
+from app.services.dashboard_snapshot_service import (
+    DashboardSnapshotService,
+    FARMING_DASHBOARD,
+    FSP_DASHBOARD,
+    dashboard_snapshot_service
+)
 
 logger = get_logger(__name__)
 
+# Snapshot fields grouped into the response sections of each dashboard
+DASHBOARD_SECTIONS = {
+    FARMING_DASHBOARD: {
+        'stats': [
+            'farms', 'activeCrops', 'activeSchedules', 'activeServices', 'openIssues', 'activeUsers'
+        ],
+        'actionRequired': [
+            'pendingRecommendations', 'unansweredQueries', 'pendingWorkOrders',
+            'unresolvedIssues', 'overdueTasks'
+        ]
+    },
+    FSP_DASHBOARD: {
+        'stats': [
+            'activeClients', 'activeOrders', 'auditsInProgress', 'pendingQueries',
+            'activeTeam', 'totalRevenue', 'totalServices'
+        ],
+        'actionRequired': [
+            'newWorkOrderRequests', 'auditsToFinalize', 'clientQueries',
+            'recommendationsAwaitingResponse', 'marketplaceInquiries'
+        ]
+    }
+}
+
 
 class DashboardService:
     """Service for dashboard data aggregation."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, snapshots: Optional[DashboardSnapshotService] = None):
         self.db = db
         self.logger = logger
+        self.snapshots = snapshots or dashboard_snapshot_service
     
     def get_farming_dashboard(self, user_id: UUID, org_id: UUID) -> Dict[str, Any]:
         """
@@ -69,42 +99,19 @@ class DashboardService:
         )
         
         try:
-            # Get stats
-            stats = {
-                'farms': self._count_farms(org_id),
-                'activeCrops': self._count_active_crops(org_id),
-                'activeSchedules': self._count_active_schedules(org_id),
-                'activeServices': self._count_active_work_orders(org_id),
-                'openIssues': self._count_open_queries(org_id),
-                'activeUsers': self._count_active_users(org_id)
-            }
-            
-            # Get action required items
-            action_required = {
-                'pendingRecommendations': self._get_pending_recommendations(org_id),
-                'unansweredQueries': self._get_unanswered_queries(org_id),
-                'pendingWorkOrders': self._get_pending_work_orders(org_id),
-                'unresolvedIssues': self._get_unresolved_issues(org_id),
-                'overdueTasks': self._get_overdue_tasks(org_id)
-            }
-            
-            # Get recent activity
-            recent_activity = self._get_recent_activity(org_id, limit=5)
+            dashboard = self._get_dashboard(FARMING_DASHBOARD, org_id)
             
             self.logger.info(
                 "Farming dashboard fetched successfully",
                 extra={
                     "user_id": str(user_id),
                     "organization_id": str(org_id),
-                    "stats": stats
+                    "stats": dashboard['stats'],
+                    "snapshot_source": dashboard['snapshot']['source']
                 }
             )
             
-            return {
-                'stats': stats,
-                'actionRequired': action_required,
-                'recentActivity': recent_activity
-            }
+            return dashboard
             
         except Exception as e:
             self.logger.error(
@@ -143,43 +150,19 @@ class DashboardService:
         )
         
         try:
-            # Get stats
-            stats = {
-                'activeClients': self._count_fsp_clients(org_id),
-                'activeOrders': self._count_fsp_work_orders(org_id),
-                'auditsInProgress': self._count_audits_in_progress(org_id),
-                'pendingQueries': self._count_pending_queries(org_id),
-                'activeTeam': self._count_active_users(org_id),
-                'totalRevenue': float(self._count_total_revenue(org_id) or 0.0),
-                'totalServices': self._count_total_completed_services(org_id)
-            }
-            
-            # Get action required items
-            action_required = {
-                'newWorkOrderRequests': self._get_new_work_order_requests(org_id),
-                'auditsToFinalize': self._get_audits_to_finalize(org_id),
-                'clientQueries': self._get_client_queries(org_id),
-                'recommendationsAwaitingResponse': self._get_recommendations_awaiting_response(org_id),
-                'marketplaceInquiries': []  # Placeholder for future implementation
-            }
-            
-            # Get recent activity
-            recent_activity = self._get_recent_activity(org_id, limit=5)
+            dashboard = self._get_dashboard(FSP_DASHBOARD, org_id)
             
             self.logger.info(
                 "FSP dashboard fetched successfully",
                 extra={
                     "user_id": str(user_id),
                     "organization_id": str(org_id),
-                    "stats": stats
+                    "stats": dashboard['stats'],
+                    "snapshot_source": dashboard['snapshot']['source']
                 }
             )
             
-            return {
-                'stats': stats,
-                'actionRequired': action_required,
-                'recentActivity': recent_activity
-            }
+            return dashboard
             
         except Exception as e:
             self.logger.error(
@@ -193,6 +176,84 @@ class DashboardService:
             )
             raise
     
+    def _get_dashboard(self, kind: str, org_id: UUID) -> Dict[str, Any]:
+        """Assemble a dashboard response from the organization's snapshot."""
+        values, snapshot = self.snapshots.get_or_build(kind, org_id, self.field_builders(kind, org_id))
+        
+        dashboard = {
+            section: {field: values[field] for field in fields}
+            for section, fields in DASHBOARD_SECTIONS[kind].items()
+        }
+        dashboard['recentActivity'] = values['recentActivity']
+        dashboard['snapshot'] = snapshot
+        return dashboard
+    
+    def field_builders(self, kind: str, org_id: UUID) -> Dict[str, Callable[[], Any]]:
+        """
+        Get the function computing each snapshot field of a dashboard.
+        
+        Args:
+            kind: FARMING_DASHBOARD or FSP_DASHBOARD
+            org_id: Organization ID
+        """
+        if kind == FARMING_DASHBOARD:
+            return {
+                'farms': lambda: self._count_farms(org_id),
+                'activeCrops': lambda: self._count_active_crops(org_id),
+                'activeSchedules': lambda: self._count_active_schedules(org_id),
+                'activeServices': lambda: self._count_active_work_orders(org_id),
+                'openIssues': lambda: self._count_open_queries(org_id),
+                'activeUsers': lambda: self._count_active_users(org_id),
+                'pendingRecommendations': lambda: self._get_pending_recommendations(org_id),
+                'unansweredQueries': lambda: self._get_unanswered_queries(org_id),
+                'pendingWorkOrders': lambda: self._get_pending_work_orders(org_id),
+                'unresolvedIssues': lambda: self._get_unresolved_issues(org_id),
+                'overdueTasks': lambda: self._get_overdue_tasks(org_id),
+                'recentActivity': lambda: self._get_recent_activity(org_id, limit=5)
+            }
+        
+        return {
+            'activeClients': lambda: self._count_fsp_clients(org_id),
+            'activeOrders': lambda: self._count_fsp_work_orders(org_id),
+            'auditsInProgress': lambda: self._count_audits_in_progress(org_id),
+            'pendingQueries': lambda: self._count_pending_queries(org_id),
+            'activeTeam': lambda: self._count_active_users(org_id),
+            'totalRevenue': lambda: float(self._count_total_revenue(org_id) or 0.0),
+            'totalServices': lambda: self._count_total_completed_services(org_id),
+            'newWorkOrderRequests': lambda: self._get_new_work_order_requests(org_id),
+            'auditsToFinalize': lambda: self._get_audits_to_finalize(org_id),
+            'clientQueries': lambda: self._get_client_queries(org_id),
+            'recommendationsAwaitingResponse': lambda: self._get_recommendations_awaiting_response(org_id),
+            'marketplaceInquiries': lambda: [],  # Placeholder for future implementation
+            'recentActivity': lambda: self._get_recent_activity(org_id, limit=5)
+        }
+    
+    def reconcile_snapshots(self) -> int:
+        """
+        Rebuild every stored dashboard snapshot from the database.
+        
+        Corrects drift from writes that bypass the ORM session (raw SQL,
+        database cascades). Intended to run periodically, see
+        scripts/reconcile_dashboard_snapshots.py.
+        
+        Returns:
+            Number of snapshots rebuilt
+        """
+        rebuilt = 0
+        for kind, org_id in list(self.snapshots.iter_snapshots()):
+            try:
+                self.snapshots.rebuild(kind, org_id, self.field_builders(kind, UUID(org_id)))
+                rebuilt += 1
+            except Exception as e:
+                self.db.rollback()
+                self.logger.error(
+                    "Failed to reconcile dashboard snapshot",
+                    extra={"organization_id": org_id, "dashboard": kind, "error": str(e)}
+                )
+        
+        self.logger.info("Dashboard snapshots reconciled", extra={"rebuilt": rebuilt})
+        return rebuilt
+    
     def _validate_org_membership(self, user_id: UUID, org_id: UUID) -> None:
         """Validate user is a member of the organization."""
         member = self.db.query(OrgMember).filter(
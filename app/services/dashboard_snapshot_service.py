@@ -0,0 +1,286 @@
+"""
+Dashboard Snapshot Service for Uzhathunai v2.0.
+
+Keeps a per-organization snapshot of BFF dashboard fields in a Redis hash so
+a dashboard read is one HGETALL instead of a dozen aggregates. Commits that
+touch farms, crops, schedules, work orders, queries, audits or members drop
+only the affected fields; the next read recomputes just those fields.
+Whole snapshots are rebuilt once older than DASHBOARD_SNAPSHOT_MAX_AGE, which
+bounds staleness of time-dependent fields (e.g. overdue tasks).
+"""
+import json
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import CacheService, cache_service
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.models.audit import Audit
+from app.models.crop import Crop
+from app.models.farm import Farm
+from app.models.organization import OrgMember
+from app.models.plot import Plot
+from app.models.query import Query
+from app.models.schedule import Schedule, ScheduleTask
+from app.models.work_order import WorkOrder
+
+logger = get_logger(__name__)
+
+FARMING_DASHBOARD = "farming"
+FSP_DASHBOARD = "fsp"
+DASHBOARD_KINDS = (FARMING_DASHBOARD, FSP_DASHBOARD)
+
+# Hash field holding the epoch seconds of the last full rebuild
+BUILT_AT_FIELD = "_built_at"
+
+# Dashboard fields that depend on each entity type
+ENTITY_FIELDS: Dict[type, Set[str]] = {
+    Farm: {"farms", "activeCrops", "activeSchedules", "overdueTasks", "recentActivity"},
+    Plot: {"activeCrops", "activeSchedules", "overdueTasks"},
+    Crop: {"activeCrops", "activeSchedules", "overdueTasks", "recentActivity"},
+    Schedule: {"activeSchedules", "overdueTasks"},
+    ScheduleTask: {"overdueTasks"},
+    WorkOrder: {
+        "activeServices", "pendingWorkOrders", "recentActivity", "activeClients",
+        "activeOrders", "totalRevenue", "totalServices", "newWorkOrderRequests"
+    },
+    Query: {"openIssues", "unansweredQueries", "unresolvedIssues", "pendingQueries", "clientQueries"},
+    Audit: {"auditsInProgress", "auditsToFinalize"},
+    OrgMember: {"activeUsers", "activeTeam"},
+}
+
+# Session.info key collecting {organization_id: fields} until commit
+_PENDING_KEY = "dashboard_snapshot_pending"
+
+FieldBuilders = Dict[str, Callable[[], Any]]
+
+
+class DashboardSnapshotService:
+    """Service for reading, invalidating and rebuilding dashboard snapshots."""
+
+    def __init__(self, cache: Optional[CacheService] = None, max_age: Optional[int] = None):
+        self.cache = cache or cache_service
+        self.max_age = max_age if max_age is not None else settings.DASHBOARD_SNAPSHOT_MAX_AGE
+
+    def _key(self, kind: str, org_id: Any) -> str:
+        return self.cache._get_key("dashboard", kind, str(org_id))
+
+    def _metadata(self, source: str, built_at: float, now: float) -> Dict[str, Any]:
+        return {
+            "source": source,
+            "computedAt": datetime.fromtimestamp(built_at, tz=timezone.utc).isoformat(),
+            "ageSeconds": round(max(now - built_at, 0.0), 3),
+            "maxStalenessSeconds": self.max_age
+        }
+
+    @staticmethod
+    def _build(builders: FieldBuilders, fields: Iterable[str]) -> Dict[str, Any]:
+        return {field: builders[field]() for field in fields}
+
+    def get_or_build(
+        self,
+        kind: str,
+        org_id: UUID,
+        builders: FieldBuilders
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Read a dashboard snapshot, recomputing only missing or invalidated fields.
+
+        The write-back is guarded by WATCH so an invalidation racing with the
+        recompute wins and the field is rebuilt on the next read.
+
+        Returns:
+            (field values, snapshot metadata)
+        """
+        now = time.time()
+        redis_client = self.cache.redis_client
+        if not redis_client:
+            return self._build(builders, builders), self._metadata("live", now, now)
+
+        key = self._key(kind, org_id)
+        pipe = redis_client.pipeline()
+        try:
+            try:
+                pipe.watch(key)
+                raw = pipe.hgetall(key)
+            except Exception as e:
+                logger.error(f"Dashboard snapshot read error for {key}: {e}")
+                return self._build(builders, builders), self._metadata("live", now, now)
+
+            built_at = float(raw.get(BUILT_AT_FIELD) or 0)
+            expired = now - built_at > self.max_age
+            if expired:
+                stale = list(builders)
+                built_at = now
+            else:
+                stale = [field for field in builders if field not in raw]
+
+            values = {field: json.loads(raw[field]) for field in builders if field not in stale}
+            values.update(self._build(builders, stale))
+
+            if stale:
+                mapping = {field: json.dumps(values[field], default=str) for field in stale}
+                if expired:
+                    mapping[BUILT_AT_FIELD] = built_at
+                try:
+                    pipe.multi()
+                    if expired:
+                        pipe.delete(key)
+                    pipe.hset(key, mapping=mapping)
+                    pipe.expire(key, self.max_age * 2)
+                    pipe.execute()
+                except Exception as e:
+                    # Invalidated while recomputing (WatchError): keep the result, skip the write
+                    logger.debug(f"Dashboard snapshot write skipped for {key}: {e}")
+        finally:
+            pipe.reset()
+
+        source = "live" if expired else ("partial" if stale else "snapshot")
+        return values, self._metadata(source, built_at, now)
+
+    def rebuild(self, kind: str, org_id: UUID, builders: FieldBuilders) -> Dict[str, Any]:
+        """Recompute and store every field of a snapshot."""
+        values = self._build(builders, builders)
+        redis_client = self.cache.redis_client
+        if not redis_client:
+            return values
+
+        key = self._key(kind, org_id)
+        mapping = {field: json.dumps(value, default=str) for field, value in values.items()}
+        mapping[BUILT_AT_FIELD] = time.time()
+        try:
+            pipe = redis_client.pipeline()
+            pipe.delete(key)
+            pipe.hset(key, mapping=mapping)
+            pipe.expire(key, self.max_age * 2)
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Dashboard snapshot rebuild error for {key}: {e}")
+        return values
+
+    def invalidate(self, org_fields: Dict[Any, Set[str]]) -> None:
+        """Drop the given fields from every dashboard snapshot of each organization."""
+        redis_client = self.cache.redis_client
+        if not redis_client or not org_fields:
+            return
+
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for org_id, fields in org_fields.items():
+                if not fields:
+                    continue
+                for kind in DASHBOARD_KINDS:
+                    pipe.hdel(self._key(kind, org_id), *fields)
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Dashboard snapshot invalidation error: {e}")
+
+    def iter_snapshots(self) -> Iterator[Tuple[str, str]]:
+        """Yield (kind, organization_id) for every stored snapshot."""
+        redis_client = self.cache.redis_client
+        if not redis_client:
+            return
+
+        prefix = self.cache._get_key("dashboard", "")
+        for key in redis_client.scan_iter(match=f"{prefix}*", count=500):
+            kind, _, org_id = key[len(prefix):].partition(":")
+            if kind in DASHBOARD_KINDS and org_id:
+                yield kind, org_id
+
+
+# Global snapshot service used by the session hooks
+dashboard_snapshot_service = DashboardSnapshotService()
+
+
+def _collect_changes(session: Session) -> Dict[type, list]:
+    """Group new, modified and deleted tracked objects by model class."""
+    changes: Dict[type, list] = {}
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        model = type(obj)
+        if model in ENTITY_FIELDS:
+            changes.setdefault(model, []).append(obj)
+    return changes
+
+
+def _organization_ids(session: Session, model: type, objects: list) -> Set[Any]:
+    """Resolve the organizations whose dashboards an entity change affects."""
+    if model is Farm or model is OrgMember:
+        return {obj.organization_id for obj in objects}
+    if model in (WorkOrder, Query, Audit):
+        return {
+            org_id
+            for obj in objects
+            for org_id in (obj.farming_organization_id, obj.fsp_organization_id)
+        }
+
+    # Farm hierarchy: resolve organization through farm with one query per model
+    if model is Plot:
+        parent_ids = {obj.farm_id for obj in objects}
+        stmt = select(Farm.organization_id).where(Farm.id.in_(parent_ids))
+    elif model is Crop:
+        parent_ids = {obj.plot_id for obj in objects}
+        stmt = select(Farm.organization_id).join(Plot, Plot.farm_id == Farm.id).where(
+            Plot.id.in_(parent_ids)
+        )
+    elif model is Schedule:
+        parent_ids = {obj.crop_id for obj in objects}
+        stmt = select(Farm.organization_id).join(Plot, Plot.farm_id == Farm.id).join(
+            Crop, Crop.plot_id == Plot.id
+        ).where(Crop.id.in_(parent_ids))
+    else:
+        parent_ids = {obj.schedule_id for obj in objects}
+        stmt = select(Farm.organization_id).join(Plot, Plot.farm_id == Farm.id).join(
+            Crop, Crop.plot_id == Plot.id
+        ).join(Schedule, Schedule.crop_id == Crop.id).where(Schedule.id.in_(parent_ids))
+
+    parent_ids.discard(None)
+    if not parent_ids:
+        return set()
+    # Use the flush connection directly so no autoflush is triggered
+    return set(session.connection().execute(stmt.distinct()).scalars())
+
+
+def _record_flush(session: Session, flush_context: Any) -> None:
+    if not dashboard_snapshot_service.cache.redis_client:
+        return
+
+    changes = _collect_changes(session)
+    if not changes:
+        return
+
+    pending = session.info.setdefault(_PENDING_KEY, {})
+    for model, objects in changes.items():
+        try:
+            org_ids = _organization_ids(session, model, objects)
+        except Exception as e:
+            logger.warning(f"Dashboard snapshot change tracking failed for {model.__name__}: {e}")
+            continue
+        for org_id in org_ids:
+            if org_id:
+                pending.setdefault(org_id, set()).update(ENTITY_FIELDS[model])
+
+
+def _apply_commit(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        dashboard_snapshot_service.invalidate(pending)
+
+
+def _discard_pending(session: Session, previous_transaction: Any) -> None:
+    # Savepoint rollbacks keep changes recorded for the enclosing transaction
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
+
+
+def register_snapshot_invalidation() -> None:
+    """Invalidate dashboard snapshot fields whenever a session commits tracked entities."""
+    if event.contains(Session, "after_flush", _record_flush):
+        return
+    event.listen(Session, "after_flush", _record_flush)
+    event.listen(Session, "after_commit", _apply_commit)
+    event.listen(Session, "after_soft_rollback", _discard_pending)
@@ -4,12 +4,13 @@ Farm service for managing farms with GIS support and ownership validation.
 from typing import List, Tuple, Optional, Dict, Any
 from uuid import UUID
 from decimal import Decimal
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy import and_, func
 import json
 
 from app.core.logging import get_logger
 from app.core.exceptions import NotFoundError, ValidationError, PermissionError
+from app.core.pagination import paginate
 from app.models.farm import (
     Farm, FarmSupervisor, FarmWaterSource, FarmSoilType, FarmIrrigationMode
 )
@@ -70,7 +71,7 @@ class FarmService:
         # Calculate area if boundary provided and area not specified
         calculated_area = None
         if data.boundary and not data.area:
-            calculated_area = self.spatial_service.calculate_area(data.boundary.dict())
+            calculated_area = SpatialService.geodesic_area(data.boundary.dict())
         
         # Create farm
         farm = Farm(
@@ -145,22 +146,22 @@ class FarmService:
         org_id: UUID,
         is_active: Optional[bool] = None,
         page: int = 1,
-        limit: int = 20
-    ) -> Tuple[List[FarmResponse], int]:
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[FarmResponse], int, Optional[str]]:
         """
-        Get farms for an organization with pagination.
+        Get farms for an organization with keyset (or page number) pagination.
         
         Args:
             org_id: Organization ID
             is_active: Filter by active status (optional)
-            page: Page number (default: 1)
+            page: Page number (default: 1), when no cursor is given
             limit: Items per page (default: 20)
+            cursor: next_cursor of the previous page
             
         Returns:
-            Tuple of (list of farms, total count)
+            Tuple of (list of farms, total count, next page cursor or None)
         """
-        offset = (page - 1) * limit
-        
         # Build filters
         filters = [Farm.organization_id == org_id]
         if is_active is not None:
@@ -174,28 +175,30 @@ class FarmService:
             # So if is_active is None, we should probably show all.
             pass
 
-        # Query farms
+        # Query farms; reference data associations are loaded for the whole
+        # page at once (a fixed number of IN queries, not per farm)
         query = (
             self.db.query(Farm)
             .filter(and_(*filters))
-            .order_by(Farm.created_at.desc())
-        )
-
-        
-        # Get total count
-        total = query.count()
-        
-        # Get paginated results
-        farms = (
-            query
             .options(
-                joinedload(Farm.area_unit).joinedload(MeasurementUnit.translations)
+                joinedload(Farm.area_unit).joinedload(MeasurementUnit.translations),
+                selectinload(Farm.water_sources).selectinload(FarmWaterSource.water_source).selectinload(ReferenceData.translations),
+                selectinload(Farm.soil_types).selectinload(FarmSoilType.soil_type).selectinload(ReferenceData.translations),
+                selectinload(Farm.irrigation_modes).selectinload(FarmIrrigationMode.irrigation_mode).selectinload(ReferenceData.translations)
             )
-            .offset(offset)
-            .limit(limit)
-            .all()
         )
         
+        result = paginate(
+            query,
+            Farm.created_at,
+            Farm.id,
+            name="farms",
+            cursor=cursor,
+            page=page,
+            limit=limit
+        )
+        farms, total = result.items, result.total
+        
         logger.info(
             "Retrieved farms",
             extra={
@@ -207,7 +210,7 @@ class FarmService:
             }
         )
         
-        return [self._to_response(farm) for farm in farms], total
+        return [self._to_response(farm) for farm in farms], total, result.next_cursor
     
     def get_farm_by_id(
         self,
@@ -386,7 +389,7 @@ class FarmService:
             
             # Recalculate area if boundary changed and area not explicitly provided
             if data.area is None:
-                calculated_area = self.spatial_service.calculate_area(data.boundary.dict())
+                calculated_area = SpatialService.geodesic_area(data.boundary.dict())
                 farm.area = calculated_area
         
         # Update area if provided
@@ -874,22 +877,9 @@ class FarmService:
         Returns:
             Farm response schema
         """
-        # Convert PostGIS geography to GeoJSON
-        from sqlalchemy import func
-        
-        location_geojson = None
-        if farm.location:
-            # Use PostGIS ST_AsText to convert binary to WKT
-            wkt_location = self.db.scalar(func.ST_AsText(farm.location))
-            if wkt_location:
-                location_geojson = self._wkt_to_geojson_point(wkt_location)
-        
-        boundary_geojson = None
-        if farm.boundary:
-            # Use PostGIS ST_AsText to convert binary to WKT
-            wkt_boundary = self.db.scalar(func.ST_AsText(farm.boundary))
-            if wkt_boundary:
-                boundary_geojson = self._wkt_to_geojson_polygon(wkt_boundary)
+        # Convert PostGIS geography to GeoJSON (decoded from the loaded WKB, no query)
+        location_geojson = SpatialService.to_geojson(farm.location)
+        boundary_geojson = SpatialService.to_geojson(farm.boundary)
         
         # Ensure relationships are loaded with reference data
         from app.models.reference_data import ReferenceData
@@ -1071,56 +1061,3 @@ class FarmService:
             created_by=str(farm.created_by) if farm.created_by else None,
             updated_by=str(farm.updated_by) if farm.updated_by else None
         )
-    
-    def _wkt_to_geojson_point(self, wkt: str) -> Dict[str, Any]:
-        """
-        Convert WKT POINT to GeoJSON Point.
-        
-        Args:
-            wkt: WKT string (e.g., "POINT(lon lat)")
-            
-        Returns:
-            GeoJSON Point object
-        """
-        # Simple WKT parser for POINT
-        # Format: POINT(lon lat)
-        coords_str = wkt.replace("POINT(", "").replace(")", "")
-        lon, lat = map(float, coords_str.split())
-        
-        return {
-            "type": "Point",
-            "coordinates": [lon, lat]
-        }
-    
-    def _wkt_to_geojson_polygon(self, wkt: str) -> Dict[str, Any]:
-        """
-        Convert WKT POLYGON to GeoJSON Polygon.
-        
-        Args:
-            wkt: WKT string (e.g., "POLYGON((lon1 lat1, lon2 lat2, ...))")
-            
-        Returns:
-            GeoJSON Polygon object
-        """
-        # Simple WKT parser for POLYGON
-        # Format: POLYGON((lon1 lat1, lon2 lat2, ...))
-        # PostGIS may use either space or comma as separator
-        coords_str = wkt.replace("POLYGON((", "").replace("))", "")
-        points = coords_str.split(",")
-        
-        coordinates = []
-        for point in points:
-            # Handle both "lon lat" and "lat,lon" formats
-            point = point.strip()
-            if " " in point:
-                # Format: "lon lat"
-                lon, lat = map(float, point.split())
-            else:
-                # This shouldn't happen with proper WKT, but handle it
-                raise ValueError(f"Invalid WKT point format: {point}")
-            coordinates.append([lon, lat])
-        
-        return {
-            "type": "Polygon",
-            "coordinates": [coordinates]
-        }
@@ -96,6 +96,8 @@ class FinalizationService:
         audit.status = AuditStatus.FINALIZED
         audit.finalized_at = datetime.utcnow()
         audit.finalized_by = user_id
+        # Rendered report PDFs are stale
+        audit.report_version = Audit.report_version + 1
 
         self.db.commit()
         self.db.refresh(audit)
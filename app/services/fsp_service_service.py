@@ -4,19 +4,23 @@ Handles FSP service listing management and approval triggers.
 """
 from datetime import datetime
 from typing import List, Optional, Tuple
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import Float, and_, func, or_, text
 from uuid import UUID
 
+from app.models.farm import Farm
 from app.models.fsp_service import FSPServiceListing, MasterService
-from app.models.organization import Organization, OrgMemberRole
+from app.models.organization import Organization, OrgMember, OrgMemberRole
 from app.models.rbac import Role
-from app.models.enums import ServiceStatus, OrganizationStatus, OrganizationType
+from app.models.enums import MemberStatus, ServiceStatus, OrganizationStatus, OrganizationType
+from app.schemas.farm import GeoJSONPoint
 from app.schemas.fsp_service import (
     FSPServiceListingCreate,
     FSPServiceListingUpdate
 )
+from app.services.spatial_service import SpatialService
 from app.core.logging import get_logger
+from app.core.pagination import TOTAL_CACHED, invalidate_totals, paginate
 from app.core.exceptions import (
     NotFoundError,
     ValidationError,
@@ -25,6 +29,25 @@ from app.core.exceptions import (
 
 logger = get_logger(__name__)
 
+# Floor for coverage radii derived from farm locations (one farm gives 0 km)
+_MIN_DERIVED_RADIUS_KM = 10
+
+# Service area of a set of districts: centroid of their active farms and the
+# distance (km) to the farthest of them
+_DERIVED_SERVICE_AREA = text("""
+    WITH district_farms AS (
+        SELECT location FROM farms
+        WHERE is_active AND location IS NOT NULL AND lower(district) = ANY(:districts)
+    ),
+    area AS (
+        SELECT ST_Centroid(ST_Collect(location::geometry))::geography AS center
+        FROM district_farms
+    )
+    SELECT ST_AsText(area.center) AS center,
+           (SELECT MAX(ST_Distance(area.center, f.location)) FROM district_farms f) / 1000.0 AS radius_km
+    FROM area
+""")
+
 
 class FSPServiceService:
     """Service for FSP service listing management."""
@@ -72,8 +95,9 @@ class FSPServiceService:
         district: Optional[str] = None,
         pricing_model: Optional[str] = None,
         page: int = 1,
-        limit: int = 20
-    ) -> Tuple[List[FSPServiceListing], int]:
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[FSPServiceListing], int, Optional[str]]:
         """
         Get service listings from marketplace with filtering.
         Only returns listings from ACTIVE FSP organizations.
@@ -83,11 +107,12 @@ class FSPServiceService:
             service_type: Filter by master service ID
             district: Filter by service area district
             pricing_model: Filter by pricing model
-            page: Page number (1-indexed)
+            page: Page number (1-indexed), when no cursor is given
             limit: Items per page
+            cursor: next_cursor of the previous page
         
         Returns:
-            Tuple of (service listings, total count)
+            Tuple of (service listings, total count (cached briefly, dropped on listing writes), next page cursor or None)
         """
         self.logger.info(
             "Fetching marketplace service listings",
@@ -125,29 +150,185 @@ class FSPServiceService:
         if pricing_model:
             query = query.filter(FSPServiceListing.pricing_model == pricing_model)
         
-        # Get total count
-        total = query.count()
-        
-        # Apply pagination
-        offset = (page - 1) * limit
-        services = query.order_by(
-            FSPServiceListing.created_at.desc()
-        ).offset(offset).limit(limit).all()
-        
-        # Eagerly load the service relationship for response serialization
-        for service_listing in services:
-            _ = service_listing.service
+        result = paginate(
+            query.options(joinedload(FSPServiceListing.service)),
+            FSPServiceListing.created_at,
+            FSPServiceListing.id,
+            name="fsp_service_listings",
+            cursor=cursor,
+            page=page,
+            limit=limit,
+            total=TOTAL_CACHED
+        )
         
         self.logger.info(
             "Marketplace service listings fetched",
             extra={
-                "count": len(services),
-                "total": total,
+                "count": len(result.items),
+                "total": result.total,
                 "page": page
             }
         )
         
-        return services, total
+        return result.items, result.total, result.next_cursor
+    
+    def get_nearby_service_listings(
+        self,
+        user_id: UUID,
+        lat: Optional[float] = None,
+        lon: Optional[float] = None,
+        farm_id: Optional[UUID] = None,
+        radius_km: Optional[float] = None,
+        service_type: Optional[UUID] = None,
+        within_coverage: bool = True,
+        cursor: Optional[str] = None,
+        limit: int = 20
+    ) -> Tuple[List[FSPServiceListing], Optional[str]]:
+        """
+        Get marketplace service listings nearest to a farm or point.
+        
+        Listings are ranked by distance from their precomputed service_center
+        using KNN ordering on idx_fsp_listings_service_center, and paginated
+        with an opaque (distance, id) cursor instead of OFFSET. Only ACTIVE
+        listings of ACTIVE or IN_PROGRESS FSP organizations with a known
+        service area are returned.
+        
+        Args:
+            user_id: Current user ID (must be a member of the farm's organization)
+            lat: Origin latitude (with lon, when no farm_id)
+            lon: Origin longitude (with lat, when no farm_id)
+            farm_id: Use this farm's location as origin
+            radius_km: Only listings whose service center is within this distance
+            service_type: Filter by master service ID
+            within_coverage: Only listings whose coverage radius reaches the origin
+            cursor: next_cursor of the previous page
+            limit: Items per page
+        
+        Returns:
+            Tuple of (service listings with distance_km set, next page cursor or None)
+        
+        Raises:
+            NotFoundError: If farm not found
+            PermissionError: If user is not a member of the farm's organization
+            ValidationError: If origin or cursor is invalid
+        """
+        lat, lon = self._resolve_origin(user_id, lat, lon, farm_id)
+        
+        self.logger.info(
+            "Fetching nearby marketplace service listings",
+            extra={
+                "farm_id": str(farm_id) if farm_id else None,
+                "radius_km": radius_km,
+                "service_type": str(service_type) if service_type else None,
+                "within_coverage": within_coverage,
+                "limit": limit
+            }
+        )
+        
+        origin = func.ST_GeogFromText(f"SRID=4326;POINT({lon} {lat})")
+        # KNN operator: ORDER BY on it is served by the GiST index
+        distance = FSPServiceListing.service_center.op('<->', return_type=Float)(origin)
+        
+        query = self.db.query(FSPServiceListing, distance.label('distance_m')).join(
+            Organization,
+            FSPServiceListing.fsp_organization_id == Organization.id
+        ).options(
+            joinedload(FSPServiceListing.service)
+        ).filter(
+            FSPServiceListing.status == ServiceStatus.ACTIVE,
+            FSPServiceListing.service_center.isnot(None),
+            Organization.status.in_([OrganizationStatus.ACTIVE, OrganizationStatus.IN_PROGRESS]),
+            Organization.organization_type == OrganizationType.FSP
+        )
+        
+        if radius_km:
+            query = query.filter(func.ST_DWithin(FSPServiceListing.service_center, origin, radius_km * 1000))
+        
+        if within_coverage:
+            query = query.filter(or_(
+                FSPServiceListing.service_radius_km.is_(None),
+                func.ST_DWithin(FSPServiceListing.service_center, origin, FSPServiceListing.service_radius_km * 1000)
+            ))
+        
+        if service_type:
+            query = query.filter(FSPServiceListing.service_id == service_type)
+        
+        result = paginate(
+            query,
+            distance,
+            FSPServiceListing.id,
+            name="fsp_nearby_listings",
+            cursor=cursor,
+            limit=limit,
+            descending=False,
+            total=None,
+            key=lambda row: (row.distance_m, row[0].id)
+        )
+        
+        listings = []
+        for listing, distance_m in result.items:
+            listing.distance_km = round(distance_m / 1000, 3)
+            listings.append(listing)
+        
+        self.logger.info(
+            "Nearby marketplace service listings fetched",
+            extra={
+                "count": len(listings),
+                "has_more": result.has_more
+            }
+        )
+        
+        return listings, result.next_cursor
+    
+    def _resolve_origin(
+        self,
+        user_id: UUID,
+        lat: Optional[float],
+        lon: Optional[float],
+        farm_id: Optional[UUID]
+    ) -> Tuple[float, float]:
+        """Get the (lat, lon) search origin from a farm the user can access or from coordinates."""
+        if farm_id:
+            farm = self.db.query(Farm.organization_id, Farm.location).filter(
+                Farm.id == farm_id,
+                Farm.is_active == True
+            ).first()
+            if not farm:
+                raise NotFoundError(
+                    message=f"Farm {farm_id} not found",
+                    error_code="FARM_NOT_FOUND",
+                    details={"farm_id": str(farm_id)}
+                )
+            
+            is_member = self.db.query(OrgMember.id).filter(
+                OrgMember.user_id == user_id,
+                OrgMember.organization_id == farm.organization_id,
+                OrgMember.status == MemberStatus.ACTIVE
+            ).first()
+            if not is_member:
+                raise PermissionError(
+                    message="You don't have access to this farm",
+                    error_code="FARM_ACCESS_DENIED"
+                )
+            
+            location = SpatialService.to_geojson(farm.location)
+            if not location:
+                raise ValidationError(
+                    message="Farm has no location",
+                    error_code="FARM_LOCATION_MISSING",
+                    details={"farm_id": str(farm_id)}
+                )
+            lon, lat = location["coordinates"]
+            return lat, lon
+        
+        if lat is None or lon is None:
+            raise ValidationError(
+                message="Either farm_id or both lat and lon are required",
+                error_code="ORIGIN_REQUIRED"
+            )
+        
+        SpatialService(self.db).validate_coordinates(lat, lon)
+        return lat, lon
     
     def get_organization_services(
         self,
@@ -365,6 +546,12 @@ class FSPServiceService:
                 created_by=user_id,
                 updated_by=user_id
             )
+            self._apply_service_area(
+                service_listing,
+                data.service_center,
+                data.service_radius_km,
+                districts_changed=True
+            )
             
             self.db.add(service_listing)
             
@@ -375,6 +562,7 @@ class FSPServiceService:
                 org.updated_at = datetime.utcnow()
             
             self.db.commit()
+            invalidate_totals("fsp_service_listings")
             self.db.refresh(service_listing)
             
             # Eagerly load the service relationship for response serialization
@@ -452,11 +640,20 @@ class FSPServiceService:
             # Update fields
             update_data = data.dict(exclude_unset=True)
             for field, value in update_data.items():
+                if field in ('service_center', 'service_radius_km'):
+                    continue
                 if field == 'pricing_variants' and value:
                     # Convert Pydantic models to dicts for JSON serialization
                     value = [v.dict() if hasattr(v, 'dict') else v for v in value]
                 setattr(service_listing, field, value)
             
+            self._apply_service_area(
+                service_listing,
+                data.service_center,
+                data.service_radius_km,
+                districts_changed='service_area_districts' in update_data
+            )
+            
             service_listing.updated_by = user_id
             service_listing.updated_at = datetime.utcnow()
             
@@ -470,6 +667,7 @@ class FSPServiceService:
                 org.updated_at = datetime.utcnow()
             
             self.db.commit()
+            invalidate_totals("fsp_service_listings")
             self.db.refresh(service_listing)
             
             # Eagerly load the service relationship for response serialization
@@ -558,6 +756,7 @@ class FSPServiceService:
         try:
             self.db.delete(service_listing)
             self.db.commit()
+            invalidate_totals("fsp_service_listings")
             
             self.logger.info(
                 "Service listing deleted successfully",
@@ -629,6 +828,7 @@ class FSPServiceService:
             service_listing.updated_at = datetime.utcnow()
             
             self.db.commit()
+            invalidate_totals("fsp_service_listings")
             self.db.refresh(service_listing)
             
             self.logger.info(
@@ -654,6 +854,46 @@ class FSPServiceService:
             )
             raise
     
+    def _apply_service_area(
+        self,
+        service_listing: FSPServiceListing,
+        center: Optional[GeoJSONPoint],
+        radius_km: Optional[float],
+        districts_changed: bool
+    ) -> None:
+        """
+        Precompute the listing's service area used by nearby search.
+        
+        An explicit center (and optional radius) wins. Otherwise, when the
+        districts change, the area is derived from the active farms in those
+        districts: their centroid, with a radius reaching the farthest one.
+        """
+        if center is not None:
+            lon, lat = center.coordinates
+            service_listing.service_center = SpatialService(self.db).create_point(lat, lon)
+            service_listing.service_radius_km = radius_km
+            return
+        
+        if radius_km is not None:
+            service_listing.service_radius_km = radius_km
+        
+        if not districts_changed:
+            return
+        
+        districts = [d.lower() for d in service_listing.service_area_districts or []]
+        area = self.db.execute(
+            _DERIVED_SERVICE_AREA, {"districts": districts}
+        ).first() if districts else None
+        
+        if not area or not area.center:
+            service_listing.service_center = None
+            service_listing.service_radius_km = radius_km
+            return
+        
+        service_listing.service_center = area.center
+        if radius_km is None:
+            service_listing.service_radius_km = round(max(area.radius_km or 0, _MIN_DERIVED_RADIUS_KM), 2)
+    
     def _check_membership(self, org_id: UUID, user_id: UUID):
         """
         Check if user is a member of organization.
@@ -17,6 +17,7 @@ from app.schemas.input_item import (
     InputItemCategoryCreate, InputItemCategoryUpdate, InputItemCategoryResponse,
     InputItemCreate, InputItemUpdate, InputItemResponse
 )
+from app.services.schedule_hydration_service import translation_name_cache
 
 logger = get_logger(__name__)
 
@@ -612,6 +613,9 @@ class InputItemService:
         self.db.commit()
         self.db.refresh(item)
         
+        if data.translations:
+            translation_name_cache.invalidate("input_item", item_id)
+        
         logger.info(
             "Updated organization-specific input item",
             extra={
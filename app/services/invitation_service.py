@@ -20,6 +20,7 @@ from app.core.exceptions import (
     PermissionError
 )
 from app.services.auth_service import AuthService
+from app.services.rbac_service import RBACService
 
 logger = get_logger(__name__)
 
@@ -682,6 +683,7 @@ class InvitationService:
             invitation.invitee_user_id = joining_user_id
             
             self.db.commit()
+            RBACService(self.db).invalidate_permission_cache(joining_user_id, invitation.organization_id)
             
             return {
                 "success": True,
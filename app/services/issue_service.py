@@ -15,6 +15,7 @@ from app.models.audit import AuditIssue, Audit
 from app.models.enums import IssueSeverity, AuditStatus
 from app.core.exceptions import NotFoundError, ValidationError, PermissionError
 from app.core.logging import get_logger
+from app.services.report_service import invalidate_report
 
 logger = get_logger(__name__)
 
@@ -95,6 +96,7 @@ class IssueService:
         )
         
         self.db.add(issue)
+        invalidate_report(self.db, audit_id)
         self.db.commit()
         self.db.refresh(issue)
         
@@ -209,6 +211,7 @@ class IssueService:
         if severity is not None:
             issue.severity = severity
         
+        invalidate_report(self.db, issue.audit_id)
         self.db.commit()
         self.db.refresh(issue)
         
@@ -238,6 +241,7 @@ class IssueService:
         audit_id = issue.audit_id
         
         self.db.delete(issue)
+        invalidate_report(self.db, audit_id)
         self.db.commit()
         
         logger.info(
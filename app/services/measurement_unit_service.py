@@ -9,12 +9,17 @@ from sqlalchemy import and_
 
 from app.core.logging import get_logger
 from app.core.exceptions import NotFoundError, ValidationError
+from app.core.tiered_cache import cached
 from app.models.measurement_unit import MeasurementUnit, MeasurementUnitTranslation
 from app.models.enums import MeasurementUnitCategory
 from app.schemas.measurement_unit import MeasurementUnitResponse
 
 logger = get_logger(__name__)
 
+# Measurement units are system-defined (DML only)
+CACHE_NAMESPACE = "measurement_units"
+CACHE_TTL = 86400
+
 
 class MeasurementUnitService:
     """Service for measurement unit operations and conversions."""
@@ -22,6 +27,7 @@ class MeasurementUnitService:
     def __init__(self, db: Session):
         self.db = db
     
+    @cached(CACHE_NAMESPACE, ttl=CACHE_TTL)
     def get_units_by_category(
         self, 
         category: MeasurementUnitCategory, 
@@ -82,6 +88,7 @@ class MeasurementUnitService:
         
         return result
     
+    @cached(CACHE_NAMESPACE, ttl=CACHE_TTL)
     def get_unit_by_id(
         self, 
         unit_id: UUID, 
@@ -0,0 +1,144 @@
+"""
+Image processing pipeline for uploaded photos.
+
+Decoding, resizing and re-encoding photos with Pillow is CPU bound, so it
+runs in a process pool instead of the request thread. JPEGs are decoded in
+draft mode, letting libjpeg scale them down by 1/2, 1/4 or 1/8 while
+decoding, which skips most of the work for camera-sized photos before the
+final LANCZOS resize. Several photos of one request are processed in
+parallel; results go to storage through app.core.storage.
+"""
+import io
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from PIL import Image
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.process_pool import LazyProcessPool
+
+logger = get_logger(__name__)
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+@dataclass(frozen=True)
+class ImageSpec:
+    """How a photo is re-encoded."""
+    max_width: int
+    quality: int
+    optimize: bool = True
+    thumbnail_size: Optional[Tuple[int, int]] = None
+    thumbnail_quality: int = 85
+
+
+@dataclass(frozen=True)
+class ProcessedImage:
+    """A re-encoded photo and, when requested, its thumbnail."""
+    data: bytes
+    content_type: str = "image/jpeg"
+    thumbnail: Optional[bytes] = None
+
+
+def _to_rgb(image: Image.Image) -> Image.Image:
+    """Flatten transparency onto white and convert to a JPEG-compatible mode."""
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.split()[3])
+        return background
+    if image.mode not in ("RGB", "L"):
+        return image.convert("RGB")
+    return image
+
+
+def _encode(image: Image.Image, quality: int, optimize: bool) -> bytes:
+    output = io.BytesIO()
+    image.save(output, format="JPEG", quality=quality, optimize=optimize)
+    return output.getvalue()
+
+
+def process_image(data: bytes, spec: ImageSpec) -> ProcessedImage:
+    """
+    Resize a photo to at most spec.max_width and re-encode it as JPEG.
+
+    Runs in the image process pool; must stay a picklable module-level function.
+    """
+    image = Image.open(io.BytesIO(data))
+    if image.format == "JPEG" and image.width > spec.max_width:
+        # Decode at the smallest DCT scale that is still at least the target size
+        image.draft("RGB", (spec.max_width, max(1, image.height * spec.max_width // image.width)))
+    image = _to_rgb(image)
+
+    if image.width > spec.max_width:
+        height = max(1, round(image.height * spec.max_width / image.width))
+        image = image.resize((spec.max_width, height), Image.Resampling.LANCZOS)
+
+    thumbnail = None
+    if spec.thumbnail_size:
+        thumb = image.copy()
+        thumb.thumbnail(spec.thumbnail_size, Image.Resampling.LANCZOS)
+        thumbnail = _encode(thumb, spec.thumbnail_quality, optimize=False)
+
+    return ProcessedImage(data=_encode(image, spec.quality, spec.optimize), thumbnail=thumbnail)
+
+
+def make_thumbnail(data: bytes, size: Tuple[int, int], quality: int = 85) -> bytes:
+    """
+    Encode a JPEG thumbnail fitting in size.
+
+    Runs in the image process pool; must stay a picklable module-level function.
+    """
+    image = Image.open(io.BytesIO(data))
+    if image.format == "JPEG":
+        image.draft("RGB", size)
+    image = _to_rgb(image)
+    image.thumbnail(size, Image.Resampling.LANCZOS)
+    return _encode(image, quality, optimize=False)
+
+
+_image_pool = LazyProcessPool("Image", lambda: settings.IMAGE_PROCESS_WORKERS)
+
+
+def submit_image(fn, *args) -> Future:
+    """Run an image function in the pool, or inline when IMAGE_PROCESS_WORKERS is 0."""
+    if settings.IMAGE_PROCESS_WORKERS <= 0:
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    return _image_pool.submit(fn, *args)
+
+
+def _content_type(data: bytes) -> str:
+    return "image/png" if data.startswith(PNG_SIGNATURE) else "image/jpeg"
+
+
+def process_images(payloads: Sequence[bytes], spec: ImageSpec) -> List[ProcessedImage]:
+    """
+    Process several photos in parallel, in input order.
+
+    A photo that cannot be processed is kept as uploaded, as the services
+    did before, so one odd file does not fail a whole upload.
+    """
+    futures = [submit_image(process_image, data, spec) for data in payloads]
+    results = []
+    for data, future in zip(payloads, futures):
+        try:
+            results.append(future.result(timeout=settings.IMAGE_PROCESS_TIMEOUT))
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                _image_pool.reset()
+            logger.error(f"Image compression failed: {e}", exc_info=True)
+            results.append(ProcessedImage(data=data, content_type=_content_type(data)))
+    return results
+
+
+def compress_image(data: bytes, spec: ImageSpec) -> ProcessedImage:
+    """Process one photo in the pool (see process_images)."""
+    return process_images([data], spec)[0]
@@ -13,6 +13,8 @@ from app.models.user import User
 from app.models.enums import MemberStatus
 from app.schemas.member import UpdateMemberRolesRequest, MemberResponse
 from app.core.logging import get_logger
+from app.services.rbac_service import RBACService
+from app.services.chat_service import invalidate_chat_access
 from app.core.exceptions import (
     NotFoundError,
     ValidationError,
@@ -253,6 +255,8 @@ class MemberService:
                 self.db.add(member_role)
             
             self.db.commit()
+            RBACService(self.db).invalidate_permission_cache(target_user_id, org_id)
+            invalidate_chat_access(target_user_id)
             
             self.logger.info(
                 "Member roles updated successfully",
@@ -360,6 +364,7 @@ class MemberService:
             member.status = status
             
             self.db.commit()
+            invalidate_chat_access(target_user_id)
             
             self.logger.info(
                 "Member status updated successfully",
@@ -468,6 +473,8 @@ class MemberService:
             self.db.delete(member)
             
             self.db.commit()
+            RBACService(self.db).invalidate_permission_cache(target_user_id, org_id)
+            invalidate_chat_access(target_user_id)
             
             self.logger.info(
                 "Member removed successfully",
@@ -0,0 +1,252 @@
+"""
+Notification service for Uzhathunai v2.0.
+
+Each user's unread count lives in a Redis counter that is seeded from the
+database on first read and then adjusted by inserts and mark-read, so polling
+clients and the SSE stream never COUNT the notifications table. Counters
+expire after NOTIFICATION_UNREAD_TTL and are recounted, which bounds any
+drift. New notifications and unread count changes are published to the
+user's realtime topic.
+"""
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.models.enums import NotificationType
+from app.models.notification import Notification
+from app.schemas.notification import NotificationResponse
+from app.core.cache import cache_service
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.exceptions import NotFoundError
+from app.core.metrics import record_cache_lookup
+from app.core.pagination import Page, paginate
+from app.core.realtime import realtime_hub
+
+logger = get_logger(__name__)
+
+# Applies a delta only to a seeded counter; a counter driven below zero has
+# drifted and is dropped so the next read recounts
+_ADJUST_UNREAD_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return nil
+end
+local count = redis.call('INCRBY', KEYS[1], ARGV[1])
+if count < 0 then
+    redis.call('DEL', KEYS[1])
+    return nil
+end
+return count
+"""
+
+
+def notification_topic(user_id: UUID) -> str:
+    """Realtime topic carrying a user's new notifications and unread count."""
+    return f"notifications:{user_id}"
+
+
+def _unread_key(user_id: UUID) -> str:
+    return cache_service._get_key("notifications", "unread", str(user_id))
+
+
+class NotificationService:
+    """Service for user notifications."""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.logger = get_logger(__name__)
+
+    def notify(
+        self,
+        user_ids: Iterable[UUID],
+        title: str,
+        message: str,
+        notification_type: NotificationType = NotificationType.INFO,
+        type: Optional[str] = None,
+        organization_id: Optional[UUID] = None,
+        reference_type: Optional[str] = None,
+        reference_id: Optional[UUID] = None,
+        data: Optional[Dict[str, Any]] = None
+    ) -> List[Notification]:
+        """
+        Send the same notification to several users in one transaction.
+
+        Unread counters are incremented and the notifications pushed to the
+        recipients' streams after the commit.
+        """
+        notifications = [
+            Notification(
+                user_id=user_id,
+                organization_id=organization_id,
+                notification_type=notification_type,
+                type=type,
+                title=title,
+                message=message,
+                reference_type=reference_type,
+                reference_id=reference_id,
+                data=data,
+                is_read=False
+            )
+            for user_id in dict.fromkeys(user_ids)
+        ]
+        if not notifications:
+            return []
+
+        self.db.add_all(notifications)
+        self.db.flush()
+        # Serialized before the commit expires the attributes
+        payloads = [
+            NotificationResponse.model_validate(n).model_dump(mode="json") for n in notifications
+        ]
+        self.db.commit()
+
+        counts = self._adjust_unread([n.user_id for n in notifications], 1)
+        for notification, payload, count in zip(notifications, payloads, counts):
+            if count is None:
+                count = self.get_unread_count(notification.user_id)
+            realtime_hub.publish(notification_topic(notification.user_id), {
+                "type": "notification",
+                "data": payload,
+                "unread_count": count
+            })
+
+        self.logger.info(
+            "Notifications created",
+            extra={"type": type, "recipients": len(notifications)}
+        )
+        return notifications
+
+    def get_notifications(
+        self,
+        user_id: UUID,
+        unread_only: bool = False,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> Page:
+        """Get one page of a user's notifications, newest first."""
+        query = self.db.query(Notification).filter(Notification.user_id == user_id)
+
+        if unread_only:
+            query = query.filter(Notification.is_read == False)
+
+        return paginate(
+            query,
+            Notification.created_at,
+            Notification.id,
+            name="notifications",
+            cursor=cursor,
+            limit=limit,
+            total=None
+        )
+
+    def mark_as_read(self, notification_id: UUID, user_id: UUID) -> None:
+        """
+        Mark a notification as read.
+
+        Marking an already read notification again is a no-op.
+
+        Raises:
+            NotFoundError: If the user has no such notification
+        """
+        updated = self.db.query(Notification).filter(
+            Notification.id == notification_id,
+            Notification.user_id == user_id,
+            Notification.is_read == False
+        ).update({"is_read": True, "read_at": datetime.utcnow()}, synchronize_session=False)
+
+        if not updated:
+            exists = self.db.query(Notification.id).filter(
+                Notification.id == notification_id,
+                Notification.user_id == user_id
+            ).first()
+            if not exists:
+                raise NotFoundError(
+                    message="Notification not found",
+                    error_code="NOTIFICATION_NOT_FOUND",
+                    details={"notification_id": str(notification_id)}
+                )
+            return
+
+        self.db.commit()
+        self._publish_unread(user_id, self._adjust_unread([user_id], -updated)[0])
+
+    def mark_all_read(self, user_id: UUID) -> int:
+        """
+        Mark every unread notification of a user as read with one UPDATE.
+
+        Returns:
+            Number of notifications marked
+        """
+        updated = self.db.query(Notification).filter(
+            Notification.user_id == user_id,
+            Notification.is_read == False
+        ).update({"is_read": True, "read_at": datetime.utcnow()}, synchronize_session=False)
+
+        if updated:
+            self.db.commit()
+            # A delta rather than a reset keeps notifications inserted meanwhile counted
+            self._publish_unread(user_id, self._adjust_unread([user_id], -updated)[0])
+
+        self.logger.info(
+            "Marked all notifications as read",
+            extra={"user_id": str(user_id), "count": updated}
+        )
+        return updated
+
+    def get_unread_count(self, user_id: UUID) -> int:
+        """Get a user's unread count from Redis, counting and seeding it on a miss."""
+        redis_client = cache_service.redis_client
+        key = _unread_key(user_id)
+
+        if redis_client:
+            try:
+                value = redis_client.get(key)
+                record_cache_lookup("redis", "notifications_unread", value is not None)
+                if value is not None:
+                    return int(value)
+            except Exception as e:
+                logger.error(f"Unread counter get error: {e}")
+
+        count = self.db.query(Notification).filter(
+            Notification.user_id == user_id,
+            Notification.is_read == False
+        ).count()
+
+        if redis_client:
+            try:
+                # NX: never overwrite a counter another worker seeded and adjusted meanwhile
+                redis_client.set(key, count, nx=True, ex=settings.NOTIFICATION_UNREAD_TTL)
+            except Exception as e:
+                logger.error(f"Unread counter seed error: {e}")
+        return count
+
+    def _adjust_unread(self, user_ids: List[UUID], delta: int) -> List[Optional[int]]:
+        """
+        Apply a delta to the users' seeded unread counters.
+
+        Returns:
+            New count per user, None where no counter is seeded (or Redis is down)
+        """
+        redis_client = cache_service.redis_client
+        if not redis_client:
+            return [None] * len(user_ids)
+
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for user_id in user_ids:
+                pipe.eval(_ADJUST_UNREAD_SCRIPT, 1, _unread_key(user_id), delta)
+            return [None if count is None else int(count) for count in pipe.execute()]
+        except Exception as e:
+            logger.error(f"Unread counter adjust error: {e}")
+            # Drop the counters so they are recounted instead of drifting
+            for user_id in user_ids:
+                cache_service.delete(_unread_key(user_id))
+            return [None] * len(user_ids)
+
+    def _publish_unread(self, user_id: UUID, count: Optional[int]) -> None:
+        """Push a user's new unread count to their streams."""
+        if count is None:
+            count = self.get_unread_count(user_id)
+        realtime_hub.publish(notification_topic(user_id), {"type": "unread", "count": count})
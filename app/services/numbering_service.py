@@ -0,0 +1,132 @@
+"""
+Business number generation for Uzhathunai v2.0.
+
+Hands out human-readable numbers (WO-2026-0001, AUD-2026-0001,
+Q-20260315-0001) from per-series, per-year counters in
+business_number_counters (migration 022).
+
+Each number costs one UPDATE ... RETURNING in the caller's transaction,
+on the connection its session already holds, so allocation never checks
+out a second pooled connection. The counter row stays locked until the
+caller commits or rolls back: concurrent creators of the same series wait
+for each other instead of colliding, and a rolled-back number is handed
+out again.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class NumberSeries:
+    """A yearly business number series and the column its numbers are stored in."""
+    name: str
+    table: str
+    column: str
+    # str.format template, receives now (datetime) and n (counter value)
+    number_format: str
+    # Regex matching this year's numbers, capturing the counter value;
+    # formatted with year (used once per year to continue existing numbering)
+    existing_pattern: str
+
+
+WORK_ORDER = NumberSeries(
+    name="work_order",
+    table="work_orders",
+    column="work_order_number",
+    number_format="WO-{now:%Y}-{n:04d}",
+    existing_pattern="^WO-{year}-([0-9]+)$"
+)
+
+AUDIT = NumberSeries(
+    name="audit",
+    table="audits",
+    column="audit_number",
+    number_format="AUD-{now:%Y}-{n:04d}",
+    existing_pattern="^AUD-{year}-([0-9]+)$"
+)
+
+QUERY = NumberSeries(
+    name="query",
+    table="queries",
+    column="query_number",
+    number_format="Q-{now:%Y%m%d}-{n:04d}",
+    existing_pattern="^Q-{year}[0-9]{{4}}-([0-9]+)$"
+)
+
+SERIES: Dict[str, NumberSeries] = {s.name: s for s in (WORK_ORDER, AUDIT, QUERY)}
+
+_INCREMENT = text("""
+    UPDATE business_number_counters
+    SET last_value = last_value + 1, updated_at = now()
+    WHERE series = :series AND period = :period
+    RETURNING last_value
+""")
+
+# First number of a period; a concurrent first use falls through to the increment
+_START = text("""
+    INSERT INTO business_number_counters (series, period, last_value)
+    VALUES (:series, :period, :start)
+    ON CONFLICT (series, period)
+    DO UPDATE SET last_value = business_number_counters.last_value + 1, updated_at = now()
+    RETURNING last_value
+""")
+
+
+class NumberingService:
+    """Service for allocating unique business numbers."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def next_number(self, series: NumberSeries, now: Optional[datetime] = None) -> str:
+        """
+        Allocate the next number of a series.
+
+        Args:
+            series: Number series (WORK_ORDER, AUDIT or QUERY)
+            now: Timestamp the number is for (defaults to current UTC time)
+
+        Returns:
+            Formatted unique number
+        """
+        now = now or datetime.utcnow()
+        value = self._next_value(series, now.year)
+        number = series.number_format.format(now=now, n=value)
+
+        logger.info(
+            "Business number allocated",
+            extra={"series": series.name, "number": number}
+        )
+
+        return number
+
+    def _next_value(self, series: NumberSeries, year: int) -> int:
+        """Increment the series counter for a year in the caller's transaction."""
+        params = {"series": series.name, "period": year}
+        value = self.db.execute(_INCREMENT, params).scalar()
+        if value is None:
+            # First number of the year: continue after any numbers already issued
+            start = self._max_existing(series, year) + 1
+            value = self.db.execute(_START, {**params, "start": start}).scalar()
+        return value
+
+    def _max_existing(self, series: NumberSeries, year: int) -> int:
+        """Highest counter value already stored for the year (0 if none)."""
+        pattern = series.existing_pattern.format(year=year)
+        max_value = self.db.execute(
+            text(f"""
+                SELECT MAX(CAST(substring({series.column} FROM :pattern) AS BIGINT))
+                FROM {series.table}
+                WHERE {series.column} ~ :pattern
+            """),
+            {"pattern": pattern}
+        ).scalar()
+        return max_value or 0
@@ -28,6 +28,7 @@ from app.schemas.organization import (
     OrganizationResponse
 )
 from app.core.logging import get_logger
+from app.core.metrics import MetricsCollector
 from app.core.exceptions import (
     NotFoundError,
     ValidationError,
@@ -39,20 +40,6 @@ from app.services.auth_service import AuthService
 logger = get_logger(__name__)
 
 
-class MetricsCollector:
-    """Simple metrics collector for tracking operations."""
-    
-    @staticmethod
-    def increment(metric_name: str, tags: dict = None):
-        """Increment a metric counter."""
-        # In production, this would send to a metrics service
-        logger.info(
-            "metric_increment",
-            metric=metric_name,
-            tags=tags or {}
-        )
-
-
 class OrganizationService:
     """Service for organization management."""
     
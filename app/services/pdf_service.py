@@ -36,7 +36,7 @@ class PDFService:
     and proper section formatting.
     """
 
-    def __init__(self, report_service: ReportService):
+    def __init__(self, report_service: Optional[ReportService] = None):
         self.report_service = report_service
 
     def generate_pdf(
@@ -77,6 +77,31 @@ class PDFService:
         # Get report data
         report_data = self.report_service.generate_report(audit_id, language)
 
+        pdf_bytes = self.render(report_data)
+
+        logger.info(
+            "PDF report generated",
+            extra={
+                "audit_id": str(audit_id),
+                "language": language,
+                "pdf_size_bytes": len(pdf_bytes)
+            }
+        )
+
+        return pdf_bytes
+
+    def render(self, report_data: Dict[str, Any]) -> bytes:
+        """
+        Render report data (ReportService.generate_report output) to PDF.
+        
+        Needs no database access, so it can run in a worker process.
+        
+        Args:
+            report_data: Report dictionary
+            
+        Returns:
+            PDF file as bytes
+        """
         # Create PDF buffer
         buffer = BytesIO()
 
@@ -125,15 +150,6 @@ class PDFService:
         pdf_bytes = buffer.getvalue()
         buffer.close()
 
-        logger.info(
-            "PDF report generated",
-            extra={
-                "audit_id": str(audit_id),
-                "language": language,
-                "pdf_size_bytes": len(pdf_bytes)
-            }
-        )
-
         return pdf_bytes
 
     def _get_styles(self) -> Dict[str, ParagraphStyle]:
@@ -446,3 +462,7 @@ class PDFService:
         
         return elements
 
+
+def render_report_pdf(report_data: Dict[str, Any]) -> bytes:
+    """Render report data to PDF bytes; entry point for the render process pool."""
+    return PDFService().render(report_data)
@@ -3,17 +3,14 @@ Photo service for Farm Audit Management System.
 
 Handles photo upload, validation, compression, and S3 storage for audit responses.
 Validates photo count against parameter metadata (min_photos, max_photos).
+Compression runs in the media pipeline's process pool (app.services.media_pipeline).
 """
-from typing import Optional, List, BinaryIO
-from uuid import UUID
+from typing import Optional, List, BinaryIO, Tuple
+from uuid import UUID, uuid4
 from datetime import datetime
 from sqlalchemy.orm import Session
 from PIL import Image
-import io
-import io
 import os
-import boto3
-from botocore.exceptions import ClientError
 
 from app.core.config import settings
 
@@ -21,6 +18,9 @@ from app.models.audit import AuditResponse, AuditResponsePhoto, AuditParameterIn
 from app.models.enums import PhotoSourceType
 from app.core.exceptions import ValidationError, NotFoundError, ServiceError
 from app.core.logging import get_logger
+from app.core.storage import MediaStorage, media_storage
+from app.services.report_service import invalidate_report
+from app.services.media_pipeline import ImageSpec, compress_image, make_thumbnail, process_images, submit_image
 
 logger = get_logger(__name__)
 
@@ -28,13 +28,15 @@ logger = get_logger(__name__)
 class PhotoService:
     """Service for managing audit response photos."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, storage: Optional[MediaStorage] = None):
         self.db = db
+        self.storage = storage or media_storage
         self.max_file_size = 10 * 1024 * 1024  # 10MB
         self.allowed_formats = ['JPEG', 'PNG', 'JPG']
         self.thumbnail_size = (300, 300)
         self.compressed_max_width = 1024
         self.compression_quality = 70
+        self.image_spec = ImageSpec(max_width=self.compressed_max_width, quality=self.compression_quality)
     
     def upload_photo(
         self,
@@ -64,6 +66,57 @@ class PhotoService:
             ValidationError: If validation fails
             ServiceError: If upload fails
         """
+        return self.upload_photos(
+            audit_id=audit_id,
+            response_id=response_id,
+            files=[(file_data, filename)],
+            captions=[caption],
+            user_id=user_id
+        )[0]
+    
+    def upload_photos(
+        self,
+        audit_id: UUID,
+        response_id: UUID,
+        files: List[Tuple[BinaryIO, str]],
+        captions: Optional[List[Optional[str]]],
+        user_id: UUID
+    ) -> List[AuditResponsePhoto]:
+        """
+        Upload several photos for an audit response in one go.
+        
+        All files are validated before any is stored, compressed in parallel
+        and committed together, so either every photo is added or none.
+        
+        Args:
+            audit_id: Audit ID
+            response_id: Audit response ID
+            files: (file data, original filename) pairs
+            captions: Optional captions, one per file
+            user_id: User uploading the photos
+            
+        Returns:
+            Created AuditResponsePhotos, in input order
+            
+        Raises:
+            NotFoundError: If response not found
+            ValidationError: If validation fails
+            ServiceError: If upload fails
+        """
+        if not files:
+            raise ValidationError(
+                message="At least one photo is required",
+                error_code="NO_PHOTOS"
+            )
+        captions = list(captions or [])
+        if len(captions) > len(files):
+            raise ValidationError(
+                message="More captions than photos",
+                error_code="TOO_MANY_CAPTIONS",
+                details={"photos": len(files), "captions": len(captions)}
+            )
+        captions += [None] * (len(files) - len(captions))
+
         # Get response and validate
         response = self.db.query(AuditResponse).filter(
             AuditResponse.id == response_id,
@@ -77,46 +130,55 @@ class PhotoService:
             )
         
         # Validate photo count against parameter metadata
-        self._validate_photo_count(response)
-        
-        # Validate file
-        self._validate_file(file_data, filename)
-        
-        # Compress image
-        compressed_data = self._compress_image(file_data)
+        self._validate_photo_count(response, adding=len(files))
         
-        # Generate file key
-        file_key = self._generate_file_key(audit_id, response_id, filename)
+        # Validate files
+        for file_data, filename in files:
+            self._validate_file(file_data, filename)
         
-        # Upload to S3 (or local storage for now)
-        file_url = self._upload_to_storage(compressed_data, file_key)
+        # Compress images in the media pipeline
+        processed = process_images([file_data.read() for file_data, _ in files], self.image_spec)
         
-        # Create photo record
-        photo = AuditResponsePhoto(
-            audit_id=audit_id,
-            audit_response_id=response_id,
-            file_url=file_url,
-            file_key=file_key,
-            caption=caption,
-            uploaded_by=user_id
-        )
-
-        
-        self.db.add(photo)
-        self.db.commit()
-        self.db.refresh(photo)
+        stored_keys = []
+        try:
+            photos = []
+            for (_, filename), image, caption in zip(files, processed, captions):
+                file_key = self._generate_file_key(audit_id, response_id, filename)
+                file_url = self.storage.put(file_key, image.data, image.content_type)
+                stored_keys.append(file_key)
+                photos.append(AuditResponsePhoto(
+                    audit_id=audit_id,
+                    audit_response_id=response_id,
+                    file_url=file_url,
+                    file_key=file_key,
+                    caption=caption,
+                    uploaded_by=user_id
+                ))
+            
+            self.db.add_all(photos)
+            invalidate_report(self.db, audit_id)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            # Do not leave orphaned files behind
+            for file_key in stored_keys:
+                self.storage.delete(file_key)
+            raise
+        
+        for photo in photos:
+            self.db.refresh(photo)
         
         logger.info(
-            "Photo uploaded",
+            "Photos uploaded",
             extra={
-                "photo_id": str(photo.id),
+                "photo_ids": [str(photo.id) for photo in photos],
                 "response_id": str(response_id),
                 "audit_id": str(audit_id),
                 "user_id": str(user_id)
             }
         )
         
-        return photo
+        return photos
     
     def upload_evidence(
         self,
@@ -154,12 +216,8 @@ class PhotoService:
         # Compress image
         compressed_data = self._compress_image(file_data)
         
-        # Generate file key (use 'evidence' prefix or just handle missing response_id in path)
-        # We'll use a specific path for unlinked evidence or just None for response_id part
-        timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
-        ext = os.path.splitext(filename)[1] or '.jpg'
-        # Path: audits/{audit_id}/evidence/{timestamp}{ext}
-        file_key = f"audits/{audit_id}/evidence/{timestamp}{ext}"
+        # Path: audits/{audit_id}/evidence/{timestamp}_{suffix}{ext}
+        file_key = f"audits/{audit_id}/evidence/{self._unique_name(filename)}"
         
         # Upload to storage
         file_url = self._upload_to_storage(compressed_data, file_key)
@@ -175,6 +233,7 @@ class PhotoService:
         )
         
         self.db.add(photo)
+        invalidate_report(self.db, audit_id)
         self.db.commit()
         self.db.refresh(photo)
         
@@ -270,6 +329,7 @@ class PhotoService:
         
         # Delete from database
         self.db.delete(photo)
+        invalidate_report(self.db, audit_id)
         self.db.commit()
         
         logger.info(
@@ -282,12 +342,13 @@ class PhotoService:
             }
         )
     
-    def _validate_photo_count(self, response: AuditResponse) -> None:
+    def _validate_photo_count(self, response: AuditResponse, adding: int = 1) -> None:
         """
         Validate photo count against parameter metadata.
         
         Args:
             response: Audit response
+            adding: Number of photos about to be added
             
         Raises:
             ValidationError: If max photos exceeded
@@ -311,11 +372,11 @@ class PhotoService:
             AuditResponsePhoto.audit_response_id == response.id
         ).count()
         
-        if current_count >= max_photos:
+        if current_count + adding > max_photos:
             raise ValidationError(
                 message=f"Maximum {max_photos} photos allowed for this parameter",
                 error_code="MAX_PHOTOS_EXCEEDED",
-                details={"max_photos": max_photos, "current_count": current_count}
+                details={"max_photos": max_photos, "current_count": current_count, "adding": adding}
             )
     
     def _validate_file(self, file_data: BinaryIO, filename: str) -> None:
@@ -360,40 +421,23 @@ class PhotoService:
     
     def _compress_image(self, file_data: BinaryIO) -> bytes:
         """
-        Compress image to reduce file size.
+        Compress image to reduce file size (in the media pipeline's process pool).
         
         Args:
             file_data: Original file data
             
         Returns:
-            Compressed image bytes
+            Compressed image bytes, or the original bytes if compression fails
         """
-        try:
-            image = Image.open(file_data)
-            
-            # Convert RGBA to RGB if necessary
-            if image.mode == 'RGBA':
-                background = Image.new('RGB', image.size, (255, 255, 255))
-                background.paste(image, mask=image.split()[3])
-                image = background
-            
-            # Resize if too large
-            if image.width > self.compressed_max_width:
-                ratio = self.compressed_max_width / image.width
-                new_height = int(image.height * ratio)
-                image = image.resize((self.compressed_max_width, new_height), Image.Resampling.LANCZOS)
-            
-            # Compress
-            output = io.BytesIO()
-            image.save(output, format='JPEG', quality=self.compression_quality, optimize=True)
-            output.seek(0)
-            
-            return output.read()
-        except Exception as e:
-            logger.error(f"Image compression failed: {e}", exc_info=True)
-            # Return original if compression fails
-            file_data.seek(0)
-            return file_data.read()
+        file_data.seek(0)
+        return compress_image(file_data.read(), self.image_spec).data
+    
+    @staticmethod
+    def _unique_name(filename: str) -> str:
+        """Timestamped storage file name; the suffix keeps same-second uploads apart."""
+        timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
+        ext = os.path.splitext(filename)[1] or '.jpg'
+        return f"{timestamp}_{uuid4().hex[:8]}{ext}"
     
     def _generate_file_key(self, audit_id: UUID, response_id: UUID, filename: str) -> str:
         """
@@ -407,9 +451,7 @@ class PhotoService:
         Returns:
             File key
         """
-        timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
-        ext = os.path.splitext(filename)[1] or '.jpg'
-        return f"audits/{audit_id}/responses/{response_id}/{timestamp}{ext}"
+        return f"audits/{audit_id}/responses/{response_id}/{self._unique_name(filename)}"
     
     def _upload_to_storage(self, file_data: bytes, file_key: str) -> str:
         """
@@ -422,50 +464,7 @@ class PhotoService:
         Returns:
             File URL
         """
-        if settings.AWS_ACCESS_KEY_ID and settings.AWS_SECRET_ACCESS_KEY:
-            try:
-                s3_client = boto3.client(
-                    's3',
-                    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                    region_name=settings.AWS_REGION_NAME
-                )
-                
-                s3_client.put_object(
-                    Bucket=settings.AWS_S3_BUCKET,
-                    Key=file_key,
-                    Body=file_data,
-                    ContentType='image/jpeg'
-                )
-                
-                # construct URL
-                url = f"https://{settings.AWS_S3_BUCKET}.s3.{settings.AWS_REGION_NAME}.amazonaws.com/{file_key}"
-                return url
-            except ClientError as e:
-                logger.error(f"S3 upload failed: {e}", exc_info=True)
-                # Fallback to local? Or raise error?
-                # For now let's raise error as S3 is configured but failed
-                raise ServiceError(
-                    message="Failed to upload photo to storage",
-                    error_code="STORAGE_UPLOAD_FAILED",
-                    details={"error": str(e)}
-                )
-        else:
-            # Local storage
-            upload_dir = settings.UPLOAD_DIR
-            os.makedirs(upload_dir, exist_ok=True)
-            
-            # Create subdirectories
-            file_path = os.path.join(upload_dir, file_key)
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            
-            # Write file
-            with open(file_path, 'wb') as f:
-                f.write(file_data)
-            
-            # Return URL (relative for local)
-            # Assuming there is a static file server serving /uploads
-            return f"/uploads/{file_key}"
+        return self.storage.put(file_key, file_data, 'image/jpeg')
     
     def _delete_from_storage(self, file_key: Optional[str]) -> None:
         """
@@ -474,36 +473,11 @@ class PhotoService:
         Args:
             file_key: Storage key
         """
-        if not file_key:
-            return
-        
-        if settings.AWS_ACCESS_KEY_ID and settings.AWS_SECRET_ACCESS_KEY:
-            try:
-                s3_client = boto3.client(
-                    's3',
-                    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                    region_name=settings.AWS_REGION_NAME
-                )
-                
-                s3_client.delete_object(
-                    Bucket=settings.AWS_S3_BUCKET,
-                    Key=file_key
-                )
-            except ClientError as e:
-                logger.error(f"Failed to delete file {file_key} from S3: {e}", exc_info=True)
-        else:
-            try:
-                upload_dir = settings.UPLOAD_DIR
-                file_path = os.path.join(upload_dir, file_key)
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-            except Exception as e:
-                logger.error(f"Failed to delete file {file_key}: {e}", exc_info=True)
+        self.storage.delete(file_key)
     
     def generate_thumbnail(self, file_data: BinaryIO) -> bytes:
         """
-        Generate thumbnail for image.
+        Generate thumbnail for image (in the media pipeline's process pool).
         
         Args:
             file_data: Original file data
@@ -512,14 +486,10 @@ class PhotoService:
             Thumbnail bytes
         """
         try:
-            image = Image.open(file_data)
-            image.thumbnail(self.thumbnail_size, Image.Resampling.LANCZOS)
-            
-            output = io.BytesIO()
-            image.save(output, format='JPEG', quality=85)
-            output.seek(0)
-            
-            return output.read()
+            file_data.seek(0)
+            return submit_image(make_thumbnail, file_data.read(), self.thumbnail_size).result(
+                timeout=settings.IMAGE_PROCESS_TIMEOUT
+            )
         except Exception as e:
             logger.error(f"Thumbnail generation failed: {e}", exc_info=True)
             raise ServiceError(
@@ -558,6 +528,7 @@ class PhotoService:
             )
             
         photo.is_flagged_for_report = is_flagged
+        invalidate_report(self.db, audit_id)
         self.db.commit()
         self.db.refresh(photo)
         
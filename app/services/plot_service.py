@@ -73,17 +73,8 @@ class PlotService:
         # Validate boundary if provided
         boundary_wkt = None
         if data.boundary:
-            self.spatial_service.validate_boundary(data.boundary.dict())
-            
-            # Validate plot is within farm boundary if farm has boundary
-            if farm.boundary:
-                # Use PostGIS to get GeoJSON directly instead of parsing WKT
-                farm_boundary_geojson = self._get_boundary_as_geojson(farm.id)
-                if farm_boundary_geojson:
-                    self.spatial_service.validate_plot_within_farm(
-                        data.boundary.dict(),
-                        farm_boundary_geojson
-                    )
+            # Containment and area in a single PostGIS round trip
+            evaluation = self._evaluate_boundary(data.boundary.dict(), farm)
             
             # Convert GeoJSON to WKT for PostGIS
             boundary_coords = data.boundary.coordinates[0]
@@ -92,7 +83,7 @@ class PlotService:
         # Calculate area if boundary provided and area not specified
         calculated_area = None
         if data.boundary and not data.area:
-            calculated_area = self.spatial_service.calculate_area(data.boundary.dict())
+            calculated_area = evaluation["area_sq_meters"]
         
         # Create plot
         plot = Plot(
@@ -313,25 +304,15 @@ class PlotService:
         
         # Update boundary if provided
         if data.boundary:
-            self.spatial_service.validate_boundary(data.boundary.dict())
-            
-            # Validate plot is within farm boundary if farm has boundary
-            if farm.boundary:
-                # Use PostGIS to get GeoJSON directly instead of parsing WKT
-                farm_boundary_geojson = self._get_boundary_as_geojson(farm.id)
-                if farm_boundary_geojson:
-                    self.spatial_service.validate_plot_within_farm(
-                        data.boundary.dict(),
-                        farm_boundary_geojson
-                    )
+            # Containment and area in a single PostGIS round trip
+            evaluation = self._evaluate_boundary(data.boundary.dict(), farm)
             
             boundary_coords = data.boundary.coordinates[0]
             plot.boundary = self.spatial_service.create_polygon(boundary_coords)
             
             # Recalculate area if boundary changed and area not explicitly provided
             if data.area is None:
-                calculated_area = self.spatial_service.calculate_area(data.boundary.dict())
-                plot.area = calculated_area
+                plot.area = evaluation["area_sq_meters"]
         
         # Update area if provided
         if data.area is not None:
@@ -676,27 +657,35 @@ class PlotService:
             updated_by=str(plot.updated_by) if plot.updated_by else None
         )
     
-    def _get_boundary_as_geojson(self, farm_id: UUID) -> Optional[Dict[str, Any]]:
+    def _evaluate_boundary(self, boundary: Dict[str, Any], farm: Farm) -> Dict[str, Any]:
         """
-        Get farm boundary as GeoJSON using PostGIS ST_AsGeoJSON.
+        Validate a plot boundary and check it lies within the farm boundary.
         
         Args:
-            farm_id: Farm ID
+            boundary: GeoJSON polygon for the plot
+            farm: Farm the plot belongs to
             
         Returns:
-            GeoJSON Polygon object or None
+            SpatialService.evaluate_plots result for the plot
+            
+        Raises:
+            ValidationError: If boundary is invalid or outside the farm boundary
         """
-        from sqlalchemy import text
+        farm_boundary = SpatialService.to_geojson(farm.boundary)
+        result = self.spatial_service.evaluate_plots([boundary], farm_boundary)["plots"][0]
         
-        result = self.db.execute(
-            text("SELECT ST_AsGeoJSON(boundary) FROM farms WHERE id = :farm_id"),
-            {"farm_id": str(farm_id)}
-        ).fetchone()
+        if farm_boundary and not result["within_farm"]:
+            raise ValidationError(
+                message="Plot boundary must be within farm boundary",
+                error_code="PLOT_OUTSIDE_FARM",
+                details={
+                    "plot_points": len(boundary["coordinates"][0]),
+                    "farm_points": len(farm_boundary["coordinates"][0])
+                }
+            )
         
-        if result and result[0]:
-            return json.loads(result[0])
-        return None
-    
+        return result
+
     def _get_plot_boundary_as_geojson(self, plot_id: UUID) -> Optional[Dict[str, Any]]:
         """
         Get plot boundary as GeoJSON using PostGIS ST_AsGeoJSON.
@@ -14,13 +14,11 @@ from app.models.enums import QueryStatus
 from app.services.schedule_change_log_service import ScheduleChangeLogService
 from app.core.exceptions import NotFoundError, ValidationError, PermissionError, ServiceError
 from app.core.logging import get_logger
-from app.core.config import settings
+from app.core.storage import MediaStorage, media_storage
+from app.services.media_pipeline import ImageSpec, compress_image
 import os
-import io
-import boto3
 from PIL import Image
 from typing import BinaryIO
-from botocore.exceptions import ClientError
 
 logger = get_logger(__name__)
 
@@ -28,14 +26,16 @@ logger = get_logger(__name__)
 class QueryResponseService:
     """Service for managing query responses."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, storage: Optional[MediaStorage] = None):
         self.db = db
+        self.storage = storage or media_storage
         self.change_log_service = ScheduleChangeLogService(db)
         self.max_file_size = 10 * 1024 * 1024  # 10MB
         self.allowed_formats = ['JPEG', 'PNG', 'JPG']
         self.thumbnail_size = (300, 300)
         self.compressed_max_width = 1024
         self.compression_quality = 70
+        self.image_spec = ImageSpec(max_width=self.compressed_max_width, quality=self.compression_quality)
     
     def create_response(
         self,
@@ -198,59 +198,13 @@ class QueryResponseService:
             )
 
     def _compress_image(self, file_data: BinaryIO) -> bytes:
-        """Compress image."""
-        try:
-            image = Image.open(file_data)
-            if image.mode == 'RGBA':
-                background = Image.new('RGB', image.size, (255, 255, 255))
-                background.paste(image, mask=image.split()[3])
-                image = background
-            
-            if image.width > self.compressed_max_width:
-                ratio = self.compressed_max_width / image.width
-                new_height = int(image.height * ratio)
-                image = image.resize((self.compressed_max_width, new_height), Image.Resampling.LANCZOS)
-            
-            output = io.BytesIO()
-            image.save(output, format='JPEG', quality=self.compression_quality, optimize=True)
-            output.seek(0)
-            return output.read()
-        except Exception:
-            file_data.seek(0)
-            return file_data.read()
+        """Compress image (in the media pipeline's process pool)."""
+        file_data.seek(0)
+        return compress_image(file_data.read(), self.image_spec).data
 
     def _upload_to_storage(self, file_data: bytes, file_key: str) -> str:
         """Upload to S3 or local."""
-        if settings.AWS_ACCESS_KEY_ID and settings.AWS_SECRET_ACCESS_KEY:
-            try:
-                s3_client = boto3.client(
-                    's3',
-                    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                    region_name=settings.AWS_REGION_NAME
-                )
-                s3_client.put_object(
-                    Bucket=settings.AWS_S3_BUCKET,
-                    Key=file_key,
-                    Body=file_data,
-                    ContentType='image/jpeg'
-                )
-                return f"https://{settings.AWS_S3_BUCKET}.s3.{settings.AWS_REGION_NAME}.amazonaws.com/{file_key}"
-            except ClientError as e:
-                raise ServiceError(
-                    message="Failed to upload photo to storage",
-                    error_code="STORAGE_UPLOAD_FAILED",
-                    details={"error": str(e)}
-                )
-        else:
-            # Local storage fallback
-            upload_dir = getattr(settings, 'UPLOAD_DIR', 'uploads')
-            os.makedirs(upload_dir, exist_ok=True)
-            file_path = os.path.join(upload_dir, file_key)
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            with open(file_path, 'wb') as f:
-                f.write(file_data)
-            return f"/uploads/{file_key}"
+        return self.storage.put(file_key, file_data, 'image/jpeg')
     
     def attach_photo_to_response(
         self,
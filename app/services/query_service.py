@@ -15,6 +15,7 @@ from app.models.work_order import WorkOrder
 from app.models.enums import QueryStatus, WorkOrderStatus
 from app.core.exceptions import NotFoundError, ValidationError, PermissionError
 from app.core.logging import get_logger
+from app.services.numbering_service import QUERY, NumberingService
 
 logger = get_logger(__name__)
 
@@ -264,17 +265,5 @@ class QueryService:
         return query
     
     def _generate_query_number(self) -> str:
-        """Generate unique query number."""
-        # Get count of existing queries
-        count = self.db.query(Query).count()
-        
-        # Generate number with format Q-YYYYMMDD-XXXX
-        date_str = datetime.utcnow().strftime("%Y%m%d")
-        number = f"Q-{date_str}-{count + 1:04d}"
-        
-        # Ensure uniqueness
-        while self.db.query(Query).filter(Query.query_number == number).first():
-            count += 1
-            number = f"Q-{date_str}-{count + 1:04d}"
-        
-        return number
+        """Generate unique query number (Q-YYYYMMDD-XXXX, XXXX counting up within the year)."""
+        return NumberingService(self.db).next_number(QUERY)
@@ -1,8 +1,15 @@
 """
 RBAC service for Uzhathunai v2.0.
 Handles permission checking with multiple roles support and caching.
+
+Permission checks are answered from a compiled per-organization matrix
+(member roles plus each role's effective permissions, i.e. base permissions
+merged with org overrides) held in process memory. Role and override edits
+bump a version counter in Redis instead of deleting keys; each process
+re-checks the counter at most every RBAC_MATRIX_VERSION_CHECK_SECONDS.
 """
-from typing import List, Dict, Optional
+import threading
+from typing import Callable, FrozenSet, List, Dict, Optional, Set, Tuple
 from sqlalchemy.orm import Session
 from uuid import UUID
 import time
@@ -11,10 +18,166 @@ from app.models.organization import OrgMemberRole
 from app.models.rbac import Role, Permission, RolePermission, OrgRolePermissionOverride
 from app.models.enums import PermissionEffect
 from app.core.logging import rbac_logger
-from app.core.cache import cache_service
+from app.core.cache import LocalLRUCache, cache_service
+from app.core.config import settings
 
 logger = rbac_logger
 
+# (resource, action)
+PermissionKey = Tuple[str, str]
+# (global version, organization version)
+MatrixVersion = Tuple[int, int]
+
+
+class OrgPermissionMatrix:
+    """
+    Compiled permissions of one organization.
+
+    Each role maps to frozensets of allowed and denied (resource, action)
+    pairs, with org overrides already applied over base role permissions.
+    A user's effective set is the union of allows minus the union of denies
+    (DENY precedence), memoized per user.
+    """
+
+    def __init__(
+        self,
+        version: MatrixVersion,
+        member_roles: Dict[UUID, FrozenSet[UUID]],
+        role_codes: Dict[UUID, str],
+        role_allows: Dict[UUID, FrozenSet[PermissionKey]],
+        role_denies: Dict[UUID, FrozenSet[PermissionKey]]
+    ):
+        self.version = version
+        self.member_roles = member_roles
+        self.role_codes = role_codes
+        self.role_allows = role_allows
+        self.role_denies = role_denies
+        self.checked_at = time.monotonic()
+        self._effective: Dict[UUID, FrozenSet[PermissionKey]] = {}
+
+    def roles_for(self, user_id: UUID) -> FrozenSet[UUID]:
+        return self.member_roles.get(user_id, frozenset())
+
+    def effective_permissions(self, user_id: UUID) -> FrozenSet[PermissionKey]:
+        """Allowed (resource, action) pairs of a user across all their roles."""
+        effective = self._effective.get(user_id)
+        if effective is None:
+            allows: Set[PermissionKey] = set()
+            denies: Set[PermissionKey] = set()
+            for role_id in self.roles_for(user_id):
+                allows |= self.role_allows.get(role_id, frozenset())
+                denies |= self.role_denies.get(role_id, frozenset())
+            effective = frozenset(allows - denies)
+            self._effective[user_id] = effective
+        return effective
+
+    def is_allowed(self, user_id: UUID, resource: str, action: str) -> bool:
+        return (resource, action) in self.effective_permissions(user_id)
+
+
+class PermissionMatrixCache:
+    """
+    Process-local cache of compiled organization permission matrices.
+
+    Versions live in Redis (one global counter for base role permissions and
+    one per organization) so every worker observes edits; without Redis the
+    counters are kept in process. Matrices also expire after
+    RBAC_MATRIX_CACHE_TTL, which bounds staleness after a write path that
+    misses the version bump.
+    """
+
+    GLOBAL_SCOPE = "global"
+
+    def __init__(
+        self,
+        maxsize: int = 2048,
+        version_check_interval: Optional[float] = None,
+        ttl: Optional[int] = None
+    ):
+        self._matrices = LocalLRUCache(
+            maxsize=maxsize,
+            ttl=ttl if ttl is not None else settings.RBAC_MATRIX_CACHE_TTL
+        )
+        self._local_versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.version_check_interval = (
+            version_check_interval if version_check_interval is not None
+            else settings.RBAC_MATRIX_VERSION_CHECK_SECONDS
+        )
+
+    def _version_key(self, scope: str) -> str:
+        return cache_service._get_key("rbac", "version", scope)
+
+    def current_version(self, organization_id: UUID) -> MatrixVersion:
+        """Read the global and organization version counters in one round trip."""
+        scopes = (self.GLOBAL_SCOPE, str(organization_id))
+        redis_client = cache_service.redis_client
+        if redis_client:
+            try:
+                values = redis_client.mget([self._version_key(scope) for scope in scopes])
+                return tuple(int(value or 0) for value in values)
+            except Exception as e:
+                logger.logger.error(f"RBAC version read error: {e}")
+
+        with self._lock:
+            return tuple(self._local_versions.get(scope, 0) for scope in scopes)
+
+    def bump(self, organization_id: Optional[UUID] = None) -> int:
+        """
+        Bump the version of one organization (or of all organizations).
+
+        Returns:
+            Number of locally cached matrices dropped
+        """
+        scope = str(organization_id) if organization_id else self.GLOBAL_SCOPE
+        redis_client = cache_service.redis_client
+        if redis_client:
+            try:
+                redis_client.incr(self._version_key(scope))
+            except Exception as e:
+                logger.logger.error(f"RBAC version bump error: {e}")
+        with self._lock:
+            self._local_versions[scope] = self._local_versions.get(scope, 0) + 1
+
+        if organization_id:
+            return 1 if self._matrices.delete(organization_id) else 0
+        dropped = len(self._matrices)
+        self._matrices.clear()
+        return dropped
+
+    def get(
+        self,
+        organization_id: UUID,
+        compile_matrix: Callable[[MatrixVersion], OrgPermissionMatrix]
+    ) -> Tuple[OrgPermissionMatrix, bool]:
+        """
+        Get the organization's matrix, compiling it when missing or outdated.
+
+        Returns:
+            (matrix, whether it was served from cache)
+        """
+        matrix = self._matrices.get(organization_id)
+        now = time.monotonic()
+        if matrix is not None and now - matrix.checked_at < self.version_check_interval:
+            return matrix, True
+
+        # Read the version before compiling so edits racing the compile force a recompile
+        version = self.current_version(organization_id)
+        if matrix is not None and matrix.version == version:
+            matrix.checked_at = now
+            return matrix, True
+
+        matrix = compile_matrix(version)
+        self._matrices.set(organization_id, matrix)
+        return matrix, False
+
+    def clear(self) -> None:
+        self._matrices.clear()
+
+
+# Global matrix cache shared by all requests in this process
+permission_matrix_cache = PermissionMatrixCache()
+
 
 class RBACService:
     """Service for RBAC permission checking."""
@@ -46,26 +209,24 @@ class RBACService:
         """
         start_time = time.time()
         
-        # Check cache first
-        cache_key = f"permission:{user_id}:{organization_id}:{resource}:{action}"
-        cached_result = self.cache.get(cache_key)
-        if cached_result is not None:
-            self.logger.log_rbac_cache_operation(
-                operation="check_permission",
-                cache_key=cache_key,
-                hit_miss="hit",
-                user_id=str(user_id),
-                organization_id=str(organization_id)
-            )
-            return cached_result == "ALLOW"
+        matrix, cache_hit = permission_matrix_cache.get(
+            organization_id,
+            lambda version: self._compile_matrix(organization_id, version)
+        )
         
-        # Get all user's roles in this organization
-        user_roles = self.db.query(OrgMemberRole).join(Role).filter(
-            OrgMemberRole.user_id == user_id,
-            OrgMemberRole.organization_id == organization_id
-        ).all()
+        if cache_hit:
+            return matrix.is_allowed(user_id, resource, action)
+        
+        self.logger.log_rbac_cache_operation(
+            operation="check_permission",
+            cache_key=f"rbac:matrix:{organization_id}",
+            hit_miss="miss",
+            user_id=str(user_id),
+            organization_id=str(organization_id)
+        )
         
-        if not user_roles:
+        role_ids = matrix.roles_for(user_id)
+        if not role_ids:
             self.logger.log_permission_denial(
                 user_id=str(user_id),
                 organization_id=str(organization_id),
@@ -76,63 +237,15 @@ class RBACService:
             )
             return False
         
-        # Collect permissions from all roles
-        all_permissions = []
-        role_names = []
-        base_permissions = {}
-        org_overrides = {}
-        
-        for user_role in user_roles:
-            role_names.append(user_role.role.code)
-            
-            # Check org-level overrides first
-            override = self.db.query(OrgRolePermissionOverride).join(Permission).filter(
-                OrgRolePermissionOverride.organization_id == organization_id,
-                OrgRolePermissionOverride.role_id == user_role.role_id,
-                Permission.resource == resource,
-                Permission.action == action
-            ).first()
-            
-            if override:
-                all_permissions.append({
-                    'role': user_role.role.code,
-                    'effect': override.effect.value,
-                    'source': 'override'
-                })
-                org_overrides[user_role.role.code] = override.effect.value
-            else:
-                # Check base role permissions
-                role_perm = self.db.query(RolePermission).join(Permission).filter(
-                    RolePermission.role_id == user_role.role_id,
-                    Permission.resource == resource,
-                    Permission.action == action
-                ).first()
-                
-                if role_perm:
-                    all_permissions.append({
-                        'role': user_role.role.code,
-                        'effect': role_perm.effect.value,
-                        'source': 'base'
-                    })
-                    base_permissions[user_role.role.code] = role_perm.effect.value
-        
-        # Evaluate: DENY from any role takes precedence
-        has_deny = any(p['effect'] == 'DENY' for p in all_permissions)
-        has_allow = any(p['effect'] == 'ALLOW' for p in all_permissions)
-        
-        # Final decision
-        if has_deny:
-            final_effect = "DENY"
-        elif has_allow:
-            final_effect = "ALLOW"
-        else:
-            final_effect = "DENY"  # Default deny
-        
-        # Cache result (5 minutes TTL)
-        self.cache.set(cache_key, final_effect, ttl=300)
-        
-        # Calculate evaluation duration
-        evaluation_duration = time.time() - start_time
+        allowed = matrix.is_allowed(user_id, resource, action)
+        key = (resource, action)
+        role_effects = {
+            matrix.role_codes.get(role_id, str(role_id)): (
+                'DENY' if key in matrix.role_denies.get(role_id, ()) else 'ALLOW'
+            )
+            for role_id in role_ids
+            if key in matrix.role_denies.get(role_id, ()) or key in matrix.role_allows.get(role_id, ())
+        }
         
         # Log evaluation
         self.logger.log_permission_evaluation(
@@ -140,36 +253,115 @@ class RBACService:
             organization_id=str(organization_id),
             resource=resource,
             action=action,
-            effect=final_effect,
-            source="multiple_roles" if len(user_roles) > 1 else "single_role",
-            roles=role_names,
-            evaluation_duration=evaluation_duration,
-            base_permissions=base_permissions,
-            org_overrides=org_overrides
+            effect="ALLOW" if allowed else "DENY",
+            source="multiple_roles" if len(role_ids) > 1 else "single_role",
+            roles=[matrix.role_codes.get(role_id, str(role_id)) for role_id in role_ids],
+            evaluation_duration=time.time() - start_time,
+            base_permissions=role_effects
         )
         
-        return final_effect == "ALLOW"
+        return allowed
+    
+    def _compile_matrix(self, organization_id: UUID, version: MatrixVersion) -> OrgPermissionMatrix:
+        """
+        Compile an organization's permission matrix in three queries.
+        
+        Args:
+            organization_id: Organization ID
+            version: Version counters the matrix is compiled against
+        """
+        assignments = self.db.query(
+            OrgMemberRole.user_id, OrgMemberRole.role_id, Role.code
+        ).join(Role, OrgMemberRole.role_id == Role.id).filter(
+            OrgMemberRole.organization_id == organization_id
+        ).all()
+        
+        member_roles: Dict[UUID, Set[UUID]] = {}
+        role_codes: Dict[UUID, str] = {}
+        for user_id, role_id, role_code in assignments:
+            member_roles.setdefault(user_id, set()).add(role_id)
+            role_codes[role_id] = role_code
+        
+        # role_id -> {(resource, action): effect}, overrides applied over base permissions
+        effects: Dict[UUID, Dict[PermissionKey, PermissionEffect]] = {role_id: {} for role_id in role_codes}
+        if role_codes:
+            base_rows = self.db.query(
+                RolePermission.role_id, Permission.resource, Permission.action, RolePermission.effect
+            ).join(Permission, RolePermission.permission_id == Permission.id).filter(
+                RolePermission.role_id.in_(list(role_codes))
+            ).all()
+            for role_id, resource, action, effect in base_rows:
+                effects[role_id][(resource, action)] = effect
+            
+            override_rows = self.db.query(
+                OrgRolePermissionOverride.role_id,
+                Permission.resource,
+                Permission.action,
+                OrgRolePermissionOverride.effect
+            ).join(Permission, OrgRolePermissionOverride.permission_id == Permission.id).filter(
+                OrgRolePermissionOverride.organization_id == organization_id,
+                OrgRolePermissionOverride.role_id.in_(list(role_codes))
+            ).all()
+            for role_id, resource, action, effect in override_rows:
+                effects[role_id][(resource, action)] = effect
+        
+        return OrgPermissionMatrix(
+            version=version,
+            member_roles={user_id: frozenset(role_ids) for user_id, role_ids in member_roles.items()},
+            role_codes=role_codes,
+            role_allows={
+                role_id: frozenset(key for key, effect in perms.items() if effect == PermissionEffect.ALLOW)
+                for role_id, perms in effects.items()
+            },
+            role_denies={
+                role_id: frozenset(key for key, effect in perms.items() if effect == PermissionEffect.DENY)
+                for role_id, perms in effects.items()
+            }
+        )
     
     def invalidate_permission_cache(self, user_id: UUID, organization_id: UUID):
         """
         Invalidate permission cache when roles change.
         
+        Bumps the organization's matrix version so every process recompiles
+        it on the next check. Call after the role change is committed.
+        
         Args:
             user_id: User ID
             organization_id: Organization ID
+        
+        Returns:
+            Number of locally cached matrices dropped
         """
-        pattern = f"permission:{user_id}:{organization_id}:*"
-        deleted_count = self.cache.delete_pattern(pattern)
+        dropped = permission_matrix_cache.bump(organization_id)
         
         self.logger.log_rbac_cache_operation(
             operation="invalidate",
-            cache_key=pattern,
+            cache_key=f"rbac:matrix:{organization_id}",
             hit_miss="invalidated",
             user_id=str(user_id),
             organization_id=str(organization_id)
         )
         
-        return deleted_count
+        return dropped
+    
+    def invalidate_all_permission_caches(self) -> int:
+        """
+        Invalidate compiled permissions of every organization.
+        Call after base role permissions (role_permissions) change.
+        
+        Returns:
+            Number of locally cached matrices dropped
+        """
+        dropped = permission_matrix_cache.bump()
+        
+        self.logger.log_rbac_cache_operation(
+            operation="invalidate",
+            cache_key="rbac:matrix:*",
+            hit_miss="invalidated"
+        )
+        
+        return dropped
     
     def get_user_permissions(
         self,
@@ -187,59 +379,14 @@ class RBACService:
         Returns:
             Dictionary mapping resource to list of allowed actions
         """
-        # Get all user's roles in this organization
-        user_roles = self.db.query(OrgMemberRole).join(Role).filter(
-            OrgMemberRole.user_id == user_id,
-            OrgMemberRole.organization_id == organization_id
-        ).all()
-        
-        if not user_roles:
-            return {}
-        
-        # Collect all permissions
-        permissions_map = {}
-        
-        for user_role in user_roles:
-            # Get base role permissions
-            role_perms = self.db.query(RolePermission).join(Permission).filter(
-                RolePermission.role_id == user_role.role_id
-            ).all()
-            
-            for rp in role_perms:
-                resource = rp.permission.resource
-                action = rp.permission.action
-                
-                # Check for org-level override
-                override = self.db.query(OrgRolePermissionOverride).filter(
-                    OrgRolePermissionOverride.organization_id == organization_id,
-                    OrgRolePermissionOverride.role_id == user_role.role_id,
-                    OrgRolePermissionOverride.permission_id == rp.permission_id
-                ).first()
-                
-                effect = override.effect if override else rp.effect
-                
-                # Track permissions
-                if resource not in permissions_map:
-                    permissions_map[resource] = {}
-                
-                if action not in permissions_map[resource]:
-                    permissions_map[resource][action] = []
-                
-                permissions_map[resource][action].append({
-                    'role': user_role.role.code,
-                    'effect': effect.value
-                })
+        matrix, _ = permission_matrix_cache.get(
+            organization_id,
+            lambda version: self._compile_matrix(organization_id, version)
+        )
         
-        # Apply DENY precedence and build final result
-        result = {}
-        for resource, actions in permissions_map.items():
-            result[resource] = []
-            for action, perms in actions.items():
-                has_deny = any(p['effect'] == 'DENY' for p in perms)
-                has_allow = any(p['effect'] == 'ALLOW' for p in perms)
-                
-                if not has_deny and has_allow:
-                    result[resource].append(action)
+        result: Dict[str, List[str]] = {}
+        for resource, action in sorted(matrix.effective_permissions(user_id)):
+            result.setdefault(resource, []).append(action)
         
         return result
     
@@ -336,17 +483,17 @@ class RBACService:
     def _invalidate_role_cache(self, organization_id: UUID, role_id: UUID):
         """
         Invalidate cache for all users with specific role in organization.
+        The organization's matrix covers every role, so this bumps its version.
         
         Args:
             organization_id: Organization ID
             role_id: Role ID
         """
-        # Get all users with this role
-        user_roles = self.db.query(OrgMemberRole).filter(
-            OrgMemberRole.organization_id == organization_id,
-            OrgMemberRole.role_id == role_id
-        ).all()
+        permission_matrix_cache.bump(organization_id)
         
-        # Invalidate cache for each user
-        for user_role in user_roles:
-            self.invalidate_permission_cache(user_role.user_id, organization_id)
+        self.logger.log_rbac_cache_operation(
+            operation="invalidate",
+            cache_key=f"rbac:matrix:{organization_id}",
+            hit_miss="invalidated",
+            organization_id=str(organization_id)
+        )
@@ -14,6 +14,7 @@ from app.core.exceptions import NotFoundError, ValidationError, PermissionError
 from app.models.schedule import ScheduleChangeLog, Schedule
 from app.models.audit import Audit
 from app.models.enums import ScheduleChangeTrigger, AuditStatus
+from app.services.report_service import invalidate_report
 from app.services.schedule_change_log_service import ScheduleChangeLogService
 
 logger = get_logger(__name__)
@@ -122,6 +123,9 @@ class RecommendationService:
                     error_code="SCHEDULE_CROP_MISMATCH"
                 )
         
+        # Committed together with the change log entry below
+        invalidate_report(self.db, audit_id)
+
         # Create recommendation using schedule_change_log_service
         # is_applied=False means it's a proposed change pending approval
         recommendation = self.change_log_service.log_schedule_change(
@@ -254,6 +258,7 @@ class RecommendationService:
                 )
             recommendation.task_details_after = task_details_after
         
+        invalidate_report(self.db, recommendation.trigger_reference_id)
         self.db.commit()
         self.db.refresh(recommendation)
         
@@ -304,6 +309,7 @@ class RecommendationService:
         
         # Delete recommendation
         self.db.delete(recommendation)
+        invalidate_report(self.db, recommendation.trigger_reference_id)
         self.db.commit()
         
         logger.info(
@@ -410,6 +416,7 @@ class RecommendationService:
         recommendation.is_applied = True
         recommendation.applied_at = datetime.utcnow()
         recommendation.applied_by = user_id
+        invalidate_report(self.db, recommendation.trigger_reference_id)
         
         self.db.commit()
         self.db.refresh(recommendation)
@@ -479,6 +486,7 @@ class RecommendationService:
         
         # Delete recommendation
         self.db.delete(recommendation)
+        invalidate_report(self.db, recommendation.trigger_reference_id)
         self.db.commit()
     
     def _apply_to_schedule(self, recommendation: ScheduleChangeLog) -> None:
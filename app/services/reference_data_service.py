@@ -7,7 +7,7 @@ from sqlalchemy.orm import Session
 
 from app.core.logging import get_logger
 from app.core.exceptions import NotFoundError
-from app.core.cache import cache_service
+from app.core.tiered_cache import cached
 from app.models.reference_data import ReferenceDataType, ReferenceData, ReferenceDataTranslation
 from app.schemas.reference_data import (
     ReferenceDataTypeResponse,
@@ -26,8 +26,8 @@ class ReferenceDataService:
     
     def __init__(self, db: Session):
         self.db = db
-        self.cache = cache_service
     
+    @cached("reference_data", ttl=CACHE_TTL)
     def get_reference_types(self) -> List[ReferenceDataTypeResponse]:
         """
         Get all reference data types.
@@ -35,20 +35,6 @@ class ReferenceDataService:
         Returns:
             List of reference data types
         """
-        # Check cache first
-        cache_key = self.cache._get_key("reference_data_types")
-        cached_data = self.cache.get(cache_key)
-        
-        if cached_data:
-            logger.info(
-                "Cache hit for reference data types",
-                extra={
-                    "cache_key": cache_key
-                }
-            )
-            return [ReferenceDataTypeResponse(**item) for item in cached_data]
-        
-        # Cache miss - query database
         types = (
             self.db.query(ReferenceDataType)
             .order_by(ReferenceDataType.name)
@@ -65,21 +51,16 @@ class ReferenceDataService:
             for ref_type in types
         ]
         
-        # Cache the result
-        cache_data = [item.dict() for item in result]
-        self.cache.set(cache_key, cache_data, CACHE_TTL)
-        
         logger.info(
-            "Retrieved reference data types from database and cached",
+            "Retrieved reference data types from database",
             extra={
-                "count": len(result),
-                "cache_key": cache_key,
-                "ttl": CACHE_TTL
+                "count": len(result)
             }
         )
         
         return result
     
+    @cached("reference_data", ttl=CACHE_TTL)
     def get_reference_data_by_type(
         self, 
         type_code: str, 
@@ -98,22 +79,6 @@ class ReferenceDataService:
         Raises:
             NotFoundError: If reference data type not found
         """
-        # Check cache first
-        cache_key = self.cache._get_key("reference_data", type_code, language)
-        cached_data = self.cache.get(cache_key)
-        
-        if cached_data:
-            logger.info(
-                "Cache hit for reference data by type",
-                extra={
-                    "type_code": type_code,
-                    "language": language,
-                    "cache_key": cache_key
-                }
-            )
-            return [ReferenceDataResponse(**item) for item in cached_data]
-        
-        # Cache miss - query database
         # Get reference data type
         ref_type = (
             self.db.query(ReferenceDataType)
@@ -159,23 +124,18 @@ class ReferenceDataService:
                 translations=translation_responses
             ))
         
-        # Cache the result
-        cache_data = [item.dict() for item in result]
-        self.cache.set(cache_key, cache_data, CACHE_TTL)
-        
         logger.info(
-            "Retrieved reference data by type from database and cached",
+            "Retrieved reference data by type from database",
             extra={
                 "type_code": type_code,
                 "language": language,
-                "count": len(result),
-                "cache_key": cache_key,
-                "ttl": CACHE_TTL
+                "count": len(result)
             }
         )
         
         return result
     
+    @cached("reference_data", ttl=CACHE_TTL)
     def get_reference_data_by_id(
         self, 
         ref_id: UUID, 
@@ -194,22 +154,6 @@ class ReferenceDataService:
         Raises:
             NotFoundError: If reference data not found
         """
-        # Check cache first
-        cache_key = self.cache._get_key("reference_data_item", str(ref_id), language)
-        cached_data = self.cache.get(cache_key)
-        
-        if cached_data:
-            logger.info(
-                "Cache hit for reference data by ID",
-                extra={
-                    "ref_id": str(ref_id),
-                    "language": language,
-                    "cache_key": cache_key
-                }
-            )
-            return ReferenceDataResponse(**cached_data)
-        
-        # Cache miss - query database
         ref_data = (
             self.db.query(ReferenceData)
             .filter(ReferenceData.id == ref_id)
@@ -243,17 +187,12 @@ class ReferenceDataService:
             translations=translation_responses
         )
         
-        # Cache the result
-        self.cache.set(cache_key, result.dict(), CACHE_TTL)
-        
         logger.info(
-            "Retrieved reference data by ID from database and cached",
+            "Retrieved reference data by ID from database",
             extra={
                 "ref_id": str(ref_id),
                 "code": ref_data.code,
-                "language": language,
-                "cache_key": cache_key,
-                "ttl": CACHE_TTL
+                "language": language
             }
         )
         
@@ -48,7 +48,7 @@ class RemoteAuditService:
 
         return audit, session
 
-    async def process_snapshot(
+    def process_snapshot(
         self,
         audit_id: UUID,
         session_id: UUID,
@@ -58,6 +58,9 @@ class RemoteAuditService:
     ):
         """
         Background task to process, compress and save the snapshot.
+
+        Synchronous so BackgroundTasks runs it in the thread pool rather than
+        on the event loop while compression waits on the media pipeline.
         """
         try:
             filename = f"snapshot_{session_id}.jpg"
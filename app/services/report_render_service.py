@@ -0,0 +1,277 @@
+"""
+Background PDF rendering for audit reports.
+
+Report data is collected in the request with ReportService, rendered with
+reportlab in a process pool and stored under a key built from the audit's
+report_version and the language. Review, finalize and share transitions
+and every write to the audit's responses, photos, issues and
+recommendations bump report_version (see report_service.invalidate_report),
+so an unchanged audit's PDF is served from storage and concurrent requests
+for the same content share one render job.
+
+Jobs are kept in Redis so any worker can answer a poll, with an in-process
+fallback when Redis is unavailable.
+"""
+import uuid
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import CacheService, LocalLRUCache, cache_service
+from app.core.config import settings
+from app.core.exceptions import ConflictError, NotFoundError, ValidationError
+from app.core.logging import get_logger
+from app.core.process_pool import LazyProcessPool
+from app.core.storage import MediaStorage, media_storage
+from app.models.audit import Audit
+from app.services.pdf_service import render_report_pdf
+from app.services.report_service import SUPPORTED_LANGUAGES, ReportService
+
+logger = get_logger(__name__)
+
+# Bump when the PDF layout changes so previously stored PDFs are not served
+PDF_LAYOUT_VERSION = 1
+
+QUEUED = "QUEUED"
+READY = "READY"
+FAILED = "FAILED"
+
+_render_pool = LazyProcessPool("Render", lambda: settings.PDF_RENDER_WORKERS)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def artifact_key(audit_id: Any, report_version: int, language: str) -> str:
+    """Storage key of an audit's rendered report PDF."""
+    return f"reports/audits/{audit_id}/v{report_version}-l{PDF_LAYOUT_VERSION}-{language}.pdf"
+
+
+class ReportArtifactStore:
+    """Rendered report PDFs, in S3 when configured and under UPLOAD_DIR otherwise."""
+
+    def __init__(self, storage: Optional[MediaStorage] = None):
+        self.storage = storage or media_storage
+
+    def exists(self, key: str) -> bool:
+        """Whether a PDF is stored under key."""
+        return self.storage.exists(key)
+
+    def save(self, key: str, data: bytes) -> None:
+        """Store a PDF under key."""
+        self.storage.put(key, data, 'application/pdf')
+
+    def load(self, key: str) -> bytes:
+        """Read the PDF stored under key."""
+        return self.storage.load(key)
+
+
+class ReportJobRegistry:
+    """Render job records in Redis with an in-process fallback."""
+
+    def __init__(self, cache: Optional[CacheService] = None, ttl: Optional[int] = None):
+        self.cache = cache or cache_service
+        self.ttl = ttl if ttl is not None else settings.REPORT_JOB_TTL
+        self._local = LocalLRUCache(maxsize=1024, ttl=self.ttl)
+
+    def _key(self, job_id: str) -> str:
+        return self.cache._get_key("report_job", job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job record, or None."""
+        job = self.cache.get(self._key(job_id))
+        if job is None:
+            job = self._local.get(job_id)
+        return dict(job) if job else None
+
+    def put(self, job: Dict[str, Any]) -> None:
+        """Create or update a job record."""
+        self._local.set(job["job_id"], dict(job))
+        self.cache.set(self._key(job["job_id"]), job, ttl=self.ttl)
+
+
+class ReportRenderService:
+    """Service for rendering audit report PDFs in the background and serving stored PDFs."""
+
+    def __init__(
+        self,
+        db: Session,
+        store: Optional[ReportArtifactStore] = None,
+        jobs: Optional[ReportJobRegistry] = None
+    ):
+        self.db = db
+        self.store = store or report_artifact_store
+        self.jobs = jobs or report_job_registry
+
+    def enqueue(self, audit_id: UUID, language: str = "en") -> Dict[str, Any]:
+        """
+        Start rendering an audit's report PDF, or return the job already covering it.
+
+        Jobs are identified by the audit's content version and language, so a
+        PDF already stored is READY immediately and repeated requests while a
+        render is running return the same job.
+
+        Args:
+            audit_id: UUID of the audit
+            language: Language code for report (en, ta, ml)
+
+        Returns:
+            Job record
+
+        Raises:
+            NotFoundError: If audit not found
+            ValidationError: If language not supported
+        """
+        audit = self._get_audit(audit_id, language)
+        key = artifact_key(audit.id, audit.report_version, language)
+        job_id = str(uuid.uuid5(uuid.NAMESPACE_URL, key))
+
+        job = self.jobs.get(job_id)
+        if job and (job["status"] == READY or (job["status"] == QUEUED and not self._is_lost(job))):
+            return job
+
+        job = {
+            "job_id": job_id,
+            "audit_id": str(audit.id),
+            "language": language,
+            "content_version": audit.report_version,
+            "artifact_key": key,
+            "filename": self._filename(audit),
+            "status": QUEUED,
+            "error": None,
+            "size_bytes": None,
+            "created_at": _now(),
+            "completed_at": None
+        }
+
+        if self.store.exists(key):
+            job.update(status=READY, completed_at=job["created_at"])
+            self.jobs.put(job)
+            return job
+
+        report_data = ReportService(self.db).generate_report(audit.id, language)
+        self.jobs.put(job)
+
+        store, jobs = self.store, self.jobs
+        _render_pool.submit(render_report_pdf, report_data).add_done_callback(
+            lambda future: _finish_job(store, jobs, job, future)
+        )
+
+        logger.info(
+            "Report PDF render queued",
+            extra={"audit_id": str(audit.id), "job_id": job_id, "content_version": audit.report_version}
+        )
+
+        return job
+
+    def get_job(self, audit_id: UUID, job_id: str) -> Dict[str, Any]:
+        """
+        Get a render job of an audit.
+
+        Raises:
+            NotFoundError: If the job does not exist or belongs to another audit
+        """
+        job = self.jobs.get(job_id)
+        if not job or job["audit_id"] != str(audit_id):
+            raise NotFoundError(
+                message=f"Report job {job_id} not found",
+                error_code="REPORT_JOB_NOT_FOUND",
+                details={"job_id": job_id}
+            )
+        return job
+
+    def download(self, audit_id: UUID, job_id: str) -> Tuple[bytes, str]:
+        """
+        Get the PDF of a finished render job.
+
+        Returns:
+            (PDF bytes, download filename)
+
+        Raises:
+            NotFoundError: If the job does not exist
+            ConflictError: If the job has not finished or failed
+        """
+        job = self.get_job(audit_id, job_id)
+        if job["status"] != READY:
+            raise ConflictError(
+                message="Report PDF is not ready",
+                error_code="REPORT_RENDER_FAILED" if job["status"] == FAILED else "REPORT_NOT_READY",
+                details={"job_id": job_id, "status": job["status"], "error": job.get("error")}
+            )
+        return self.store.load(job["artifact_key"]), job["filename"]
+
+    def get_or_render(self, audit_id: UUID, language: str = "en") -> Tuple[bytes, str]:
+        """
+        Get an audit's report PDF, rendering it in the pool and waiting on a miss.
+
+        Returns:
+            (PDF bytes, download filename)
+        """
+        audit = self._get_audit(audit_id, language)
+        key = artifact_key(audit.id, audit.report_version, language)
+        if self.store.exists(key):
+            return self.store.load(key), self._filename(audit)
+
+        report_data = ReportService(self.db).generate_report(audit.id, language)
+        pdf_bytes = _render_pool.submit(render_report_pdf, report_data).result(timeout=settings.PDF_RENDER_TIMEOUT)
+        self.store.save(key, pdf_bytes)
+        return pdf_bytes, self._filename(audit)
+
+    def _get_audit(self, audit_id: UUID, language: str):
+        if language not in SUPPORTED_LANGUAGES:
+            raise ValidationError(
+                message=f"Language '{language}' not supported",
+                error_code="UNSUPPORTED_LANGUAGE",
+                details={"language": language, "supported_languages": SUPPORTED_LANGUAGES}
+            )
+
+        audit = self.db.query(Audit.id, Audit.audit_number, Audit.report_version).filter(
+            Audit.id == audit_id
+        ).first()
+        if not audit:
+            raise NotFoundError(
+                message=f"Audit {audit_id} not found",
+                error_code="AUDIT_NOT_FOUND",
+                details={"audit_id": str(audit_id)}
+            )
+        return audit
+
+    @staticmethod
+    def _filename(audit) -> str:
+        return f"{audit.audit_number or audit.id}_report.pdf"
+
+    @staticmethod
+    def _is_lost(job: Dict[str, Any]) -> bool:
+        """A queued job older than the render timeout lost its worker (e.g. a restart)."""
+        queued_at = datetime.fromisoformat(job["created_at"])
+        return (datetime.now(timezone.utc) - queued_at).total_seconds() > settings.PDF_RENDER_TIMEOUT
+
+
+def _finish_job(store: ReportArtifactStore, jobs: ReportJobRegistry, job: Dict[str, Any], future: Future) -> None:
+    """Store a finished render and record the outcome (runs on the pool's result thread)."""
+    job = dict(job)
+    try:
+        pdf_bytes = future.result()
+        store.save(job["artifact_key"], pdf_bytes)
+        job.update(status=READY, size_bytes=len(pdf_bytes))
+        logger.info(
+            "Report PDF rendered",
+            extra={"audit_id": job["audit_id"], "job_id": job["job_id"], "pdf_size_bytes": len(pdf_bytes)}
+        )
+    except Exception as e:
+        job.update(status=FAILED, error=str(e) or type(e).__name__)
+        logger.error(
+            "Report PDF render failed",
+            extra={"audit_id": job["audit_id"], "job_id": job["job_id"], "error": str(e)},
+            exc_info=True
+        )
+    job["completed_at"] = _now()
+    jobs.put(job)
+
+
+report_artifact_store = ReportArtifactStore()
+report_job_registry = ReportJobRegistry()
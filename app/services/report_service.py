@@ -32,6 +32,22 @@ from app.models.enums import IssueSeverity
 
 logger = get_logger(__name__)
 
+SUPPORTED_LANGUAGES = ["en", "ta", "ml"]
+
+
+def invalidate_report(db: Session, audit_id: UUID) -> None:
+    """
+    Bump an audit's report_version in the caller's transaction.
+    
+    Every write to data the report includes (reviews, issues,
+    recommendations) calls this, so PDFs rendered from the old content are
+    no longer served.
+    """
+    db.query(Audit).filter(Audit.id == audit_id).update(
+        {Audit.report_version: Audit.report_version + 1},
+        synchronize_session=False
+    )
+
 
 class ReportService:
     """
@@ -86,7 +102,7 @@ class ReportService:
         )
 
         # Validate language
-        supported_languages = ["en", "ta", "ml"]
+        supported_languages = SUPPORTED_LANGUAGES
         if language not in supported_languages:
             raise ValidationError(
                 message=f"Language '{language}' not supported",
@@ -278,62 +294,57 @@ class ReportService:
             if sec_id:
                 section_name_map[sec_id] = name
 
-        # Get all responses with reviewing that are flagged
+        # Flagged reviews with their responses and parameter instances in one query
         flagged_responses = []
-        
-        responses = self.db.query(AuditResponse).filter(
+
+        rows = self.db.query(AuditResponse, AuditReview, AuditParameterInstance).join(
+            AuditReview, and_(
+                AuditReview.audit_response_id == AuditResponse.id,
+                AuditReview.is_flagged_for_report == True
+            )
+        ).join(
+            AuditParameterInstance,
+            AuditParameterInstance.id == AuditResponse.audit_parameter_instance_id
+        ).filter(
             AuditResponse.audit_id == audit.id
         ).all()
-        
-        for response in responses:
-            # Check if response has a review that is flagged
-            review = self.db.query(AuditReview).filter(
-                AuditReview.audit_response_id == response.id,
-                AuditReview.is_flagged_for_report == True
-            ).first()
-            
-            if review:
-                # Get parameter instance for snapshot
-                param_instance = self.db.query(AuditParameterInstance).filter(
-                    AuditParameterInstance.id == response.audit_parameter_instance_id
-                ).first()
-                
-                if param_instance:
-                    parameter_snapshot = param_instance.parameter_snapshot
-                    
-                    # Get parameter name from snapshot
-                    param_translations = parameter_snapshot.get("translations", {})
-                    param_name = param_translations.get(language, {}).get("name", "")
-                    if not param_name and param_translations:
-                        param_name = param_translations.get("en", {}).get("name", "")
-                    
-                    # Get response value (prioritize review overrides, fallback to original)
-                    response_value = self._format_response_value(
-                        review,
-                        parameter_snapshot,
-                        language,
-                        original_response=response
-                    )
-
-                    # Determine section info
-                    section_id = ts_map.get(param_instance.template_section_id)
-                    section_name = section_name_map.get(section_id, "Unknown Section")
-                    
-                    flagged_responses.append({
-                        "id": response.id,
-                        "audit_id": response.audit_id,
-                        "audit_parameter_instance_id": response.audit_parameter_instance_id,
-                        "section_id": section_id,
-                        "section_name": section_name,
-                        "parameter_name": param_name,
-                        "parameter_code": parameter_snapshot.get("code", ""),
-                        "parameter_type": parameter_snapshot.get("parameter_type", ""),
-                        "response_value": response_value,
-                        "notes": review.response_text if (review and review.response_text and review.response_text != response.response_text) else response.notes,
-                        "created_at": response.created_at,
-                        "updated_at": response.updated_at,
-                        "created_by": response.created_by
-                    })
+
+        for response, review, param_instance in rows:
+            parameter_snapshot = param_instance.parameter_snapshot
+
+            # Get parameter name from snapshot
+            param_translations = parameter_snapshot.get("translations", {})
+            param_name = param_translations.get(language, {}).get("name", "")
+            if not param_name and param_translations:
+                param_name = param_translations.get("en", {}).get("name", "")
+
+            # Get response value (prioritize review overrides, fallback to original)
+            response_value = self._format_response_value(
+                review,
+                parameter_snapshot,
+                language,
+                original_response=response
+            )
+
+            # Determine section info
+            section_id = ts_map.get(param_instance.template_section_id)
+            section_name = section_name_map.get(section_id, "Unknown Section")
+
+            flagged_responses.append({
+                "id": response.id,
+                "audit_id": response.audit_id,
+                "audit_parameter_instance_id": response.audit_parameter_instance_id,
+                "section_id": section_id,
+                "section_name": section_name,
+                "parameter_name": param_name,
+                "parameter_code": parameter_snapshot.get("code", ""),
+                "parameter_type": parameter_snapshot.get("parameter_type", ""),
+                "response_value": response_value,
+                "notes": review.response_text if (review and review.response_text and review.response_text != response.response_text) else response.notes,
+                "created_at": response.created_at,
+                "updated_at": response.updated_at,
+                "created_by": response.created_by
+            })
         
         return flagged_responses
 
@@ -407,36 +418,29 @@ class ReportService:
         Requirements: 18.3
         """
         flagged_photos = []
-        
-        # Get all photos for this audit by joining with AuditResponse
-        photos = self.db.query(AuditResponsePhoto).join(
-            AuditResponse, AuditResponsePhoto.audit_response_id == AuditResponse.id
-        ).filter(
-            AuditResponse.audit_id == audit.id
-        ).all()
 
-        print(f"DEBUG: [FlaggedPhotos] Found {len(photos)} total photos for audit {audit.id}", flush=True)
-        
-        # BROADENED LOGIC: Pull all photos for this audit from AuditResponsePhoto
-        photos = self.db.query(AuditResponsePhoto).join(
+        # All response photos of the audit with their review photo (if any) in one query
+        photos = self.db.query(AuditResponsePhoto, AuditReviewPhoto).join(
             AuditResponse, AuditResponsePhoto.audit_response_id == AuditResponse.id
+        ).outerjoin(
+            AuditReviewPhoto, AuditReviewPhoto.audit_response_photo_id == AuditResponsePhoto.id
         ).filter(
             AuditResponse.audit_id == audit.id
         ).all()
-        
-        print(f"DEBUG: [ReportPhotos] Found {len(photos)} total response photos for audit {audit.id}", flush=True)
 
-        for photo in photos:
+        seen = set()
+        for photo, review_photo in photos:
+            # A photo is listed once even if several review photos reference it
+            if photo.id in seen:
+                continue
+            seen.add(photo.id)
+
             # Include if flagged in original photo OR review photo OR just because it exists
             # (Satisfying user requirement to see "submitted images")
             is_flagged = photo.is_flagged_for_report
             caption = photo.caption
-            
+
             # Check review photo status
-            review_photo = self.db.query(AuditReviewPhoto).filter(
-                AuditReviewPhoto.audit_response_photo_id == photo.id
-            ).first()
-            
             if review_photo:
                 is_flagged = is_flagged or review_photo.is_flagged_for_report
                 if review_photo.caption:
@@ -17,8 +17,11 @@ from app.models.enums import PhotoSourceType, AuditStatus
 from app.schemas.audit import ResponseSubmit, ResponseUpdate, ResponseBulkSubmit
 from app.core.exceptions import NotFoundError, ValidationError, PermissionError
 from app.core.logging import get_logger
+from app.core.debug_trace import get_debug_trace
+from app.services.report_service import invalidate_report
 
 logger = get_logger(__name__)
+trace = get_debug_trace("audit.responses")
 
 
 class ValidationResult:
@@ -46,6 +49,7 @@ class ResponseService:
         """
         self._check_audit_status(audit_id)
         response = self._process_response_internal(audit_id, data, user_id)
+        invalidate_report(self.db, audit_id)
         self.db.commit()
         self.db.refresh(response)
         return response
@@ -64,7 +68,7 @@ class ResponseService:
         if not data.responses:
             return []
             
-        print(f"DEBUG: [ResponseService] Bulk Submit: Processing {len(data.responses)} items for audit {audit_id}", flush=True)
+        trace("bulk_submit", audit_id=str(audit_id), items=len(data.responses))
 
         # 1. Collect all parameter instance IDs
         param_instance_ids = [r.audit_parameter_instance_id for r in data.responses]
@@ -100,7 +104,12 @@ class ResponseService:
         for response_data in data.responses:
             param_instance = param_instance_map[response_data.audit_parameter_instance_id]
             
-            print(f"DEBUG: [ResponseService] Process item: text={response_data.response_text}, num={response_data.response_numeric}", flush=True)
+            trace(
+                "bulk_item",
+                parameter_instance_id=str(response_data.audit_parameter_instance_id),
+                text=response_data.response_text,
+                numeric=response_data.response_numeric
+            )
 
             # Validate
             validation_result = self._validate_response(response_data, param_instance.parameter_snapshot)
@@ -149,11 +158,12 @@ class ResponseService:
                 # For bulk, let's just assume if boolean is provided, we store in text as fallback
                 if insert_data.get("response_text") is None:
                     insert_data["response_text"] = "true" if response_data.response_boolean else "false"
-                    print(f"DEBUG: [ResponseService] Mapped boolean {response_data.response_boolean} to text {insert_data['response_text']}", flush=True)
+                    trace("boolean_mapped", value=response_data.response_boolean, text=insert_data["response_text"])
         
         # 5. Bulk writes
         if new_responses_data:
             self.db.bulk_insert_mappings(AuditResponse, new_responses_data)
+            self._increment_answered_count(audit_id, len(new_responses_data))
         if update_responses_data:
             self.db.bulk_update_mappings(AuditResponse, update_responses_data)
             
@@ -161,6 +171,7 @@ class ResponseService:
         for resp_id, urls in evidence_processing_queue:
             self._process_evidence_urls(audit_id, resp_id, urls, user_id)
             
+        invalidate_report(self.db, audit_id)
         self.db.commit()
         
         return self.db.query(AuditResponse).filter(
@@ -179,6 +190,21 @@ class ResponseService:
             raise PermissionError(message=f"Cannot submit responses to {audit.status.lower()} audit", error_code="AUDIT_LOCKED")
         return audit
 
+    def _increment_answered_count(self, audit_id: UUID, delta: int) -> None:
+        """
+        Keep the denormalized Audit.answered_count in step with inserted responses.
+        
+        Uses an atomic SQL increment; audits whose counters were never computed
+        (NULL) are left alone so progress falls back to the aggregate query.
+        """
+        self.db.query(Audit).filter(
+            Audit.id == audit_id,
+            Audit.answered_count.isnot(None)
+        ).update(
+            {Audit.answered_count: Audit.answered_count + delta},
+            synchronize_session=False
+        )
+
     def _process_response_internal(
         self,
         audit_id: UUID,
@@ -229,6 +255,7 @@ class ResponseService:
              
         self.db.add(response)
         self.db.flush()
+        self._increment_answered_count(audit_id, 1)
         if data.evidence_urls:
             self._process_evidence_urls(audit_id, response.id, data.evidence_urls, user_id)
         return response
@@ -286,6 +313,7 @@ class ResponseService:
         if data.evidence_urls:
              self._process_evidence_urls(audit_id, response.id, data.evidence_urls, user_id)
 
+        invalidate_report(self.db, audit_id)
         self.db.commit()
         self.db.refresh(response)
         return response
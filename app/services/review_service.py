@@ -13,8 +13,9 @@ from sqlalchemy import and_
 
 from app.core.logging import get_logger
 from app.core.exceptions import NotFoundError, ValidationError, ConflictError
-from app.models.audit import AuditReview, AuditReviewPhoto, AuditResponse, AuditResponsePhoto
+from app.models.audit import Audit, AuditReview, AuditReviewPhoto, AuditResponse, AuditResponsePhoto
 from app.models.user import User
+from app.services.report_service import invalidate_report
 
 logger = get_logger(__name__)
 
@@ -111,6 +112,7 @@ class ReviewService:
             existing_review.is_flagged_for_report = is_flagged_for_report
             existing_review.reviewed_by = user_id
             existing_review.reviewed_at = datetime.utcnow()
+            invalidate_report(self.db, audit_response.audit_id)
             
             self.db.commit()
             self.db.refresh(existing_review)
@@ -134,6 +136,7 @@ class ReviewService:
             )
             
             self.db.add(review)
+            invalidate_report(self.db, audit_response.audit_id)
             self.db.commit()
             self.db.refresh(review)
             
@@ -189,6 +192,7 @@ class ReviewService:
             existing_review.is_flagged_for_report = flag
             existing_review.reviewed_by = user_id
             existing_review.reviewed_at = datetime.utcnow()
+            invalidate_report(self.db, existing_review.audit_response.audit_id)
             
             self.db.commit()
             self.db.refresh(existing_review)
@@ -266,6 +270,7 @@ class ReviewService:
             existing_review_photo.is_flagged_for_report = is_flagged_for_report
             existing_review_photo.reviewed_by = user_id
             existing_review_photo.reviewed_at = datetime.utcnow()
+            invalidate_report(self.db, photo.audit_id)
             
             self.db.commit()
             self.db.refresh(existing_review_photo)
@@ -281,6 +286,7 @@ class ReviewService:
             )
             
             self.db.add(review_photo)
+            invalidate_report(self.db, photo.audit_id)
             self.db.commit()
             self.db.refresh(review_photo)
             
@@ -373,6 +379,7 @@ class ReviewService:
         review.is_flagged_for_report = is_flagged
         review.reviewed_by = user_id
         review.reviewed_at = datetime.utcnow()
+        invalidate_report(self.db, audit_id)
         
         self.db.commit()
         self.db.refresh(review)
@@ -4,13 +4,70 @@ Schedule Calculation Service for Uzhathunai v2.0.
 Handles quantity calculations for schedule templates based on calculation_basis.
 Supports per_acre, per_plant, and fixed calculations.
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Set, Tuple
 from decimal import Decimal
 from app.core.logging import get_logger
 from app.core.exceptions import ValidationError
 
 logger = get_logger(__name__)
 
+# What a template quantity is scaled by: ('dosage', dosage per) or ('basis', calculation_basis)
+ScalingKind = Tuple[str, Optional[str]]
+
+
+class _Scaled:
+    """A template quantity, multiplied by its scaling factor when evaluated."""
+    
+    __slots__ = ('base', 'kind')
+    
+    def __init__(self, base: float, kind: ScalingKind):
+        self.base = base
+        self.kind = kind
+    
+    def evaluate(self, factors: Dict[ScalingKind, float]) -> float:
+        return self.base * factors[self.kind]
+
+
+class _Ingredient:
+    """A concentration ingredient's total quantity for the evaluated solution volume."""
+    
+    __slots__ = ('concentration_per_liter', 'volume')
+    
+    def __init__(self, concentration_per_liter: float, volume: _Scaled):
+        self.concentration_per_liter = concentration_per_liter
+        self.volume = volume
+    
+    def evaluate(self, factors: Dict[ScalingKind, float]) -> float:
+        return self.concentration_per_liter * (self.volume.evaluate(factors) / 1000.0)
+
+
+def _render(node: Any, factors: Dict[ScalingKind, float]) -> Any:
+    """Copy a compiled skeleton, evaluating its quantities."""
+    if isinstance(node, (_Scaled, _Ingredient)):
+        return node.evaluate(factors)
+    if isinstance(node, dict):
+        return {key: _render(value, factors) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_render(value, factors) for value in node]
+    return node
+
+
+class CompiledTaskCalculation:
+    """
+    A template task's calculations, parsed once and evaluated per crop.
+    
+    calculate(factors) returns what calculate_task_quantities returns for
+    parameters with those scaling factors.
+    """
+    
+    def __init__(self, skeleton: Dict[str, Any], kinds: List[ScalingKind], required_parameters: Set[str]):
+        self.skeleton = skeleton
+        self.kinds = kinds
+        self.required_parameters = required_parameters
+    
+    def calculate(self, factors: Dict[ScalingKind, float]) -> Dict[str, Any]:
+        return _render(self.skeleton, factors)
+
 
 class ScheduleCalculationService:
     """Service for calculating task quantities from schedule templates."""
@@ -167,33 +224,7 @@ class ScheduleCalculationService:
         Returns:
             float: Calculated quantity
         """
-        if per == 'ACRE':
-            # Map total_acres or area
-            factor = template_parameters.get('total_acres') or template_parameters.get('area')
-            if factor is None:
-                 raise ValidationError(message="Missing 'total_acres' or 'area' for ACRE calculation", error_code="MISSING_SCALING_FACTOR")
-            return float(amount) * float(factor)
-            
-        elif per == 'PLANT':
-            # Map total_plants or plant_count
-            factor = template_parameters.get('total_plants') or template_parameters.get('plant_count')
-            if factor is None:
-                raise ValidationError(message="Missing 'total_plants' or 'plant_count' for PLANT calculation", error_code="MISSING_SCALING_FACTOR")
-            return float(amount) * float(factor)
-            
-        elif per == 'LITER_WATER':
-            # Map water_liters
-            factor = template_parameters.get('water_liters')
-            if factor is None:
-                raise ValidationError(message="Missing 'water_liters' for LITER_WATER calculation", error_code="MISSING_SCALING_FACTOR")
-            return float(amount) * float(factor)
-            
-        elif per is None:
-             # Fixed amount if per is not specified? Or error? Assuming fixed.
-             return float(amount)
-             
-        else:
-             raise ValidationError(message=f"Invalid dosage per: {per}", error_code="INVALID_DOSAGE_PER")
+        return float(amount) * self._scaling_factor(('dosage', per), template_parameters)
 
     def _calculate_labor(
         self,
@@ -292,39 +323,185 @@ class ScheduleCalculationService:
         
         Validates: Requirements 6.8, 6.9, 6.10
         """
-        if calculation_basis == 'per_acre':
+        return float(base_quantity) * self._scaling_factor(('basis', calculation_basis), template_parameters)
+    
+    def _scaling_factor(self, kind: ScalingKind, template_parameters: Dict[str, Any]) -> float:
+        """
+        Resolve the factor a quantity of the given kind is multiplied by.
+        
+        Validates: Requirements 6.8, 6.9, 6.10
+        """
+        source, value = kind
+        
+        if source == 'dosage':
+            if value == 'ACRE':
+                # Map total_acres or area
+                factor = template_parameters.get('total_acres') or template_parameters.get('area')
+                if factor is None:
+                     raise ValidationError(message="Missing 'total_acres' or 'area' for ACRE calculation", error_code="MISSING_SCALING_FACTOR")
+                return float(factor)
+                
+            elif value == 'PLANT':
+                # Map total_plants or plant_count
+                factor = template_parameters.get('total_plants') or template_parameters.get('plant_count')
+                if factor is None:
+                    raise ValidationError(message="Missing 'total_plants' or 'plant_count' for PLANT calculation", error_code="MISSING_SCALING_FACTOR")
+                return float(factor)
+                
+            elif value == 'LITER_WATER':
+                # Map water_liters
+                factor = template_parameters.get('water_liters')
+                if factor is None:
+                    raise ValidationError(message="Missing 'water_liters' for LITER_WATER calculation", error_code="MISSING_SCALING_FACTOR")
+                return float(factor)
+                
+            elif value is None:
+                 # Fixed amount if per is not specified? Or error? Assuming fixed.
+                 return 1.0
+                 
+            else:
+                 raise ValidationError(message=f"Invalid dosage per: {value}", error_code="INVALID_DOSAGE_PER")
+        
+        if value == 'per_acre':
             # Requirement 6.8: Multiply by area
             area = template_parameters.get('area') or template_parameters.get('total_acres')
             if area is None:
                 raise ValidationError(
                     message="Area/Total Acres required for per_acre calculation",
                     error_code="MISSING_AREA_PARAMETER",
-                    details={"calculation_basis": calculation_basis}
+                    details={"calculation_basis": value}
                 )
-            return float(base_quantity) * float(area)
+            return float(area)
         
-        elif calculation_basis == 'per_plant':
+        elif value == 'per_plant':
             # Requirement 6.9: Multiply by plant_count
             plant_count = template_parameters.get('plant_count') or template_parameters.get('total_plants')
             if plant_count is None:
                 raise ValidationError(
                     message="Plant count/Total Plants required for per_plant calculation",
                     error_code="MISSING_PLANT_COUNT_PARAMETER",
-                    details={"calculation_basis": calculation_basis}
+                    details={"calculation_basis": value}
                 )
-            return float(base_quantity) * float(plant_count)
+            return float(plant_count)
         
-        elif calculation_basis == 'fixed':
+        elif value == 'fixed':
             # Requirement 6.10: Use quantity directly
-            return float(base_quantity)
+            return 1.0
         
         else:
             raise ValidationError(
-                message=f"Invalid calculation_basis: {calculation_basis}",
+                message=f"Invalid calculation_basis: {value}",
                 error_code="INVALID_CALCULATION_BASIS",
-                details={"calculation_basis": calculation_basis}
+                details={"calculation_basis": value}
             )
     
+    def compile_task_calculation(self, task_details_template: Dict[str, Any]) -> CompiledTaskCalculation:
+        """
+        Parse a template task's calculations once, for evaluation against many crops.
+        
+        Mirrors calculate_task_quantities: the result has the same structure,
+        with each quantity replaced by its base value and scaling kind.
+        
+        Raises:
+            KeyError, TypeError, ValueError: If the template is malformed
+        """
+        kinds: Dict[ScalingKind, None] = {}
+        
+        def scaled(base: Any, kind: ScalingKind) -> _Scaled:
+            kinds[kind] = None
+            return _Scaled(float(base), kind)
+        
+        skeleton: Dict[str, Any] = {}
+        
+        if 'input_items' in task_details_template:
+            items = []
+            for item in task_details_template['input_items']:
+                if 'dosage' in item:
+                    dosage = item['dosage']
+                    result_item = {
+                        'input_item_id': item['input_item_id'],
+                        'quantity': scaled(dosage['amount'], ('dosage', dosage.get('per'))),
+                        'quantity_unit_id': dosage.get('unit_id') or dosage.get('unit'),
+                        'dosage': dosage
+                    }
+                    if 'application_method_id' in item:
+                        result_item['application_method_id'] = item['application_method_id']
+                    items.append(result_item)
+                else:
+                    items.append({
+                        'input_item_id': item['input_item_id'],
+                        'quantity': scaled(item['quantity'], ('basis', item['calculation_basis'])),
+                        'quantity_unit_id': item['quantity_unit_id']
+                    })
+            skeleton['input_items'] = items
+        
+        if 'labor' in task_details_template:
+            labor = task_details_template['labor']
+            skeleton['labor'] = {
+                'estimated_hours': scaled(labor['estimated_hours'], ('basis', labor['calculation_basis']))
+            }
+            if 'worker_count' in labor:
+                skeleton['labor']['worker_count'] = labor['worker_count']
+        
+        if 'machinery' in task_details_template:
+            machinery = task_details_template['machinery']
+            skeleton['machinery'] = {
+                'equipment_type': machinery['equipment_type'],
+                'estimated_hours': scaled(machinery['estimated_hours'], ('basis', machinery['calculation_basis']))
+            }
+        
+        if 'concentration' in task_details_template:
+            concentration = task_details_template['concentration']
+            volume = scaled(concentration['solution_volume'], ('basis', concentration['calculation_basis']))
+            skeleton['concentration'] = {
+                'total_solution_volume': volume,
+                'total_solution_volume_unit_id': concentration['solution_volume_unit_id'],
+                'ingredients': [
+                    {
+                        'input_item_id': ing['input_item_id'],
+                        'total_quantity': _Ingredient(float(ing['concentration_per_liter']), volume),
+                        'quantity_unit_id': ing['concentration_unit_id'],
+                        'concentration_per_liter': ing['concentration_per_liter']
+                    }
+                    for ing in concentration['ingredients']
+                ]
+            }
+        
+        # Flat structure (dosage + input item at root)
+        if 'dosage_amount' in task_details_template and 'input_item_id' in task_details_template:
+            amount = task_details_template.get('dosage_amount', 0)
+            per = task_details_template.get('dosage_per', 'ACRE')
+            result_item = {
+                'input_item_id': task_details_template['input_item_id'],
+                'quantity': scaled(amount, ('dosage', per)),
+                'quantity_unit_id': task_details_template.get('dosage_unit'),
+                'dosage': {
+                    'amount': amount,
+                    'per': per,
+                    'unit': task_details_template.get('dosage_unit')
+                }
+            }
+            if 'application_method_id' in task_details_template:
+                result_item['application_method_id'] = task_details_template['application_method_id']
+            skeleton.setdefault('input_items', []).append(result_item)
+        
+        required_params: Set[str] = set()
+        self._collect_required_parameters(task_details_template, required_params)
+        return CompiledTaskCalculation(skeleton, list(kinds), required_params)
+    
+    def resolve_scaling_factors(
+        self,
+        kinds: List[ScalingKind],
+        template_parameters: Dict[str, Any]
+    ) -> Dict[ScalingKind, float]:
+        """
+        Resolve the scaling factors of one crop's parameters, once for all its tasks.
+        
+        Raises:
+            ValidationError: If a factor is missing or a kind is invalid
+        """
+        return {kind: self._scaling_factor(kind, template_parameters) for kind in kinds}
+    
     def validate_template_parameters(
         self,
         task_details_template: Dict[str, Any],
@@ -346,7 +523,19 @@ class ScheduleCalculationService:
         
         # Check all calculation_basis fields in template
         self._collect_required_parameters(task_details_template, required_params)
+        self.check_template_parameters(required_params, template_parameters)
+    
+    def check_template_parameters(
+        self,
+        required_params: Set[str],
+        template_parameters: Dict[str, Any]
+    ) -> None:
+        """
+        Check template_parameters against parameters collected from template tasks.
         
+        Raises:
+            ValidationError: If required parameters are missing
+        """
         # Validate required parameters are present
         missing_params = []
         for param in required_params:
@@ -0,0 +1,329 @@
+"""
+Schedule Hydration Service for Uzhathunai v2.0.
+
+Resolves the denormalized display fields of schedule list and detail views
+(task counts, crop/plot/farm names, FSP authorship and translated names of
+input items, tasks, application methods and units) for a whole page in a
+constant number of queries.
+"""
+import threading
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session, joinedload
+
+from app.core.cache import LocalLRUCache
+from app.core.logging import get_logger
+from app.models.crop import Crop
+from app.models.enums import OrganizationType, TaskStatus
+from app.models.input_item import InputItem, InputItemTranslation
+from app.models.measurement_unit import MeasurementUnit
+from app.models.organization import Organization
+from app.models.plot import Plot
+from app.models.reference_data import ReferenceData, ReferenceDataTranslation, Task, TaskTranslation
+from app.models.schedule import Schedule, ScheduleTask
+
+logger = get_logger(__name__)
+
+# Translation rows are (entity_id, fallback_code, language_code, name)
+TranslationRow = Tuple[Any, Optional[str], Optional[str], Optional[str]]
+
+
+class TranslationNameCache:
+    """
+    Per-language in-process LRU cache of translated display names.
+
+    Keys are (entity_type, entity_id) inside one LRU per language, so hot
+    languages cannot evict each other's entries.
+    """
+
+    def __init__(self, maxsize_per_language: int = 5000, ttl: int = 300):
+        self.maxsize_per_language = maxsize_per_language
+        self.ttl = ttl
+        self._caches: Dict[str, LocalLRUCache] = {}
+        self._lock = threading.Lock()
+
+    def _cache_for(self, language_code: str) -> LocalLRUCache:
+        with self._lock:
+            cache = self._caches.get(language_code)
+            if cache is None:
+                cache = LocalLRUCache(maxsize=self.maxsize_per_language, ttl=self.ttl)
+                self._caches[language_code] = cache
+            return cache
+
+    def get_many(
+        self,
+        entity_type: str,
+        language_code: str,
+        entity_ids: Iterable[str]
+    ) -> Tuple[Dict[str, str], List[str]]:
+        """Return (cached names, ids missing from the cache)."""
+        cache = self._cache_for(language_code)
+        found = {}
+        missing = []
+        for entity_id in entity_ids:
+            name = cache.get((entity_type, entity_id))
+            if name is None:
+                missing.append(entity_id)
+            else:
+                found[entity_id] = name
+        return found, missing
+
+    def set_many(self, entity_type: str, language_code: str, names: Dict[str, str]) -> None:
+        """Cache resolved names for one entity type and language."""
+        cache = self._cache_for(language_code)
+        for entity_id, name in names.items():
+            cache.set((entity_type, entity_id), name)
+
+    def invalidate(self, entity_type: str, entity_id: Optional[Any] = None) -> None:
+        """Drop cached names for one entity (or a whole entity type) in every language."""
+        with self._lock:
+            caches = list(self._caches.values())
+
+        for cache in caches:
+            if entity_id is None:
+                cache.delete_where(lambda key: key[0] == entity_type)
+            else:
+                cache.delete((entity_type, str(entity_id)))
+
+    def clear(self) -> None:
+        """Drop all cached names."""
+        with self._lock:
+            self._caches.clear()
+
+
+# Global translation name cache shared by all requests in this process
+translation_name_cache = TranslationNameCache()
+
+
+def _valid_uuids(values: Iterable[Any]) -> List[str]:
+    """Keep only values that parse as UUIDs (task_details may hold unit codes like 'kg')."""
+    valid = []
+    for value in values:
+        if not value:
+            continue
+        try:
+            valid.append(str(uuid.UUID(str(value))))
+        except ValueError:
+            continue
+    return valid
+
+
+class ScheduleHydrationService:
+    """Service for batch-resolving schedule display fields."""
+
+    def __init__(self, db: Session, name_cache: Optional[TranslationNameCache] = None):
+        self.db = db
+        self.name_cache = name_cache or translation_name_cache
+
+    @staticmethod
+    def list_load_options() -> list:
+        """Eager-load options resolving crop → plot → farm and the creator in the main query."""
+        return [
+            joinedload(Schedule.crop).joinedload(Crop.plot).joinedload(Plot.farm),
+            joinedload(Schedule.creator)
+        ]
+
+    # ------------------------------------------------------------------
+    # Schedule-level fields
+    # ------------------------------------------------------------------
+
+    def get_task_counts(self, schedule_ids: List[UUID]) -> Dict[UUID, Tuple[int, int]]:
+        """
+        Get (total, completed) task counts for many schedules in one grouped query.
+        """
+        if not schedule_ids:
+            return {}
+
+        rows = self.db.query(
+            ScheduleTask.schedule_id,
+            func.count(ScheduleTask.id),
+            func.count(case((ScheduleTask.status == TaskStatus.COMPLETED, ScheduleTask.id)))
+        ).filter(
+            ScheduleTask.schedule_id.in_(schedule_ids)
+        ).group_by(ScheduleTask.schedule_id).all()
+
+        return {schedule_id: (total, completed) for schedule_id, total, completed in rows}
+
+    @staticmethod
+    def _creator_organization_id(schedule: Schedule) -> Optional[str]:
+        """Creator org stored at creation time, falling back to the creator's current org."""
+        creator_org_id = None
+        if schedule.template_parameters and isinstance(schedule.template_parameters, dict):
+            creator_org_id = schedule.template_parameters.get('creator_organization_id')
+
+        if not creator_org_id and schedule.creator:
+            creator_org_id = schedule.creator.current_organization_id
+
+        return str(creator_org_id) if creator_org_id else None
+
+    def get_creator_organizations(
+        self,
+        schedules: List[Schedule]
+    ) -> Dict[UUID, Tuple[str, OrganizationType]]:
+        """
+        Resolve the creating organization (name, type) of each schedule in one query.
+
+        Returns:
+            Mapping of schedule_id -> (organization name, organization type)
+        """
+        schedule_org_ids = {
+            schedule.id: self._creator_organization_id(schedule) for schedule in schedules
+        }
+        org_ids = _valid_uuids(set(filter(None, schedule_org_ids.values())))
+        if not org_ids:
+            return {}
+
+        rows = self.db.query(
+            Organization.id, Organization.name, Organization.organization_type
+        ).filter(Organization.id.in_(org_ids)).all()
+        orgs = {str(org_id): (name, org_type) for org_id, name, org_type in rows}
+
+        return {
+            schedule_id: orgs[org_id]
+            for schedule_id, org_id in schedule_org_ids.items()
+            if org_id in orgs
+        }
+
+    @staticmethod
+    def apply_location_names(schedule: Schedule) -> None:
+        """Populate crop_name, field_name and farm_name from the (eager-loaded) crop path."""
+        if schedule.crop:
+            schedule.crop_name = schedule.crop.name
+            if schedule.crop.plot:
+                schedule.field_name = schedule.crop.plot.name
+                if schedule.crop.plot.farm:
+                    schedule.farm_name = schedule.crop.plot.farm.name
+
+    def hydrate_schedules(self, schedules: List[Schedule]) -> None:
+        """
+        Populate list-view computed fields for a page of schedules.
+
+        Sets total_tasks, completed_tasks, status, crop/field/farm names and
+        FSP authorship using one grouped count and one organization lookup.
+        Expects schedules to be loaded with list_load_options().
+        """
+        if not schedules:
+            return
+
+        task_counts = self.get_task_counts([schedule.id for schedule in schedules])
+        creator_orgs = self.get_creator_organizations(schedules)
+
+        for schedule in schedules:
+            total, completed = task_counts.get(schedule.id, (0, 0))
+            schedule.total_tasks = total
+            schedule.completed_tasks = completed
+
+            # Frontend expects: ACTIVE, COMPLETED, PENDING, CANCELLED
+            schedule.status = 'ACTIVE' if schedule.is_active else 'CANCELLED'
+
+            try:
+                self.apply_location_names(schedule)
+            except Exception as e:
+                logger.warning(f"Error populating extra fields for schedule {schedule.id}: {e}")
+
+            org_name, org_type = creator_orgs.get(schedule.id, (None, None))
+            if org_type == OrganizationType.FSP:
+                schedule.fsp_name = org_name
+                schedule.is_fsp_created = True
+            else:
+                schedule.is_fsp_created = False
+
+    # ------------------------------------------------------------------
+    # Translated names
+    # ------------------------------------------------------------------
+
+    def _resolve_names(
+        self,
+        entity_type: str,
+        entity_ids: Iterable[Any],
+        language_code: str,
+        fetch_rows: Callable[[List[str]], List[TranslationRow]]
+    ) -> Dict[str, str]:
+        """
+        Resolve display names through the LRU cache, fetching misses in one query.
+
+        Name preference: requested language, then English, then the first
+        available translation, then the entity code.
+        """
+        ids = _valid_uuids(set(entity_ids))
+        if not ids:
+            return {}
+
+        names, missing = self.name_cache.get_many(entity_type, language_code, ids)
+        if not missing:
+            return names
+
+        translations: Dict[str, Dict[str, str]] = {}
+        codes: Dict[str, Optional[str]] = {}
+        for entity_id, code, row_language, name in fetch_rows(missing):
+            key = str(entity_id)
+            codes[key] = code
+            if row_language and name:
+                translations.setdefault(key, {}).setdefault(row_language, name)
+
+        fetched = {}
+        for key, code in codes.items():
+            by_language = translations.get(key, {})
+            name = (
+                by_language.get(language_code)
+                or by_language.get('en')
+                or next(iter(by_language.values()), None)
+                or code
+            )
+            if name:
+                fetched[key] = name
+
+        self.name_cache.set_many(entity_type, language_code, fetched)
+        names.update(fetched)
+        return names
+
+    def get_input_item_names(self, input_item_ids: Iterable[Any], language_code: str = 'en') -> Dict[str, str]:
+        """Resolve input item names with one translation query for all cache misses."""
+        def fetch(ids: List[str]) -> List[TranslationRow]:
+            return self.db.query(
+                InputItem.id, InputItem.code, InputItemTranslation.language_code, InputItemTranslation.name
+            ).outerjoin(
+                InputItemTranslation, InputItemTranslation.input_item_id == InputItem.id
+            ).filter(InputItem.id.in_(ids)).all()
+
+        return self._resolve_names("input_item", input_item_ids, language_code, fetch)
+
+    def get_task_names(self, task_ids: Iterable[Any], language_code: str = 'en') -> Dict[str, str]:
+        """Resolve task type names with one translation query for all cache misses."""
+        def fetch(ids: List[str]) -> List[TranslationRow]:
+            return self.db.query(
+                Task.id, Task.code, TaskTranslation.language_code, TaskTranslation.name
+            ).outerjoin(
+                TaskTranslation, TaskTranslation.task_id == Task.id
+            ).filter(Task.id.in_(ids)).all()
+
+        return self._resolve_names("task", task_ids, language_code, fetch)
+
+    def get_reference_data_names(self, reference_data_ids: Iterable[Any], language_code: str = 'en') -> Dict[str, str]:
+        """Resolve reference data (e.g. application method) names with one translation query."""
+        def fetch(ids: List[str]) -> List[TranslationRow]:
+            return self.db.query(
+                ReferenceData.id,
+                ReferenceData.code,
+                ReferenceDataTranslation.language_code,
+                ReferenceDataTranslation.display_name
+            ).outerjoin(
+                ReferenceDataTranslation, ReferenceDataTranslation.reference_data_id == ReferenceData.id
+            ).filter(ReferenceData.id.in_(ids)).all()
+
+        return self._resolve_names("reference_data", reference_data_ids, language_code, fetch)
+
+    def get_unit_symbols(self, unit_ids: Iterable[Any]) -> Dict[str, str]:
+        """Resolve measurement unit symbols (falling back to code) in one query."""
+        ids = _valid_uuids(set(unit_ids))
+        if not ids:
+            return {}
+
+        rows = self.db.query(
+            MeasurementUnit.id, MeasurementUnit.symbol, MeasurementUnit.code
+        ).filter(MeasurementUnit.id.in_(ids)).all()
+
+        return {str(unit_id): symbol or code for unit_id, symbol, code in rows}
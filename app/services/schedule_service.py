@@ -8,8 +8,8 @@ from datetime import date, datetime, timedelta
 import uuid
 import logging
 from uuid import UUID
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import and_, or_, func, insert, select
 
 from app.models.schedule import Schedule, ScheduleTask
 from app.models.schedule_template import ScheduleTemplate, ScheduleTemplateTask
@@ -18,16 +18,38 @@ from app.models.user import User
 from app.models.enums import TaskStatus, WorkOrderStatus
 from app.models.input_item import InputItem
 from app.models.reference_data import Task, ReferenceData
-from app.schemas.schedule import ScheduleWithTasksResponse, ScheduleTaskCreate
+from app.schemas.schedule import ScheduleWithTasksResponse, ScheduleTaskCreate, ScheduleDeploymentTarget
 from app.core.logging import get_logger
 from app.core.exceptions import NotFoundError, ValidationError, PermissionError
+from app.core.pagination import paginate
+from app.services.dashboard_snapshot_service import ENTITY_FIELDS, dashboard_snapshot_service
 from app.services.schedule_calculation_service import ScheduleCalculationService
 from app.services.rbac_service import RBACService
 from app.services.work_order_scope_service import WorkOrderScopeService
+from app.services.schedule_hydration_service import ScheduleHydrationService
 from app.models.enums import WorkOrderScopeType
 
 logger = get_logger(__name__)
 
+# Human-readable labels for activity types
+ACTIVITY_TYPE_LABELS = {
+    'PLOUGHING': 'Ploughing',
+    'FOLIAR_SPRAY': 'Foliar Spray',
+    'HARVESTING': 'Harvesting',
+    'FERTIGATION': 'Fertigation',
+    'BASAL_DOSE': 'Basal Dose Application',
+    'DRENCHING': 'Drenching',
+    'BED_PREPARATION': 'Bed Preparation',
+    'EARTHING_UP': 'Earthing Up',
+    'IRRIGATION': 'Irrigation',
+    'WEEDING': 'Weeding',
+    'PRUNING': 'Pruning',
+    'THINNING': 'Thinning',
+    'TRANSPLANTING': 'Transplanting',
+    'SOWING': 'Sowing',
+    'GENERAL_FARMING': 'General Farming',
+}
+
 
 class ScheduleService:
     """Service for managing schedules."""
@@ -37,6 +59,7 @@ class ScheduleService:
         self.calculation_service = ScheduleCalculationService()
         self.rbac_service = RBACService(db)
         self.scope_service = WorkOrderScopeService(db)
+        self.hydration_service = ScheduleHydrationService(db)
     
     def create_schedule_from_template(
         self,
@@ -142,25 +165,6 @@ class ScheduleService:
         # Create schedule tasks with calculations (Requirement 6.7, 6.8, 6.9, 6.10, 6.11, 6.12)
         start_date = date.fromisoformat(template_parameters['start_date'])
         
-        # Human-readable labels for activity types
-        ACTIVITY_TYPE_LABELS = {
-            'PLOUGHING': 'Ploughing',
-            'FOLIAR_SPRAY': 'Foliar Spray',
-            'HARVESTING': 'Harvesting',
-            'FERTIGATION': 'Fertigation',
-            'BASAL_DOSE': 'Basal Dose Application',
-            'DRENCHING': 'Drenching',
-            'BED_PREPARATION': 'Bed Preparation',
-            'EARTHING_UP': 'Earthing Up',
-            'IRRIGATION': 'Irrigation',
-            'WEEDING': 'Weeding',
-            'PRUNING': 'Pruning',
-            'THINNING': 'Thinning',
-            'TRANSPLANTING': 'Transplanting',
-            'SOWING': 'Sowing',
-            'GENERAL_FARMING': 'General Farming',
-        }
-        
         for template_task in template_tasks:
             # Calculate due date (Requirement 6.7)
             due_date = start_date + timedelta(days=template_task.day_offset)
@@ -179,25 +183,7 @@ class ScheduleService:
             if not task_details and tdt:
                 task_details = dict(tdt)  # Store raw template details as a copy
             
-            # Determine task name. Priority:
-            # 1. Explicitly set task_name in template details (injected by frontend add.tsx)
-            # 2. Map from activity_type in template details
-            # 3. Linked task ORM name (fallback, often generic like "Ploughing" for all)
-            # 4. Hardcoded fallback
-            task_name = None
-            if tdt.get('task_name'):
-                task_name = tdt['task_name']
-            elif tdt.get('activity_type') and tdt['activity_type'] in ACTIVITY_TYPE_LABELS:
-                task_name = ACTIVITY_TYPE_LABELS[tdt['activity_type']]
-            elif tdt.get('activity_type'):
-                # Unknown activity type: convert SNAKE_CASE to Title Case
-                task_name = tdt['activity_type'].replace('_', ' ').title()
-            
-            if not task_name:
-                if template_task.task:
-                    task_name = template_task.task.name
-                else:
-                    task_name = "Scheduled Task"
+            task_name = self._template_task_name(template_task)
             
             # Create schedule task (Requirement 6.12)
             schedule_task = ScheduleTask(
@@ -231,6 +217,231 @@ class ScheduleService:
         schedule.status = 'ACTIVE' # Has tasks
         return schedule
     
+    def deploy_template(
+        self,
+        template_id: UUID,
+        name: str,
+        targets: List[ScheduleDeploymentTarget],
+        user: User
+    ) -> List[Dict[str, Any]]:
+        """
+        Create schedules from one template for many crops in one transaction.
+        
+        The template is loaded and its task calculations compiled once; per
+        crop only the scaling factors are resolved before every task is
+        evaluated. Crop existence and access are checked for the whole batch
+        with one query each, and schedules and tasks are inserted with one
+        bulk INSERT each.
+        
+        A crop that is missing, not writable, listed twice or has invalid
+        parameters is reported in its result and skipped; the other crops are
+        still deployed. Problems with the template itself fail the batch.
+        
+        Args:
+            template_id: Schedule template ID
+            name: Schedule name for targets without their own
+            targets: Crops with their template parameters
+            user: User creating the schedules
+        
+        Returns:
+            One result per target, in order: crop_id with schedule_id and
+            tasks_count, or with error_code and message
+        """
+        from app.models.organization import Organization
+        from app.models.enums import OrganizationType
+        from app.models.plot import Plot
+        from app.models.farm import Farm
+        
+        org_type = self.db.query(Organization.organization_type).filter(
+            Organization.id == user.current_organization_id
+        ).scalar()
+        if org_type == OrganizationType.FARMING:
+            raise PermissionError(
+                message="Farming organizations are only allowed to create schedules from scratch.",
+                error_code="TEMPLATE_ACCESS_DENIED",
+                details={"organization_id": str(user.current_organization_id)}
+            )
+        
+        template = self.db.query(ScheduleTemplate).filter(
+            ScheduleTemplate.id == template_id,
+            ScheduleTemplate.is_active == True
+        ).first()
+        
+        if not template:
+            raise NotFoundError(
+                message=f"Schedule template {template_id} not found or inactive",
+                error_code="TEMPLATE_NOT_FOUND",
+                details={"template_id": str(template_id)}
+            )
+        
+        template_tasks = self.db.query(ScheduleTemplateTask).options(
+            selectinload(ScheduleTemplateTask.task)
+        ).filter(
+            ScheduleTemplateTask.schedule_template_id == template_id
+        ).order_by(ScheduleTemplateTask.sort_order).all()
+        
+        if not template_tasks:
+            raise ValidationError(
+                message="Template has no tasks",
+                error_code="EMPTY_TEMPLATE",
+                details={"template_id": str(template_id)}
+            )
+        
+        # Compile every template task once for the whole batch
+        try:
+            compiled_tasks = [
+                self.calculation_service.compile_task_calculation(t.task_details_template or {})
+                for t in template_tasks
+            ]
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValidationError(
+                message="Template task details are invalid",
+                error_code="INVALID_TEMPLATE",
+                details={"template_id": str(template_id), "error": str(e)}
+            )
+        required_params = set().union(*(c.required_parameters for c in compiled_tasks))
+        kinds = list(dict.fromkeys(kind for c in compiled_tasks for kind in c.kinds))
+        task_names = [self._template_task_name(t) for t in template_tasks]
+        
+        # Resolve existence and access for all crops at once
+        crop_ids = list(dict.fromkeys(target.crop_id for target in targets))
+        existing = set(self.db.execute(select(Crop.id).where(Crop.id.in_(crop_ids))).scalars())
+        if user.is_system_user():
+            writable, denial = existing, None
+        elif org_type == OrganizationType.FSP:
+            writable = self.scope_service.fsp_writable_crop_ids(user.current_organization_id, crop_ids)
+            denial = ("FSP requires active work order with write permission for this crop", "FSP_NO_WRITE_ACCESS")
+        else:
+            writable = set(self.db.execute(
+                select(Crop.id).join(Plot, Plot.id == Crop.plot_id).join(Farm, Farm.id == Plot.farm_id).where(
+                    Crop.id.in_(crop_ids),
+                    Farm.organization_id == user.current_organization_id
+                )
+            ).scalars())
+            denial = ("Cannot create schedule for crop not owned by your organization", "CROP_NOT_OWNED")
+        
+        results = []
+        schedule_rows = []
+        task_rows = []
+        seen = set()
+        
+        for target in targets:
+            crop_id = target.crop_id
+            params = target.template_parameters
+            try:
+                if crop_id in seen:
+                    raise ValidationError(
+                        message=f"Crop {crop_id} is listed more than once",
+                        error_code="DUPLICATE_CROP"
+                    )
+                seen.add(crop_id)
+                if crop_id not in existing:
+                    raise NotFoundError(message=f"Crop {crop_id} not found", error_code="CROP_NOT_FOUND")
+                if crop_id not in writable:
+                    raise PermissionError(message=denial[0], error_code=denial[1])
+                
+                self.calculation_service.check_template_parameters(required_params, params)
+                try:
+                    start_date = date.fromisoformat(params['start_date'])
+                    factors = self.calculation_service.resolve_scaling_factors(kinds, params)
+                except (TypeError, ValueError) as e:
+                    raise ValidationError(
+                        message=f"Invalid template parameters: {e}",
+                        error_code="INVALID_TEMPLATE_PARAMETERS"
+                    )
+            except (ValidationError, NotFoundError, PermissionError) as e:
+                results.append({"crop_id": crop_id, "error_code": e.error_code, "message": e.message})
+                continue
+            
+            final_params = dict(params)
+            if user.current_organization_id:
+                final_params['creator_organization_id'] = str(user.current_organization_id)
+            
+            schedule_id = uuid.uuid4()
+            schedule_rows.append({
+                "id": schedule_id,
+                "crop_id": crop_id,
+                "template_id": template_id,
+                "name": target.name or name,
+                "description": f"Created from template: {template.code}",
+                "template_parameters": final_params,
+                "is_active": True,
+                "created_by": user.id,
+                "updated_by": user.id
+            })
+            
+            for template_task, compiled, task_name in zip(template_tasks, compiled_tasks, task_names):
+                task_details = compiled.calculate(factors)
+                # As in create_schedule_from_template: keep raw details of tasks without quantities
+                if not task_details and template_task.task_details_template:
+                    task_details = dict(template_task.task_details_template)
+                task_rows.append({
+                    "schedule_id": schedule_id,
+                    "task_id": template_task.task_id,
+                    "due_date": start_date + timedelta(days=template_task.day_offset),
+                    "status": TaskStatus.NOT_STARTED,
+                    "task_name": task_name,
+                    "task_details": task_details,
+                    "notes": template_task.notes,
+                    "created_by": user.id,
+                    "updated_by": user.id
+                })
+            
+            results.append({"crop_id": crop_id, "schedule_id": schedule_id, "tasks_count": len(template_tasks)})
+        
+        if schedule_rows:
+            affected_org_ids = set(self.db.execute(
+                select(Farm.organization_id).join(Plot, Plot.farm_id == Farm.id).join(
+                    Crop, Crop.plot_id == Plot.id
+                ).where(Crop.id.in_([row["crop_id"] for row in schedule_rows])).distinct()
+            ).scalars())
+            if user.current_organization_id:
+                affected_org_ids.add(user.current_organization_id)
+            
+            self.db.execute(insert(Schedule), schedule_rows)
+            self.db.execute(insert(ScheduleTask), task_rows)
+            self.db.commit()
+            
+            # Bulk inserts bypass the session's flush hooks, so drop the
+            # dashboard fields those hooks would have dropped
+            fields = ENTITY_FIELDS[Schedule] | ENTITY_FIELDS[ScheduleTask]
+            dashboard_snapshot_service.invalidate({org_id: fields for org_id in affected_org_ids})
+        
+        logger.info(
+            "Template deployed to crops",
+            extra={
+                "template_id": str(template_id),
+                "schedules_created": len(schedule_rows),
+                "tasks_created": len(task_rows),
+                "failed": len(targets) - len(schedule_rows),
+                "user_id": str(user.id)
+            }
+        )
+        
+        return results
+    
+    def _template_task_name(self, template_task: ScheduleTemplateTask) -> str:
+        """
+        Name of the schedule task created from a template task.
+        
+        Priority:
+        1. Explicitly set task_name in template details (injected by frontend add.tsx)
+        2. Map from activity_type in template details
+        3. Linked task ORM name (fallback, often generic like "Ploughing" for all)
+        4. Hardcoded fallback
+        """
+        tdt = template_task.task_details_template or {}
+        if tdt.get('task_name'):
+            return tdt['task_name']
+        if tdt.get('activity_type') and tdt['activity_type'] in ACTIVITY_TYPE_LABELS:
+            return ACTIVITY_TYPE_LABELS[tdt['activity_type']]
+        if tdt.get('activity_type'):
+            # Unknown activity type: convert SNAKE_CASE to Title Case
+            return tdt['activity_type'].replace('_', ' ').title()
+        if template_task.task:
+            return template_task.task.name
+        return "Scheduled Task"
+    
     def create_schedule_from_scratch(
         self,
         crop_id: UUID,
@@ -391,8 +602,9 @@ class ScheduleService:
         fsp_id: Optional[UUID] = None,
         status: Optional[str] = None,
         page: int = 1,
-        limit: int = 20
-    ) -> Tuple[List[Schedule], int]:
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Schedule], int, Optional[str]]:
         """
         Get schedules with access control.
         
@@ -401,16 +613,15 @@ class ScheduleService:
             crop_id: Optional filter by crop
             fsp_id: Optional filter by Service Partner organization
             status: Optional filter by status (ACTIVE, CANCELLED)
-            page: Page number
+            page: Page number, when no cursor is given
             limit: Items per page
+            cursor: next_cursor of the previous page
         
         Returns:
-            Tuple of (schedules list, total count)
+            Tuple of (schedules list, total count, next page cursor or None)
         
         Validates: Requirements 6.3, 7.2, 7.3
         """
-        offset = (page - 1) * limit
-        
         # Build base query
         query = self.db.query(Schedule)
         
@@ -443,77 +654,25 @@ class ScheduleService:
             # System users can see all schedules
             pass
         else:
-            # Get accessible crop IDs for user
-            accessible_crop_ids = self._get_accessible_crop_ids(user)
-            query = query.filter(Schedule.crop_id.in_(accessible_crop_ids))
-        
-        # Get total count
-        total = query.count()
-        
-        # Get paginated results
-        schedules = query.order_by(Schedule.created_at.desc()).offset(offset).limit(limit).all()
-        
-        # Populate computed fields for response schema
-        for schedule in schedules:
-            # 0. Populate task counts for list view
-            from app.models.schedule import ScheduleTask
-            schedule.total_tasks = self.db.query(func.count(ScheduleTask.id)).filter(ScheduleTask.schedule_id == schedule.id).scalar()
-            schedule.completed_tasks = self.db.query(func.count(ScheduleTask.id)).filter(
-                ScheduleTask.schedule_id == schedule.id,
-                ScheduleTask.status == TaskStatus.COMPLETED
-            ).scalar()
-
-            # 1. Computed Status
-            # Logic: If active -> ACTIVE, else CANCELLED. 
-            # TODO: Add logic for COMPLETED based on all tasks being completed
-            schedule.status = TaskStatus.NOT_STARTED.value if not schedule.tasks else 'ACTIVE' 
-            # Use 'ACTIVE' as generic status string or map to Enum if needed.
-            # Frontend expects: ACTIVE, COMPLETED, PENDING, CANCELLED
-            if schedule.is_active:
-                schedule.status = 'ACTIVE'
-            else:
-                schedule.status = 'CANCELLED'
-                
-            # 2. Farm, Plot, and Crop Names
-            try:
-                if schedule.crop:
-                    schedule.crop_name = schedule.crop.name
-                    if schedule.crop.plot:
-                        schedule.field_name = schedule.crop.plot.name
-                        if schedule.crop.plot.farm:
-                            schedule.farm_name = schedule.crop.plot.farm.name
-            except Exception as e:
-                logger.warning(f"Error populating extra fields for schedule {schedule.id}: {e}")
-            
-            # 3. FSP Information
-            try:
-                if schedule.creator:
-                    # Check if creator_organization_id was stored at creation time
-                    creator_org_id = None
-                    if schedule.template_parameters and isinstance(schedule.template_parameters, dict):
-                        creator_org_id = schedule.template_parameters.get('creator_organization_id')
-                    
-                    # Fallback to current_organization_id if not stored (for old schedules)
-                    if not creator_org_id:
-                        creator_org_id = schedule.creator.current_organization_id
-                    
-                    if creator_org_id:
-                        from app.models.organization import Organization
-                        from app.models.enums import OrganizationType
-                        
-                        creator_org = self.db.query(Organization).filter(
-                            Organization.id == creator_org_id
-                        ).first()
-                        
-                        if creator_org and creator_org.organization_type == OrganizationType.FSP:
-                            schedule.fsp_name = creator_org.name
-                            schedule.is_fsp_created = True
-                        else:
-                            schedule.is_fsp_created = False
-                    else:
-                        schedule.is_fsp_created = False
-            except Exception as e:
-                logger.warning(f"Error populating FSP info for schedule {schedule.id}: {e}")
+            # Restrict to crops accessible to user, resolved in the same statement
+            query = query.filter(Schedule.crop_id.in_(
+                self.scope_service.accessible_crop_ids_query(user.current_organization_id)
+            ))
+        
+        # Paginated results with crop → plot → farm and creator eager-loaded
+        result = paginate(
+            query.options(*ScheduleHydrationService.list_load_options()),
+            Schedule.created_at,
+            Schedule.id,
+            name="schedules",
+            cursor=cursor,
+            page=page,
+            limit=limit
+        )
+        schedules, total = result.items, result.total
+        
+        # Populate computed fields for response schema (grouped counts, bulk org lookup)
+        self.hydration_service.hydrate_schedules(schedules)
 
         logger.info(
             "Schedules retrieved",
@@ -525,7 +684,7 @@ class ScheduleService:
             }
         )
         
-        return schedules, total
+        return schedules, total, result.next_cursor
 
     def get_schedule_with_details(self, user: User, schedule_id: UUID) -> ScheduleWithTasksResponse:
         """
@@ -533,7 +692,10 @@ class ScheduleService:
         
         Populates extra fields: input_item_name, application_method_name, total_quantity_required, dosage, area
         """
-        schedule = self.db.query(Schedule).filter(
+        schedule = self.db.query(Schedule).options(
+            *ScheduleHydrationService.list_load_options(),
+            selectinload(Schedule.tasks)
+        ).filter(
             Schedule.id == schedule_id,
             Schedule.is_active == True
         ).first()
@@ -548,40 +710,33 @@ class ScheduleService:
         schedule.status = 'ACTIVE' if schedule.is_active else 'CANCELLED'
         
         try:
-            if schedule.crop:
-                schedule.crop_name = schedule.crop.name
-                if schedule.crop.plot:
-                    schedule.field_name = schedule.crop.plot.name
-                    if schedule.crop.plot.farm:
-                        schedule.farm_name = schedule.crop.plot.farm.name
+            self.hydration_service.apply_location_names(schedule)
         except Exception as e:
             logger.warning(f"Error populating extra fields for schedule {schedule.id}: {e}")
 
         try:
-            if schedule.creator:
-                # Check if creator_organization_id was stored at creation time
-                creator_org_id = None
-                if schedule.template_parameters and isinstance(schedule.template_parameters, dict):
-                    creator_org_id = schedule.template_parameters.get('creator_organization_id')
+            creator_org = self.hydration_service.get_creator_organizations([schedule]).get(schedule.id)
+            if creator_org:
+                from app.models.enums import OrganizationType
                 
-                # Fallback to current_organization_id if not stored (for old schedules)
-                if not creator_org_id:
-                    creator_org_id = schedule.creator.current_organization_id
-                
-                if creator_org_id:
-                    from app.models.organization import Organization
-                    from app.models.enums import OrganizationType
-                    
-                    creator_org = self.db.query(Organization).filter(
-                        Organization.id == creator_org_id
-                    ).first()
-                    
-                    if creator_org:
-                        schedule.fsp_name = creator_org.name
-                        schedule.is_fsp_created = creator_org.organization_type == OrganizationType.FSP
+                org_name, org_type = creator_org
+                schedule.fsp_name = org_name
+                schedule.is_fsp_created = org_type == OrganizationType.FSP
         except Exception as e:
             logger.warning(f"Error populating FSP info for schedule {schedule.id}: {e}")
 
+        # Task type names for display fallbacks, resolved once for all tasks
+        orm_task_map = {t.id: t for t in schedule.tasks}
+        task_type_names = self.hydration_service.get_task_names(
+            {t.task_id for t in schedule.tasks if not t.task_name}
+        )
+
+        def display_task_name(task_id: UUID) -> str:
+            orm_task = orm_task_map.get(task_id)
+            if not orm_task:
+                return "Generic Task"
+            return orm_task.task_name or task_type_names.get(str(orm_task.task_id)) or "Unknown Task"
+
         # Convert to Pydantic model
         response = ScheduleWithTasksResponse.from_orm(schedule)
         
@@ -653,12 +808,8 @@ class ScheduleService:
             
             # Final fallback for task_name if still null (for old schedules or missing template name)
             if not task.task_name:
-                # Find the matching ORM task to get its display_task_name (which handles fallback to task type name)
-                orm_task = next((t for t in schedule.tasks if t.id == task.id), None)
-                if orm_task:
-                    task.task_name = orm_task.display_task_name
-                else:
-                    task.task_name = "Generic Task"
+                # Use the matching ORM task's display name (falls back to task type name)
+                task.task_name = display_task_name(task.id)
             
             # CRITICAL FIX: Assign the calculated/fetched details back to the task object
             # This ensures the frontend receives the full details (machinery, labour, etc.)
@@ -703,48 +854,10 @@ class ScheduleService:
             
             task_data_map[task.id] = extracted
         
-        # --- 3. Bulk Fetch Names & Units ---
-        input_item_names = {}
-        if input_item_ids:
-            items = self.db.query(InputItem).filter(InputItem.id.in_(input_item_ids)).all()
-            for item in items:
-                name = item.code # Default
-                if item.translations:
-                    # Prefer English, fallback to first
-                    for t in item.translations:
-                        if t.language_code == 'en':
-                            name = t.name
-                            break
-                    else:
-                        name = item.translations[0].name
-                input_item_names[str(item.id)] = name
-                
-        method_names = {}
-        if method_ids:
-            methods = self.db.query(ReferenceData).filter(ReferenceData.id.in_(method_ids)).all()
-            for method in methods:
-                 method_names[str(method.id)] = method.display_name
-        
-        unit_map = {} # id -> symbol (or code)
-        if unit_ids:
-             from app.models.measurement_unit import MeasurementUnit
-             
-             # Filter out non-UUID values to avoid database errors
-             valid_unit_uuids = []
-             for uid in unit_ids:
-                  try:
-                       if uid:
-                            uuid.UUID(str(uid))
-                            valid_unit_uuids.append(uid)
-                  except ValueError:
-                       # Likely a code like 'kg', 'L', etc.
-                       pass
-             
-             if valid_unit_uuids:
-                 units = self.db.query(MeasurementUnit).filter(MeasurementUnit.id.in_(valid_unit_uuids)).all()
-                 for unit in units:
-                      # Prefer symbol, fallback to code
-                      unit_map[str(unit.id)] = unit.symbol or unit.code
+        # --- 3. Bulk Fetch Names & Units (one query per entity type, cached) ---
+        input_item_names = self.hydration_service.get_input_item_names(input_item_ids)
+        method_names = self.hydration_service.get_reference_data_names(method_ids)
+        unit_map = self.hydration_service.get_unit_symbols(unit_ids)  # id -> symbol (or code)
 
         # --- 4. Populate Response ---
         
@@ -774,9 +887,8 @@ class ScheduleService:
                      if task.input_item_name and task.input_item_name not in ["Generic Task", "Unknown Item"]:
                           task.task_name = task.input_item_name
                      elif not task.task_name or task.task_name == "Generic Task":
-                          # Fallback to model's display_task_name if possible
-                          orm_task = next((t for t in schedule.tasks if t.id == task.id), None)
-                          task.task_name = orm_task.display_task_name if orm_task else "Generic Task"
+                          # Fallback to model's display name if possible
+                          task.task_name = display_task_name(task.id)
                           
                 # Ultimate fallback for task_name if still not set
                 if not task.task_name:
@@ -959,74 +1071,9 @@ class ScheduleService:
     
     def _get_accessible_crop_ids(self, user: User) -> List[UUID]:
         """Get list of crop IDs accessible to user."""
-        from app.models.plot import Plot
-        from app.models.farm import Farm
-        from app.models.work_order import WorkOrder, WorkOrderScope
-        from app.models.enums import WorkOrderScopeType
-        
-        accessible_crop_ids = []
-        
-        # Get crops from user's organization
-        farms = self.db.query(Farm).filter(
-            Farm.organization_id == user.current_organization_id
-        ).all()
-        
-        for farm in farms:
-            plots = self.db.query(Plot).filter(Plot.farm_id == farm.id).all()
-            for plot in plots:
-                crops = self.db.query(Crop).filter(Crop.plot_id == plot.id).all()
-                accessible_crop_ids.extend([crop.id for crop in crops])
-        
-        # If FSP user, add crops from work orders
-        if self._is_fsp_consultancy_user(user):
-            work_orders = self.db.query(WorkOrder).filter(
-                WorkOrder.fsp_organization_id == user.current_organization_id,
-                WorkOrder.status == WorkOrderStatus.ACTIVE
-            ).all()
-            
-            for work_order in work_orders:
-                # 1. Check Global Access (Grant Farm Access)
-                if work_order.access_granted:
-                    # Get all crops for the farming organization
-                    org_farms = self.db.query(Farm).filter(Farm.organization_id == work_order.farming_organization_id).all()
-                    for farm in org_farms:
-                        farm_plots = self.db.query(Plot).filter(Plot.farm_id == farm.id).all()
-                        for plot in farm_plots:
-                            plot_crops = self.db.query(Crop).filter(Crop.plot_id == plot.id).all()
-                            accessible_crop_ids.extend([c.id for c in plot_crops])
-                    continue
-
-                # 2. Check Scoped Access
-                scope_items = self.db.query(WorkOrderScope).filter(
-                    WorkOrderScope.work_order_id == work_order.id
-                ).all()
-                
-                for item in scope_items:
-                    if item.scope == WorkOrderScopeType.ORGANIZATION:
-                        # Add all crops for this organization
-                        org_farms = self.db.query(Farm).filter(Farm.organization_id == item.scope_id).all()
-                        for farm in org_farms:
-                            farm_plots = self.db.query(Plot).filter(Plot.farm_id == farm.id).all()
-                            for plot in farm_plots:
-                                plot_crops = self.db.query(Crop).filter(Crop.plot_id == plot.id).all()
-                                accessible_crop_ids.extend([c.id for c in plot_crops])
-                                
-                    elif item.scope == WorkOrderScopeType.FARM:
-                        # Add all crops for this farm
-                        farm_plots = self.db.query(Plot).filter(Plot.farm_id == item.scope_id).all()
-                        for plot in farm_plots:
-                            plot_crops = self.db.query(Crop).filter(Crop.plot_id == plot.id).all()
-                            accessible_crop_ids.extend([c.id for c in plot_crops])
-                            
-                    elif item.scope == WorkOrderScopeType.PLOT:
-                         # Add all crops for this plot
-                        plot_crops = self.db.query(Crop).filter(Crop.plot_id == item.scope_id).all()
-                        accessible_crop_ids.extend([c.id for c in plot_crops])
-                        
-                    elif item.scope == WorkOrderScopeType.CROP:
-                        accessible_crop_ids.append(item.scope_id)
-        
-        return list(set(accessible_crop_ids))  # Remove duplicates
+        return self.db.execute(
+            self.scope_service.accessible_crop_ids_query(user.current_organization_id)
+        ).scalars().all()
     
     def copy_schedule(
         self,
@@ -1156,9 +1203,6 @@ class ScheduleService:
             logger.warning("[HYDRATION] No tasks to hydrate")
             return
             
-        from app.models.input_item import InputItem, InputItemTranslation
-        from app.models.measurement_unit import MeasurementUnit, MeasurementUnitTranslation
-        from app.models.reference_data import ReferenceData, ReferenceDataTranslation
         from app.schemas.schedule import Dosage
         
         # 1. Collect IDs
@@ -1198,51 +1242,16 @@ class ScheduleService:
 
         logger.info(f"[HYDRATION] Collected IDs - InputItems: {len(input_item_ids)}, Units: {len(unit_ids)}")
         
-        # 2. Bulk Fetch
-        input_item_map = {}
-        if input_item_ids:
-            # Prefer translation, fallback to code/default name
-            # For simplicity, fetching code/name. A real robust solution joins translations.
-            # Assuming 'en' for now or code.
-            items = self.db.query(InputItem).filter(InputItem.id.in_(list(input_item_ids))).all()
-            for item in items:
-                # Naive name fetch: translation or code. 
-                # Ideally: fetch translation.
-                name = item.code # Fallback
-                # Try to get translation
-                # Logic: We can't easily join in this bulk fetch without complexity.
-                # Let's rely on a property or specific fetch if needed.
-                # Checking InputItem model... has 'translations'.
-                # Accessing 'translations' might trigger N+1 if not eager loaded.
-                # Let's just use a simple name fetch for now or rely on loaded translations if lazy=False (default is lazy)
-                # To be improved: eager load.
-                
-                # Fetch translation manually or use helper
-                # Using a quick query for translations for these items
-                trans = self.db.query(InputItemTranslation).filter(
-                    InputItemTranslation.input_item_id == item.id,
-                    InputItemTranslation.language_code == language_code
-                ).first()
-                if trans:
-                    name = trans.name
-                
-                input_item_map[str(item.id)] = name
-
-        unit_map = {}
-        if unit_ids:
-            units = self.db.query(MeasurementUnit).filter(MeasurementUnit.id.in_(list(unit_ids))).all()
-            for unit in units:
-                unit_map[str(unit.id)] = unit.symbol or unit.code
+        # 2. Bulk Fetch (one translation query per entity type, backed by the name cache)
+        input_item_map = self.hydration_service.get_input_item_names(input_item_ids, language_code)
+        unit_map = self.hydration_service.get_unit_symbols(unit_ids)
+        task_name_map = self.hydration_service.get_task_names(
+            {task.task_id for task in tasks if task.task_id}, language_code
+        )
 
         logger.info(f"[HYDRATION] Fetched {len(input_item_map)} input items, {len(unit_map)} units")
         
         # 3. Hydrate Objects
-        from app.models.reference_data import TaskTranslation
-
-        active_task_translations = {}
-        # Optimization: Fetch task translations for all tasks in schedule if needed
-        # (Assuming laziness is okay for now or relying on existing load)
-        
         for task in tasks:
             # Initialize (Null by default)
             # Use __dict__ to bypass @property setters
@@ -1273,46 +1282,10 @@ class ScheduleService:
             task.__dict__['input_item_name'] = i_name
 
             # --- Application Method Name ---
+            # Fallback to the task type name (e.g. "Foliar Spray")
             app_name = td.get('application_method_name')
-            if not app_name:
-                 # Fallback to Task Name (e.g. "Foliar Spray")
-                 # Avoid using task.name as it might not exist.
-                 if task.task:
-                     # Try to get translation if loaded/available
-                     # This is N+1 if not careful, but for <50 tasks valid.
-                     # We can try to fetch translation for preferred lang.
-                     # Or use code as last resort.
-                     
-                     # Check if we can find translation in loaded list?
-                     # task.task.translations is a relationship.
-                     # Prefer direct query or simplified property if avail.
-                     
-                     # Simple robust fallback: Code
-                     resolved_name = task.task.code
-                     
-                     # Try translation
-                     # We can query it if not too heavy, or rely on loaded translations
-                     try:
-                         # Manual query to avoid N+1 issue on large lists? 
-                         # Actually we can trust lazy load or cache.
-                         # Let's simple query for this task's translation.
-                         t_trans = self.db.query(TaskTranslation).filter(
-                             TaskTranslation.task_id == task.task_id,
-                             TaskTranslation.language_code == language_code
-                         ).first()
-                         
-                         if not t_trans and language_code != 'en':
-                             t_trans = self.db.query(TaskTranslation).filter(
-                                 TaskTranslation.task_id == task.task_id,
-                                 TaskTranslation.language_code == 'en'
-                             ).first()
-                             
-                         if t_trans:
-                             resolved_name = t_trans.name
-                     except:
-                         pass
-                     
-                     app_name = resolved_name
+            if not app_name and task.task_id:
+                app_name = task_name_map.get(str(task.task_id))
             
             task.__dict__['application_method_name'] = app_name
             
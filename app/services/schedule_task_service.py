@@ -328,10 +328,9 @@ class ScheduleTaskService:
         today = date.today()
         future_limit = today + timedelta(days=days_ahead)
         
-        # This is a bit complex because we need to filter by accessible schedules
-        # Get accessible crop IDs
-        from app.services.schedule_service import ScheduleService
-        accessible_crop_ids = ScheduleService(self.db)._get_accessible_crop_ids(user)
+        # Filter by accessible schedules, resolved in the same statement
+        from app.services.work_order_scope_service import WorkOrderScopeService
+        accessible_crop_ids = WorkOrderScopeService(self.db).accessible_crop_ids_query(user.current_organization_id)
         
         # Query tasks
         query = self.db.query(ScheduleTask).join(Schedule)
@@ -94,6 +94,8 @@ class SharingService:
         # Transition to SHARED status
         audit.status = AuditStatus.SHARED
         audit.shared_at = datetime.utcnow()
+        # Rendered report PDFs are stale
+        audit.report_version = Audit.report_version + 1
 
         self.db.commit()
         self.db.refresh(audit)
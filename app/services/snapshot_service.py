@@ -5,11 +5,16 @@ This service creates immutable snapshots of templates and parameters at audit cr
 Snapshots capture complete configuration including options, validation rules, and translations.
 """
 
-from typing import Dict, Any, List, Optional
+import hashlib
+import json
+from collections import defaultdict
+from typing import Dict, Any, Iterable, List, Optional
 from uuid import UUID
 from datetime import datetime
 from sqlalchemy.orm import Session
 
+from app.core.cache import LocalLRUCache
+from app.core.config import settings
 from app.core.logging import get_logger
 from app.core.exceptions import NotFoundError, ServiceError
 from app.models.parameter import Parameter, ParameterTranslation, ParameterOptionSetMap
@@ -19,6 +24,33 @@ from app.models.section import Section, SectionTranslation
 
 logger = get_logger(__name__)
 
+# Memoized template snapshots as JSON text, keyed by (template_id, version, updated_at).
+# The TTL bounds how long edits to shared parameters, sections and options take to show.
+_template_snapshots = LocalLRUCache(
+    maxsize=settings.TEMPLATE_SNAPSHOT_CACHE_SIZE,
+    ttl=settings.TEMPLATE_SNAPSHOT_CACHE_TTL
+)
+
+
+# Keys recording when a snapshot was taken rather than what it captures
+VOLATILE_SNAPSHOT_KEYS = frozenset({"snapshot_date"})
+
+
+def snapshot_content(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a snapshot without its volatile keys, as hashed and stored."""
+    return {key: value for key, value in snapshot.items() if key not in VOLATILE_SNAPSHOT_KEYS}
+
+
+def snapshot_content_hash(snapshot: Dict[str, Any]) -> str:
+    """
+    SHA-256 of a snapshot's canonical JSON (sorted keys, no whitespace).
+    
+    Equal snapshots hash equally regardless of key order and of when they
+    were taken, so the hash can be used to store each distinct snapshot once.
+    """
+    canonical = json.dumps(snapshot_content(snapshot), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
 
 class SnapshotService:
     """
@@ -54,82 +86,13 @@ class SnapshotService:
             extra={"parameter_id": str(parameter_id)}
         )
 
-        # Get parameter
-        parameter = self.db.query(Parameter).filter(Parameter.id == parameter_id).first()
-        if not parameter:
-            raise NotFoundError(
-                message=f"Parameter {parameter_id} not found",
-                error_code="PARAMETER_NOT_FOUND",
-                details={"parameter_id": str(parameter_id)}
-            )
-
-        # Build snapshot
-        snapshot = {
-            "parameter_id": str(parameter.id),
-            "code": parameter.code,
-            "parameter_type": parameter.parameter_type.value,
-            "parameter_metadata": parameter.parameter_metadata or {},
-            "option_set_id": None,
-            "options": [],
-            "translations": {},
-            "snapshot_date": datetime.utcnow().isoformat()
-        }
-
-        # Get translations
-        translations = self.db.query(ParameterTranslation).filter(
-            ParameterTranslation.parameter_id == parameter_id
-        ).all()
-
-        for trans in translations:
-            snapshot["translations"][trans.language_code] = {
-                "name": trans.name,
-                "description": trans.description,
-                "help_text": trans.help_text
-            }
-
-        # Get option set and options (for SINGLE_SELECT and MULTI_SELECT)
-        if parameter.parameter_type.value in ['SINGLE_SELECT', 'MULTI_SELECT']:
-            option_set_map = self.db.query(ParameterOptionSetMap).filter(
-                ParameterOptionSetMap.parameter_id == parameter_id
-            ).first()
-
-            if option_set_map:
-                option_set = self.db.query(OptionSet).filter(
-                    OptionSet.id == option_set_map.option_set_id
-                ).first()
-
-                if option_set:
-                    snapshot["option_set_id"] = str(option_set.id)
-
-                    # Get options
-                    options = self.db.query(Option).filter(
-                        Option.option_set_id == option_set.id,
-                        Option.is_active == True
-                    ).order_by(Option.sort_order).all()
-
-                    for option in options:
-                        option_data = {
-                            "option_id": str(option.id),
-                            "code": option.code,
-                            "sort_order": option.sort_order,
-                            "translations": {}
-                        }
-
-                        # Get option translations
-                        option_translations = self.db.query(OptionTranslation).filter(
-                            OptionTranslation.option_id == option.id
-                        ).all()
-
-                        for opt_trans in option_translations:
-                            option_data["translations"][opt_trans.language_code] = opt_trans.display_text
-
-                        snapshot["options"].append(option_data)
+        snapshot = self._build_parameter_snapshots([parameter_id])[UUID(str(parameter_id))]
 
         logger.info(
             "Parameter snapshot created",
             extra={
                 "parameter_id": str(parameter_id),
-                "parameter_type": parameter.parameter_type.value,
+                "parameter_type": snapshot["parameter_type"],
                 "has_options": len(snapshot["options"]) > 0
             }
         )
@@ -146,6 +109,11 @@ class SnapshotService:
         - All multilingual translations
         - Parameter snapshots for each parameter
         
+        The tree is loaded in a fixed number of queries and memoized per
+        (template_id, version, updated_at); later audits from the same
+        template version get a fresh copy of the cached snapshot with the
+        current snapshot_date.
+        
         Args:
             template_id: UUID of the template
             
@@ -169,7 +137,36 @@ class SnapshotService:
                 details={"template_id": str(template_id)}
             )
 
-        # Build snapshot
+        cache_key = (template.id, template.version, template.updated_at)
+        cached = _template_snapshots.get(cache_key) if _template_snapshots.ttl else None
+        if cached is not None:
+            snapshot = json.loads(cached)
+            snapshot["snapshot_date"] = datetime.utcnow().isoformat()
+            logger.info(
+                "Template snapshot reused",
+                extra={"template_id": str(template_id), "version": template.version}
+            )
+            return snapshot
+
+        # Cached as JSON text: immutable, and every caller decodes its own copy
+        encoded = json.dumps(self._build_template_snapshot(template))
+        if _template_snapshots.ttl:
+            _template_snapshots.set(cache_key, encoded)
+        snapshot = json.loads(encoded)
+
+        logger.info(
+            "Template snapshot created",
+            extra={
+                "template_id": str(template_id),
+                "sections_count": len(snapshot["sections"]),
+                "total_parameters": sum(len(s["parameters"]) for s in snapshot["sections"])
+            }
+        )
+
+        return snapshot
+
+    def _build_template_snapshot(self, template: Template) -> Dict[str, Any]:
+        """Load a template's sections, parameters and translations set-wise and assemble the snapshot."""
         snapshot = {
             "template_id": str(template.id),
             "code": template.code,
@@ -180,9 +177,8 @@ class SnapshotService:
             "snapshot_date": datetime.utcnow().isoformat()
         }
 
-        # Get template translations
         template_translations = self.db.query(TemplateTranslation).filter(
-            TemplateTranslation.template_id == template_id
+            TemplateTranslation.template_id == template.id
         ).all()
 
         for trans in template_translations:
@@ -191,20 +187,19 @@ class SnapshotService:
                 "description": trans.description
             }
 
-        # Get template sections
-        template_sections = self.db.query(TemplateSection).filter(
-            TemplateSection.template_id == template_id
+        # Template sections whose section no longer exists are skipped by the join
+        template_sections = self.db.query(TemplateSection, Section).join(
+            Section, Section.id == TemplateSection.section_id
+        ).filter(
+            TemplateSection.template_id == template.id
         ).order_by(TemplateSection.sort_order).all()
 
-        for template_section in template_sections:
-            # Get section details
-            section = self.db.query(Section).filter(
-                Section.id == template_section.section_id
-            ).first()
-
-            if not section:
-                continue
+        if not template_sections:
+            return snapshot
 
+        sections_by_template_section = {}
+        sections_by_section = defaultdict(list)
+        for template_section, section in template_sections:
             section_data = {
                 "section_id": str(section.id),
                 "code": section.code,
@@ -212,48 +207,148 @@ class SnapshotService:
                 "translations": {},
                 "parameters": []
             }
+            snapshot["sections"].append(section_data)
+            sections_by_template_section[template_section.id] = section_data
+            sections_by_section[section.id].append(section_data)
 
-            # Get section translations
-            section_translations = self.db.query(SectionTranslation).filter(
-                SectionTranslation.section_id == section.id
-            ).all()
+        section_translations = self.db.query(SectionTranslation).filter(
+            SectionTranslation.section_id.in_(list(sections_by_section))
+        ).all()
 
-            for sec_trans in section_translations:
+        for sec_trans in section_translations:
+            for section_data in sections_by_section[sec_trans.section_id]:
                 section_data["translations"][sec_trans.language_code] = {
                     "name": sec_trans.name,
                     "description": sec_trans.description
                 }
 
-            # Get template parameters for this section
-            template_parameters = self.db.query(TemplateParameter).filter(
-                TemplateParameter.template_section_id == template_section.id
-            ).order_by(TemplateParameter.sort_order).all()
+        template_parameters = self.db.query(TemplateParameter).filter(
+            TemplateParameter.template_section_id.in_(list(sections_by_template_section))
+        ).order_by(TemplateParameter.sort_order).all()
 
-            for template_param in template_parameters:
-                # Create parameter snapshot
-                param_snapshot = self.create_parameter_snapshot(template_param.parameter_id)
+        parameter_snapshots = self._build_parameter_snapshots(
+            [template_param.parameter_id for template_param in template_parameters]
+        )
 
-                parameter_data = {
-                    "parameter_id": str(template_param.parameter_id),
-                    "is_required": template_param.is_required,
-                    "sort_order": template_param.sort_order,
-                    "parameter_snapshot": param_snapshot
-                }
+        for template_param in template_parameters:
+            sections_by_template_section[template_param.template_section_id]["parameters"].append({
+                "parameter_id": str(template_param.parameter_id),
+                "is_required": template_param.is_required,
+                "sort_order": template_param.sort_order,
+                "parameter_snapshot": parameter_snapshots[template_param.parameter_id]
+            })
 
-                section_data["parameters"].append(parameter_data)
+        return snapshot
 
-            snapshot["sections"].append(section_data)
+    def _build_parameter_snapshots(self, parameter_ids: Iterable[Any]) -> Dict[UUID, Dict[str, Any]]:
+        """
+        Build snapshots for many parameters in a fixed number of queries.
+        
+        Returns:
+            Snapshots keyed by parameter UUID
+            
+        Raises:
+            NotFoundError: If any parameter is not found
+        """
+        ids = list(dict.fromkeys(UUID(str(parameter_id)) for parameter_id in parameter_ids))
+        if not ids:
+            return {}
 
-        logger.info(
-            "Template snapshot created",
-            extra={
-                "template_id": str(template_id),
-                "sections_count": len(snapshot["sections"]),
-                "total_parameters": sum(len(s["parameters"]) for s in snapshot["sections"])
+        parameters = {
+            parameter.id: parameter
+            for parameter in self.db.query(Parameter).filter(Parameter.id.in_(ids)).all()
+        }
+        for parameter_id in ids:
+            if parameter_id not in parameters:
+                raise NotFoundError(
+                    message=f"Parameter {parameter_id} not found",
+                    error_code="PARAMETER_NOT_FOUND",
+                    details={"parameter_id": str(parameter_id)}
+                )
+
+        snapshot_date = datetime.utcnow().isoformat()
+        snapshots = {
+            parameter_id: {
+                "parameter_id": str(parameter_id),
+                "code": parameters[parameter_id].code,
+                "parameter_type": parameters[parameter_id].parameter_type.value,
+                "parameter_metadata": parameters[parameter_id].parameter_metadata or {},
+                "option_set_id": None,
+                "options": [],
+                "translations": {},
+                "snapshot_date": snapshot_date
             }
-        )
+            for parameter_id in ids
+        }
 
-        return snapshot
+        translations = self.db.query(ParameterTranslation).filter(
+            ParameterTranslation.parameter_id.in_(ids)
+        ).all()
+
+        for trans in translations:
+            snapshots[trans.parameter_id]["translations"][trans.language_code] = {
+                "name": trans.name,
+                "description": trans.description,
+                "help_text": trans.help_text
+            }
+
+        # Get option sets and options (for SINGLE_SELECT and MULTI_SELECT)
+        select_ids = [
+            parameter_id for parameter_id in ids
+            if parameters[parameter_id].parameter_type.value in ['SINGLE_SELECT', 'MULTI_SELECT']
+        ]
+        if not select_ids:
+            return snapshots
+
+        option_set_for: Dict[UUID, UUID] = {}
+        option_set_maps = self.db.query(
+            ParameterOptionSetMap.parameter_id, ParameterOptionSetMap.option_set_id
+        ).join(
+            OptionSet, OptionSet.id == ParameterOptionSetMap.option_set_id
+        ).filter(
+            ParameterOptionSetMap.parameter_id.in_(select_ids)
+        ).all()
+
+        for parameter_id, option_set_id in option_set_maps:
+            option_set_for.setdefault(parameter_id, option_set_id)
+
+        if not option_set_for:
+            return snapshots
+
+        options = self.db.query(Option).filter(
+            Option.option_set_id.in_(set(option_set_for.values())),
+            Option.is_active == True
+        ).order_by(Option.sort_order).all()
+
+        options_by_set = defaultdict(list)
+        options_by_id = {}
+        for option in options:
+            option_data = {
+                "option_id": str(option.id),
+                "code": option.code,
+                "sort_order": option.sort_order,
+                "translations": {}
+            }
+            options_by_set[option.option_set_id].append(option_data)
+            options_by_id[option.id] = option_data
+
+        if options_by_id:
+            option_translations = self.db.query(OptionTranslation).filter(
+                OptionTranslation.option_id.in_(list(options_by_id))
+            ).all()
+
+            for opt_trans in option_translations:
+                options_by_id[opt_trans.option_id]["translations"][opt_trans.language_code] = opt_trans.display_text
+
+        for parameter_id, option_set_id in option_set_for.items():
+            snapshots[parameter_id]["option_set_id"] = str(option_set_id)
+            # Parameters sharing an option set get their own option dicts
+            snapshots[parameter_id]["options"] = [
+                dict(option_data, translations=dict(option_data["translations"]))
+                for option_data in options_by_set[option_set_id]
+            ]
+
+        return snapshots
 
     def validate_snapshot_integrity(self, snapshot: Dict[str, Any]) -> bool:
         """
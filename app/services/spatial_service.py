@@ -1,8 +1,11 @@
 """
 Spatial service for GIS operations using PostGIS.
 """
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, List, Tuple, Optional
 from decimal import Decimal
+import math
+import re
+import struct
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
@@ -11,6 +14,75 @@ from app.core.exceptions import ValidationError
 
 logger = get_logger(__name__)
 
+# WKB geometry type codes
+WKB_POINT = 1
+WKB_POLYGON = 3
+
+# EWKB flags carried in the high bits of the geometry type
+_EWKB_Z = 0x80000000
+_EWKB_M = 0x40000000
+_EWKB_SRID = 0x20000000
+
+_WKT_NUMBER_PAIR = re.compile(r"(-?[\d.eE+-]+)\s+(-?[\d.eE+-]+)")
+
+# WGS84 ellipsoid, as used by PostGIS geography (SRID 4326)
+_WGS84_A = 6378137.0
+_WGS84_F = 1 / 298.257223563
+_WGS84_E = math.sqrt(_WGS84_F * (2 - _WGS84_F))
+
+
+def _authalic_q(lat_rad: float) -> float:
+    """The q function of the authalic latitude for the WGS84 ellipsoid."""
+    e = _WGS84_E
+    sin_lat = math.sin(lat_rad)
+    return (1 - e * e) * (
+        sin_lat / (1 - (e * sin_lat) ** 2)
+        - math.log((1 - e * sin_lat) / (1 + e * sin_lat)) / (2 * e)
+    )
+
+
+_AUTHALIC_QP = _authalic_q(math.pi / 2)
+# Radius of the sphere with the same surface area as the ellipsoid
+_AUTHALIC_RADIUS = _WGS84_A * math.sqrt(_AUTHALIC_QP / 2)
+
+
+def _authalic_latitude(lat_rad: float) -> float:
+    """Latitude on the authalic sphere (equal-area mapping from the ellipsoid)."""
+    return math.asin(max(-1.0, min(1.0, _authalic_q(lat_rad) / _AUTHALIC_QP)))
+
+
+def _ring_excess(ring: List[List[float]]) -> float:
+    """Signed spherical excess (steradians) of a closed [lon, lat] ring on the authalic sphere."""
+    excess = 0.0
+    points = [(math.radians(lon), _authalic_latitude(math.radians(lat))) for lon, lat in ring]
+    for (lon1, lat1), (lon2, lat2) in zip(points, points[1:]):
+        delta = (lon2 - lon1 + math.pi) % (2 * math.pi) - math.pi
+        t1 = math.tan(lat1 / 2)
+        t2 = math.tan(lat2 / 2)
+        excess += 2 * math.atan2(math.tan(delta / 2) * (t1 + t2), 1 + t1 * t2)
+    return excess
+
+
+def _unit_vector(lon: float, lat: float) -> Tuple[float, float, float]:
+    """Unit vector on the sphere for a lon/lat position in degrees."""
+    lon_rad, lat_rad = math.radians(lon), math.radians(lat)
+    return (
+        math.cos(lat_rad) * math.cos(lon_rad),
+        math.cos(lat_rad) * math.sin(lon_rad),
+        math.sin(lat_rad)
+    )
+
+
+def _triangle_excess(a, b, c) -> float:
+    """Signed spherical excess of the triangle a, b, c given as unit vectors."""
+    triple = (
+        a[0] * (b[1] * c[2] - b[2] * c[1])
+        - a[1] * (b[0] * c[2] - b[2] * c[0])
+        + a[2] * (b[0] * c[1] - b[1] * c[0])
+    )
+    dots = sum(a[i] * b[i] for i in range(3)) + sum(b[i] * c[i] for i in range(3)) + sum(c[i] * a[i] for i in range(3))
+    return 2 * math.atan2(triple, 1 + dots)
+
 
 class SpatialService:
     """Service for spatial/GIS operations using PostGIS."""
@@ -418,3 +490,248 @@ class SpatialService:
         )
         
         return centroid
+    
+    def evaluate_plots(
+        self,
+        plot_boundaries: List[Dict[str, Any]],
+        farm_boundary: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Evaluate a batch of plot boundaries against a farm in one PostGIS statement.
+        
+        For every plot computes containment in the farm boundary, area and
+        centroid, and for every pair of plots the area they share. Pairs that
+        only touch along an edge are not reported as overlapping.
+        
+        Args:
+            plot_boundaries: GeoJSON polygons for the plots
+            farm_boundary: GeoJSON polygon for the farm (optional)
+            
+        Returns:
+            Dict with 'plots' (one entry per input, in order, with 'index',
+            'within_farm', 'area_sq_meters' and 'centroid') and 'overlaps'
+            (entries with 'plots' index pair and 'area_sq_meters')
+            
+        Raises:
+            ValidationError: If any boundary is invalid
+        """
+        if not plot_boundaries:
+            return {"plots": [], "overlaps": []}
+        
+        plot_wkts = []
+        for boundary in plot_boundaries:
+            self.validate_boundary(boundary)
+            plot_wkts.append(self.create_polygon(boundary['coordinates'][0]))
+        
+        farm_wkt = None
+        if farm_boundary:
+            self.validate_boundary(farm_boundary)
+            farm_wkt = self.create_polygon(farm_boundary['coordinates'][0])
+        
+        # Plots are addressed by their 1-based position in the input array.
+        # ST_Within works with geometry, not geography, as in validate_plot_within_farm.
+        query = text("""
+            WITH farm AS (
+                SELECT ST_GeogFromText(CAST(:farm_wkt AS text)) AS geog
+            ),
+            plots AS (
+                SELECT t.idx, ST_GeogFromText(t.wkt) AS geog
+                FROM unnest(CAST(:plot_wkts AS text[])) WITH ORDINALITY AS t(wkt, idx)
+            ),
+            overlaps AS (
+                SELECT a.idx AS idx, b.idx AS other_idx,
+                       ST_Area(ST_Intersection(a.geog, b.geog)) AS area
+                FROM plots a
+                JOIN plots b ON a.idx < b.idx AND ST_Intersects(a.geog, b.geog)
+            )
+            SELECT p.idx, NULL::bigint AS other_idx,
+                   ST_Within(p.geog::geometry, farm.geog::geometry) AS within_farm,
+                   ST_Area(p.geog) AS area,
+                   ST_Y(ST_Centroid(p.geog)::geometry) AS lat,
+                   ST_X(ST_Centroid(p.geog)::geometry) AS lon
+            FROM plots p CROSS JOIN farm
+            UNION ALL
+            SELECT idx, other_idx, NULL, area, NULL, NULL
+            FROM overlaps
+            WHERE area > 0
+            ORDER BY 1, 2 NULLS FIRST
+        """)
+        
+        rows = self.db.execute(
+            query,
+            {"farm_wkt": farm_wkt, "plot_wkts": plot_wkts}
+        ).fetchall()
+        
+        plots = []
+        overlaps = []
+        for row in rows:
+            if row.other_idx is None:
+                plots.append({
+                    "index": row.idx - 1,
+                    "within_farm": None if farm_wkt is None else bool(row.within_farm),
+                    "area_sq_meters": Decimal(str(row.area)),
+                    "centroid": {"lat": float(row.lat), "lon": float(row.lon)}
+                })
+            else:
+                overlaps.append({
+                    "plots": (row.idx - 1, row.other_idx - 1),
+                    "area_sq_meters": Decimal(str(row.area))
+                })
+        
+        logger.info(
+            "Plots evaluated",
+            extra={
+                "plots_count": len(plots),
+                "overlaps_count": len(overlaps),
+                "with_farm_boundary": farm_wkt is not None
+            }
+        )
+        
+        return {"plots": plots, "overlaps": overlaps}
+    
+    @staticmethod
+    def geodesic_area(boundary: Dict[str, Any]) -> Decimal:
+        """
+        Calculate the area of a boundary polygon in square meters without PostGIS.
+        
+        Vertices are mapped to authalic latitudes, which preserve area, and the
+        polygon's spherical excess is summed edge by edge on the authalic
+        sphere. For farm and plot sized polygons the result agrees with
+        ST_Area on geography (WGS84 spheroid) to well under 0.1%.
+        
+        Args:
+            boundary: GeoJSON polygon object (outer ring first, holes after)
+            
+        Returns:
+            Area in square meters
+        """
+        rings = boundary['coordinates']
+        area = abs(_ring_excess(rings[0])) - sum(abs(_ring_excess(ring)) for ring in rings[1:])
+        return Decimal(str(area * _AUTHALIC_RADIUS ** 2))
+    
+    @staticmethod
+    def geodesic_centroid(boundary: Dict[str, Any]) -> Dict[str, float]:
+        """
+        Get the centroid of a boundary polygon without PostGIS.
+        
+        Follows ST_Centroid on geography: the outer ring is split into a fan of
+        spherical triangles and their unit-vector centroids are averaged,
+        weighted by triangle area.
+        
+        Args:
+            boundary: GeoJSON polygon object
+            
+        Returns:
+            Dict with 'lat' and 'lon' keys
+        """
+        vectors = [_unit_vector(lon, lat) for lon, lat in boundary['coordinates'][0][:-1]]
+        origin = vectors[0]
+        total = [0.0, 0.0, 0.0]
+        for second, third in zip(vectors[1:], vectors[2:]):
+            weight = _triangle_excess(origin, second, third)
+            center = [origin[i] + second[i] + third[i] for i in range(3)]
+            norm = math.sqrt(sum(c * c for c in center)) or 1.0
+            for i in range(3):
+                total[i] += weight * center[i] / norm
+        
+        # A clockwise ring gives negative weights throughout
+        if sum(total[i] * origin[i] for i in range(3)) < 0:
+            total = [-c for c in total]
+        x, y, z = total
+        if not any(total):
+            # Degenerate ring: fall back to the mean of the vertices
+            x, y, z = (sum(v[i] for v in vectors) for i in range(3))
+        return {
+            "lat": math.degrees(math.atan2(z, math.hypot(x, y))),
+            "lon": math.degrees(math.atan2(y, x))
+        }
+    
+    @staticmethod
+    def to_geojson(value: Any) -> Optional[Dict[str, Any]]:
+        """
+        Convert a stored POINT/POLYGON geography to GeoJSON without a database round trip.
+        
+        Accepts what the ORM holds for a Geography column: a GeoAlchemy2
+        WKBElement as loaded from the database, raw (E)WKB bytes or hex, or a
+        WKT string not yet flushed (e.g. "POINT(lon lat)", optionally with an
+        "SRID=4326;" prefix).
+        
+        Args:
+            value: Geography column value
+            
+        Returns:
+            GeoJSON Point or Polygon, or None if value is empty
+        """
+        if value is None:
+            return None
+        
+        data = getattr(value, "data", value)
+        if isinstance(data, str):
+            text_value = data.strip()
+            if text_value[:1].isalpha() or text_value.upper().startswith("SRID="):
+                return SpatialService._parse_wkt(text_value)
+            data = bytes.fromhex(text_value)
+        
+        return SpatialService._decode_wkb(bytes(data))
+    
+    @staticmethod
+    def _decode_wkb(data: bytes) -> Dict[str, Any]:
+        """Decode (E)WKB POINT or POLYGON bytes into GeoJSON (2D coordinates)."""
+        byte_order = "<" if data[0] == 1 else ">"
+        (geometry_type,) = struct.unpack_from(f"{byte_order}I", data, 1)
+        offset = 5
+        
+        dimensions = 2
+        if geometry_type & (_EWKB_Z | _EWKB_M | _EWKB_SRID):
+            dimensions += bool(geometry_type & _EWKB_Z) + bool(geometry_type & _EWKB_M)
+            if geometry_type & _EWKB_SRID:
+                offset += 4
+            geometry_type &= 0x0FFFFFFF
+        else:
+            # ISO WKB encodes Z/M as 1000/2000/3000 added to the base type
+            dimensions += {0: 0, 1: 1, 2: 1, 3: 2}.get(geometry_type // 1000, 0)
+            geometry_type %= 1000
+        
+        point_size = 8 * dimensions
+        
+        if geometry_type == WKB_POINT:
+            lon, lat = struct.unpack_from(f"{byte_order}2d", data, offset)
+            return {"type": "Point", "coordinates": [lon, lat]}
+        
+        if geometry_type == WKB_POLYGON:
+            (ring_count,) = struct.unpack_from(f"{byte_order}I", data, offset)
+            offset += 4
+            rings: List[List[List[float]]] = []
+            for _ in range(ring_count):
+                (point_count,) = struct.unpack_from(f"{byte_order}I", data, offset)
+                offset += 4
+                values = struct.unpack_from(f"{byte_order}{point_count * dimensions}d", data, offset)
+                offset += point_count * point_size
+                rings.append([
+                    [values[i], values[i + 1]] for i in range(0, len(values), dimensions)
+                ])
+            return {"type": "Polygon", "coordinates": rings}
+        
+        raise ValueError(f"Unsupported WKB geometry type: {geometry_type}")
+    
+    @staticmethod
+    def _parse_wkt(wkt: str) -> Dict[str, Any]:
+        """Parse WKT POINT or POLYGON (optionally EWKT) into GeoJSON."""
+        if wkt.upper().startswith("SRID="):
+            wkt = wkt.split(";", 1)[1]
+        
+        geometry_type = wkt.split("(", 1)[0].strip().upper()
+        if geometry_type == "POINT":
+            lon, lat = _WKT_NUMBER_PAIR.search(wkt).groups()
+            return {"type": "Point", "coordinates": [float(lon), float(lat)]}
+        
+        if geometry_type == "POLYGON":
+            body = wkt[wkt.index("(") + 1:wkt.rindex(")")]
+            rings = [
+                [[float(lon), float(lat)] for lon, lat in _WKT_NUMBER_PAIR.findall(ring)]
+                for ring in body.split(")")
+                if _WKT_NUMBER_PAIR.search(ring)
+            ]
+            return {"type": "Polygon", "coordinates": rings}
+        
+        raise ValueError(f"Unsupported WKT geometry: {geometry_type}")
@@ -12,7 +12,7 @@ from sqlalchemy.orm import Session
 from app.core.logging import get_logger
 from app.core.exceptions import NotFoundError, ValidationError, PermissionError
 from app.models.schedule import TaskActual, TaskPhoto, ScheduleTask
-from app.models.enums import TaskStatus
+from app.models.enums import TaskStatus, WorkOrderScopeType
 from app.services.work_order_scope_service import WorkOrderScopeService
 
 logger = get_logger(__name__)
@@ -181,9 +181,8 @@ class TaskActualService:
                 )
             
             # Validate permission (check farm ownership)
-            from app.models.farm import Farm
-            farm = self.db.query(Farm).filter(Farm.id == plot.farm_id).first()
-            if farm.organization_id != user_org_id:
+            ancestry = self.work_order_scope_service.resolve_resource_ancestry(WorkOrderScopeType.PLOT, plot_id)
+            if ancestry[WorkOrderScopeType.ORGANIZATION] != user_org_id:
                 # Check if FSP has track permission via work order
                 self._validate_fsp_track_permission(user_org_id, 'PLOT', plot_id)
         
@@ -347,15 +346,11 @@ class TaskActualService:
         1. User owns the crop's organization
         2. OR user is FSP with track permission via work order
         """
-        # Get farm and organization
-        from app.models.plot import Plot
-        from app.models.farm import Farm
-        
-        plot = self.db.query(Plot).filter(Plot.id == crop.plot_id).first()
-        farm = self.db.query(Farm).filter(Farm.id == plot.farm_id).first()
+        # Resolve the crop's organization (reused by the FSP access check)
+        ancestry = self.work_order_scope_service.resolve_resource_ancestry(WorkOrderScopeType.CROP, crop.id)
         
         # Check if user owns the organization
-        if farm.organization_id == user_org_id:
+        if ancestry[WorkOrderScopeType.ORGANIZATION] == user_org_id:
             return True
         
         # Check if FSP has track permission via work order
@@ -369,8 +364,8 @@ class TaskActualService:
             PermissionError: If FSP lacks track permission
         """
         has_permission = self.work_order_scope_service.validate_fsp_access(
-            fsp_org_id=fsp_org_id,
-            resource_type=resource_type,
+            fsp_organization_id=fsp_org_id,
+            resource_type=WorkOrderScopeType(resource_type),
             resource_id=resource_id,
             required_permission='track'
         )
@@ -41,12 +41,12 @@ class TaskService:
             List of tasks with translations
         """
         # Check cache first
-        cache_key = self.cache._get_key(
+        cache_key = self.cache.namespaced_key(
             "tasks",
             language,
             "active" if is_active else "all"
         )
-        cached_data = self.cache.get(cache_key)
+        cached_data = self.cache.get(cache_key, namespace="tasks")
         
         if cached_data:
             logger.info(
@@ -128,8 +128,8 @@ class TaskService:
             NotFoundError: If task not found
         """
         # Check cache first
-        cache_key = self.cache._get_key("task", str(task_id), language)
-        cached_data = self.cache.get(cache_key)
+        cache_key = self.cache.namespaced_key(f"task:{task_id}", language)
+        cached_data = self.cache.get(cache_key, namespace="task")
         
         if cached_data:
             logger.info(
@@ -211,8 +211,8 @@ class TaskService:
             List of tasks in the specified category
         """
         # Check cache first
-        cache_key = self.cache._get_key("tasks", "category", category.value, language)
-        cached_data = self.cache.get(cache_key)
+        cache_key = self.cache.namespaced_key("tasks", "category", category.value, language)
+        cached_data = self.cache.get(cache_key, namespace="tasks")
         
         if cached_data:
             logger.info(
@@ -305,9 +305,8 @@ class TaskService:
         self.db.commit()
         
         # Invalidate cache
-        if hasattr(self.cache, 'delete_pattern'):
-            self.cache.delete_pattern(self.cache._get_key("tasks", "*"))
-            self.cache.delete_pattern(self.cache._get_key("task", str(task_obj.id), "*"))
+        self.cache.invalidate_namespace("tasks")
+        self.cache.invalidate_namespace(f"task:{task_obj.id}")
         
         logger.info(f"Created new task {task_obj.code} ({task_obj.id})")
         return self.get_task_by_id(task_obj.id)
@@ -342,9 +341,8 @@ class TaskService:
         self.db.commit()
         
         # Invalidate cache
-        if hasattr(self.cache, 'delete_pattern'):
-            self.cache.delete_pattern(self.cache._get_key("tasks", "*"))
-            self.cache.delete_pattern(self.cache._get_key("task", str(task_id), "*"))
+        self.cache.invalidate_namespace("tasks")
+        self.cache.invalidate_namespace(f"task:{task_id}")
         
         logger.info(f"Updated task {task.code} ({task.id})")
         return self.get_task_by_id(task_id)
@@ -359,8 +357,7 @@ class TaskService:
         self.db.commit()
         
         # Invalidate cache
-        if hasattr(self.cache, 'delete_pattern'):
-            self.cache.delete_pattern(self.cache._get_key("tasks", "*"))
-            self.cache.delete_pattern(self.cache._get_key("task", str(task_id), "*"))
+        self.cache.invalidate_namespace("tasks")
+        self.cache.invalidate_namespace(f"task:{task_id}")
         
         logger.info(f"Deleted task {task.code} ({task_id})")
@@ -12,7 +12,7 @@ from sqlalchemy.orm import Session, joinedload
 # ... (existing imports) ...
 
 
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, func, or_
 from sqlalchemy.exc import IntegrityError
 
 from app.core.logging import get_logger
@@ -458,6 +458,7 @@ class TemplateService:
         )
 
         self.db.add(template_section)
+        self._touch_template(template)
         self.db.commit()
         self.db.refresh(template_section)
 
@@ -520,6 +521,7 @@ class TemplateService:
             )
 
         self.db.delete(template_section)
+        self._touch_template(template)
         self.db.commit()
 
         logger.info(
@@ -623,6 +625,7 @@ class TemplateService:
         )
 
         self.db.add(template_parameter)
+        self._touch_template(template)
         self.db.commit()
         self.db.refresh(template_parameter)
 
@@ -704,6 +707,7 @@ class TemplateService:
             )
 
         self.db.delete(template_parameter)
+        self._touch_template(template)
         self.db.commit()
 
         logger.info(
@@ -863,6 +867,11 @@ class TemplateService:
 
         return new_template
 
+    def _touch_template(self, template: Template) -> None:
+        """Bump updated_at after a structural change so memoized snapshots are rebuilt."""
+        # clock_timestamp() rather than now(): distinct even within one transaction
+        template.updated_at = func.clock_timestamp()
+
     def _validate_modification_permission(
         self,
         template: Template,
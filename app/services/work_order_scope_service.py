@@ -3,9 +3,11 @@ Work Order Scope service for Uzhathunai v2.0.
 Handles work order scope management, permissions, and FSP access validation.
 """
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Set
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.sql import Select
+from sqlalchemy import select, union, func, or_, and_, case, exists
 from uuid import UUID
 
 from app.models.work_order import WorkOrder, WorkOrderScope
@@ -14,10 +16,14 @@ from app.models.farm import Farm
 from app.models.plot import Plot
 from app.models.crop import Crop
 from app.models.enums import (
+    OrganizationType,
     WorkOrderStatus,
     WorkOrderScopeType
 )
+from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.metrics import MetricsCollector
+from app.core.tiered_cache import tiered_cache
 from app.core.exceptions import (
     NotFoundError,
     ValidationError,
@@ -27,19 +33,20 @@ from app.core.exceptions import (
 
 logger = get_logger(__name__)
 
+# validate_fsp_access outcomes, cached per (FSP organization, resource)
+ACCESS_GRANTED = "granted"
+ACCESS_DENIED = "denied"
+ACCESS_NO_WORK_ORDER = "no_work_order"
+
+
+def fsp_access_namespace(fsp_organization_id: UUID) -> str:
+    """Cache namespace of an FSP organization's access decisions."""
+    return f"fsp_access:{fsp_organization_id}"
 
-class MetricsCollector:
-    """Simple metrics collector for tracking operations."""
-    
-    @staticmethod
-    def increment(metric_name: str, tags: dict = None):
-        """Increment a metric counter."""
-        # In production, this would send to a metrics service
-        logger.info(
-            "metric_increment",
-            metric=metric_name,
-            tags=tags or {}
-        )
+
+def invalidate_fsp_access(fsp_organization_id: UUID) -> None:
+    """Drop cached access decisions of an FSP after its work orders or scope change."""
+    tiered_cache.invalidate(fsp_access_namespace(fsp_organization_id))
 
 
 class WorkOrderScopeService:
@@ -49,6 +56,8 @@ class WorkOrderScopeService:
         self.db = db
         self.logger = get_logger(__name__)
         self.metrics = MetricsCollector()
+        # Resource ancestry resolved during this request (service instances are per request)
+        self._ancestry: Dict[tuple, Dict[WorkOrderScopeType, Optional[UUID]]] = {}
     
     def add_work_order_scope(
         self,
@@ -142,6 +151,7 @@ class WorkOrderScopeService:
             self._update_scope_metadata(work_order_id)
             
             self.db.commit()
+            invalidate_fsp_access(work_order.fsp_organization_id)
             
             # Refresh items
             # Refresh items
@@ -302,6 +312,7 @@ class WorkOrderScopeService:
             scope_item.access_permissions = permissions
             
             self.db.commit()
+            invalidate_fsp_access(work_order.fsp_organization_id)
             self.db.refresh(scope_item)
             
             # Metrics
@@ -347,6 +358,10 @@ class WorkOrderScopeService:
         - PLOT scope grants access to all crops in that plot
         - CROP scope grants access to that specific crop only
         
+        Decisions are cached per (FSP, resource) for FSP_ACCESS_CACHE_TTL
+        seconds; scope, status and access changes of the FSP's work orders
+        drop them.
+        
         Args:
             fsp_organization_id: FSP organization ID
             resource_type: Type of resource (FARM, PLOT, CROP, ORGANIZATION)
@@ -359,6 +374,8 @@ class WorkOrderScopeService:
         Raises:
             PermissionError: If access not granted
         """
+        resource_type = WorkOrderScopeType(resource_type)
+        
         self.logger.info(
             "Validating FSP access",
             extra={
@@ -369,80 +386,25 @@ class WorkOrderScopeService:
             }
         )
         
-        # Find active work orders for FSP
-        active_work_orders = self.db.query(WorkOrder).filter(
-            WorkOrder.fsp_organization_id == fsp_organization_id,
-            WorkOrder.status == WorkOrderStatus.ACTIVE
-        ).all()
+        # Scope items of access_granted work orders allow every permission, so
+        # the decision does not depend on required_permission
+        decision = tiered_cache.get_or_compute(
+            fsp_access_namespace(fsp_organization_id),
+            [resource_type.value, str(resource_id)],
+            lambda: self._decide_fsp_access(fsp_organization_id, resource_type, resource_id),
+            ttl=settings.FSP_ACCESS_CACHE_TTL
+        )
         
-        if not active_work_orders:
+        if decision == ACCESS_GRANTED:
+            return True
+        
+        if decision == ACCESS_NO_WORK_ORDER:
             raise PermissionError(
                 message="No active work orders found for FSP organization",
                 error_code="NO_ACTIVE_WORK_ORDER",
                 details={"fsp_org_id": str(fsp_organization_id)}
             )
         
-        # Check each work order for access
-        for work_order in active_work_orders:
-            # Check if farmer explicitly granted/revoked access
-            if not work_order.access_granted:
-                self.logger.info(
-                    "FSP access denied (access_granted=False)",
-                    extra={"work_order_id": str(work_order.id)}
-                )
-                continue
-
-            # Global Access Check: If access_granted is True, allow if resource belongs to farming org
-            if work_order.access_granted:
-                # Determine owner org of the resource
-                owner_org_id = None
-                if resource_type == WorkOrderScopeType.ORGANIZATION:
-                    owner_org_id = resource_id
-                else:
-                    owner_org_id = self._get_farming_org_for_resource(resource_type, resource_id)
-                
-                if owner_org_id and str(owner_org_id) == str(work_order.farming_organization_id):
-                    self.logger.info(
-                        "FSP access granted (global access)",
-                        extra={
-                            "work_order_id": str(work_order.id),
-                            "resource_type": resource_type.value,
-                            "access_granted": True
-                        }
-                    )
-                    return True
-
-            # Direct scope match
-            scope_item = self.db.query(WorkOrderScope).filter(
-                WorkOrderScope.work_order_id == work_order.id,
-                WorkOrderScope.scope == resource_type,
-                WorkOrderScope.scope_id == resource_id
-            ).first()
-            
-            if scope_item:
-                # Check if global access allows it OR specific permission set
-                if work_order.access_granted or scope_item.access_permissions.get(required_permission):
-                    self.logger.info(
-                        "FSP access granted (direct match)",
-                        extra={
-                            "work_order_id": str(work_order.id),
-                            "scope_type": resource_type.value,
-                            "access_granted": work_order.access_granted
-                        }
-                    )
-                    return True
-            
-            # Hierarchical check
-            if self._check_hierarchical_access(
-                work_order.id,
-                resource_type,
-                resource_id,
-                required_permission,
-                access_granted=work_order.access_granted
-            ):
-                return True
-        
-        # No access found
         raise PermissionError(
             message=f"FSP does not have '{required_permission}' access to {resource_type.value} {resource_id}",
             error_code="FSP_ACCESS_DENIED",
@@ -454,6 +416,94 @@ class WorkOrderScopeService:
             }
         )
     
+    def _decide_fsp_access(
+        self,
+        fsp_organization_id: UUID,
+        resource_type: WorkOrderScopeType,
+        resource_id: UUID
+    ) -> str:
+        """
+        Evaluate FSP access to a resource over all active work orders in one query.
+        
+        Only work orders with access_granted count. One of them grants access
+        when the resource belongs to its farming organization, or when it has
+        a scope item on the resource or on one of its ancestors.
+        """
+        ancestry = self.resolve_resource_ancestry(resource_type, resource_id)
+        owner_org_id = ancestry[WorkOrderScopeType.ORGANIZATION]
+        
+        scope_matches = [
+            and_(WorkOrderScope.scope == scope, WorkOrderScope.scope_id == scope_id)
+            for scope, scope_id in ancestry.items()
+            if scope_id is not None
+        ]
+        grants = [exists().where(
+            WorkOrderScope.work_order_id == WorkOrder.id,
+            or_(*scope_matches)
+        )]
+        if owner_org_id is not None:
+            grants.append(WorkOrder.farming_organization_id == owner_org_id)
+        granted = and_(WorkOrder.access_granted == True, or_(*grants))
+        
+        active_count, allowed = self.db.query(
+            func.count(WorkOrder.id),
+            func.max(case((granted, 1), else_=0))
+        ).filter(
+            WorkOrder.fsp_organization_id == fsp_organization_id,
+            WorkOrder.status == WorkOrderStatus.ACTIVE
+        ).one()
+        
+        if not active_count:
+            return ACCESS_NO_WORK_ORDER
+        return ACCESS_GRANTED if allowed else ACCESS_DENIED
+    
+    def resolve_resource_ancestry(
+        self,
+        resource_type: WorkOrderScopeType,
+        resource_id: UUID
+    ) -> Dict[WorkOrderScopeType, Optional[UUID]]:
+        """
+        Resolve a resource and its ancestors (crop → plot → farm → organization) with one join.
+        
+        Results are kept for the lifetime of this service instance, so
+        ownership checks and access validation of one request share them.
+        
+        Returns:
+            Scope type → ID of the resource or its ancestor at that level; the
+            resource's own level is always set, missing ancestors are None
+        """
+        resource_type = WorkOrderScopeType(resource_type)
+        key = (resource_type, resource_id)
+        if key in self._ancestry:
+            return self._ancestry[key]
+        
+        ancestry = dict.fromkeys(WorkOrderScopeType)
+        ancestry[resource_type] = resource_id
+        
+        if resource_type == WorkOrderScopeType.CROP:
+            row = self.db.query(Plot.id, Farm.id, Farm.organization_id).select_from(Crop).join(
+                Plot, Plot.id == Crop.plot_id
+            ).join(
+                Farm, Farm.id == Plot.farm_id
+            ).filter(Crop.id == resource_id).first()
+            if row:
+                ancestry[WorkOrderScopeType.PLOT], ancestry[WorkOrderScopeType.FARM], ancestry[WorkOrderScopeType.ORGANIZATION] = row
+        
+        elif resource_type == WorkOrderScopeType.PLOT:
+            row = self.db.query(Farm.id, Farm.organization_id).select_from(Plot).join(
+                Farm, Farm.id == Plot.farm_id
+            ).filter(Plot.id == resource_id).first()
+            if row:
+                ancestry[WorkOrderScopeType.FARM], ancestry[WorkOrderScopeType.ORGANIZATION] = row
+        
+        elif resource_type == WorkOrderScopeType.FARM:
+            ancestry[WorkOrderScopeType.ORGANIZATION] = self.db.query(Farm.organization_id).filter(
+                Farm.id == resource_id
+            ).scalar()
+        
+        self._ancestry[key] = ancestry
+        return ancestry
+    
     def get_work_order_scope(
         self,
         work_order_id: UUID
@@ -561,6 +611,103 @@ class WorkOrderScopeService:
         
         return scope_items
     
+    def accessible_crop_ids_query(self, organization_id: UUID) -> Select:
+        """
+        Build a single statement selecting the IDs of all crops an organization can access.
+        
+        An organization reaches the crops on its own farms. An FSP organization
+        also reaches, through each ACTIVE work order, every crop of the farming
+        organization when access_granted is set, and otherwise the crops under
+        the work order's ORGANIZATION, FARM, PLOT and CROP scope items.
+        
+        The result is meant for `column.in_(...)` filters, so list queries
+        resolve access in the database as a semi-join.
+        
+        Args:
+            organization_id: Organization ID (the user's current organization)
+        
+        Returns:
+            Selectable of crop IDs
+        """
+        work_orders = select(
+            WorkOrder.id,
+            WorkOrder.farming_organization_id,
+            func.coalesce(WorkOrder.access_granted, False).label("access_granted")
+        ).join(
+            Organization, Organization.id == WorkOrder.fsp_organization_id
+        ).where(
+            WorkOrder.fsp_organization_id == organization_id,
+            WorkOrder.status == WorkOrderStatus.ACTIVE,
+            Organization.organization_type == OrganizationType.FSP
+        ).cte("accessible_work_orders")
+        
+        # Scope items only narrow access for work orders without global access
+        scope_items = select(
+            WorkOrderScope.scope, WorkOrderScope.scope_id
+        ).join(
+            work_orders, work_orders.c.id == WorkOrderScope.work_order_id
+        ).where(
+            work_orders.c.access_granted == False
+        ).cte("accessible_scope_items")
+        
+        def scoped_ids(scope_type: WorkOrderScopeType):
+            return select(scope_items.c.scope_id).where(scope_items.c.scope == scope_type)
+        
+        return union(
+            select(Crop.id).join(Plot, Plot.id == Crop.plot_id).join(Farm, Farm.id == Plot.farm_id).where(or_(
+                Farm.organization_id == organization_id,
+                Farm.organization_id.in_(
+                    select(work_orders.c.farming_organization_id).where(work_orders.c.access_granted == True)
+                ),
+                Farm.organization_id.in_(scoped_ids(WorkOrderScopeType.ORGANIZATION))
+            )),
+            select(Crop.id).join(Plot, Plot.id == Crop.plot_id).where(
+                Plot.farm_id.in_(scoped_ids(WorkOrderScopeType.FARM))
+            ),
+            select(Crop.id).where(Crop.plot_id.in_(scoped_ids(WorkOrderScopeType.PLOT))),
+            scoped_ids(WorkOrderScopeType.CROP)
+        )
+    
+    def fsp_writable_crop_ids(self, fsp_organization_id: UUID, crop_ids: Iterable[UUID]) -> Set[UUID]:
+        """
+        Select which of the given crops an FSP may write to, in one query.
+        
+        Set-based form of validate_fsp_access for many crops: a crop is
+        writable when an ACTIVE work order with access_granted belongs to the
+        crop's farming organization, or has a scope item on the crop or one
+        of its ancestors.
+        
+        Returns:
+            IDs of the writable crops among crop_ids
+        """
+        granted_work_orders = select(
+            WorkOrder.id, WorkOrder.farming_organization_id
+        ).where(
+            WorkOrder.fsp_organization_id == fsp_organization_id,
+            WorkOrder.status == WorkOrderStatus.ACTIVE,
+            WorkOrder.access_granted == True
+        ).cte("granted_work_orders")
+        
+        scope_item = exists().where(
+            WorkOrderScope.work_order_id.in_(select(granted_work_orders.c.id)),
+            or_(
+                and_(WorkOrderScope.scope == WorkOrderScopeType.CROP, WorkOrderScope.scope_id == Crop.id),
+                and_(WorkOrderScope.scope == WorkOrderScopeType.PLOT, WorkOrderScope.scope_id == Plot.id),
+                and_(WorkOrderScope.scope == WorkOrderScopeType.FARM, WorkOrderScope.scope_id == Farm.id),
+                and_(WorkOrderScope.scope == WorkOrderScopeType.ORGANIZATION, WorkOrderScope.scope_id == Farm.organization_id)
+            )
+        )
+        
+        return set(self.db.execute(
+            select(Crop.id).join(Plot, Plot.id == Crop.plot_id).join(Farm, Farm.id == Plot.farm_id).where(
+                Crop.id.in_(list(crop_ids)),
+                or_(
+                    Farm.organization_id.in_(select(granted_work_orders.c.farming_organization_id)),
+                    scope_item
+                )
+            )
+        ).scalars())
+    
     def _validate_scope_resource(
         self,
         scope_type: str,
@@ -691,125 +838,3 @@ class WorkOrderScopeService:
         
         if work_order:
             work_order.scope_metadata = metadata
-    
-    def _check_hierarchical_access(
-        self,
-        work_order_id: UUID,
-        resource_type: WorkOrderScopeType,
-        resource_id: UUID,
-        required_permission: str,
-        access_granted: bool = False
-    ) -> bool:
-        """
-        Check hierarchical access for resource.
-        
-        Args:
-            work_order_id: Work order ID
-            resource_type: Resource type
-            resource_id: Resource ID
-            required_permission: Required permission
-            access_granted: Whether work order has global access granted
-        
-        Returns:
-            True if hierarchical access granted
-        """
-        # Check ORGANIZATION scope (grants access to everything)
-        if resource_type in [WorkOrderScopeType.FARM, WorkOrderScopeType.PLOT, WorkOrderScopeType.CROP]:
-            # Get farming organization for this resource
-            farming_org_id = self._get_farming_org_for_resource(resource_type, resource_id)
-            
-            if farming_org_id:
-                org_scope = self.db.query(WorkOrderScope).filter(
-                    WorkOrderScope.work_order_id == work_order_id,
-                    WorkOrderScope.scope == WorkOrderScopeType.ORGANIZATION,
-                    WorkOrderScope.scope_id == farming_org_id
-                ).first()
-                
-                if org_scope and (access_granted or org_scope.access_permissions.get(required_permission)):
-                    self.logger.info(
-                        "FSP access granted (organization scope)",
-                        extra={"work_order_id": str(work_order_id)}
-                    )
-                    return True
-        
-        # Check FARM scope (grants access to plots and crops in that farm)
-        if resource_type in [WorkOrderScopeType.PLOT, WorkOrderScopeType.CROP]:
-            farm_id = self._get_farm_for_resource(resource_type, resource_id)
-            
-            if farm_id:
-                farm_scope = self.db.query(WorkOrderScope).filter(
-                    WorkOrderScope.work_order_id == work_order_id,
-                    WorkOrderScope.scope == WorkOrderScopeType.FARM,
-                    WorkOrderScope.scope_id == farm_id
-                ).first()
-                
-                if farm_scope and (access_granted or farm_scope.access_permissions.get(required_permission)):
-                    self.logger.info(
-                        "FSP access granted (farm scope)",
-                        extra={"work_order_id": str(work_order_id)}
-                    )
-                    return True
-        
-        # Check PLOT scope (grants access to crops in that plot)
-        if resource_type == WorkOrderScopeType.CROP:
-            crop = self.db.query(Crop).filter(Crop.id == resource_id).first()
-            
-            if crop:
-                plot_scope = self.db.query(WorkOrderScope).filter(
-                    WorkOrderScope.work_order_id == work_order_id,
-                    WorkOrderScope.scope == WorkOrderScopeType.PLOT,
-                    WorkOrderScope.scope_id == crop.plot_id
-                ).first()
-                
-                if plot_scope and (access_granted or plot_scope.access_permissions.get(required_permission)):
-                    self.logger.info(
-                        "FSP access granted (plot scope)",
-                        extra={"work_order_id": str(work_order_id)}
-                    )
-                    return True
-        
-        return False
-    
-    def _get_farming_org_for_resource(
-        self,
-        resource_type: WorkOrderScopeType,
-        resource_id: UUID
-    ) -> Optional[UUID]:
-        """Get farming organization ID for a resource."""
-        if resource_type == WorkOrderScopeType.FARM:
-            farm = self.db.query(Farm).filter(Farm.id == resource_id).first()
-            return farm.organization_id if farm else None
-        
-        elif resource_type == WorkOrderScopeType.PLOT:
-            plot = self.db.query(Plot).filter(Plot.id == resource_id).first()
-            if plot:
-                farm = self.db.query(Farm).filter(Farm.id == plot.farm_id).first()
-                return farm.organization_id if farm else None
-        
-        elif resource_type == WorkOrderScopeType.CROP:
-            crop = self.db.query(Crop).filter(Crop.id == resource_id).first()
-            if crop:
-                plot = self.db.query(Plot).filter(Plot.id == crop.plot_id).first()
-                if plot:
-                    farm = self.db.query(Farm).filter(Farm.id == plot.farm_id).first()
-                    return farm.organization_id if farm else None
-        
-        return None
-    
-    def _get_farm_for_resource(
-        self,
-        resource_type: WorkOrderScopeType,
-        resource_id: UUID
-    ) -> Optional[UUID]:
-        """Get farm ID for a resource."""
-        if resource_type == WorkOrderScopeType.PLOT:
-            plot = self.db.query(Plot).filter(Plot.id == resource_id).first()
-            return plot.farm_id if plot else None
-        
-        elif resource_type == WorkOrderScopeType.CROP:
-            crop = self.db.query(Crop).filter(Crop.id == resource_id).first()
-            if crop:
-                plot = self.db.query(Plot).filter(Plot.id == crop.plot_id).first()
-                return plot.farm_id if plot else None
-        
-        return None
@@ -16,30 +16,19 @@ from app.models.enums import (
     OrganizationType
 )
 from app.core.logging import get_logger
+from app.core.metrics import MetricsCollector
 from app.core.exceptions import (
     NotFoundError,
     ValidationError,
     ConflictError,
     PermissionError
 )
+from app.services.numbering_service import WORK_ORDER, NumberingService
+from app.services.work_order_scope_service import invalidate_fsp_access
 
 logger = get_logger(__name__)
 
 
-class MetricsCollector:
-    """Simple metrics collector for tracking operations."""
-    
-    @staticmethod
-    def increment(metric_name: str, tags: dict = None):
-        """Increment a metric counter."""
-        # In production, this would send to a metrics service
-        logger.info(
-            "metric_increment",
-            metric=metric_name,
-            tags=tags or {}
-        )
-
-
 class WorkOrderService:
     """Service for work order management."""
     
@@ -331,6 +320,7 @@ class WorkOrderService:
                 work_order.cancelled_at = datetime.utcnow()
             
             self.db.commit()
+            invalidate_fsp_access(work_order.fsp_organization_id)
             self.db.refresh(work_order)
             
             # Metrics
@@ -548,18 +538,7 @@ class WorkOrderService:
         Returns:
             Unique work order number (e.g., WO-2024-0001)
         """
-        # Get current year
-        year = datetime.utcnow().year
-        
-        # Get count of work orders this year
-        count = self.db.query(WorkOrder).filter(
-            WorkOrder.work_order_number.like(f'WO-{year}-%')
-        ).count()
-        
-        # Generate number
-        number = f'WO-{year}-{count + 1:04d}'
-        
-        return number
+        return NumberingService(self.db).next_number(WORK_ORDER)
     
     def _validate_status_transition(
         self,
@@ -727,6 +706,7 @@ class WorkOrderService:
         work_order.updated_at = datetime.utcnow()
         
         self.db.commit()
+        invalidate_fsp_access(work_order.fsp_organization_id)
         self.db.refresh(work_order)
         
         self.logger.info(
@@ -795,6 +775,7 @@ class WorkOrderService:
         work_order.updated_at = datetime.utcnow()
         
         self.db.commit()
+        invalidate_fsp_access(work_order.fsp_organization_id)
         self.db.refresh(work_order)
         
         self.logger.info("Work order started", extra={"work_order_id": str(work_order.id)})
@@ -114,6 +114,8 @@ class WorkflowService:
             # Update status
             print(f"DEBUG: [Transition] Updating status to {to_status.value}", flush=True)
             audit.status = to_status
+            # Status is part of the report, so rendered report PDFs are stale
+            audit.report_version = Audit.report_version + 1
             
             # If finalizing, capture metadata
             if to_status == AuditStatus.FINALIZED:
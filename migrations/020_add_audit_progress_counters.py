@@ -0,0 +1,69 @@
+"""
+Add denormalized progress counters (parameter_count, answered_count) to audits.
+
+The counters are maintained by AuditService (on instance creation) and
+ResponseService (on response insert) so audit lists can report progress
+without aggregating audit_parameter_instances and audit_responses per row.
+Existing audits are backfilled from the source tables.
+"""
+from sqlalchemy import text
+from app.core.database import SessionLocal
+
+def upgrade():
+    """Add and backfill audit progress counters."""
+    db = SessionLocal()
+    try:
+        db.execute(text("""
+            ALTER TABLE audits
+            ADD COLUMN IF NOT EXISTS parameter_count INTEGER,
+            ADD COLUMN IF NOT EXISTS answered_count INTEGER;
+        """))
+
+        # Backfill from source tables
+        db.execute(text("""
+            UPDATE audits a
+            SET parameter_count = (
+                    SELECT COUNT(*) FROM audit_parameter_instances i WHERE i.audit_id = a.id
+                ),
+                answered_count = (
+                    SELECT COUNT(*) FROM audit_responses r WHERE r.audit_id = a.id
+                );
+        """))
+
+        db.execute(text("""
+            COMMENT ON COLUMN audits.parameter_count IS 'Denormalized count of audit_parameter_instances (NULL = not computed)';
+        """))
+        db.execute(text("""
+            COMMENT ON COLUMN audits.answered_count IS 'Denormalized count of audit_responses (NULL = not computed)';
+        """))
+
+        db.commit()
+        print("✅ Successfully added progress counters to audits table")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error adding audit progress counters: {e}")
+        raise
+    finally:
+        db.close()
+
+def downgrade():
+    """Remove audit progress counters."""
+    db = SessionLocal()
+    try:
+        db.execute(text("""
+            ALTER TABLE audits
+            DROP COLUMN IF EXISTS parameter_count,
+            DROP COLUMN IF EXISTS answered_count;
+        """))
+        db.commit()
+        print("✅ Successfully removed progress counters from audits table")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error removing audit progress counters: {e}")
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    print("Running migration: Add progress counters to audits")
+    upgrade()
@@ -0,0 +1,92 @@
+"""
+Add a precomputed service area (centre point + coverage radius) to FSP service listings.
+
+FSPServiceService maintains service_center/service_radius_km on listing
+create/update so nearby-provider search can rank listings with a KNN scan of
+idx_fsp_listings_service_center instead of computing distances per row.
+Existing listings are backfilled from the active farms in their
+service_area_districts.
+"""
+from sqlalchemy import text
+from app.core.database import SessionLocal
+
+def upgrade():
+    """Add, index and backfill listing service areas."""
+    db = SessionLocal()
+    try:
+        db.execute(text("""
+            ALTER TABLE fsp_service_listings
+            ADD COLUMN IF NOT EXISTS service_center GEOGRAPHY(POINT, 4326),
+            ADD COLUMN IF NOT EXISTS service_radius_km NUMERIC(8, 2);
+        """))
+
+        db.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_fsp_listings_service_center
+            ON fsp_service_listings USING GIST(service_center)
+            WHERE status = 'ACTIVE';
+        """))
+
+        # Backfill: centroid of the farms in the listing's districts, radius
+        # reaching the farthest of them (at least 10 km)
+        db.execute(text("""
+            UPDATE fsp_service_listings l
+            SET service_center = area.center,
+                service_radius_km = GREATEST(
+                    (SELECT MAX(ST_Distance(area.center, f.location)) FROM farms f
+                     WHERE f.is_active AND f.location IS NOT NULL
+                       AND lower(f.district) = ANY(area.districts)) / 1000.0,
+                    10
+                )
+            FROM (
+                SELECT l2.id, c.center,
+                       ARRAY(SELECT lower(d) FROM unnest(l2.service_area_districts) d) AS districts
+                FROM fsp_service_listings l2
+                CROSS JOIN LATERAL (
+                    SELECT ST_Centroid(ST_Collect(f.location::geometry))::geography AS center
+                    FROM farms f
+                    WHERE f.is_active AND f.location IS NOT NULL
+                      AND lower(f.district) IN (SELECT lower(d) FROM unnest(l2.service_area_districts) d)
+                ) c
+                WHERE l2.service_center IS NULL
+            ) area
+            WHERE area.id = l.id AND area.center IS NOT NULL;
+        """))
+
+        db.execute(text("""
+            COMMENT ON COLUMN fsp_service_listings.service_center IS 'Precomputed centre of the service area (KNN search origin)';
+        """))
+        db.execute(text("""
+            COMMENT ON COLUMN fsp_service_listings.service_radius_km IS 'Coverage radius around service_center in km (NULL = unbounded)';
+        """))
+
+        db.commit()
+        print("✅ Successfully added service areas to fsp_service_listings table")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error adding listing service areas: {e}")
+        raise
+    finally:
+        db.close()
+
+def downgrade():
+    """Remove listing service areas."""
+    db = SessionLocal()
+    try:
+        db.execute(text("DROP INDEX IF EXISTS idx_fsp_listings_service_center;"))
+        db.execute(text("""
+            ALTER TABLE fsp_service_listings
+            DROP COLUMN IF EXISTS service_center,
+            DROP COLUMN IF EXISTS service_radius_km;
+        """))
+        db.commit()
+        print("✅ Successfully removed service areas from fsp_service_listings table")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error removing listing service areas: {e}")
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    print("Running migration: Add service areas to fsp_service_listings")
+    upgrade()
@@ -0,0 +1,55 @@
+"""
+Create business_number_counters for work order, audit and query numbers.
+
+One row per (series, year) holding the last number handed out. The
+NumberingService increments it with a single UPDATE ... RETURNING instead
+of counting or scanning the target table, and on first use of a year
+continues after the highest number already stored.
+"""
+from sqlalchemy import text
+from app.core.database import SessionLocal
+
+def upgrade():
+    """Create the counters table."""
+    db = SessionLocal()
+    try:
+        db.execute(text("""
+            CREATE TABLE IF NOT EXISTS business_number_counters (
+                series VARCHAR(50) NOT NULL,
+                period INTEGER NOT NULL,
+                last_value BIGINT NOT NULL,
+                updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (series, period)
+            );
+        """))
+
+        db.execute(text("""
+            COMMENT ON TABLE business_number_counters IS 'Last allocated WO/AUD/Q number per series and year (gap-tolerant)';
+        """))
+
+        db.commit()
+        print("✅ Successfully created business_number_counters table")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error creating business_number_counters: {e}")
+        raise
+    finally:
+        db.close()
+
+def downgrade():
+    """Drop the counters table."""
+    db = SessionLocal()
+    try:
+        db.execute(text("DROP TABLE IF EXISTS business_number_counters;"))
+        db.commit()
+        print("✅ Successfully dropped business_number_counters table")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error dropping business_number_counters: {e}")
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    print("Running migration: Create business_number_counters")
+    upgrade()
@@ -0,0 +1,73 @@
+"""
+Store audit parameter snapshots once per distinct content.
+
+Every audit created from a template copied each parameter's full JSON
+snapshot onto its audit_parameter_instances row. New instances reference a
+row in parameter_snapshot_blobs (keyed by the SHA-256 of the canonical
+snapshot JSON) through parameter_snapshot_hash instead; existing instances
+keep their inline parameter_snapshot and are read as before.
+"""
+from sqlalchemy import text
+from app.core.database import SessionLocal
+
+def upgrade():
+    """Create parameter_snapshot_blobs and the instance reference column."""
+    db = SessionLocal()
+    try:
+        db.execute(text("""
+            CREATE TABLE IF NOT EXISTS parameter_snapshot_blobs (
+                hash VARCHAR(64) PRIMARY KEY,
+                snapshot JSONB NOT NULL,
+                created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+            );
+        """))
+
+        db.execute(text("""
+            ALTER TABLE audit_parameter_instances
+            ADD COLUMN IF NOT EXISTS parameter_snapshot_hash VARCHAR(64)
+            REFERENCES parameter_snapshot_blobs(hash);
+        """))
+
+        db.execute(text("""
+            COMMENT ON TABLE parameter_snapshot_blobs IS 'Distinct audit parameter snapshots keyed by SHA-256 of canonical JSON';
+        """))
+        db.execute(text("""
+            COMMENT ON COLUMN audit_parameter_instances.parameter_snapshot_hash IS 'Shared snapshot (parameter_snapshot_blobs); parameter_snapshot is NULL when set';
+        """))
+
+        db.commit()
+        print("✅ Successfully added parameter_snapshot_blobs")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error adding parameter_snapshot_blobs: {e}")
+        raise
+    finally:
+        db.close()
+
+def downgrade():
+    """Inline shared snapshots again and drop parameter_snapshot_blobs."""
+    db = SessionLocal()
+    try:
+        db.execute(text("""
+            UPDATE audit_parameter_instances i
+            SET parameter_snapshot = b.snapshot
+            FROM parameter_snapshot_blobs b
+            WHERE i.parameter_snapshot_hash = b.hash AND i.parameter_snapshot IS NULL;
+        """))
+        db.execute(text("""
+            ALTER TABLE audit_parameter_instances
+            DROP COLUMN IF EXISTS parameter_snapshot_hash;
+        """))
+        db.execute(text("DROP TABLE IF EXISTS parameter_snapshot_blobs;"))
+        db.commit()
+        print("✅ Successfully removed parameter_snapshot_blobs")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error removing parameter_snapshot_blobs: {e}")
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    print("Running migration: Add parameter_snapshot_blobs")
+    upgrade()
@@ -0,0 +1,48 @@
+"""
+Add audits.report_version for the rendered report PDF cache.
+
+Rendered PDFs are stored per (audit, report_version, language). Review,
+finalize and share transitions bump the version, so an unchanged audit's
+PDF is served from storage and a changed one is rendered again.
+"""
+from sqlalchemy import text
+from app.core.database import SessionLocal
+
+def upgrade():
+    """Add the report_version column."""
+    db = SessionLocal()
+    try:
+        db.execute(text("""
+            ALTER TABLE audits ADD COLUMN IF NOT EXISTS report_version INTEGER NOT NULL DEFAULT 0;
+        """))
+
+        db.execute(text("""
+            COMMENT ON COLUMN audits.report_version IS 'Content version of the audit report; bumped on review, finalize and share transitions';
+        """))
+
+        db.commit()
+        print("✅ Successfully added audits.report_version")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error adding audits.report_version: {e}")
+        raise
+    finally:
+        db.close()
+
+def downgrade():
+    """Drop the report_version column."""
+    db = SessionLocal()
+    try:
+        db.execute(text("ALTER TABLE audits DROP COLUMN IF EXISTS report_version;"))
+        db.commit()
+        print("✅ Successfully dropped audits.report_version")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error dropping audits.report_version: {e}")
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    print("Running migration: Add audits.report_version")
+    upgrade()
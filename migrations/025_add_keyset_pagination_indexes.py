@@ -0,0 +1,55 @@
+"""
+Add (filter, created_at, id) indexes for keyset-paginated lists.
+
+app.core.pagination pages lists by (created_at, id) newest first. These
+indexes let each page start at the cursor position with an index scan
+instead of sorting the whole filtered list, so deep pages cost the same
+as the first one.
+"""
+from sqlalchemy import text
+from app.core.database import SessionLocal
+
+INDEXES = {
+    "idx_chat_messages_channel_keyset": "chat_messages (channel_id, created_at DESC, id DESC)",
+    "idx_notifications_user_keyset": "notifications (user_id, created_at DESC, id DESC)",
+    "idx_farms_org_keyset": "farms (organization_id, created_at DESC, id DESC)",
+    "idx_audits_keyset": "audits (created_at DESC, id DESC)",
+    "idx_audits_fsp_keyset": "audits (fsp_organization_id, created_at DESC, id DESC)",
+    "idx_audits_farming_org_keyset": "audits (farming_organization_id, created_at DESC, id DESC)",
+    "idx_schedules_keyset": "schedules (created_at DESC, id DESC)",
+    "idx_fsp_listings_keyset": "fsp_service_listings (created_at DESC, id DESC) WHERE status = 'ACTIVE'",
+}
+
+def upgrade():
+    """Create keyset pagination indexes."""
+    db = SessionLocal()
+    try:
+        for name, definition in INDEXES.items():
+            db.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {definition};"))
+        db.commit()
+        print("✅ Successfully added keyset pagination indexes")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error adding keyset pagination indexes: {e}")
+        raise
+    finally:
+        db.close()
+
+def downgrade():
+    """Drop keyset pagination indexes."""
+    db = SessionLocal()
+    try:
+        for name in INDEXES:
+            db.execute(text(f"DROP INDEX IF EXISTS {name};"))
+        db.commit()
+        print("✅ Successfully removed keyset pagination indexes")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error removing keyset pagination indexes: {e}")
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    print("Running migration: Add keyset pagination indexes")
+    upgrade()
@@ -0,0 +1,133 @@
+"""
+Benchmark audit list progress computation.
+
+Compares the legacy per-audit progress calculation (one instance load plus one
+response COUNT per audit) with the set-based aggregate and the denormalized
+parameter_count/answered_count counters used by AuditService.get_audits.
+
+Synthetic parameter instances and responses are inserted inside a transaction
+that is rolled back at the end, so the database is left untouched.
+
+Usage:
+    DATABASE_URL=postgresql://... python scripts/bench_audit_list_progress.py [--page-size 20]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+from app.models.audit import Audit, AuditParameterInstance, AuditResponse
+from app.services.audit_service import AuditService
+
+PARAMETER_SIZES = [10, 100, 1000, 5000]
+
+
+class StatementCounter:
+    """Counts statements executed on a connection."""
+
+    def __init__(self, connection):
+        self.count = 0
+        event.listen(connection, "before_cursor_execute", self._before)
+
+    def _before(self, *args, **kwargs):
+        self.count += 1
+
+
+def legacy_progress(db, audits):
+    """Per-audit progress as computed before the set-based engine."""
+    for audit in audits:
+        instances = db.query(AuditParameterInstance).filter(
+            AuditParameterInstance.audit_id == audit.id
+        ).all()
+        if not instances:
+            continue
+        db.query(AuditResponse).filter(AuditResponse.audit_id == audit.id).count()
+
+
+def timed(label, counter, fn, repeat=5):
+    """Run fn `repeat` times and print the median latency and statement count."""
+    timings = []
+    statements = 0
+    for _ in range(repeat):
+        before = counter.count
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+        statements = counter.count - before
+    timings.sort()
+    print(f"  {label:<12} {timings[len(timings) // 2]:>10.2f} ms  {statements:>5} statements")
+
+
+def seed_instances(db, audit_ids, per_audit, section_id, parameter_id):
+    """Insert `per_audit` instances per audit and answer half of them."""
+    db.execute(text("""
+        INSERT INTO audit_parameter_instances (id, audit_id, template_section_id, parameter_id, sort_order, is_required)
+        SELECT uuid_generate_v4(), a.id, :section_id, :parameter_id, g, false
+        FROM unnest(CAST(:audit_ids AS uuid[])) AS a(id), generate_series(1, :n) AS g
+    """), {"audit_ids": [str(a) for a in audit_ids], "n": per_audit,
+           "section_id": section_id, "parameter_id": parameter_id})
+    db.execute(text("""
+        INSERT INTO audit_responses (id, audit_id, audit_parameter_instance_id, response_text)
+        SELECT uuid_generate_v4(), i.audit_id, i.id, 'bench'
+        FROM audit_parameter_instances i
+        WHERE i.audit_id = ANY(CAST(:audit_ids AS uuid[])) AND i.sort_order % 2 = 0
+    """), {"audit_ids": [str(a) for a in audit_ids]})
+    db.execute(text("""
+        UPDATE audits a
+        SET parameter_count = (SELECT COUNT(*) FROM audit_parameter_instances i WHERE i.audit_id = a.id),
+            answered_count = (SELECT COUNT(*) FROM audit_responses r WHERE r.audit_id = a.id)
+        WHERE a.id = ANY(CAST(:audit_ids AS uuid[]))
+    """), {"audit_ids": [str(a) for a in audit_ids]})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page-size", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine(os.environ["DATABASE_URL"])
+    connection = engine.connect()
+    transaction = connection.begin()
+    db = sessionmaker(bind=connection, autoflush=False)()
+    counter = StatementCounter(connection)
+
+    try:
+        audits = db.query(Audit).order_by(Audit.created_at.desc()).limit(args.page_size).all()
+        section_id = db.execute(text("SELECT id FROM template_sections LIMIT 1")).scalar()
+        parameter_id = db.execute(text("SELECT id FROM parameters LIMIT 1")).scalar()
+        if not audits or not section_id or not parameter_id:
+            print("Need at least one audit, template section and parameter in the database.")
+            return
+
+        fsp_org_id = audits[0].fsp_organization_id
+        audit_ids = [a.id for a in audits]
+        service = AuditService(db)
+        seeded = 0
+
+        print(f"Page of {len(audits)} audits")
+        for size in PARAMETER_SIZES:
+            seed_instances(db, audit_ids, size - seeded, section_id, parameter_id)
+            seeded = size
+            db.expire_all()
+            page = db.query(Audit).filter(Audit.id.in_(audit_ids)).all()
+
+            print(f"\n~{size} parameters per audit")
+            timed("legacy", counter, lambda: legacy_progress(db, page))
+            timed("aggregate", counter, lambda: service._calculate_progress_bulk(audit_ids))
+            timed("counters", counter, lambda: service._attach_progress(page))
+            timed("get_audits", counter, lambda: service.get_audits(
+                fsp_organization_id=fsp_org_id, limit=args.page_size
+            ))
+    finally:
+        db.close()
+        transaction.rollback()
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Benchmark audit parameter instance materialization for large templates.
+
+Takes an existing audit, its template's sections and existing parameters,
+synthesizes template snapshots of --sizes parameters (spread over the
+sections, parameters reused cyclically) and materializes them inside a
+transaction that is rolled back afterwards:
+
+  legacy     - the previous implementation: one TemplateSection query per
+               section and one ORM add per instance with its inline snapshot
+  first      - AuditService._create_parameter_instances, snapshots not yet stored
+  repeat     - the same template again (snapshots already stored, as for every
+               audit after the first from a template version)
+
+Usage:
+    DATABASE_URL=postgresql://... python scripts/bench_audit_materialization.py [--sizes 50 500 5000]
+"""
+import argparse
+import os
+import sys
+import time
+from uuid import uuid4
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app.models.audit import Audit, AuditParameterInstance
+from app.models.parameter import Parameter
+from app.models.template import TemplateSection
+from app.services.audit_service import AuditService
+
+
+def measure(label, engine, fn):
+    """Run fn once and print statement count and latency."""
+    statements = []
+    listener = lambda *args, **kwargs: statements.append(1)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        start = time.perf_counter()
+        fn()
+        elapsed = (time.perf_counter() - start) * 1000
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    print(f"  {label:<8} {elapsed:>9.2f} ms  {len(statements):>5} statements")
+
+
+def synthetic_snapshot(sections, parameter_ids, size, salt):
+    """A template snapshot with `size` parameters and realistic per-parameter snapshots."""
+    snapshot = {"sections": [{"section_id": str(s.section_id), "parameters": []} for s in sections]}
+    for i in range(size):
+        parameter_id = parameter_ids[i % len(parameter_ids)]
+        snapshot["sections"][i % len(sections)]["parameters"].append({
+            "parameter_id": str(parameter_id),
+            "sort_order": i,
+            "is_required": i % 3 == 0,
+            "parameter_snapshot": {
+                "parameter_id": str(parameter_id),
+                "code": f"BENCH_{salt}_{i}",
+                "parameter_type": "SINGLE_SELECT",
+                "parameter_metadata": {"min_value": 0, "max_value": 500, "unit": "cm"},
+                "options": [
+                    {"option_id": str(uuid4()), "code": f"OPT_{j}", "display_text": f"Option {j}", "sort_order": j}
+                    for j in range(8)
+                ],
+                "translations": {
+                    lang: {"name": f"Parameter {i}", "help_text": "Measured at the plot centre " * 4}
+                    for lang in ("en", "ta", "ml")
+                }
+            }
+        })
+    return snapshot
+
+
+def legacy_materialize(db, audit, snapshot, user_id):
+    """The removed implementation: per-section lookups and per-instance adds."""
+    for section in snapshot["sections"]:
+        template_section = db.query(TemplateSection).filter(
+            TemplateSection.template_id == audit.template_id,
+            TemplateSection.section_id == section["section_id"]
+        ).first()
+        for parameter in section["parameters"]:
+            db.add(AuditParameterInstance(
+                audit_id=audit.id,
+                template_section_id=template_section.id,
+                parameter_id=parameter["parameter_id"],
+                sort_order=parameter["sort_order"],
+                is_required=parameter["is_required"],
+                parameter_snapshot=parameter["parameter_snapshot"],
+                created_by=user_id
+            ))
+    db.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 5000])
+    args = parser.parse_args()
+
+    engine = create_engine(os.environ["DATABASE_URL"])
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        db = Session(bind=conn, join_transaction_mode="create_savepoint")
+        try:
+            audit = db.query(Audit).join(TemplateSection, TemplateSection.template_id == Audit.template_id).first()
+            if not audit:
+                print("Need an audit whose template has at least one section.")
+                return
+            sections = db.query(TemplateSection).filter(TemplateSection.template_id == audit.template_id).all()
+            parameter_ids = [row.id for row in db.query(Parameter.id).limit(1000)]
+            service = AuditService(db)
+
+            print(f"audit {audit.id}: {len(sections)} sections, {len(parameter_ids)} parameters to cycle")
+            for size in args.sizes:
+                print(f"\n{size} parameters")
+                legacy = synthetic_snapshot(sections, parameter_ids, size, salt=f"legacy{size}")
+                measure("legacy", engine, lambda: legacy_materialize(db, audit, legacy, audit.created_by))
+
+                snapshot = synthetic_snapshot(sections, parameter_ids, size, salt=f"new{size}")
+                measure("first", engine, lambda: service._create_parameter_instances(audit, snapshot, audit.created_by))
+                measure("repeat", engine, lambda: service._create_parameter_instances(audit, snapshot, audit.created_by))
+        finally:
+            db.close()
+            transaction.rollback()
+
+
+if __name__ == "__main__":
+    main()
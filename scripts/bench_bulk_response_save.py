@@ -0,0 +1,110 @@
+"""
+Benchmark the bulk audit response save path with and without debug output.
+
+Re-submits the existing responses of the open audit with the most responses
+through ResponseService.submit_bulk_responses, inside a transaction that is
+rolled back after every run, and reports items/second for:
+
+  print    - the previous behaviour: one flushed print() per item (to stderr)
+  off      - debug tracing disabled (the default)
+  sampled  - debug tracing enabled at DEBUG_TRACE_SAMPLE_RATE
+
+Usage:
+    DATABASE_URL=postgresql://... python scripts/bench_bulk_response_save.py [--runs 20] 2>/dev/null
+"""
+import argparse
+import contextvars
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.debug_trace import stop_debug_trace
+from app.models.audit import Audit, AuditResponse
+from app.models.enums import AuditStatus
+from app.schemas.audit import ResponseBulkSubmit, ResponseSubmit
+from app.services import response_service
+
+
+def legacy_print(event, **fields):
+    """Stand-in for the removed print(..., flush=True) calls."""
+    print(f"DEBUG: [ResponseService] {event} {fields}", file=sys.stderr, flush=True)
+
+
+def run(engine, audit, payload, runs):
+    """Submit the payload `runs` times, rolling back each time; return items/second."""
+    elapsed = 0.0
+    for _ in range(runs):
+        with engine.connect() as conn:
+            transaction = conn.begin()
+            db = Session(bind=conn, join_transaction_mode="create_savepoint")
+            try:
+                service = response_service.ResponseService(db)
+                start = time.perf_counter()
+                # Fresh context per run, as each request gets its own sampling decision
+                contextvars.Context().run(
+                    service.submit_bulk_responses,
+                    audit_id=audit.id, data=payload, user_id=audit.created_by
+                )
+                elapsed += time.perf_counter() - start
+            finally:
+                db.close()
+                transaction.rollback()
+    return len(payload.responses) * runs / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine(os.environ["DATABASE_URL"])
+    with Session(engine) as db:
+        row = db.query(AuditResponse.audit_id, func.count(AuditResponse.id).label("n")).join(
+            Audit, Audit.id == AuditResponse.audit_id
+        ).filter(
+            Audit.status.notin_([AuditStatus.FINALIZED, AuditStatus.SHARED])
+        ).group_by(AuditResponse.audit_id).order_by(func.count(AuditResponse.id).desc()).first()
+        if not row:
+            print("Need an open audit with at least one response in the database.")
+            return
+
+        audit = db.get(Audit, row.audit_id)
+        payload = ResponseBulkSubmit(responses=[
+            ResponseSubmit(
+                audit_parameter_instance_id=r.audit_parameter_instance_id,
+                response_text=r.response_text,
+                response_numeric=r.response_numeric,
+                response_date=r.response_date,
+                response_options=r.response_options,
+                notes=r.notes
+            )
+            for r in db.query(AuditResponse).filter(AuditResponse.audit_id == audit.id)
+        ])
+        db.expunge(audit)
+
+    print(f"audit {audit.id}: {row.n} responses, {args.runs} runs per mode")
+    trace = response_service.trace
+    modes = [
+        ("print", legacy_print, False),
+        ("off", trace, False),
+        ("sampled", trace, True),
+    ]
+    try:
+        for label, emitter, enabled in modes:
+            response_service.trace = emitter
+            settings.DEBUG_TRACE_ENABLED = enabled
+            rate = run(engine, audit, payload, args.runs)
+            print(f"  {label:<8} {rate:>10.1f} items/s")
+    finally:
+        response_service.trace = trace
+        stop_debug_trace()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Benchmark crop access resolution for FSP schedule listing.
+
+Seeds an FSP organization with --clients farming organizations (5 farms of
+5 plots each per client, --crops crops in total) and one ACTIVE work order
+per client: half with access_granted, half scoped to a farm, a plot and a
+crop. Then compares:
+
+  legacy walk   - the removed per-farm, per-plot, per-scope-item crop walk
+  set-based     - WorkOrderScopeService.accessible_crop_ids_query, fetched
+  schedules IN  - counting schedules with the legacy crop id list as IN (...)
+  schedules sub - counting schedules with the set-based query as a subquery
+
+Everything is inserted inside a transaction that is rolled back at the end,
+so the database is left untouched.
+
+Usage:
+    DATABASE_URL=postgresql://... python scripts/bench_crop_access.py [--clients 200] [--crops 50000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import create_engine, event, func, text
+from sqlalchemy.orm import sessionmaker
+
+from app.models.crop import Crop
+from app.models.enums import WorkOrderScopeType, WorkOrderStatus
+from app.models.farm import Farm
+from app.models.plot import Plot
+from app.models.schedule import Schedule
+from app.models.work_order import WorkOrder, WorkOrderScope
+from app.services.work_order_scope_service import WorkOrderScopeService
+
+FARMS_PER_CLIENT = 5
+PLOTS_PER_FARM = 5
+
+
+class StatementCounter:
+    """Counts statements executed on a connection."""
+
+    def __init__(self, connection):
+        self.count = 0
+        event.listen(connection, "before_cursor_execute", self._before)
+
+    def _before(self, *args, **kwargs):
+        self.count += 1
+
+
+def timed(label, counter, fn, repeat=5):
+    """Run fn `repeat` times and print the median latency and statement count."""
+    timings = []
+    statements = 0
+    for _ in range(repeat):
+        before = counter.count
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+        statements = counter.count - before
+    timings.sort()
+    print(f"  {label:<14} {timings[len(timings) // 2]:>10.2f} ms  {statements:>6} statements")
+
+
+def _org_crop_ids(db, organization_id):
+    crop_ids = []
+    for farm in db.query(Farm).filter(Farm.organization_id == organization_id).all():
+        crop_ids.extend(_farm_crop_ids(db, farm.id))
+    return crop_ids
+
+
+def _farm_crop_ids(db, farm_id):
+    crop_ids = []
+    for plot in db.query(Plot).filter(Plot.farm_id == farm_id).all():
+        crop_ids.extend(c.id for c in db.query(Crop).filter(Crop.plot_id == plot.id).all())
+    return crop_ids
+
+
+def legacy_accessible_crop_ids(db, organization_id):
+    """The removed ScheduleService._get_accessible_crop_ids walk."""
+    crop_ids = _org_crop_ids(db, organization_id)
+    work_orders = db.query(WorkOrder).filter(
+        WorkOrder.fsp_organization_id == organization_id,
+        WorkOrder.status == WorkOrderStatus.ACTIVE
+    ).all()
+    for work_order in work_orders:
+        if work_order.access_granted:
+            crop_ids.extend(_org_crop_ids(db, work_order.farming_organization_id))
+            continue
+        for item in db.query(WorkOrderScope).filter(WorkOrderScope.work_order_id == work_order.id).all():
+            if item.scope == WorkOrderScopeType.ORGANIZATION:
+                crop_ids.extend(_org_crop_ids(db, item.scope_id))
+            elif item.scope == WorkOrderScopeType.FARM:
+                crop_ids.extend(_farm_crop_ids(db, item.scope_id))
+            elif item.scope == WorkOrderScopeType.PLOT:
+                crop_ids.extend(c.id for c in db.query(Crop).filter(Crop.plot_id == item.scope_id).all())
+            elif item.scope == WorkOrderScopeType.CROP:
+                crop_ids.append(item.scope_id)
+    return list(set(crop_ids))
+
+
+def seed(db, clients, crops_per_plot):
+    """Insert the FSP, its clients, their farm trees and work orders; return the FSP id."""
+    fsp_id = db.execute(text("""
+        INSERT INTO organizations (id, name, organization_type)
+        VALUES (uuid_generate_v4(), 'bench fsp', 'FSP') RETURNING id
+    """)).scalar()
+    db.execute(text("""
+        CREATE TEMP TABLE bench_clients ON COMMIT DROP AS
+        SELECT uuid_generate_v4() AS id, g AS n FROM generate_series(1, :clients) AS g
+    """), {"clients": clients})
+    db.execute(text("""
+        INSERT INTO organizations (id, name, organization_type)
+        SELECT id, 'bench client ' || n, 'FARMING' FROM bench_clients
+    """))
+    db.execute(text("""
+        INSERT INTO farms (id, organization_id, name)
+        SELECT uuid_generate_v4(), c.id, 'bench farm ' || g
+        FROM bench_clients c, generate_series(1, :farms) AS g
+    """), {"farms": FARMS_PER_CLIENT})
+    db.execute(text("""
+        INSERT INTO plots (id, farm_id, name)
+        SELECT uuid_generate_v4(), f.id, 'bench plot ' || g
+        FROM farms f JOIN bench_clients c ON c.id = f.organization_id, generate_series(1, :plots) AS g
+    """), {"plots": PLOTS_PER_FARM})
+    db.execute(text("""
+        INSERT INTO crops (id, plot_id, name)
+        SELECT uuid_generate_v4(), p.id, 'bench crop ' || g
+        FROM plots p JOIN farms f ON f.id = p.farm_id JOIN bench_clients c ON c.id = f.organization_id,
+             generate_series(1, :crops) AS g
+    """), {"crops": crops_per_plot})
+    db.execute(text("""
+        INSERT INTO work_orders (id, farming_organization_id, fsp_organization_id, title, status, access_granted)
+        SELECT uuid_generate_v4(), c.id, :fsp_id, 'bench work order', 'ACTIVE', c.n % 2 = 0
+        FROM bench_clients c
+    """), {"fsp_id": fsp_id})
+    for scope, source in (
+        ("FARM", "SELECT f.id FROM farms f WHERE f.organization_id = w.farming_organization_id"),
+        ("PLOT", "SELECT p.id FROM plots p JOIN farms f ON f.id = p.farm_id WHERE f.organization_id = w.farming_organization_id"),
+        ("CROP", "SELECT cr.id FROM crops cr JOIN plots p ON p.id = cr.plot_id JOIN farms f ON f.id = p.farm_id "
+                 "WHERE f.organization_id = w.farming_organization_id"),
+    ):
+        db.execute(text(f"""
+            INSERT INTO work_order_scope (id, work_order_id, scope, scope_id)
+            SELECT uuid_generate_v4(), w.id, '{scope}', ({source} ORDER BY 1 LIMIT 1)
+            FROM work_orders w
+            WHERE w.fsp_organization_id = :fsp_id AND NOT w.access_granted
+        """), {"fsp_id": fsp_id})
+    db.execute(text("ANALYZE organizations, farms, plots, crops, work_orders, work_order_scope"))
+    return fsp_id
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--crops", type=int, default=50000)
+    args = parser.parse_args()
+
+    engine = create_engine(os.environ["DATABASE_URL"])
+    connection = engine.connect()
+    transaction = connection.begin()
+    db = sessionmaker(bind=connection, autoflush=False)()
+    counter = StatementCounter(connection)
+
+    try:
+        crops_per_plot = max(1, args.crops // (args.clients * FARMS_PER_CLIENT * PLOTS_PER_FARM))
+        fsp_id = seed(db, args.clients, crops_per_plot)
+        service = WorkOrderScopeService(db)
+        accessible = service.accessible_crop_ids_query(fsp_id)
+
+        legacy_ids = legacy_accessible_crop_ids(db, fsp_id)
+        set_ids = db.execute(accessible).scalars().all()
+        assert set(legacy_ids) == set(set_ids), "set-based resolution differs from the legacy walk"
+        print(f"{args.clients} clients, {args.clients * FARMS_PER_CLIENT * PLOTS_PER_FARM * crops_per_plot} crops, "
+              f"{len(set_ids)} accessible")
+
+        timed("legacy walk", counter, lambda: legacy_accessible_crop_ids(db, fsp_id), repeat=3)
+        timed("set-based", counter, lambda: db.execute(accessible).scalars().all())
+        timed("schedules IN", counter, lambda: db.query(func.count(Schedule.id)).filter(
+            Schedule.crop_id.in_(legacy_accessible_crop_ids(db, fsp_id))
+        ).scalar(), repeat=3)
+        timed("schedules sub", counter, lambda: db.query(func.count(Schedule.id)).filter(
+            Schedule.crop_id.in_(accessible)
+        ).scalar())
+    finally:
+        db.close()
+        transaction.rollback()
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark the farm list page with large boundary polygons.
+
+Inserts --farms farms with a --vertices point boundary (plus water source,
+soil type and irrigation mode associations when reference data exists) into
+a transaction that is rolled back afterwards, then measures:
+
+  list page     - FarmService.get_farms for the whole page (statements, latency)
+  legacy geom   - the previous per-farm ST_AsText round trips for location and
+                  boundary plus WKT parsing, for comparison
+
+Usage:
+    DATABASE_URL=postgresql://... python scripts/bench_farm_list.py [--farms 100] [--vertices 2000]
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import create_engine, event, func
+from sqlalchemy.orm import Session
+
+from app.models.farm import Farm, FarmIrrigationMode, FarmSoilType, FarmWaterSource
+from app.models.organization import Organization
+from app.models.reference_data import ReferenceData
+from app.services.farm_service import FarmService
+from app.services.spatial_service import SpatialService
+
+
+def measure(label, engine, fn):
+    """Run fn once and print statement count and latency."""
+    statements = []
+    listener = lambda *args, **kwargs: statements.append(1)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        start = time.perf_counter()
+        fn()
+        elapsed = (time.perf_counter() - start) * 1000
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    print(f"  {label:<16} {elapsed:>9.2f} ms  {len(statements):>4} statements")
+
+
+def boundary_wkt(lon, lat, vertices):
+    """A closed circle-ish polygon of `vertices` points around (lon, lat)."""
+    points = [
+        (lon + 0.01 * math.cos(2 * math.pi * i / vertices), lat + 0.01 * math.sin(2 * math.pi * i / vertices))
+        for i in range(vertices)
+    ]
+    points.append(points[0])
+    return "POLYGON((" + ", ".join(f"{x} {y}" for x, y in points) + "))"
+
+
+def legacy_geometry(db, farms):
+    """The removed implementation: two ST_AsText queries per farm, then WKT parsing."""
+    for farm in farms:
+        SpatialService.to_geojson(db.scalar(func.ST_AsText(farm.location)))
+        SpatialService.to_geojson(db.scalar(func.ST_AsText(farm.boundary)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--farms", type=int, default=100)
+    parser.add_argument("--vertices", type=int, default=2000)
+    args = parser.parse_args()
+
+    engine = create_engine(os.environ["DATABASE_URL"])
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        db = Session(bind=conn, join_transaction_mode="create_savepoint")
+        try:
+            org = db.query(Organization).first()
+            if not org:
+                print("Need at least one organization in the database.")
+                return
+            reference = db.query(ReferenceData).first()
+
+            for i in range(args.farms):
+                lon, lat = 77.0 + i * 0.05, 12.0
+                farm = Farm(
+                    organization_id=org.id,
+                    name=f"bench-farm-{i}",
+                    location=f"POINT({lon} {lat})",
+                    boundary=boundary_wkt(lon, lat, args.vertices),
+                    is_active=True
+                )
+                db.add(farm)
+                if reference:
+                    farm.water_sources.append(FarmWaterSource(water_source_id=reference.id))
+                    farm.soil_types.append(FarmSoilType(soil_type_id=reference.id))
+                    farm.irrigation_modes.append(FarmIrrigationMode(irrigation_mode_id=reference.id))
+            db.flush()
+
+            print(f"{args.farms} farms x {args.vertices}-vertex boundaries (org {org.id})")
+            service = FarmService(db)
+            for run in ("first", "second"):
+                db.expire_all()
+                print(f"\n{run} run")
+                measure("list page", engine, lambda: service.get_farms(org_id=org.id, limit=args.farms))
+                farms = db.query(Farm).filter(Farm.organization_id == org.id).limit(args.farms).all()
+                measure("legacy geom", engine, lambda: legacy_geometry(db, farms))
+        finally:
+            db.close()
+            transaction.rollback()
+
+
+if __name__ == "__main__":
+    main()
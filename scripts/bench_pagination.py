@@ -0,0 +1,111 @@
+"""
+Benchmark OFFSET versus keyset (cursor) pagination.
+
+Seeds a chat channel with synthetic messages and reads pages at increasing
+depth, once with page numbers (OFFSET) and once continuing from the cursor of
+the previous page, as app.core.pagination.paginate does for
+ChatService.get_messages. Run migration 025 first for the keyset indexes.
+
+The messages are inserted inside a transaction that is rolled back at the end,
+so the database is left untouched.
+
+Usage:
+    DATABASE_URL=postgresql://... python scripts/bench_pagination.py [--messages 200000] [--page-size 50]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.pagination import encode_cursor, paginate
+from app.models.chat import ChatChannel, ChatMessage
+
+DEPTHS = [1, 10, 100, 1000]
+
+
+class StatementCounter:
+    """Counts statements executed on a connection."""
+
+    def __init__(self, connection):
+        self.count = 0
+        event.listen(connection, "before_cursor_execute", self._before)
+
+    def _before(self, *args, **kwargs):
+        self.count += 1
+
+
+def timed(label, counter, fn, repeat=5):
+    """Run fn `repeat` times and print the median latency and statement count."""
+    timings = []
+    statements = 0
+    for _ in range(repeat):
+        before = counter.count
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+        statements = counter.count - before
+    timings.sort()
+    print(f"  {label:<12} {timings[len(timings) // 2]:>10.2f} ms  {statements:>5} statements")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=200000)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = create_engine(os.environ["DATABASE_URL"])
+    connection = engine.connect()
+    transaction = connection.begin()
+    db = sessionmaker(bind=connection, autoflush=False)()
+    counter = StatementCounter(connection)
+
+    try:
+        channel = db.query(ChatChannel).first()
+        if not channel:
+            print("Need at least one chat channel in the database.")
+            return
+
+        db.execute(text("""
+            INSERT INTO chat_messages (id, channel_id, message_type, content, created_at)
+            SELECT uuid_generate_v4(), :channel_id, 'TEXT', 'bench ' || g,
+                   now() - make_interval(secs => g / 4)
+            FROM generate_series(1, :n) AS g
+        """), {"channel_id": channel.id, "n": args.messages})
+        db.execute(text("ANALYZE chat_messages"))
+
+        def messages():
+            return db.query(ChatMessage).filter(ChatMessage.channel_id == channel.id)
+
+        print(f"{args.messages} messages, pages of {args.page_size}")
+        for depth in DEPTHS:
+            offset = (depth - 1) * args.page_size
+            if offset >= args.messages:
+                break
+            previous = messages().order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc()).offset(
+                max(offset - 1, 0)
+            ).first()
+            cursor = encode_cursor("chat_messages", [previous.created_at, previous.id]) if offset else None
+
+            print(f"\npage {depth}")
+            timed("offset", counter, lambda: paginate(
+                messages(), ChatMessage.created_at, ChatMessage.id, name="chat_messages",
+                page=depth, limit=args.page_size, total=None
+            ))
+            timed("keyset", counter, lambda: paginate(
+                messages(), ChatMessage.created_at, ChatMessage.id, name="chat_messages",
+                cursor=cursor, limit=args.page_size, total=None
+            ))
+    finally:
+        db.close()
+        transaction.rollback()
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
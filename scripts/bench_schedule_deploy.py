@@ -0,0 +1,122 @@
+"""
+Benchmark deploying a schedule template to many crops.
+
+Inserts --crops crops on an existing plot and deploys an existing active
+template (the one with the most tasks, or --template) to all of them:
+
+  per crop  - ScheduleService.create_schedule_from_template once per crop
+  bulk      - ScheduleService.deploy_template for the whole batch
+
+Every parameter the template requires is filled in with the same values for
+each crop. Everything is inserted inside a transaction that is rolled back
+at the end, so the database is left untouched.
+
+Usage:
+    DATABASE_URL=postgresql://... python scripts/bench_schedule_deploy.py [--crops 300] [--template <uuid>]
+"""
+import argparse
+import os
+import sys
+import time
+from types import SimpleNamespace
+from uuid import UUID, uuid4
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import create_engine, event, func, text
+from sqlalchemy.orm import sessionmaker
+
+from app.models.plot import Plot
+from app.models.schedule_template import ScheduleTemplate, ScheduleTemplateTask
+from app.schemas.schedule import ScheduleDeploymentTarget
+from app.services.schedule_calculation_service import ScheduleCalculationService
+from app.services.schedule_service import ScheduleService
+
+
+class StatementCounter:
+    """Counts statements executed on a connection."""
+
+    def __init__(self, connection):
+        self.count = 0
+        event.listen(connection, "before_cursor_execute", self._before)
+
+    def _before(self, *args, **kwargs):
+        self.count += 1
+
+
+def timed(label, counter, fn):
+    """Run fn once and print its latency and statement count."""
+    before = counter.count
+    start = time.perf_counter()
+    fn()
+    print(f"  {label:<10} {(time.perf_counter() - start) * 1000:>10.2f} ms  {counter.count - before:>6} statements")
+
+
+def template_parameters(db, template_id):
+    """Parameters satisfying every task of the template."""
+    calculation = ScheduleCalculationService()
+    required = set()
+    for details, in db.query(ScheduleTemplateTask.task_details_template).filter(
+        ScheduleTemplateTask.schedule_template_id == template_id
+    ):
+        required |= calculation.compile_task_calculation(details or {}).required_parameters
+    params = {name: 2.5 for name in required}
+    params.update(start_date="2026-06-01", area_unit_id=str(uuid4()))
+    return params
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--crops", type=int, default=300)
+    parser.add_argument("--template", type=UUID)
+    args = parser.parse_args()
+
+    engine = create_engine(os.environ["DATABASE_URL"])
+    connection = engine.connect()
+    transaction = connection.begin()
+    db = sessionmaker(bind=connection, autoflush=False)()
+    counter = StatementCounter(connection)
+
+    try:
+        plot = db.query(Plot).first()
+        template_id = args.template or db.query(ScheduleTemplate.id).join(
+            ScheduleTemplateTask, ScheduleTemplateTask.schedule_template_id == ScheduleTemplate.id
+        ).filter(ScheduleTemplate.is_active == True).group_by(ScheduleTemplate.id).order_by(
+            func.count(ScheduleTemplateTask.id).desc()
+        ).limit(1).scalar()
+        if not plot or not template_id:
+            print("Need at least one plot and one active template with tasks in the database.")
+            return
+
+        def insert_crops():
+            return db.execute(text("""
+                INSERT INTO crops (id, plot_id, name)
+                SELECT uuid_generate_v4(), :plot_id, 'bench crop ' || g FROM generate_series(1, :n) AS g
+                RETURNING id
+            """), {"plot_id": plot.id, "n": args.crops}).scalars().all()
+
+        params = template_parameters(db, template_id)
+        # System users skip the per-crop access checks in both paths
+        user = SimpleNamespace(id=None, current_organization_id=None, is_system_user=lambda: True)
+        service = ScheduleService(db)
+        tasks = db.query(ScheduleTemplateTask).filter(ScheduleTemplateTask.schedule_template_id == template_id).count()
+        print(f"template {template_id} ({tasks} tasks), {args.crops} crops")
+
+        crop_ids = insert_crops()
+        timed("per crop", counter, lambda: [
+            service.create_schedule_from_template(crop_id, template_id, "bench", params, user)
+            for crop_id in crop_ids
+        ])
+
+        crop_ids = insert_crops()
+        timed("bulk", counter, lambda: service.deploy_template(template_id, "bench", [
+            ScheduleDeploymentTarget(crop_id=crop_id, template_parameters=params) for crop_id in crop_ids
+        ], user))
+    finally:
+        db.close()
+        transaction.rollback()
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
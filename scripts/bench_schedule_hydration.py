@@ -0,0 +1,79 @@
+"""
+Benchmark schedule list/detail hydration query counts.
+
+Counts SQL statements and latency for a page of schedules (ScheduleService.get_schedules)
+and for the schedule with the most tasks (ScheduleService.get_schedule_with_details).
+Runs as a system user so access control does not dominate the numbers.
+
+Usage:
+    DATABASE_URL=postgresql://... python scripts/bench_schedule_hydration.py [--page-size 20]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import create_engine, event, func
+from sqlalchemy.orm import sessionmaker
+
+from app.models.schedule import Schedule, ScheduleTask
+from app.models.user import User
+from app.services.schedule_hydration_service import translation_name_cache
+from app.services.schedule_service import ScheduleService
+
+
+def measure(label, engine, fn):
+    """Run fn once and print statement count and latency."""
+    statements = []
+    listener = lambda *args, **kwargs: statements.append(1)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        start = time.perf_counter()
+        fn()
+        elapsed = (time.perf_counter() - start) * 1000
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    print(f"  {label:<28} {elapsed:>9.2f} ms  {len(statements):>4} statements")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page-size", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine(os.environ["DATABASE_URL"])
+    db = sessionmaker(bind=engine, autoflush=False)()
+
+    try:
+        user = db.query(User).first()
+        if not user:
+            print("Need at least one user in the database.")
+            return
+        user._is_system_user = True
+
+        largest = db.query(ScheduleTask.schedule_id, func.count(ScheduleTask.id).label("n")).join(
+            Schedule, Schedule.id == ScheduleTask.schedule_id
+        ).filter(Schedule.is_active == True).group_by(ScheduleTask.schedule_id).order_by(
+            func.count(ScheduleTask.id).desc()
+        ).first()
+
+        service = ScheduleService(db)
+        for run in ("cold", "warm"):
+            if run == "cold":
+                translation_name_cache.clear()
+            db.expire_all()
+            print(f"\n{run} name cache")
+            measure(f"list page ({args.page_size})", engine,
+                    lambda: service.get_schedules(user=user, limit=args.page_size))
+            if largest:
+                db.expire_all()
+                measure(f"detail ({largest.n} tasks)", engine,
+                        lambda: service.get_schedule_with_details(user=user, schedule_id=largest.schedule_id))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
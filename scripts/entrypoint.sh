@@ -11,6 +11,12 @@ python scripts/init_db.py
 echo "Running Python Migrations..."
 python run_all_migrations.py
 
+# Reset Prometheus multiprocess samples left over from a previous run
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+    mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
 # Start the Server
 echo "Initialization complete. Starting uvicorn..."
 exec "$@"
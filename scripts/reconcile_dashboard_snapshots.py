@@ -0,0 +1,46 @@
+"""
+Reconcile BFF dashboard snapshots with the database.
+
+Rebuilds every stored dashboard snapshot so counters drifted by writes outside
+the ORM session (raw SQL, database cascades) are corrected. Run periodically,
+e.g. from cron every few minutes (well under DASHBOARD_SNAPSHOT_MAX_AGE).
+
+Usage:
+    python scripts/reconcile_dashboard_snapshots.py [--interval SECONDS]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.core.database import SessionLocal
+from app.services.dashboard_service import DashboardService
+
+
+def reconcile_once() -> int:
+    db = SessionLocal()
+    try:
+        return DashboardService(db).reconcile_snapshots()
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interval", type=int, default=0,
+                        help="Repeat every N seconds instead of running once")
+    args = parser.parse_args()
+
+    while True:
+        start = time.perf_counter()
+        rebuilt = reconcile_once()
+        print(f"Rebuilt {rebuilt} dashboard snapshots in {(time.perf_counter() - start) * 1000:.1f} ms")
+        if not args.interval:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
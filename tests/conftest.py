@@ -1,13 +1,21 @@
 """
 Pytest configuration and fixtures for Uzhathunai v2.0 tests.
 """
+import fnmatch
+import queue
+import threading
+
 import pytest
+from contextlib import contextmanager
 from typing import Generator
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker, Session
 from fastapi.testclient import TestClient
+from starlette.concurrency import run_in_threadpool
 
-from app.core.database import Base, get_db
+from app.core.database import Base, get_db, engine as app_engine
+from app.core.async_database import get_async_db, install_event_loop_guard
+from app.core.query_profiler import count_queries, install_query_profiler
 from app.main import app
 from app.models.user import User, RefreshToken
 from app.core.security import get_password_hash
@@ -22,6 +30,256 @@ engine = create_engine(TEST_DATABASE_URL)
 
 # Create test session factory
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+install_query_profiler(engine)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def event_loop_db_guard():
+    """
+    Flag synchronous database calls made on the event loop thread.
+
+    Violations emit SyncDBOnEventLoopWarning; run pytest with
+    `-W error::app.core.async_database.SyncDBOnEventLoopWarning` to fail on them.
+    """
+    removers = [install_event_loop_guard(engine), install_event_loop_guard(app_engine)]
+    yield
+    for remove in removers:
+        remove()
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Assert an upper bound on the SQL statements issued inside a block.
+
+    Usage:
+        with query_budget(5):
+            client.get("/api/v1/admin/organizations", headers=headers)
+    """
+    @contextmanager
+    def budget(max_queries: int):
+        with count_queries() as stats:
+            yield stats
+        assert stats.count <= max_queries, (
+            f"Issued {stats.count} SQL statements, budget is {max_queries}:\n"
+            + "\n".join(" ".join(statement.split())[:200] for statement in stats.statements)
+        )
+
+    return budget
+
+
+class ThreadpoolAsyncSession:
+    """
+    AsyncSession stand-in over the transactional test session.
+
+    Lets async endpoints share the rolled-back test transaction; every call
+    runs in the threadpool so the event loop guard stays quiet.
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    def add(self, instance) -> None:
+        self.sync_session.add(instance)
+
+    async def execute(self, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.execute, *args, **kwargs)
+
+    async def scalar(self, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalar, *args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.get, *args, **kwargs)
+
+    async def flush(self) -> None:
+        await run_in_threadpool(self.sync_session.flush)
+
+    async def commit(self) -> None:
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def refresh(self, instance) -> None:
+        await run_in_threadpool(self.sync_session.refresh, instance)
+
+
+class FakePubSub:
+    """Pub/sub connection fed by FakeRedis.publish."""
+
+    def __init__(self, redis_client: "FakeRedis"):
+        self.redis_client = redis_client
+        self.messages = queue.Queue()
+        self.channels = set()
+        self.patterns = set()
+
+    def subscribe(self, *channels) -> None:
+        self.channels.update(channels)
+        self.redis_client.pubsubs.append(self)
+
+    def psubscribe(self, *patterns) -> None:
+        self.patterns.update(patterns)
+        self.redis_client.pubsubs.append(self)
+
+    def deliver(self, channel: str, data) -> None:
+        if channel in self.channels:
+            self.messages.put({"type": "message", "channel": channel, "data": data})
+        for pattern in self.patterns:
+            if fnmatch.fnmatchcase(channel, pattern):
+                self.messages.put({"type": "pmessage", "pattern": pattern, "channel": channel, "data": data})
+
+    def get_message(self, timeout=None):
+        try:
+            return self.messages.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        while self in self.redis_client.pubsubs:
+            self.redis_client.pubsubs.remove(self)
+
+
+class FakePipeline:
+    """
+    Pipeline over FakeRedis.
+
+    Commands are queued and run on execute; between watch and multi they run
+    immediately, as in redis-py.
+    """
+
+    def __init__(self, redis_client: "FakeRedis"):
+        self.redis_client = redis_client
+        self.commands = []
+        self.immediate = False
+
+    def watch(self, *keys) -> None:
+        self.immediate = True
+
+    def multi(self) -> None:
+        self.immediate = False
+
+    def reset(self) -> None:
+        self.commands = []
+        self.immediate = False
+
+    def __getattr__(self, name):
+        command = getattr(self.redis_client, name)
+
+        def call(*args, **kwargs):
+            if self.immediate:
+                return command(*args, **kwargs)
+            self.commands.append((command, args, kwargs))
+            return self
+
+        return call
+
+    def execute(self) -> list:
+        results = [command(*args, **kwargs) for command, args, kwargs in self.commands]
+        self.reset()
+        return results
+
+
+class FakeRedis:
+    """
+    In-memory Redis stand-in for strings, sets, hashes, pipelines and pub/sub.
+
+    Lua scripts are not interpreted: tests register a Python equivalent in
+    `scripts`, called as fn(redis_client, keys, args).
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.sets = {}
+        self.hashes = {}
+        self.scripts = {}
+        self.published = []
+        self.pubsubs = []
+        self.lock = threading.RLock()
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, nx=False, ex=None, px=None):
+        with self.lock:
+            if nx and key in self.data:
+                return None
+            self.data[key] = value if isinstance(value, (str, bytes)) else str(value)
+            return True
+
+    def setex(self, key, ttl, value):
+        return self.set(key, value)
+
+    def incr(self, key):
+        with self.lock:
+            self.data[key] = str(int(self.data.get(key, 0)) + 1)
+            return int(self.data[key])
+
+    def exists(self, key):
+        return int(key in self.data or key in self.hashes or key in self.sets)
+
+    def delete(self, *keys):
+        with self.lock:
+            return sum(
+                1 for key in keys
+                if any(store.pop(key, None) is not None for store in (self.data, self.hashes, self.sets))
+            )
+
+    def unlink(self, *keys):
+        return self.delete(*keys)
+
+    def expire(self, key, seconds):
+        return int(self.exists(key))
+
+    def scan_iter(self, match="*", count=None):
+        return [key for key in [*self.data, *self.hashes, *self.sets] if fnmatch.fnmatchcase(key, match)]
+
+    def sadd(self, key, *members):
+        with self.lock:
+            self.sets.setdefault(key, set()).update(members)
+            return len(members)
+
+    def spop(self, key, count=None):
+        with self.lock:
+            return list(self.sets.pop(key, set()))
+
+    def hset(self, key, field=None, value=None, mapping=None):
+        with self.lock:
+            values = dict(mapping or {})
+            if field is not None:
+                values[field] = value
+            self.hashes.setdefault(key, {}).update({f: str(v) for f, v in values.items()})
+            return len(values)
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def hdel(self, key, *fields):
+        with self.lock:
+            stored = self.hashes.get(key, {})
+            return sum(1 for field in fields if stored.pop(field, None) is not None)
+
+    def eval(self, script, numkeys, *keys_and_args):
+        with self.lock:
+            return self.scripts[script](self, keys_and_args[:numkeys], keys_and_args[numkeys:])
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+        receivers = list(self.pubsubs)
+        for pubsub in receivers:
+            pubsub.deliver(channel, message)
+        return len(receivers)
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return FakePubSub(self)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+@pytest.fixture
+def fake_redis() -> FakeRedis:
+    """In-memory Redis stand-in; see FakeRedis."""
+    return FakeRedis()
 
 
 @pytest.fixture(scope="function")
@@ -57,7 +315,11 @@ def client(db: Session) -> Generator[TestClient, None, None]:
         finally:
             pass
     
+    async def override_get_async_db():
+        yield ThreadpoolAsyncSession(db)
+    
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     
     with TestClient(app) as test_client:
         yield test_client
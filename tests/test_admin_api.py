@@ -212,6 +212,23 @@ class TestAdminOrganizationList:
         assert data["data"]["limit"] == 5
         assert len(data["data"]["items"]) <= 5
     
+    def test_list_organizations_query_budget(
+        self, 
+        client: TestClient, 
+        super_admin_headers: dict,
+        pending_organization: Organization,
+        query_budget
+    ):
+        """Test listing issues a fixed number of statements (3 auth + count + page)."""
+        with query_budget(5):
+            response = client.get(
+                "/api/v1/admin/organizations",
+                headers=super_admin_headers
+            )
+        
+        assert response.status_code == 200
+        assert int(response.headers["X-DB-Query-Count"]) <= 5
+    
     def test_list_organizations_unauthorized(
         self, 
         client: TestClient, 
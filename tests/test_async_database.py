@@ -0,0 +1,50 @@
+"""
+Tests for the async database helpers (app/core/async_database.py).
+"""
+import asyncio
+
+from sqlalchemy import create_engine, text
+
+from app.core.async_database import install_event_loop_guard, to_async_url
+
+
+def test_to_async_url_switches_postgres_driver():
+    """Test sync PostgreSQL URLs are mapped onto asyncpg."""
+    assert to_async_url("postgresql://u:p@db:5432/farm") == "postgresql+asyncpg://u:p@db:5432/farm"
+    assert to_async_url("postgresql+psycopg2://u:p@db/farm") == "postgresql+asyncpg://u:p@db/farm"
+
+
+def test_guard_flags_sync_calls_on_event_loop():
+    """Test a sync statement inside a coroutine is reported."""
+    engine = create_engine("sqlite://")
+    violations = []
+    remove = install_event_loop_guard(engine, on_violation=violations.append)
+
+    async def handler():
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    asyncio.run(handler())
+    remove()
+
+    assert violations == ["SELECT 1"]
+
+
+def test_guard_allows_threadpool_and_plain_calls():
+    """Test statements off the event loop thread are not reported."""
+    engine = create_engine("sqlite://")
+    violations = []
+    remove = install_event_loop_guard(engine, on_violation=violations.append)
+
+    def query():
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT 1")).scalar()
+
+    async def handler():
+        return await asyncio.to_thread(query)
+
+    assert asyncio.run(handler()) == 1
+    assert query() == 1
+    remove()
+
+    assert violations == []
@@ -0,0 +1,170 @@
+"""
+Tests for audit parameter instance materialization in AuditService.
+
+Covers section resolution, snapshot deduplication and the INSERT/COPY write
+paths, using a recording stand-in for the session.
+"""
+import csv
+import io
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.services import audit_service
+from app.services.audit_service import AuditService
+from app.services.snapshot_service import snapshot_content_hash
+
+
+class RecordingSession:
+    """Session stand-in that records statements and serves canned results."""
+
+    def __init__(self, template_sections, existing_hashes=()):
+        self.template_sections = template_sections
+        self.existing_hashes = list(existing_hashes)
+        self.section_queries = 0
+        self.executed = []
+        self.copied = []
+
+    def query(self, *entities):
+        session = self
+
+        class _Query:
+            def filter(self, *criteria):
+                return self
+
+            def all(self):
+                session.section_queries += 1
+                return list(session.template_sections.items())
+
+        return _Query()
+
+    def scalars(self, statement):
+        return iter(self.existing_hashes)
+
+    def execute(self, statement, params=None):
+        self.executed.append((statement, params))
+
+    def connection(self):
+        session = self
+
+        class _Cursor:
+            def copy_expert(self, sql, buffer):
+                session.copied.append((sql, buffer.getvalue()))
+
+            def close(self):
+                pass
+
+        return SimpleNamespace(connection=SimpleNamespace(cursor=_Cursor))
+
+
+def _template_snapshot(section_ids, parameters_per_section, snapshot_for=lambda i: {"code": f"P{i}"}):
+    sections = []
+    counter = 0
+    for section_id in section_ids:
+        parameters = []
+        for _ in range(parameters_per_section):
+            parameters.append({
+                "parameter_id": str(uuid4()),
+                "sort_order": counter,
+                "is_required": counter % 2 == 0,
+                "parameter_snapshot": snapshot_for(counter)
+            })
+            counter += 1
+        sections.append({"section_id": str(section_id), "parameters": parameters})
+    return {"sections": sections}
+
+
+def _materialize(session, snapshot):
+    service = AuditService.__new__(AuditService)
+    service.db = session
+    audit = SimpleNamespace(id=uuid4(), template_id=uuid4(), parameter_count=None, answered_count=None)
+    service._create_parameter_instances(audit, snapshot, uuid4())
+    return audit
+
+
+def test_sections_resolved_in_one_query_and_instances_in_one_insert():
+    """Test all sections are looked up together and instances are inserted in a single statement."""
+    section_ids = [uuid4() for _ in range(5)]
+    session = RecordingSession({section_id: uuid4() for section_id in section_ids})
+
+    audit = _materialize(session, _template_snapshot(section_ids, 10))
+
+    assert session.section_queries == 1
+    # One statement for new snapshot blobs, one for the instances
+    assert len(session.executed) == 2
+    rows = session.executed[1][1]
+    assert len(rows) == 50
+    assert audit.parameter_count == 50
+    assert audit.answered_count == 0
+
+
+def test_identical_snapshots_stored_once():
+    """Test instances with equal snapshots share one content-hashed blob."""
+    section_id = uuid4()
+    session = RecordingSession({section_id: uuid4()})
+    shared = {"code": "PH", "options": [], "translations": {"en": {"name": "pH"}}}
+
+    _materialize(session, _template_snapshot([section_id], 4, snapshot_for=lambda i: dict(shared)))
+
+    blobs = session.executed[0][0].compile().params
+    rows = session.executed[1][1]
+    assert {row["parameter_snapshot_hash"] for row in rows} == {snapshot_content_hash(shared)}
+    assert len([key for key in blobs if key.startswith("hash")]) == 1
+
+
+def test_snapshots_taken_at_different_times_stored_once():
+    """Test snapshot_date is left out of the hash and the stored blob."""
+    section_id = uuid4()
+    session = RecordingSession({section_id: uuid4()})
+    shared = {"code": "PH", "options": [], "translations": {"en": {"name": "pH"}}}
+
+    _materialize(session, _template_snapshot(
+        [section_id], 3, snapshot_for=lambda i: dict(shared, snapshot_date=f"2026-05-0{i + 1}T00:00:00")
+    ))
+
+    blobs = session.executed[0][0].compile().params
+    rows = session.executed[1][1]
+    assert {row["parameter_snapshot_hash"] for row in rows} == {snapshot_content_hash(shared)}
+    assert [value for key, value in blobs.items() if key.startswith("snapshot")] == [shared]
+
+
+def test_existing_snapshots_not_rewritten():
+    """Test snapshots already stored by earlier audits are only referenced."""
+    section_id = uuid4()
+    snapshot = _template_snapshot([section_id], 3)
+    hashes = [snapshot_content_hash(p["parameter_snapshot"]) for p in snapshot["sections"][0]["parameters"]]
+    session = RecordingSession({section_id: uuid4()}, existing_hashes=hashes)
+
+    _materialize(session, snapshot)
+
+    assert len(session.executed) == 1
+    assert [row["parameter_snapshot_hash"] for row in session.executed[0][1]] == hashes
+
+
+def test_large_templates_use_copy(monkeypatch):
+    """Test templates over the threshold are written with COPY."""
+    monkeypatch.setattr(audit_service, "COPY_INSTANCES_THRESHOLD", 20)
+    section_id = uuid4()
+    session = RecordingSession({section_id: uuid4()})
+
+    _materialize(session, _template_snapshot([section_id], 25))
+
+    assert len(session.copied) == 1
+    sql, data = session.copied[0]
+    assert sql.startswith("COPY audit_parameter_instances (id, audit_id, template_section_id")
+    assert len(list(csv.reader(io.StringIO(data)))) == 25
+
+
+def test_missing_template_section_skipped():
+    """Test parameters of sections unknown to the template are not materialized."""
+    known, unknown = uuid4(), uuid4()
+    session = RecordingSession({known: uuid4()})
+
+    audit = _materialize(session, _template_snapshot([known, unknown], 2))
+
+    assert audit.parameter_count == 2
+
+
+def test_snapshot_hash_ignores_key_order():
+    """Test equal snapshots hash equally regardless of key order."""
+    assert snapshot_content_hash({"a": 1, "b": [1, 2]}) == snapshot_content_hash({"b": [1, 2], "a": 1})
+    assert snapshot_content_hash({"a": 1}) != snapshot_content_hash({"a": 2})
@@ -0,0 +1,66 @@
+"""
+Tests for audit progress computation in AuditService.
+
+Covers the percentage calculation and the counter-first progress attachment
+used by audit list views.
+"""
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.services.audit_service import AuditService
+
+
+def _audit(parameter_count=None, answered_count=None):
+    return SimpleNamespace(
+        id=uuid4(),
+        parameter_count=parameter_count,
+        answered_count=answered_count
+    )
+
+
+def test_progress_percentage_rounding_and_cap():
+    """Test progress is rounded to one decimal place and capped at 100."""
+    assert AuditService._progress_percentage(1, 3) == 33.3
+    assert AuditService._progress_percentage(5, 4) == 100.0
+    assert AuditService._progress_percentage(0, 10) == 0.0
+
+
+def test_progress_percentage_no_parameters():
+    """Test audits without parameter instances report zero progress."""
+    assert AuditService._progress_percentage(0, 0) == 0.0
+    assert AuditService._progress_percentage(3, None) == 0.0
+
+
+def test_attach_progress_uses_counters_without_querying():
+    """Test populated counters are used directly without hitting the database."""
+    service = AuditService.__new__(AuditService)
+    service._calculate_progress_bulk = lambda audit_ids: (_ for _ in ()).throw(
+        AssertionError("aggregate query should not run")
+    )
+
+    audits = [_audit(10, 5), _audit(4, 4)]
+    service._attach_progress(audits)
+
+    assert [a.progress for a in audits] == [50.0, 100.0]
+
+
+def test_attach_progress_falls_back_to_single_aggregate():
+    """Test audits without counters are resolved in one bulk aggregate call."""
+    service = AuditService.__new__(AuditService)
+    calls = []
+
+    counted = _audit(2, 1)
+    legacy_a = _audit()
+    legacy_b = _audit(None, 3)
+
+    def fake_bulk(audit_ids):
+        calls.append(list(audit_ids))
+        return {legacy_a.id: 25.0}
+
+    service._calculate_progress_bulk = fake_bulk
+    service._attach_progress([counted, legacy_a, legacy_b])
+
+    assert calls == [[legacy_a.id, legacy_b.id]]
+    assert counted.progress == 50.0
+    assert legacy_a.progress == 25.0
+    assert legacy_b.progress == 0.0
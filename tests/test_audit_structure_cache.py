@@ -0,0 +1,106 @@
+"""
+Tests for the audit structure payload cache (app/services/audit_structure_cache.py).
+
+Covers reuse per structure version, strong ETags, If-None-Match evaluation
+and the gzip variant, using a stand-in for AuditService.
+"""
+import gzip
+import json
+from uuid import uuid4
+
+from app.services.audit_structure_cache import (
+    AuditStructureCache,
+    StructurePayload,
+    accepts_gzip,
+    etag_matches
+)
+
+
+class FakeAuditService:
+    """AuditService stand-in counting structure builds."""
+
+    def __init__(self, parameters=50):
+        self.version = ("audit", "AUD-2026-0001", "Audit", "DRAFT", parameters, None)
+        self.parameters = parameters
+        self.builds = 0
+
+    def get_audit_structure_version(self, audit_id):
+        return self.version
+
+    def get_audit_structure(self, audit_id):
+        self.builds += 1
+        return {
+            "audit_id": str(audit_id),
+            "status": self.version[3],
+            "sections": [{"parameters": [{"name": f"Parameter {i}"} for i in range(self.parameters)]}]
+        }
+
+
+def _render(structure):
+    return json.dumps({"success": True, "data": structure}).encode("utf-8")
+
+
+def test_structure_built_once_per_version():
+    """Test repeat fetches reuse the serialized body until the version changes."""
+    cache = AuditStructureCache(maxsize=8, ttl=60)
+    service = FakeAuditService()
+    audit_id = uuid4()
+
+    first = cache.get(service, audit_id, render=_render)
+    second = cache.get(service, audit_id, render=_render)
+    assert service.builds == 1
+    assert second.body is first.body
+    assert second.etag == first.etag
+
+    service.version = service.version[:3] + ("IN_PROGRESS",) + service.version[4:]
+    third = cache.get(service, audit_id, render=_render)
+    assert service.builds == 2
+    assert json.loads(third.body)["data"]["status"] == "IN_PROGRESS"
+    assert third.etag != first.etag
+
+
+def test_gzip_variant_has_own_strong_etag():
+    """Test the gzip body decompresses to the identity body and is tagged separately."""
+    cache = AuditStructureCache(maxsize=8, ttl=60)
+    service = FakeAuditService()
+    audit_id = uuid4()
+
+    identity = cache.get(service, audit_id, render=_render)
+    compressed = cache.get(service, audit_id, render=_render, accept_gzip=True)
+
+    assert compressed.content_encoding == "gzip"
+    assert gzip.decompress(compressed.body) == identity.body
+    assert len(compressed.body) < len(identity.body)
+    assert compressed.etag == identity.etag[:-1] + '-gzip"'
+    assert not compressed.etag.startswith("W/")
+
+
+def test_small_bodies_not_compressed():
+    """Test tiny structures are sent uncompressed even when gzip is accepted."""
+    cache = AuditStructureCache(maxsize=8, ttl=60)
+
+    payload = cache.get(FakeAuditService(parameters=0), uuid4(), render=_render, accept_gzip=True)
+
+    assert payload.content_encoding is None
+
+
+def test_etag_matching():
+    """Test If-None-Match evaluation with lists, weak tags, wildcards and either encoding."""
+    payload = StructurePayload(etag='"abc123"', body=b"{}")
+
+    assert etag_matches('"abc123"', payload)
+    assert etag_matches('"zzz", W/"abc123"', payload)
+    assert etag_matches('"abc123-gzip"', payload)
+    assert etag_matches("*", payload)
+    assert not etag_matches('"abc12"', payload)
+    assert not etag_matches(None, payload)
+
+
+def test_accept_encoding_parsing():
+    """Test gzip is only chosen when the client accepts it."""
+    assert accepts_gzip("gzip, deflate, br")
+    assert accepts_gzip("br;q=1.0, gzip;q=0.8")
+    assert accepts_gzip("*")
+    assert not accepts_gzip("gzip;q=0")
+    assert not accepts_gzip("identity")
+    assert not accepts_gzip(None)
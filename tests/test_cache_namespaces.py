@@ -0,0 +1,62 @@
+"""
+Tests for versioned cache namespaces in CacheService.
+
+Covers generation-based invalidation, the SCAN-based sweeper and
+per-namespace hit/miss counters against the in-memory Redis stand-in from
+conftest.
+"""
+import threading
+
+from app.core.cache import CacheService
+
+
+def _cache(redis_client):
+    cache = CacheService.__new__(CacheService)
+    cache._namespace_stats = {}
+    cache._stats_lock = threading.Lock()
+    cache.redis_client = redis_client
+    return cache
+
+
+def test_invalidate_namespace_hides_old_entries(fake_redis):
+    """Test a single INCR makes previously cached entries unreachable."""
+    cache = _cache(fake_redis)
+    cache.set_namespaced("crops:org:1", "list", value=[1, 2])
+
+    assert cache.get_namespaced("crops:org:1", "list") == [1, 2]
+    assert cache.invalidate_namespace("crops:org:1") == 1
+    assert cache.get_namespaced("crops:org:1", "list") is None
+
+
+def test_invalidation_is_scoped_to_namespace(fake_redis):
+    """Test other namespaces keep their entries."""
+    cache = _cache(fake_redis)
+    cache.set_namespaced("crops:org:1", "list", value="a")
+    cache.set_namespaced("crops:org:2", "list", value="b")
+
+    cache.invalidate_namespace("crops:org:1")
+
+    assert cache.get_namespaced("crops:org:2", "list") == "b"
+
+
+def test_sweeper_deletes_only_stale_generations(fake_redis):
+    """Test the sweeper removes superseded entries and keeps current ones."""
+    cache = _cache(fake_redis)
+    cache.set_namespaced("tasks", "en", "active", value="old")
+    cache.invalidate_namespace("tasks")
+    cache.set_namespaced("tasks", "en", "active", value="new")
+
+    assert cache.sweep_stale_namespaces() == 1
+    assert cache.get_namespaced("tasks", "en", "active") == "new"
+    assert cache.sweep_stale_namespaces() == 0
+
+
+def test_namespace_hit_miss_counters(fake_redis):
+    """Test lookups are counted per namespace family."""
+    cache = _cache(fake_redis)
+    cache.get_namespaced("crops:org:1", "list")
+    cache.set_namespaced("crops:org:1", "list", value=1)
+    cache.get_namespaced("crops:org:1", "list")
+    cache.get_namespaced("crops:org:2", "list")
+
+    assert cache.get_namespace_stats()["crops"] == {"hits": 1, "misses": 2, "hit_ratio": 0.3333}
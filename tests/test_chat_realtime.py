@@ -0,0 +1,277 @@
+"""
+Tests for real-time chat delivery.
+
+Covers the realtime hub (app/core/realtime.py) with and without Redis,
+using the in-memory Redis stand-in from conftest shared by two hubs to
+play two workers, the cached channel access check and "since message" resume in
+ChatService, and the channel WebSocket endpoint.
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import Boolean, Column, DateTime, MetaData, String, Table, Text, Uuid, create_engine, insert
+from sqlalchemy.orm import Session
+from starlette.websockets import WebSocketDisconnect
+
+from app.api.v1 import chat as chat_api
+from app.core.cache import CacheService
+from app.core.database import get_db
+from app.core.exceptions import NotFoundError, PermissionError
+from app.core.realtime import RealtimeHub
+from app.services.chat_service import ChatService, chat_topic, invalidate_chat_access
+
+
+def _hub(redis_client=None, queue_size=100):
+    redis_cache = CacheService.__new__(CacheService)
+    redis_cache.redis_client = redis_client
+    return RealtimeHub(redis_cache, queue_size=queue_size)
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestRealtimeHub:
+    """Test topic fan-out."""
+
+    def test_local_delivery_without_redis(self):
+        """Test events reach subscribers of the topic in this process when Redis is down."""
+        hub = _hub()
+
+        async def scenario():
+            subscription = hub.subscribe("chat:a")
+            other = hub.subscribe("chat:b")
+            hub.publish("chat:a", {"type": "message", "data": {"id": uuid4()}})
+            event = await subscription.get(timeout=1)
+            assert await other.get(timeout=0.05) is None
+            subscription.close()
+            other.close()
+            return event
+
+        event = asyncio.run(scenario())
+        assert event["type"] == "message"
+        assert isinstance(event["data"]["id"], str)
+        assert hub.subscriber_count() == 0
+
+    def test_fan_out_across_workers(self, fake_redis):
+        """Test an event published by one worker reaches subscribers of another through Redis."""
+        publisher, receiver = _hub(fake_redis), _hub(fake_redis)
+
+        async def scenario():
+            subscription = receiver.subscribe("chat:a")
+            assert await asyncio.to_thread(_wait_for, lambda: fake_redis.pubsubs)
+            publisher.publish("chat:a", {"type": "message", "data": {"id": "1"}})
+            publisher.publish("chat:b", {"type": "message", "data": {"id": "2"}})
+            first = await subscription.get(timeout=2)
+            second = await subscription.get(timeout=0.1)
+            subscription.close()
+            return first, second
+
+        try:
+            first, second = asyncio.run(scenario())
+        finally:
+            receiver.stop()
+
+        assert first == {"type": "message", "data": {"id": "1"}}
+        assert second is None
+
+    def test_slow_subscriber_dropped(self):
+        """Test a subscriber that falls behind is told to resync instead of blocking the hub."""
+        hub = _hub(queue_size=2)
+
+        async def scenario():
+            subscription = hub.subscribe("chat:a")
+            for i in range(3):
+                hub.publish("chat:a", {"type": "message", "data": {"id": str(i)}})
+            await asyncio.sleep(0)
+            return subscription, await subscription.get(timeout=0.1)
+
+        subscription, event = asyncio.run(scenario())
+        assert subscription.overflowed
+        assert event is None
+
+
+metadata = MetaData()
+chat_messages = Table(
+    "chat_messages", metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("channel_id", Uuid),
+    Column("sender_id", Uuid),
+    Column("sender_org_id", Uuid),
+    Column("message_type", String),
+    Column("content", Text),
+    Column("media_url", Text),
+    Column("is_system_message", Boolean),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+    Column("deleted_at", DateTime)
+)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def _insert_messages(db, channel_id, count, start=datetime(2026, 5, 1)):
+    # Ascending ids, so insertion order is the (created_at, id) order
+    ids = sorted(uuid4() for _ in range(count))
+    for i, message_id in enumerate(ids):
+        db.execute(insert(chat_messages).values(
+            id=message_id, channel_id=channel_id, sender_id=uuid4(), message_type="TEXT",
+            content=f"message {i}", is_system_message=False,
+            # Pairs share a timestamp so the id tie-breaker matters
+            created_at=start + timedelta(seconds=i // 2)
+        ))
+    return ids
+
+
+class TestChatService:
+    """Test cached access checks and resume."""
+
+    def test_access_check_cached_when_granted(self, db, monkeypatch):
+        """Test granted access is reused while denials are re-checked every time."""
+        checks = []
+        granted = set()
+
+        def check(self, channel_id, user_id):
+            checks.append(user_id)
+            if user_id not in granted:
+                raise PermissionError("Access denied", "PERMISSION_DENIED")
+            return True
+
+        monkeypatch.setattr(ChatService, "_check_channel_access", check)
+        service = ChatService(db)
+        channel_id, member, outsider = uuid4(), uuid4(), uuid4()
+        granted.add(member)
+
+        service.ensure_channel_access(channel_id, member)
+        service.ensure_channel_access(channel_id, member)
+        for _ in range(2):
+            with pytest.raises(PermissionError):
+                service.ensure_channel_access(channel_id, outsider)
+
+        assert checks == [member, outsider, outsider]
+
+    def test_access_rechecked_after_member_change(self, db, monkeypatch):
+        """Test a removed member loses cached access once their access is invalidated."""
+        granted = set()
+
+        def check(self, channel_id, user_id):
+            if user_id not in granted:
+                raise PermissionError("Access denied", "PERMISSION_DENIED")
+            return True
+
+        monkeypatch.setattr(ChatService, "_check_channel_access", check)
+        service = ChatService(db)
+        channel_id, other_channel_id, member = uuid4(), uuid4(), uuid4()
+        granted.add(member)
+        service.ensure_channel_access(channel_id, member)
+        service.ensure_channel_access(other_channel_id, member)
+
+        granted.discard(member)
+        invalidate_chat_access(member)
+
+        for channel in (channel_id, other_channel_id):
+            with pytest.raises(PermissionError):
+                service.ensure_channel_access(channel, member)
+
+    def test_messages_since(self, db, monkeypatch):
+        """Test resuming returns later messages oldest first, in batches, across timestamp ties."""
+        monkeypatch.setattr(ChatService, "ensure_channel_access", lambda self, channel_id, user_id: None)
+        channel_id = uuid4()
+        ids = _insert_messages(db, channel_id, 9)
+        _insert_messages(db, uuid4(), 3)
+        service = ChatService(db)
+
+        first, more = service.get_messages_since(channel_id, uuid4(), ids[2], limit=4)
+        rest, more_after = service.get_messages_since(channel_id, uuid4(), first[-1].id, limit=4)
+
+        assert [m.id for m in first] == ids[3:7] and more
+        assert [m.id for m in rest] == ids[7:] and not more_after
+
+    def test_messages_since_unknown_message(self, db, monkeypatch):
+        """Test resuming from a message of another channel is rejected."""
+        monkeypatch.setattr(ChatService, "ensure_channel_access", lambda self, channel_id, user_id: None)
+        other_message = _insert_messages(db, uuid4(), 1)[0]
+
+        with pytest.raises(NotFoundError):
+            ChatService(db).get_messages_since(uuid4(), uuid4(), other_message)
+
+
+class TestChannelWebSocket:
+    """Test the channel stream endpoint."""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        hub = _hub()
+        monkeypatch.setattr(chat_api, "realtime_hub", hub)
+        app = FastAPI()
+        app.include_router(chat_api.router)
+        app.dependency_overrides[get_db] = lambda: Session()
+        return TestClient(app), hub
+
+    def test_replays_missed_then_streams(self, client, monkeypatch):
+        """Test missed messages are replayed, then live messages pushed without duplicates."""
+        test_client, hub = client
+        channel_id = uuid4()
+        missed = [{"id": "m1"}, {"id": "m2"}]
+        opened = []
+
+        def open_stream(db, token, channel, since, limit):
+            opened.append((token, channel, since))
+            return uuid4(), missed, False
+
+        monkeypatch.setattr(chat_api, "_open_channel_stream", open_stream)
+        since = uuid4()
+
+        with test_client.websocket_connect(f"/channels/{channel_id}/ws?token=t&since={since}") as ws:
+            assert [ws.receive_json()["data"]["id"] for _ in missed] == ["m1", "m2"]
+            # Sent while the replay was loading: already delivered, not repeated
+            hub.publish(chat_topic(channel_id), {"type": "message", "data": {"id": "m2"}})
+            hub.publish(chat_topic(channel_id), {"type": "message", "data": {"id": "m3"}})
+            assert ws.receive_json() == {"type": "message", "data": {"id": "m3"}}
+            ws.send_text("ping")
+            assert ws.receive_json() == {"type": "pong"}
+
+        assert opened == [("t", channel_id, since)]
+        assert _wait_for(lambda: hub.subscriber_count() == 0)
+
+    def test_session_released_while_streaming(self, client, monkeypatch):
+        """Test the database session is closed once the stream is set up, not when it ends."""
+        test_client, hub = client
+        session, closed = Session(), []
+        monkeypatch.setattr(session, "close", lambda: closed.append(True))
+        test_client.app.dependency_overrides[get_db] = lambda: session
+        monkeypatch.setattr(chat_api, "_open_channel_stream", lambda *args: (uuid4(), [{"id": "m1"}], False))
+
+        with test_client.websocket_connect(f"/channels/{uuid4()}/ws?token=t") as ws:
+            ws.receive_json()
+            assert closed == [True]
+
+    def test_rejects_without_access(self, client, monkeypatch):
+        """Test connections without channel access are closed before they are accepted."""
+        test_client, hub = client
+
+        def open_stream(db, token, channel, since, limit):
+            raise PermissionError("Access denied", "PERMISSION_DENIED")
+
+        monkeypatch.setattr(chat_api, "_open_channel_stream", open_stream)
+
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            with test_client.websocket_connect(f"/channels/{uuid4()}/ws?token=t") as ws:
+                ws.receive_json()
+
+        assert exc_info.value.code == chat_api.WS_POLICY_VIOLATION
+        assert hub.subscriber_count() == 0
@@ -0,0 +1,270 @@
+"""
+Tests for work order access resolution in WorkOrderScopeService:
+set-based crop access (accessible_crop_ids_query) and FSP authorization
+(validate_fsp_access, fsp_writable_crop_ids).
+
+The statements run on an in-memory SQLite database holding just the columns
+they read, covering own crops, global work order access, each scope level,
+work orders that must not grant access and the access decision cache.
+"""
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import Boolean, Column, MetaData, String, Table, Uuid, create_engine, event, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import PermissionError
+from app.models.enums import WorkOrderScopeType
+from app.services.work_order_scope_service import WorkOrderScopeService, invalidate_fsp_access
+
+metadata = MetaData()
+organizations = Table("organizations", metadata, Column("id", Uuid, primary_key=True), Column("organization_type", String))
+farms = Table("farms", metadata, Column("id", Uuid, primary_key=True), Column("organization_id", Uuid))
+plots = Table("plots", metadata, Column("id", Uuid, primary_key=True), Column("farm_id", Uuid))
+crops = Table("crops", metadata, Column("id", Uuid, primary_key=True), Column("plot_id", Uuid))
+work_orders = Table(
+    "work_orders", metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("farming_organization_id", Uuid),
+    Column("fsp_organization_id", Uuid),
+    Column("status", String),
+    Column("access_granted", Boolean)
+)
+work_order_scope = Table(
+    "work_order_scope", metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("work_order_id", Uuid),
+    Column("scope", String),
+    Column("scope_id", Uuid)
+)
+
+
+class Tree:
+    """Organizations with two farms of two plots of two crops each."""
+
+    def __init__(self, db):
+        self.db = db
+
+    def organization(self, organization_type="FARMING"):
+        org_id = uuid4()
+        self.db.execute(insert(organizations).values(id=org_id, organization_type=organization_type))
+        farm_ids, plot_ids, crop_ids = [], [], []
+        for _ in range(2):
+            farm_ids.append(uuid4())
+            self.db.execute(insert(farms).values(id=farm_ids[-1], organization_id=org_id))
+            for _ in range(2):
+                plot_ids.append(uuid4())
+                self.db.execute(insert(plots).values(id=plot_ids[-1], farm_id=farm_ids[-1]))
+                for _ in range(2):
+                    crop_ids.append(uuid4())
+                    self.db.execute(insert(crops).values(id=crop_ids[-1], plot_id=plot_ids[-1]))
+        return org_id, farm_ids, plot_ids, crop_ids
+
+    def work_order(self, fsp_id, client_id, status="ACTIVE", access_granted=False, scopes=()):
+        work_order_id = uuid4()
+        self.db.execute(insert(work_orders).values(
+            id=work_order_id, farming_organization_id=client_id, fsp_organization_id=fsp_id,
+            status=status, access_granted=access_granted
+        ))
+        for scope, scope_id in scopes:
+            self.db.execute(insert(work_order_scope).values(
+                id=uuid4(), work_order_id=work_order_id, scope=scope, scope_id=scope_id
+            ))
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def _accessible(db, org_id):
+    return set(db.execute(WorkOrderScopeService(db).accessible_crop_ids_query(org_id)).scalars())
+
+
+def test_own_crops_only_without_work_orders(db):
+    """Test a farming organization reaches exactly its own crops."""
+    tree = Tree(db)
+    org_id, _, _, own_crops = tree.organization()
+    tree.organization()
+
+    assert _accessible(db, org_id) == set(own_crops)
+
+
+def test_global_access_covers_whole_client(db):
+    """Test access_granted work orders reach every crop of the farming organization, ignoring scope items."""
+    tree = Tree(db)
+    fsp_id, _, _, fsp_crops = tree.organization("FSP")
+    client_id, client_farms, _, client_crops = tree.organization()
+    tree.work_order(fsp_id, client_id, access_granted=True, scopes=[("FARM", client_farms[0])])
+
+    assert _accessible(db, fsp_id) == set(fsp_crops) | set(client_crops)
+
+
+def test_scope_levels(db):
+    """Test ORGANIZATION, FARM, PLOT and CROP scope items each reach the crops beneath them."""
+    tree = Tree(db)
+    fsp_id, _, _, fsp_crops = tree.organization("FSP")
+    org_client, _, _, org_crops = tree.organization()
+    farm_client, farm_ids, _, farm_crops = tree.organization()
+    plot_client, _, plot_ids, plot_crops = tree.organization()
+    crop_client, _, _, crop_crops = tree.organization()
+    tree.work_order(fsp_id, org_client, scopes=[("ORGANIZATION", org_client)])
+    tree.work_order(fsp_id, farm_client, scopes=[("FARM", farm_ids[1])])
+    # access_granted NULL behaves as not granted
+    tree.work_order(fsp_id, plot_client, access_granted=None, scopes=[("PLOT", plot_ids[0])])
+    tree.work_order(fsp_id, crop_client, scopes=[("CROP", crop_crops[3]), ("CROP", crop_crops[3])])
+
+    assert _accessible(db, fsp_id) == (
+        set(fsp_crops) | set(org_crops) | set(farm_crops[4:]) | set(plot_crops[:2]) | {crop_crops[3]}
+    )
+
+
+def test_inactive_and_non_fsp_work_orders_ignored(db):
+    """Test work orders that are not ACTIVE, or held by a non-FSP organization, grant nothing."""
+    tree = Tree(db)
+    fsp_id, _, _, fsp_crops = tree.organization("FSP")
+    farmer_id, _, _, farmer_crops = tree.organization()
+    client_id, _, _, _ = tree.organization()
+    tree.work_order(fsp_id, client_id, status="PENDING", access_granted=True)
+    tree.work_order(farmer_id, client_id, access_granted=True)
+
+    assert _accessible(db, fsp_id) == set(fsp_crops)
+    assert _accessible(db, farmer_id) == set(farmer_crops)
+
+
+def test_usable_as_in_filter(db):
+    """Test the statement works as an IN subquery of an outer query."""
+    tree = Tree(db)
+    fsp_id, _, _, _ = tree.organization("FSP")
+    client_id, _, plot_ids, client_crops = tree.organization()
+    tree.work_order(fsp_id, client_id, scopes=[("PLOT", plot_ids[2])])
+    query = WorkOrderScopeService(db).accessible_crop_ids_query(fsp_id)
+
+    rows = db.execute(select(crops.c.id).where(crops.c.plot_id == plot_ids[2], crops.c.id.in_(query))).scalars()
+
+    assert set(rows) == set(client_crops[4:6])
+
+
+class TestValidateFSPAccess:
+    """Test the single-query FSP access decision and its cache."""
+
+    def test_global_access_covers_client_resources(self, db):
+        """Test an access_granted work order allows every level of the farming organization's tree."""
+        tree = Tree(db)
+        fsp_id, _, _, _ = tree.organization("FSP")
+        client_id, farm_ids, plot_ids, crop_ids = tree.organization()
+        tree.work_order(fsp_id, client_id, access_granted=True)
+        service = WorkOrderScopeService(db)
+
+        for resource_type, resource_id in [
+            (WorkOrderScopeType.ORGANIZATION, client_id),
+            (WorkOrderScopeType.FARM, farm_ids[0]),
+            (WorkOrderScopeType.PLOT, plot_ids[1]),
+            (WorkOrderScopeType.CROP, crop_ids[7])
+        ]:
+            assert service.validate_fsp_access(fsp_id, resource_type, resource_id, "write") is True
+
+    def test_ancestor_scope_items(self, db):
+        """Test scope items on a resource's farm or plot allow it, and other resources stay denied."""
+        tree = Tree(db)
+        fsp_id, _, _, _ = tree.organization("FSP")
+        client_id, farm_ids, plot_ids, crop_ids = tree.organization()
+        other_client, _, _, other_crops = tree.organization()
+        # Scope items on another organization's resources
+        tree.work_order(fsp_id, other_client, access_granted=True, scopes=[
+            ("FARM", farm_ids[0]), ("PLOT", plot_ids[3])
+        ])
+        service = WorkOrderScopeService(db)
+
+        assert service.validate_fsp_access(fsp_id, WorkOrderScopeType.CROP, crop_ids[2], "track")
+        assert service.validate_fsp_access(fsp_id, "CROP", crop_ids[7], "track")
+        assert service.validate_fsp_access(fsp_id, WorkOrderScopeType.CROP, other_crops[0], "track")
+        with pytest.raises(PermissionError) as exc_info:
+            service.validate_fsp_access(fsp_id, WorkOrderScopeType.CROP, crop_ids[4], "track")
+        assert exc_info.value.error_code == "FSP_ACCESS_DENIED"
+
+    def test_work_orders_without_access_granted_ignored(self, db):
+        """Test scope items of revoked work orders do not allow access, and missing work orders are reported."""
+        tree = Tree(db)
+        fsp_id, _, _, _ = tree.organization("FSP")
+        client_id, _, _, crop_ids = tree.organization()
+        tree.work_order(fsp_id, client_id, access_granted=False, scopes=[("CROP", crop_ids[0])])
+        service = WorkOrderScopeService(db)
+
+        with pytest.raises(PermissionError) as exc_info:
+            service.validate_fsp_access(fsp_id, WorkOrderScopeType.CROP, crop_ids[0], "read")
+        assert exc_info.value.error_code == "FSP_ACCESS_DENIED"
+
+        with pytest.raises(PermissionError) as exc_info:
+            service.validate_fsp_access(uuid4(), WorkOrderScopeType.CROP, crop_ids[0], "read")
+        assert exc_info.value.error_code == "NO_ACTIVE_WORK_ORDER"
+
+    def test_decisions_cached_until_invalidated(self, db):
+        """Test repeated checks reuse the cached decision until the FSP's access is invalidated."""
+        tree = Tree(db)
+        fsp_id, _, _, _ = tree.organization("FSP")
+        client_id, _, _, crop_ids = tree.organization()
+        tree.work_order(fsp_id, client_id, access_granted=False)
+        statements = []
+        event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        with pytest.raises(PermissionError):
+            WorkOrderScopeService(db).validate_fsp_access(fsp_id, WorkOrderScopeType.CROP, crop_ids[0], "read")
+        # Ancestry join plus one decision query
+        assert len(statements) == 2
+
+        db.execute(work_orders.update().values(access_granted=True))
+        with pytest.raises(PermissionError):
+            WorkOrderScopeService(db).validate_fsp_access(fsp_id, WorkOrderScopeType.CROP, crop_ids[0], "read")
+        assert len(statements) == 3
+
+        invalidate_fsp_access(fsp_id)
+        assert WorkOrderScopeService(db).validate_fsp_access(fsp_id, WorkOrderScopeType.CROP, crop_ids[0], "read")
+
+    def test_ancestry_resolved_once_per_service(self, db):
+        """Test a resource's ancestry is resolved with one query and reused within the service instance."""
+        tree = Tree(db)
+        client_id, farm_ids, plot_ids, crop_ids = tree.organization()
+        service = WorkOrderScopeService(db)
+        statements = []
+        event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        ancestry = service.resolve_resource_ancestry(WorkOrderScopeType.CROP, crop_ids[5])
+        service.resolve_resource_ancestry("CROP", crop_ids[5])
+
+        assert ancestry == {
+            WorkOrderScopeType.ORGANIZATION: client_id,
+            WorkOrderScopeType.FARM: farm_ids[1],
+            WorkOrderScopeType.PLOT: plot_ids[2],
+            WorkOrderScopeType.CROP: crop_ids[5]
+        }
+        assert len(statements) == 1
+
+    def test_writable_crops_match_single_checks(self, db):
+        """Test the batch writable-crop query agrees with validate_fsp_access crop by crop."""
+        tree = Tree(db)
+        fsp_id, _, _, _ = tree.organization("FSP")
+        granted_client, _, _, granted_crops = tree.organization()
+        scoped_client, farm_ids, plot_ids, scoped_crops = tree.organization()
+        revoked_client, _, _, revoked_crops = tree.organization()
+        tree.work_order(fsp_id, granted_client, access_granted=True)
+        tree.work_order(fsp_id, tree.organization()[0], access_granted=True, scopes=[
+            ("FARM", farm_ids[1]), ("CROP", scoped_crops[0])
+        ])
+        tree.work_order(fsp_id, revoked_client, access_granted=False, scopes=[("CROP", revoked_crops[0])])
+        service = WorkOrderScopeService(db)
+        crop_ids = granted_crops + scoped_crops + revoked_crops
+
+        def allowed(crop_id):
+            try:
+                return service.validate_fsp_access(fsp_id, WorkOrderScopeType.CROP, crop_id, "write")
+            except PermissionError:
+                return False
+
+        writable = service.fsp_writable_crop_ids(fsp_id, crop_ids)
+
+        assert writable == {crop_id for crop_id in crop_ids if allowed(crop_id)}
+        assert writable == set(granted_crops) | {scoped_crops[0]} | set(scoped_crops[4:])
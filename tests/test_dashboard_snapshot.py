@@ -0,0 +1,97 @@
+"""
+Tests for DashboardSnapshotService.
+
+Covers incremental field refresh, staleness-bounded rebuilds and
+invalidation against the in-memory Redis stand-in from conftest.
+"""
+import time
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.services.dashboard_snapshot_service import (
+    BUILT_AT_FIELD,
+    ENTITY_FIELDS,
+    FARMING_DASHBOARD,
+    DashboardSnapshotService
+)
+from app.models.work_order import WorkOrder
+
+
+def _service(redis_client=None, max_age=300):
+    cache = SimpleNamespace(
+        redis_client=redis_client,
+        _get_key=lambda prefix, *args: ":".join(["test", prefix, *args])
+    )
+    return DashboardSnapshotService(cache=cache, max_age=max_age)
+
+
+def _counting_builders(calls):
+    def builder(field, value):
+        def build():
+            calls.append(field)
+            return value
+        return build
+
+    return {'farms': builder('farms', 2), 'openIssues': builder('openIssues', 1)}
+
+
+def test_without_redis_computes_live():
+    """Test every field is computed when Redis is unavailable."""
+    calls = []
+    values, meta = _service().get_or_build(FARMING_DASHBOARD, uuid4(), _counting_builders(calls))
+
+    assert values == {'farms': 2, 'openIssues': 1}
+    assert meta['source'] == 'live'
+    assert sorted(calls) == ['farms', 'openIssues']
+
+
+def test_second_read_served_from_snapshot(fake_redis):
+    """Test a fresh snapshot is read without recomputing any field."""
+    service = _service(fake_redis)
+    org_id = uuid4()
+    calls = []
+
+    service.get_or_build(FARMING_DASHBOARD, org_id, _counting_builders(calls))
+    calls.clear()
+    values, meta = service.get_or_build(FARMING_DASHBOARD, org_id, _counting_builders(calls))
+
+    assert values == {'farms': 2, 'openIssues': 1}
+    assert meta['source'] == 'snapshot'
+    assert calls == []
+
+
+def test_invalidation_recomputes_only_affected_fields(fake_redis):
+    """Test invalidated fields are rebuilt while the rest stay cached."""
+    service = _service(fake_redis)
+    org_id = uuid4()
+    calls = []
+
+    service.get_or_build(FARMING_DASHBOARD, org_id, _counting_builders(calls))
+    calls.clear()
+    service.invalidate({org_id: {'openIssues'}})
+    _, meta = service.get_or_build(FARMING_DASHBOARD, org_id, _counting_builders(calls))
+
+    assert calls == ['openIssues']
+    assert meta['source'] == 'partial'
+
+
+def test_expired_snapshot_is_rebuilt(fake_redis):
+    """Test snapshots older than the staleness bound are fully recomputed."""
+    service = _service(fake_redis, max_age=60)
+    org_id = uuid4()
+    calls = []
+
+    service.get_or_build(FARMING_DASHBOARD, org_id, _counting_builders(calls))
+    key = service._key(FARMING_DASHBOARD, org_id)
+    fake_redis.hashes[key][BUILT_AT_FIELD] = str(time.time() - 120)
+    calls.clear()
+    _, meta = service.get_or_build(FARMING_DASHBOARD, org_id, _counting_builders(calls))
+
+    assert sorted(calls) == ['farms', 'openIssues']
+    assert meta['maxStalenessSeconds'] == 60
+    assert meta['ageSeconds'] == 0
+
+
+def test_work_order_changes_touch_dashboard_fields():
+    """Test work order changes map onto both farming and FSP dashboard fields."""
+    assert {'activeServices', 'activeOrders', 'totalRevenue'} <= ENTITY_FIELDS[WorkOrder]
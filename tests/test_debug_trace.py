@@ -0,0 +1,65 @@
+"""
+Tests for the sampled debug trace channel (app/core/debug_trace.py).
+"""
+import contextvars
+import logging
+
+from app.core import debug_trace
+from app.core.debug_trace import get_debug_trace, trace_sampled
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def _capture(monkeypatch):
+    """Route trace events to a recording handler instead of the queue writer."""
+    handler = RecordingHandler()
+    stdlib_logger = logging.getLogger("test_debug_trace")
+    stdlib_logger.addHandler(handler)
+    stdlib_logger.setLevel(logging.DEBUG)
+    stdlib_logger.propagate = False
+    monkeypatch.setattr(debug_trace, "_get_logger", lambda: debug_trace.structlog.wrap_logger(
+        stdlib_logger, wrapper_class=debug_trace.structlog.stdlib.BoundLogger
+    ))
+    return handler
+
+
+def test_disabled_by_default_emits_nothing(monkeypatch):
+    """Test no event is emitted while tracing is disabled."""
+    handler = _capture(monkeypatch)
+    monkeypatch.setattr(debug_trace.settings, "DEBUG_TRACE_ENABLED", False)
+
+    contextvars.Context().run(get_debug_trace("test"), "event", value=1)
+
+    assert handler.messages == []
+
+
+def test_enabled_and_sampled_emits_structured_event(monkeypatch):
+    """Test sampled contexts emit events with their channel and fields."""
+    handler = _capture(monkeypatch)
+    monkeypatch.setattr(debug_trace.settings, "DEBUG_TRACE_ENABLED", True)
+    monkeypatch.setattr(debug_trace.settings, "DEBUG_TRACE_SAMPLE_RATE", 1.0)
+
+    contextvars.Context().run(get_debug_trace("audit.responses"), "bulk_item", items=3)
+
+    assert len(handler.messages) == 1
+    assert "bulk_item" in handler.messages[0]
+    assert "audit.responses" in handler.messages[0]
+
+
+def test_sampling_decision_is_sticky_per_context(monkeypatch):
+    """Test one request is either fully traced or not traced at all."""
+    monkeypatch.setattr(debug_trace.settings, "DEBUG_TRACE_ENABLED", True)
+    monkeypatch.setattr(debug_trace.settings, "DEBUG_TRACE_SAMPLE_RATE", 0.5)
+
+    def decisions():
+        return {trace_sampled() for _ in range(50)}
+
+    for _ in range(10):
+        assert len(contextvars.Context().run(decisions)) == 1
@@ -907,3 +907,97 @@ class TestMarketplaceBrowsing:
         
         # NOT_STARTED FSP listing should NOT be present
         assert str(not_started_listing.id) not in listing_ids
+
+
+class TestNearbyMarketplace:
+    """
+    Integration tests for proximity search over marketplace listings.
+    """
+    
+    # Far from any seeded data, so radius filters isolate the test listings
+    ORIGIN = {"lat": -40.0, "lon": 10.0}
+    
+    def _add_listing(self, db, org, service, title, lon, lat, radius_km=None):
+        listing = FSPServiceListing(
+            fsp_organization_id=org.id,
+            service_id=service.id,
+            title=title,
+            service_area_districts=[],
+            service_center=f"POINT({lon} {lat})",
+            service_radius_km=radius_km,
+            status=ServiceStatus.ACTIVE,
+            created_by=org.created_by
+        )
+        db.add(listing)
+        return listing
+    
+    def test_nearby_ranked_by_distance_with_cursor(
+        self,
+        client: TestClient,
+        auth_headers: dict,
+        active_fsp_org: Organization,
+        master_service_consultancy: MasterService,
+        db: Session
+    ):
+        """Test listings come nearest first and the cursor walks every page once."""
+        self._add_listing(db, active_fsp_org, master_service_consultancy, "Far", 10.3, -40.0)
+        self._add_listing(db, active_fsp_org, master_service_consultancy, "Near", 10.01, -40.0)
+        self._add_listing(db, active_fsp_org, master_service_consultancy, "Middle", 10.1, -40.0)
+        db.commit()
+        
+        titles, distances, cursor = [], [], None
+        for _ in range(3):
+            params = {**self.ORIGIN, "radius_km": 100, "limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get(
+                "/api/v1/fsp-services/fsp-marketplace/services/nearby",
+                params=params,
+                headers=auth_headers
+            )
+            assert response.status_code == 200
+            data = response.json()["data"]
+            titles += [item["title"] for item in data["items"]]
+            distances += [item["distance_km"] for item in data["items"]]
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+        
+        assert titles == ["Near", "Middle", "Far"]
+        assert distances == sorted(distances)
+        assert 0.5 < distances[0] < 1.0
+    
+    def test_nearby_radius_and_coverage_filters(
+        self,
+        client: TestClient,
+        auth_headers: dict,
+        active_fsp_org: Organization,
+        master_service_consultancy: MasterService,
+        db: Session
+    ):
+        """Test radius limits the search and providers only appear where they serve."""
+        self._add_listing(db, active_fsp_org, master_service_consultancy, "Covers origin", 10.1, -40.0, radius_km=20)
+        self._add_listing(db, active_fsp_org, master_service_consultancy, "Too small", 10.2, -40.0, radius_km=5)
+        self._add_listing(db, active_fsp_org, master_service_consultancy, "Out of radius", 11.0, -40.0)
+        db.commit()
+        
+        def titles(**params):
+            response = client.get(
+                "/api/v1/fsp-services/fsp-marketplace/services/nearby",
+                params={**self.ORIGIN, **params},
+                headers=auth_headers
+            )
+            assert response.status_code == 200
+            return [item["title"] for item in response.json()["data"]["items"]]
+        
+        assert titles(radius_km=50) == ["Covers origin"]
+        assert titles(radius_km=50, within_coverage=False) == ["Covers origin", "Too small"]
+    
+    def test_nearby_requires_origin(self, client: TestClient, auth_headers: dict):
+        """Test a search without farm_id or coordinates is rejected."""
+        response = client.get(
+            "/api/v1/fsp-services/fsp-marketplace/services/nearby",
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 422
@@ -0,0 +1,247 @@
+"""
+Tests for the photo media pipeline (app/services/media_pipeline.py) and
+media storage (app/core/storage.py).
+
+Covers draft-mode downscaling, transparency flattening, the fallback for
+unreadable files, the real image process pool, the local filesystem and
+S3 storage backends (with an in-memory S3 stand-in) and bulk photo upload.
+"""
+import io
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from botocore.exceptions import ClientError
+from PIL import Image
+from PIL.JpegImagePlugin import JpegImageFile
+
+from app.core.config import settings
+from app.core.exceptions import ServiceError, ValidationError
+from app.core.process_pool import shutdown_process_pools
+from app.core.storage import MediaStorage
+from app.models.audit import AuditResponse
+from app.services.media_pipeline import (
+    ImageSpec,
+    make_thumbnail,
+    process_image,
+    process_images,
+    submit_image
+)
+from app.services.photo_service import PhotoService
+
+
+def _image_bytes(size=(4000, 3000), mode="RGB", image_format="JPEG", color=(40, 120, 60)):
+    output = io.BytesIO()
+    Image.new(mode, size, color).save(output, format=image_format)
+    return output.getvalue()
+
+
+class FakeS3:
+    """In-memory stand-in for an S3 client."""
+
+    def __init__(self, fail=False):
+        self.objects = {}
+        self.fail = fail
+
+    def upload_fileobj(self, fileobj, bucket, key, ExtraArgs=None):
+        if self.fail:
+            raise ClientError({"Error": {"Code": "500", "Message": "boom"}}, "PutObject")
+        self.objects[(bucket, key)] = (fileobj.read(), ExtraArgs["ContentType"])
+
+    def head_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise ClientError({"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject")
+
+    def get_object(self, Bucket, Key):
+        return {"Body": io.BytesIO(self.objects[(Bucket, Key)][0])}
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop((Bucket, Key), None)
+
+
+@pytest.fixture
+def inline(monkeypatch):
+    """Process images in the calling thread."""
+    monkeypatch.setattr(settings, "IMAGE_PROCESS_WORKERS", 0)
+
+
+def test_large_jpeg_is_downscaled(inline):
+    """Test camera-sized JPEGs come out at the configured width with a thumbnail."""
+    result = process_image(_image_bytes(), ImageSpec(max_width=1024, quality=70, thumbnail_size=(300, 300)))
+
+    image = Image.open(io.BytesIO(result.data))
+    assert image.format == "JPEG"
+    assert image.size == (1024, 768)
+    assert Image.open(io.BytesIO(result.thumbnail)).size == (300, 225)
+
+
+def test_jpeg_decoded_in_draft_mode(monkeypatch):
+    """Test JPEG decoding is reduced to the smallest scale still covering the target width."""
+    decoded = []
+    original = JpegImageFile.draft
+
+    def draft(self, mode, size):
+        result = original(self, mode, size)
+        decoded.append(self.size)
+        return result
+
+    monkeypatch.setattr(JpegImageFile, "draft", draft)
+    process_image(_image_bytes(), ImageSpec(max_width=1024, quality=70))
+    process_image(_image_bytes(size=(800, 600)), ImageSpec(max_width=1024, quality=70))
+
+    # 4000px wide: 1/2 scale (2000px) is the smallest not below 1024px; small photos skip draft
+    assert decoded == [(2000, 1500)]
+
+
+def test_transparent_png_flattened_on_white():
+    """Test transparent PNGs are flattened onto white before JPEG encoding."""
+    data = _image_bytes(size=(10, 10), mode="RGBA", image_format="PNG", color=(0, 0, 0, 0))
+
+    result = process_image(data, ImageSpec(max_width=1024, quality=90))
+
+    assert Image.open(io.BytesIO(result.data)).getpixel((5, 5)) == (255, 255, 255)
+    assert Image.open(io.BytesIO(make_thumbnail(data, (4, 4)))).size == (4, 4)
+
+
+def test_unreadable_file_kept_as_uploaded(inline):
+    """Test a photo that cannot be processed is returned unchanged without failing the batch."""
+    good = _image_bytes(size=(2000, 1000))
+
+    results = process_images([b"not an image", good], ImageSpec(max_width=500, quality=70))
+
+    assert results[0].data == b"not an image"
+    assert Image.open(io.BytesIO(results[1].data)).size == (500, 250)
+
+
+def test_process_pool_processes_photos():
+    """Test photos survive the trip to spawned image processes."""
+    try:
+        results = process_images([_image_bytes(), _image_bytes(size=(640, 480))], ImageSpec(max_width=1024, quality=70))
+        thumbnail = submit_image(make_thumbnail, _image_bytes(), (300, 300)).result(timeout=60)
+    finally:
+        shutdown_process_pools()
+
+    assert [Image.open(io.BytesIO(r.data)).size for r in results] == [(1024, 768), (640, 480)]
+    assert Image.open(io.BytesIO(thumbnail)).size == (300, 225)
+
+
+def test_local_storage_streams_and_deletes(tmp_path):
+    """Test the filesystem backend writes file objects atomically and serves them under /uploads."""
+    storage = MediaStorage(root=str(tmp_path))
+
+    url = storage.put("audits/a/photo.jpg", io.BytesIO(b"jpeg bytes"), "image/jpeg")
+
+    assert url == "/uploads/audits/a/photo.jpg"
+    assert storage.exists("audits/a/photo.jpg")
+    assert storage.load("audits/a/photo.jpg") == b"jpeg bytes"
+    assert [p.name for p in (tmp_path / "audits" / "a").iterdir()] == ["photo.jpg"]
+
+    storage.delete("audits/a/photo.jpg")
+    assert not storage.exists("audits/a/photo.jpg")
+
+
+def test_s3_storage(monkeypatch):
+    """Test the S3 backend against a stand-in client, including S3-compatible endpoints and failures."""
+    s3 = FakeS3()
+    storage = MediaStorage(s3_client=s3, bucket="media")
+
+    url = storage.put("reports/r.pdf", b"%PDF", "application/pdf")
+    assert url == f"https://media.s3.{settings.AWS_REGION_NAME}.amazonaws.com/reports/r.pdf"
+    assert s3.objects[("media", "reports/r.pdf")] == (b"%PDF", "application/pdf")
+    assert storage.exists("reports/r.pdf")
+    assert storage.load("reports/r.pdf") == b"%PDF"
+    assert not storage.exists("reports/missing.pdf")
+
+    monkeypatch.setattr(settings, "AWS_S3_ENDPOINT_URL", "http://localhost:9000/")
+    assert storage.url("reports/r.pdf") == "http://localhost:9000/media/reports/r.pdf"
+
+    with pytest.raises(ServiceError) as exc_info:
+        MediaStorage(s3_client=FakeS3(fail=True), bucket="media").put("x.jpg", b"x", "image/jpeg")
+    assert exc_info.value.error_code == "STORAGE_UPLOAD_FAILED"
+
+
+class FakeSession:
+    """Session stand-in serving one audit response."""
+
+    def __init__(self, response, fail_commit=False):
+        self.response = response
+        self.fail_commit = fail_commit
+        self.added = []
+        self.rolled_back = False
+
+    def query(self, entity):
+        result = self.response if entity is AuditResponse else None
+
+        class _Query:
+            def filter(self, *criteria):
+                return self
+
+            def first(self):
+                return result
+
+            def update(self, values, synchronize_session=None):
+                return 0
+
+        return _Query()
+
+    def add_all(self, objects):
+        self.added.extend(objects)
+
+    def commit(self):
+        if self.fail_commit:
+            raise RuntimeError("database unavailable")
+        for photo in self.added:
+            photo.id = uuid4()
+
+    def refresh(self, obj):
+        pass
+
+    def rollback(self):
+        self.rolled_back = True
+
+
+def _response():
+    return SimpleNamespace(id=uuid4(), audit_id=uuid4(), audit_parameter_instance_id=uuid4())
+
+
+def test_bulk_upload_stores_compressed_photos(inline, tmp_path):
+    """Test several photos are compressed, stored under distinct keys and recorded together."""
+    response = _response()
+    session = FakeSession(response)
+    service = PhotoService(session, storage=MediaStorage(root=str(tmp_path)))
+    files = [(io.BytesIO(_image_bytes()), "a.jpg"), (io.BytesIO(_image_bytes(image_format="PNG")), "b.png")]
+
+    photos = service.upload_photos(response.audit_id, response.id, files, ["north plot"], uuid4())
+
+    assert [p.caption for p in photos] == ["north plot", None]
+    assert len({p.file_key for p in photos}) == 2
+    for photo in photos:
+        assert photo.file_url == f"/uploads/{photo.file_key}"
+        assert Image.open(tmp_path / photo.file_key).size == (1024, 768)
+
+
+def test_bulk_upload_removes_files_when_commit_fails(inline, tmp_path):
+    """Test stored files are deleted again when the photo rows cannot be saved."""
+    response = _response()
+    session = FakeSession(response, fail_commit=True)
+    storage = MediaStorage(root=str(tmp_path))
+    service = PhotoService(session, storage=storage)
+    files = [(io.BytesIO(_image_bytes(size=(100, 100))), f"{i}.jpg") for i in range(3)]
+
+    with pytest.raises(RuntimeError):
+        service.upload_photos(response.audit_id, response.id, files, None, uuid4())
+
+    assert session.rolled_back
+    assert not any(p.is_file() for p in tmp_path.rglob("*"))
+
+
+def test_bulk_upload_rejects_invalid_file_before_storing(inline, tmp_path):
+    """Test one invalid file fails the batch before anything is stored."""
+    response = _response()
+    service = PhotoService(FakeSession(response), storage=MediaStorage(root=str(tmp_path)))
+    files = [(io.BytesIO(_image_bytes(size=(100, 100))), "ok.jpg"), (io.BytesIO(b"text"), "notes.txt")]
+
+    with pytest.raises(ValidationError):
+        service.upload_photos(response.audit_id, response.id, files, None, uuid4())
+
+    assert list(tmp_path.iterdir()) == []
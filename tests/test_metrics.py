@@ -0,0 +1,52 @@
+"""
+Tests for the Prometheus metrics surface (app/core/metrics.py).
+"""
+from types import SimpleNamespace
+
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+from app.core.metrics import MetricsCollector, install_pool_metrics, record_cache_lookup, route_label
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_metrics_collector_increments_counter():
+    """Test call sites' tags become labels and missing tags are left empty."""
+    before = _sample("work_order_status_updated_total", old_status="", new_status="", status="failure")
+
+    MetricsCollector.increment("work_order.status_updated", {"status": "failure"})
+
+    after = _sample("work_order_status_updated_total", old_status="", new_status="", status="failure")
+    assert after == before + 1
+
+
+def test_route_label_uses_template():
+    """Test requests are labelled by route template, not by raw path."""
+    assert route_label({"route": SimpleNamespace(path="/api/v1/farms/{farm_id}")}) == "/api/v1/farms/{farm_id}"
+    assert route_label({}) == "unmatched"
+
+
+def test_pool_gauges_follow_checkouts(tmp_path):
+    """Test pool gauges track checked out connections."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'db.sqlite'}", poolclass=QueuePool, pool_size=3)
+    install_pool_metrics(engine, "test")
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        assert _sample("db_pool_checked_out", engine="test") == 1
+        assert _sample("db_pool_size", engine="test") == 3
+
+    assert _sample("db_pool_checked_out", engine="test") == 0
+
+
+def test_cache_lookup_counter():
+    """Test cache hits and misses are counted per tier and namespace."""
+    before = _sample("cache_lookups_total", tier="local", namespace="units", result="hit")
+
+    record_cache_lookup("local", "units", True)
+
+    assert _sample("cache_lookups_total", tier="local", namespace="units", result="hit") == before + 1
@@ -0,0 +1,279 @@
+"""
+Tests for the notification subsystem.
+
+Covers NotificationService on an in-memory SQLite copy of the notifications
+table with the in-memory Redis stand-in from conftest holding the unread
+counters (seeding, adjustment on insert and mark-read, recount without
+Redis), the events it publishes, and the SSE event stream.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import JSON, Boolean, Column, DateTime, MetaData, String, Table, Text, Uuid, create_engine, event, insert
+from sqlalchemy.orm import Session
+
+from app.api.v1 import notifications as notifications_api
+from app.core.cache import CacheService
+from app.core.exceptions import NotFoundError
+from app.core.realtime import RealtimeHub
+from app.services import notification_service
+from app.services.notification_service import _ADJUST_UNREAD_SCRIPT, NotificationService, _unread_key, notification_topic
+
+
+class RecordingHub:
+    """Collects published events."""
+
+    def __init__(self):
+        self.events = []
+
+    def publish(self, topic, event):
+        self.events.append((topic, event))
+
+
+metadata = MetaData()
+notifications = Table(
+    "notifications", metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("user_id", Uuid),
+    Column("organization_id", Uuid),
+    Column("type", String),
+    Column("notification_type", String),
+    Column("title", String),
+    Column("message", Text),
+    Column("reference_type", String),
+    Column("reference_id", Uuid),
+    Column("data", JSON),
+    Column("is_read", Boolean),
+    Column("read_at", DateTime),
+    Column("is_push_sent", Boolean),
+    Column("push_sent_at", DateTime),
+    Column("created_at", DateTime)
+)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def _adjust_unread(redis_client, keys, args):
+    if redis_client.get(keys[0]) is None:
+        return None
+    count = int(redis_client.get(keys[0])) + int(args[0])
+    if count < 0:
+        redis_client.delete(keys[0])
+        return None
+    redis_client.set(keys[0], count)
+    return count
+
+
+@pytest.fixture
+def redis_client(fake_redis, monkeypatch):
+    fake_redis.scripts[_ADJUST_UNREAD_SCRIPT] = _adjust_unread
+    redis_cache = CacheService.__new__(CacheService)
+    redis_cache.redis_client = fake_redis
+    monkeypatch.setattr(notification_service, "cache_service", redis_cache)
+    return fake_redis
+
+
+@pytest.fixture
+def hub(monkeypatch):
+    hub = RecordingHub()
+    monkeypatch.setattr(notification_service, "realtime_hub", hub)
+    return hub
+
+
+def _insert_unread(db, user_id, count, start=datetime(2026, 5, 1)):
+    ids = []
+    for i in range(count):
+        ids.append(uuid4())
+        db.execute(insert(notifications).values(
+            id=ids[-1], user_id=user_id, notification_type="INFO", title=f"n{i}", message="m",
+            is_read=False, created_at=start + timedelta(minutes=i)
+        ))
+    db.commit()
+    return ids
+
+
+def _count_queries(db):
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+class TestUnreadCounter:
+    """Test the Redis unread counters."""
+
+    def test_seeded_once_then_served_from_redis(self, db, redis_client, hub):
+        """Test the first read counts and seeds the counter and later reads skip the database."""
+        user_id = uuid4()
+        _insert_unread(db, user_id, 3)
+        _insert_unread(db, uuid4(), 2)
+        service = NotificationService(db)
+        statements = _count_queries(db)
+
+        assert service.get_unread_count(user_id) == 3
+        assert service.get_unread_count(user_id) == 3
+        assert len(statements) == 1
+        assert redis_client.data[_unread_key(user_id)] == "3"
+
+    def test_adjusted_by_notify_and_mark_read(self, db, redis_client, hub):
+        """Test inserts and reads move the counter, and repeated reads do not."""
+        user_id, other = uuid4(), uuid4()
+        _insert_unread(db, user_id, 1)
+        service = NotificationService(db)
+        service.get_unread_count(user_id)
+
+        created = service.notify([user_id, other, user_id], "Title", "Message", type="VIDEO_CALL")
+        assert len(created) == 2
+        assert redis_client.data[_unread_key(user_id)] == "2"
+        # Not seeded before: counted (after the insert) to publish the count
+        assert redis_client.data[_unread_key(other)] == "1"
+
+        service.mark_as_read(created[0].id, user_id)
+        service.mark_as_read(created[0].id, user_id)
+        assert redis_client.data[_unread_key(user_id)] == "1"
+
+        statements = _count_queries(db)
+        assert service.get_unread_count(user_id) == 1
+        assert statements == []
+
+    def test_mark_all_read(self, db, redis_client, hub):
+        """Test marking everything read updates every unread row and only the user's counter."""
+        user_id, other = uuid4(), uuid4()
+        _insert_unread(db, user_id, 4)
+        _insert_unread(db, other, 2)
+        service = NotificationService(db)
+        service.get_unread_count(user_id)
+        service.get_unread_count(other)
+
+        assert service.mark_all_read(user_id) == 4
+        assert service.mark_all_read(user_id) == 0
+
+        assert redis_client.data[_unread_key(user_id)] == "0"
+        assert redis_client.data[_unread_key(other)] == "2"
+        db.expire_all()
+        assert service.get_notifications(user_id, unread_only=True).items == []
+        assert hub.events == [(notification_topic(user_id), {"type": "unread", "count": 0})]
+
+    def test_counts_without_redis(self, db, monkeypatch, hub):
+        """Test counts fall back to the database when Redis is unavailable."""
+        redis_cache = CacheService.__new__(CacheService)
+        redis_cache.redis_client = None
+        monkeypatch.setattr(notification_service, "cache_service", redis_cache)
+        user_id = uuid4()
+        ids = _insert_unread(db, user_id, 2)
+        service = NotificationService(db)
+
+        service.mark_as_read(ids[0], user_id)
+
+        assert service.get_unread_count(user_id) == 1
+        assert hub.events == [(notification_topic(user_id), {"type": "unread", "count": 1})]
+
+
+class TestNotificationService:
+    """Test notification creation and history."""
+
+    def test_notify_publishes_to_each_recipient(self, db, redis_client, hub):
+        """Test every recipient's stream gets the serialized notification and its unread count."""
+        recipients = [uuid4(), uuid4()]
+        reference_id = uuid4()
+
+        NotificationService(db).notify(
+            recipients, "Video Call Invitation", "Join now", type="VIDEO_CALL",
+            reference_type="WORK_ORDER", reference_id=reference_id, data={"room_name": "r"}
+        )
+
+        assert [topic for topic, _ in hub.events] == [notification_topic(u) for u in recipients]
+        _, event = hub.events[0]
+        assert event["type"] == "notification"
+        assert event["unread_count"] == 1
+        assert event["data"]["reference_id"] == str(reference_id)
+        assert event["data"]["notification_type"] == "INFO"
+        assert event["data"]["data"] == {"room_name": "r"}
+
+    def test_mark_unknown_notification(self, db, redis_client, hub):
+        """Test marking another user's notification is reported as not found."""
+        notification_id = _insert_unread(db, uuid4(), 1)[0]
+
+        with pytest.raises(NotFoundError):
+            NotificationService(db).mark_as_read(notification_id, uuid4())
+
+    def test_history_pages(self, db, redis_client, hub):
+        """Test history is returned newest first in cursor pages."""
+        user_id = uuid4()
+        ids = _insert_unread(db, user_id, 5)
+        service = NotificationService(db)
+
+        first = service.get_notifications(user_id, limit=3)
+        second = service.get_notifications(user_id, cursor=first.next_cursor, limit=3)
+
+        assert [n.id for n in first.items] == ids[:1:-1]
+        assert [n.id for n in second.items] == ids[1::-1]
+        assert second.next_cursor is None
+
+
+class FakeRequest:
+    """Request that reports a disconnect after a number of checks."""
+
+    def __init__(self, connected_checks=0):
+        self.connected_checks = connected_checks
+
+    async def is_disconnected(self):
+        self.connected_checks -= 1
+        return self.connected_checks < 0
+
+
+class TestNotificationStream:
+    """Test the SSE event stream."""
+
+    @pytest.fixture
+    def realtime(self, monkeypatch):
+        redis_cache = CacheService.__new__(CacheService)
+        redis_cache.redis_client = None
+        monkeypatch.setattr(notifications_api.settings, "NOTIFICATION_STREAM_KEEPALIVE", 0.05)
+        return RealtimeHub(redis_cache, queue_size=2)
+
+    def test_streams_count_events_and_keepalives(self, realtime):
+        """Test the stream opens with the unread count, forwards events and sends keepalives until disconnect."""
+        user_id = uuid4()
+
+        async def scenario():
+            subscription = realtime.subscribe(notification_topic(user_id))
+            realtime.publish(notification_topic(user_id), {"type": "unread", "count": 2})
+            chunks = [chunk async for chunk in notifications_api._notification_events(
+                FakeRequest(connected_checks=1), subscription, 3
+            )]
+            return chunks
+
+        chunks = asyncio.run(scenario())
+
+        assert chunks == [
+            'event: unread\ndata: {"type": "unread", "count": 3}\n\n',
+            'event: unread\ndata: {"type": "unread", "count": 2}\n\n',
+            ": keepalive\n\n"
+        ]
+        assert realtime.subscriber_count() == 0
+
+    def test_slow_client_told_to_resync(self, realtime):
+        """Test a client that fell behind gets a resync event and the stream ends."""
+        user_id = uuid4()
+
+        async def scenario():
+            subscription = realtime.subscribe(notification_topic(user_id))
+            for count in range(3):
+                realtime.publish(notification_topic(user_id), {"type": "unread", "count": count})
+            await asyncio.sleep(0)
+            return [chunk async for chunk in notifications_api._notification_events(
+                FakeRequest(), subscription, 0
+            )]
+
+        chunks = asyncio.run(scenario())
+
+        assert chunks[-1] == 'event: resync\ndata: {"type": "resync"}\n\n'
+        assert realtime.subscriber_count() == 0
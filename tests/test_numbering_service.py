@@ -0,0 +1,140 @@
+"""
+Tests for business number allocation (app/services/numbering_service.py).
+
+Numbers are allocated for the year 2999 so the real counters are untouched;
+the counter rows are removed afterwards.
+"""
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+from app.core.database import SessionLocal, engine
+from app.services.audit_service import AuditService
+from app.services.numbering_service import AUDIT, QUERY, WORK_ORDER, NumberingService
+from app.services.query_service import QueryService
+from app.services.work_order_service import WorkOrderService
+
+TEST_NOW = datetime(2999, 3, 15)
+
+
+@pytest.fixture(autouse=True)
+def clean_counters():
+    yield
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("DELETE FROM business_number_counters WHERE period = 2999"))
+
+
+def _allocate(series, count):
+    db = SessionLocal()
+    try:
+        service = NumberingService(db)
+        numbers = []
+        for _ in range(count):
+            numbers.append(service.next_number(series, now=TEST_NOW))
+            db.commit()
+        return numbers
+    finally:
+        db.close()
+
+
+def test_number_formats(db):
+    """Test each series keeps its established number format."""
+    service = NumberingService(db)
+
+    assert re.fullmatch(r"WO-2999-\d{4,}", service.next_number(WORK_ORDER, now=TEST_NOW))
+    assert re.fullmatch(r"AUD-2999-\d{4,}", service.next_number(AUDIT, now=TEST_NOW))
+    assert re.fullmatch(r"Q-29990315-\d{4,}", service.next_number(QUERY, now=TEST_NOW))
+
+
+def test_numbers_are_sequential_within_a_year(db):
+    """Test consecutive allocations count up by one."""
+    service = NumberingService(db)
+
+    first = service.next_number(WORK_ORDER, now=TEST_NOW)
+    second = service.next_number(WORK_ORDER, now=TEST_NOW)
+
+    assert int(second.rsplit("-", 1)[1]) == int(first.rsplit("-", 1)[1]) + 1
+
+
+def test_concurrent_allocation_has_no_duplicates():
+    """Test thousands of numbers allocated from parallel sessions are all distinct."""
+    per_task, tasks = 125, 8
+    jobs = [series for series in (WORK_ORDER, AUDIT, QUERY) for _ in range(tasks)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda series: (series, _allocate(series, per_task)), jobs))
+
+    for series in (WORK_ORDER, AUDIT, QUERY):
+        numbers = [n for s, batch in results if s is series for n in batch]
+        duplicates = [n for n, seen in Counter(numbers).items() if seen > 1]
+        assert len(numbers) == per_task * tasks
+        assert duplicates == []
+        # No gaps either when nothing rolls back
+        values = sorted(int(n.rsplit("-", 1)[1]) for n in numbers)
+        assert values == list(range(values[0], values[0] + len(values)))
+
+
+def test_service_generators_are_concurrency_safe(monkeypatch):
+    """Test work order, audit and query creation paths never hand out a number twice."""
+    next_number = NumberingService.next_number
+    monkeypatch.setattr(
+        NumberingService, "next_number",
+        lambda self, series, now=None: next_number(self, series, now=TEST_NOW)
+    )
+    generators = [
+        lambda db: WorkOrderService(db)._generate_work_order_number(),
+        lambda db: AuditService(db)._generate_audit_number(),
+        lambda db: QueryService(db)._generate_query_number(),
+    ]
+
+    def run(generator):
+        db = SessionLocal()
+        try:
+            numbers = []
+            for _ in range(100):
+                numbers.append(generator(db))
+                db.commit()
+            return numbers
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        numbers = [n for batch in pool.map(run, generators * 8) for n in batch]
+
+    assert len(numbers) == 2400
+    assert len(set(numbers)) == len(numbers)
+
+
+def test_rolled_back_number_is_reused():
+    """Test a number allocated by a transaction that rolls back is handed out again."""
+    db = SessionLocal()
+    try:
+        service = NumberingService(db)
+        first = service.next_number(AUDIT, now=TEST_NOW)
+        db.commit()
+        rolled_back = service.next_number(AUDIT, now=TEST_NOW)
+        db.rollback()
+
+        assert service.next_number(AUDIT, now=TEST_NOW) == rolled_back
+        assert rolled_back != first
+    finally:
+        db.close()
+
+
+def test_allocation_uses_the_session_connection(monkeypatch):
+    """Test allocating never checks out another pooled connection."""
+    db = SessionLocal()
+    try:
+        db.execute(text("SELECT 1"))
+        monkeypatch.setattr(engine, "connect", lambda: pytest.fail("second connection checked out"))
+
+        number = NumberingService(db).next_number(WORK_ORDER, now=TEST_NOW)
+
+        assert re.fullmatch(r"WO-2999-\d{4,}", number)
+    finally:
+        db.rollback()
+        db.close()
@@ -0,0 +1,153 @@
+"""
+Tests for keyset pagination (app/core/pagination.py).
+
+Covers cursor encoding, walking a list by cursor (including sort key ties),
+the legacy page-number path and the total modes, on an in-memory SQLite
+table so no database server is needed.
+"""
+from datetime import datetime, timedelta
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import Column, DateTime, Integer, String, create_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from app.core.exceptions import ValidationError
+from app.core.pagination import (
+    TOTAL_CACHED,
+    count_total,
+    decode_cursor,
+    encode_cursor,
+    invalidate_totals,
+    paginate
+)
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    start = datetime(2026, 1, 1)
+    # Pairs of rows share a timestamp so the id tie-breaker matters
+    session.add_all([
+        Item(id=i, name=f"item-{i}", created_at=start + timedelta(minutes=i // 2))
+        for i in range(1, 24)
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+
+def _walk(session, limit, descending=True):
+    pages, cursor = [], None
+    while True:
+        page = paginate(
+            session.query(Item), Item.created_at, Item.id, name="items",
+            cursor=cursor, limit=limit, descending=descending, total=None
+        )
+        pages.append([item.id for item in page.items])
+        if not page.has_more:
+            return pages
+        cursor = page.next_cursor
+
+
+def test_cursor_round_trip():
+    """Test cursor values keep their types through encoding."""
+    values = [datetime(2026, 3, 1, 12, 30), uuid4(), Decimal("1.50"), 3.5, None]
+
+    cursor = encode_cursor("farms", values)
+
+    assert decode_cursor("farms", cursor, size=5) == values
+    assert isinstance(decode_cursor("farms", cursor, size=5)[1], UUID)
+    assert "=" not in cursor
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor("audits", [1, 2]), encode_cursor("farms", [1])])
+def test_invalid_cursors_rejected(cursor):
+    """Test malformed cursors and cursors of other lists are rejected."""
+    with pytest.raises(ValidationError) as exc_info:
+        decode_cursor("farms", cursor)
+    assert exc_info.value.error_code == "INVALID_CURSOR"
+
+
+@pytest.mark.parametrize("descending", [True, False])
+def test_cursor_walk_visits_every_row_once(session, descending):
+    """Test following next_cursor returns every row exactly once, in order, across timestamp ties."""
+    pages = _walk(session, limit=5, descending=descending)
+
+    expected = list(range(23, 0, -1)) if descending else list(range(1, 24))
+    assert [i for page in pages for i in page] == expected
+    assert [len(page) for page in pages] == [5, 5, 5, 5, 3]
+
+
+def test_page_numbers_match_cursor_pages(session):
+    """Test legacy page numbers return the same pages and a cursor to continue from."""
+    pages = _walk(session, limit=7)
+
+    third = paginate(session.query(Item), Item.created_at, Item.id, name="items", page=3, limit=7, total=None)
+    assert [item.id for item in third.items] == pages[2]
+
+    after_third = paginate(session.query(Item), Item.created_at, Item.id, name="items", cursor=third.next_cursor, limit=7, total=None)
+    assert [item.id for item in after_third.items] == pages[3]
+
+
+def test_last_page_has_no_cursor(session):
+    """Test an exactly filled last page does not advertise another page."""
+    page = paginate(session.query(Item), Item.created_at, Item.id, name="items", limit=23, total=None)
+
+    assert len(page.items) == 23
+    assert page.next_cursor is None
+
+
+def test_filtered_query_and_custom_key(session):
+    """Test filters are kept and a key function can read the sort value from tuple rows."""
+    query = session.query(Item, Item.created_at.label("sort_at")).filter(Item.id % 2 == 0)
+
+    first = paginate(query, Item.created_at, Item.id, name="even", limit=4, total=None,
+                     key=lambda row: (row.sort_at, row[0].id))
+    second = paginate(query, Item.created_at, Item.id, name="even", limit=4, total=None,
+                      cursor=first.next_cursor, key=lambda row: (row.sort_at, row[0].id))
+
+    assert [row[0].id for row in first.items] == [22, 20, 18, 16]
+    assert [row[0].id for row in second.items] == [14, 12, 10, 8]
+
+
+def test_totals(session):
+    """Test exact totals follow the data while cached totals are reused per filter set until invalidated."""
+    query = session.query(Item)
+    name = f"items-{uuid4().hex}"
+
+    assert count_total(query, name, TOTAL_CACHED) == 23
+    session.add(Item(id=100, name="late", created_at=datetime(2026, 2, 1)))
+    session.commit()
+
+    assert count_total(query, name, TOTAL_CACHED) == 23
+    assert count_total(query, name) == 24
+    assert count_total(query.filter(Item.id > 20), name, TOTAL_CACHED) == 4
+    assert count_total(query, name, None) is None
+
+    invalidate_totals(name)
+    assert count_total(query, name, TOTAL_CACHED) == 24
+
+
+def test_page_total_exact_by_default(session):
+    """Test a list's total reflects rows added since the previous page was served."""
+    query = session.query(Item)
+    assert paginate(query, Item.created_at, Item.id, name="items", limit=5).total == 23
+
+    session.add(Item(id=100, name="late", created_at=datetime(2026, 2, 1)))
+    session.commit()
+
+    assert paginate(query, Item.created_at, Item.id, name="items", limit=5).total == 24
@@ -0,0 +1,79 @@
+"""
+Tests for the per-request SQL profiler (app/core/query_profiler.py).
+"""
+import threading
+
+from sqlalchemy import create_engine, text
+
+from app.core import query_profiler
+from app.core.query_profiler import count_queries, install_query_profiler, profile_queries
+
+
+def _engine():
+    engine = create_engine("sqlite://")
+    install_query_profiler(engine)
+    return engine
+
+
+def test_profile_counts_statements_in_context():
+    """Test statements are counted and the slowest are kept per scope."""
+    engine = _engine()
+
+    with profile_queries(top_n=2) as stats:
+        with engine.connect() as conn:
+            for _ in range(3):
+                conn.execute(text("SELECT 1"))
+
+    assert stats.count == 3
+    assert stats.total_ms >= 0
+    assert len(stats.slowest) == 2
+    assert stats.summary()["db_queries"] == 3
+
+
+def test_profile_ignores_other_threads():
+    """Test a request scope does not see statements of unrelated threads."""
+    engine = _engine()
+
+    def other_request():
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    with profile_queries() as stats:
+        thread = threading.Thread(target=other_request)
+        thread.start()
+        thread.join()
+
+    assert stats.count == 0
+
+
+def test_count_queries_sees_every_thread():
+    """Test the budget collector counts statements from any thread."""
+    engine = _engine()
+
+    def server_thread():
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 2"))
+
+    with count_queries() as stats:
+        thread = threading.Thread(target=server_thread)
+        thread.start()
+        thread.join()
+
+    assert stats.count == 1
+    assert stats.statements == ["SELECT 2"]
+
+
+def test_slow_queries_are_logged(monkeypatch):
+    """Test statements over the threshold are reported."""
+    engine = _engine()
+    logged = []
+    monkeypatch.setattr(query_profiler.settings, "SLOW_QUERY_THRESHOLD_MS", 0.0)
+    monkeypatch.setattr(
+        query_profiler, "_log_slow_query",
+        lambda conn, statement, parameters, duration_ms, executemany: logged.append(statement)
+    )
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 3"))
+
+    assert logged == ["SELECT 3"]
@@ -7,11 +7,17 @@ Tests cover:
 - DENY precedence over ALLOW
 - Organization-level permission overrides
 """
+import time
+
 import pytest
 from sqlalchemy.orm import Session
 from uuid import uuid4
 
-from app.services.rbac_service import RBACService
+from app.services.rbac_service import (
+    RBACService,
+    OrgPermissionMatrix,
+    PermissionMatrixCache
+)
 from app.models.organization import Organization, OrgMember, OrgMemberRole
 from app.models.rbac import Role, Permission, RolePermission, OrgRolePermissionOverride
 from app.models.user import User
@@ -742,3 +748,66 @@ class TestRBACServiceCaching:
             'create'
         )
         assert result2 is True
+
+
+class TestPermissionMatrix:
+    """Tests for the compiled permission matrix and its version-checked cache."""
+    
+    def _matrix(self, version=(0, 0)):
+        user_id, admin_id, member_id = uuid4(), uuid4(), uuid4()
+        matrix = OrgPermissionMatrix(
+            version=version,
+            member_roles={user_id: frozenset({admin_id, member_id})},
+            role_codes={admin_id: 'ADMIN', member_id: 'MEMBER'},
+            role_allows={
+                admin_id: frozenset({('farms', 'create'), ('farms', 'delete')}),
+                member_id: frozenset({('farms', 'read')})
+            },
+            role_denies={admin_id: frozenset(), member_id: frozenset({('farms', 'delete')})}
+        )
+        return matrix, user_id
+    
+    def test_union_with_deny_precedence(self):
+        """Test allows are unioned across roles and any DENY wins."""
+        matrix, user_id = self._matrix()
+        
+        assert matrix.is_allowed(user_id, 'farms', 'create') is True
+        assert matrix.is_allowed(user_id, 'farms', 'read') is True
+        assert matrix.is_allowed(user_id, 'farms', 'delete') is False
+        assert matrix.is_allowed(uuid4(), 'farms', 'create') is False
+    
+    def test_cache_recompiles_only_on_version_change(self):
+        """Test the matrix is reused until the organization version is bumped."""
+        cache = PermissionMatrixCache(version_check_interval=0)
+        org_id = uuid4()
+        compiled = []
+        
+        def compile_matrix(version):
+            compiled.append(version)
+            return self._matrix(version)[0]
+        
+        _, hit1 = cache.get(org_id, compile_matrix)
+        _, hit2 = cache.get(org_id, compile_matrix)
+        cache.bump(org_id)
+        _, hit3 = cache.get(org_id, compile_matrix)
+        
+        assert (hit1, hit2, hit3) == (False, True, False)
+        assert len(compiled) == 2
+        assert compiled[0] != compiled[1]
+    
+    def test_cached_matrix_expires_without_version_change(self, monkeypatch):
+        """Test a matrix is recompiled after the TTL even when no version bump happened."""
+        cache = PermissionMatrixCache(version_check_interval=0, ttl=300)
+        org_id = uuid4()
+        now = [1000.0]
+        monkeypatch.setattr(time, "monotonic", lambda: now[0])
+        compile_matrix = lambda version: self._matrix(version)[0]
+        
+        cache.get(org_id, compile_matrix)
+        now[0] += 299
+        _, fresh_hit = cache.get(org_id, compile_matrix)
+        now[0] += 2
+        _, expired_hit = cache.get(org_id, compile_matrix)
+        
+        assert (fresh_hit, expired_hit) == (True, False)
+
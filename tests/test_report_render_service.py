@@ -0,0 +1,377 @@
+"""
+Tests for background report PDF rendering (app/services/report_render_service.py).
+
+Covers job reuse per content version, storage hits, failures and the real
+render process pool, with in-memory stand-ins for the session, storage
+and Redis.
+"""
+import io
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from PIL import Image
+from sqlalchemy import (
+    JSON, Boolean, Column, DateTime, Integer, MetaData, Numeric, String, Table, Text, Uuid, create_engine, insert, select
+)
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.exceptions import ConflictError, NotFoundError, ValidationError
+from app.core.process_pool import shutdown_process_pools
+from app.core.storage import MediaStorage
+from app.models.enums import IssueSeverity
+from app.services import report_render_service
+from app.services.report_render_service import (
+    FAILED,
+    QUEUED,
+    READY,
+    ReportJobRegistry,
+    ReportRenderService
+)
+from app.services.issue_service import IssueService
+from app.services.photo_service import PhotoService
+from app.services.report_service import ReportService
+
+
+class FakeSession:
+    """Session stand-in serving one audit row."""
+
+    def __init__(self, audit):
+        self.audit = audit
+
+    def query(self, *entities):
+        audit = self.audit
+
+        class _Query:
+            def filter(self, *criteria):
+                return self
+
+            def first(self):
+                return audit
+
+        return _Query()
+
+
+class MemoryStore:
+    """ReportArtifactStore stand-in."""
+
+    def __init__(self):
+        self.objects = {}
+
+    def exists(self, key):
+        return key in self.objects
+
+    def save(self, key, data):
+        self.objects[key] = data
+
+    def load(self, key):
+        return self.objects[key]
+
+
+class NoRedis:
+    """CacheService stand-in without Redis."""
+
+    def _get_key(self, prefix, *args):
+        return ":".join((prefix,) + args)
+
+    def get(self, key, namespace=None):
+        return None
+
+    def set(self, key, value, ttl=None):
+        return False
+
+
+class ManualExecutor:
+    """Executor whose futures complete only when the test says so."""
+
+    def __init__(self):
+        self.pending = []
+
+    def submit(self, fn, *args):
+        future = Future()
+        self.pending.append((future, fn, args))
+        return future
+
+    def run_all(self):
+        for future, fn, args in self.pending:
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+        self.pending = []
+
+
+def _report_data():
+    return {
+        "audit": {"id": uuid4(), "audit_number": "AUD-2026-0001", "created_at": datetime(2026, 3, 1)},
+        "audit_details": {"audit_number": "AUD-2026-0001", "audit_name": "Pre-harvest check", "status": "FINALIZED"},
+        "organization_info": {"fsp_organization": {"name": "Agri Services"}},
+        "template_info": {"template_name": "Banana pre-harvest"},
+        "flagged_responses": [{"parameter_name": "Plant height", "response_value": "120 cm"}],
+        "flagged_photos": [],
+        "issues": {"HIGH": [{"title": "Sigatoka spots", "severity": IssueSeverity.HIGH}]},
+        "recommendations": [{"title": "Spray fungicide", "description": "Within a week"}]
+    }
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    executor = ManualExecutor()
+    monkeypatch.setattr(report_render_service, "_render_pool", executor)
+    return executor
+
+
+@pytest.fixture
+def reports(monkeypatch):
+    calls = []
+
+    def generate_report(self, audit_id, language="en"):
+        calls.append((audit_id, language))
+        return _report_data()
+
+    monkeypatch.setattr(ReportService, "generate_report", generate_report)
+    return calls
+
+
+def _service(audit, store=None):
+    return ReportRenderService(
+        FakeSession(audit),
+        store=store or MemoryStore(),
+        jobs=ReportJobRegistry(cache=NoRedis(), ttl=60)
+    )
+
+
+def _audit(report_version=0):
+    return SimpleNamespace(id=uuid4(), audit_number="AUD-2026-0001", report_version=report_version)
+
+
+def test_job_renders_once_and_is_served_from_storage(executor, reports):
+    """Test a finished job's PDF is stored and later requests for the same version skip rendering."""
+    audit = _audit()
+    service = _service(audit)
+
+    job = service.enqueue(audit.id)
+    assert job["status"] == QUEUED
+    executor.run_all()
+
+    finished = service.get_job(audit.id, job["job_id"])
+    assert finished["status"] == READY
+    pdf_bytes, filename = service.download(audit.id, job["job_id"])
+    assert pdf_bytes.startswith(b"%PDF")
+    assert filename == "AUD-2026-0001_report.pdf"
+
+    again = _service(audit, store=service.store).enqueue(audit.id)
+    assert again["status"] == READY
+    assert len(reports) == 1
+
+
+def test_running_job_is_shared(executor, reports):
+    """Test repeated enqueues while a render is queued return the same job."""
+    audit = _audit()
+    service = _service(audit)
+
+    first = service.enqueue(audit.id)
+    second = service.enqueue(audit.id)
+
+    assert second["job_id"] == first["job_id"]
+    assert len(executor.pending) == 1
+    with pytest.raises(ConflictError):
+        service.download(audit.id, first["job_id"])
+
+
+def test_new_report_version_renders_again(executor, reports):
+    """Test a bumped report_version (review, finalize, share) gets a new job and PDF."""
+    audit = _audit()
+    service = _service(audit)
+    first = service.enqueue(audit.id)
+    executor.run_all()
+
+    audit.report_version += 1
+    second = service.enqueue(audit.id)
+
+    assert second["job_id"] != first["job_id"]
+    assert second["status"] == QUEUED
+    assert second["content_version"] == 1
+
+
+metadata = MetaData()
+audits = Table(
+    "audits", metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("audit_number", String),
+    Column("status", String),
+    Column("report_version", Integer),
+    Column("updated_at", DateTime)
+)
+audit_issues = Table(
+    "audit_issues", metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("audit_id", Uuid),
+    Column("title", String),
+    Column("description", Text),
+    Column("recommendation", Text),
+    Column("severity", String),
+    Column("created_at", DateTime),
+    Column("created_by", Uuid)
+)
+audit_parameter_instances = Table(
+    "audit_parameter_instances", metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("audit_id", Uuid),
+    Column("template_section_id", Uuid),
+    Column("parameter_id", Uuid),
+    Column("sort_order", Integer),
+    Column("is_required", Boolean),
+    Column("parameter_snapshot", JSON),
+    Column("parameter_snapshot_hash", String),
+    Column("created_at", DateTime),
+    Column("created_by", Uuid),
+    Column("updated_at", DateTime)
+)
+audit_responses = Table(
+    "audit_responses", metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("audit_id", Uuid),
+    Column("audit_parameter_instance_id", Uuid),
+    Column("response_text", Text),
+    Column("response_numeric", Numeric),
+    Column("response_date", DateTime),
+    Column("response_options", JSON),
+    Column("notes", Text),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+    Column("created_by", Uuid)
+)
+audit_response_photos = Table(
+    "audit_response_photos", metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("audit_id", Uuid),
+    Column("audit_response_id", Uuid),
+    Column("file_url", String),
+    Column("file_key", String),
+    Column("caption", Text),
+    Column("is_flagged_for_report", Boolean),
+    Column("uploaded_at", DateTime, default=datetime.utcnow),
+    Column("uploaded_by", Uuid)
+)
+
+
+def test_issue_edit_changes_artifact_key(executor, reports):
+    """Test editing an issue of a finalized audit bumps report_version, so its stored PDF is not served."""
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    audit_id, issue_id = uuid4(), uuid4()
+    with Session(engine) as db:
+        db.execute(insert(audits).values(id=audit_id, audit_number="AUD-2026-0001", status="FINALIZED", report_version=0))
+        db.execute(insert(audit_issues).values(id=issue_id, audit_id=audit_id, title="Sigatoka", severity="HIGH"))
+        db.commit()
+        service = ReportRenderService(db, store=MemoryStore(), jobs=ReportJobRegistry(cache=NoRedis(), ttl=60))
+        first = service.enqueue(audit_id)
+        executor.run_all()
+
+        IssueService(db).update_issue(issue_id, severity=IssueSeverity.CRITICAL)
+        second = service.enqueue(audit_id)
+
+        assert db.scalar(select(audits.c.report_version)) == 1
+    assert second["artifact_key"] != first["artifact_key"]
+    assert second["status"] == QUEUED
+    assert len(reports) == 2
+
+
+def test_photo_upload_changes_artifact_key(executor, reports, monkeypatch, tmp_path):
+    """Test uploading a photo after a render bumps report_version, so the stored PDF is not served."""
+    monkeypatch.setattr(settings, "IMAGE_PROCESS_WORKERS", 0)
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    audit_id, response_id = uuid4(), uuid4()
+    image = io.BytesIO()
+    Image.new("RGB", (100, 100)).save(image, format="JPEG")
+    image.seek(0)
+    with Session(engine) as db:
+        db.execute(insert(audits).values(id=audit_id, audit_number="AUD-2026-0001", status="SUBMITTED", report_version=0))
+        db.execute(insert(audit_responses).values(
+            id=response_id, audit_id=audit_id, audit_parameter_instance_id=uuid4(),
+            created_at=datetime(2026, 3, 1), updated_at=datetime(2026, 3, 1)
+        ))
+        db.commit()
+        service = ReportRenderService(db, store=MemoryStore(), jobs=ReportJobRegistry(cache=NoRedis(), ttl=60))
+        first = service.enqueue(audit_id)
+        executor.run_all()
+
+        PhotoService(db, storage=MediaStorage(root=str(tmp_path))).upload_photo(
+            audit_id, response_id, image, "leaf.jpg", None, uuid4()
+        )
+        second = service.enqueue(audit_id)
+
+        assert db.scalar(select(audits.c.report_version)) == 1
+    assert second["artifact_key"] != first["artifact_key"]
+    assert second["status"] == QUEUED
+
+
+def test_failed_render_is_reported_and_retried(executor, reports, monkeypatch):
+    """Test a failing render marks the job FAILED and a new enqueue retries it."""
+    audit = _audit()
+    service = _service(audit)
+    monkeypatch.setattr(report_render_service, "render_report_pdf", lambda data: 1 / 0)
+
+    job = service.enqueue(audit.id)
+    executor.run_all()
+
+    failed = service.get_job(audit.id, job["job_id"])
+    assert failed["status"] == FAILED
+    with pytest.raises(ConflictError) as exc_info:
+        service.download(audit.id, job["job_id"])
+    assert exc_info.value.error_code == "REPORT_RENDER_FAILED"
+
+    assert service.enqueue(audit.id)["status"] == QUEUED
+    assert len(executor.pending) == 1
+
+
+def test_job_of_another_audit_not_found(executor, reports):
+    """Test jobs are only visible under their own audit."""
+    audit = _audit()
+    service = _service(audit)
+    job = service.enqueue(audit.id)
+
+    with pytest.raises(NotFoundError):
+        service.get_job(uuid4(), job["job_id"])
+
+
+def test_unsupported_language_rejected(executor, reports):
+    """Test languages without report translations are rejected before any work."""
+    audit = _audit()
+
+    with pytest.raises(ValidationError):
+        _service(audit).enqueue(audit.id, language="fr")
+    assert reports == []
+
+
+def test_get_or_render_waits_for_pool(monkeypatch, reports):
+    """Test the synchronous download renders in the pool once and then reads storage."""
+    pool = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(report_render_service, "_render_pool", pool)
+    audit = _audit()
+    service = _service(audit)
+
+    first, _ = service.get_or_render(audit.id)
+    second, _ = service.get_or_render(audit.id)
+
+    assert first.startswith(b"%PDF")
+    assert second == first
+    assert len(reports) == 1
+    pool.shutdown()
+
+
+def test_process_pool_renders_report_data(reports):
+    """Test report data survives the trip to a spawned render process."""
+    audit = _audit()
+    service = _service(audit)
+    try:
+        pdf_bytes, _ = service.get_or_render(audit.id)
+    finally:
+        shutdown_process_pools()
+
+    assert pdf_bytes.startswith(b"%PDF")
@@ -0,0 +1,315 @@
+"""
+Tests for bulk template deployment.
+
+Checks that compiled template calculations (ScheduleCalculationService.
+compile_task_calculation) match calculate_task_quantities, and runs
+ScheduleService.deploy_template on an in-memory SQLite database holding the
+tables it reads and writes: per-crop failures, bulk inserts and the number
+of statements per batch.
+"""
+from datetime import date
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import JSON, Boolean, Column, Date, DateTime, Integer, MetaData, String, Table, Text, Uuid, create_engine, event, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import PermissionError, ValidationError
+from app.schemas.schedule import ScheduleDeploymentTarget
+from app.services import schedule_service
+from app.services.schedule_calculation_service import ScheduleCalculationService
+from app.services.schedule_service import ScheduleService
+
+TEMPLATES = [
+    {"input_items": [
+        {"input_item_id": "a", "dosage": {"amount": 2.5, "per": "ACRE", "unit_id": "kg"}, "application_method_id": "m"},
+        {"input_item_id": "b", "dosage": {"amount": "0.3", "per": "PLANT", "unit": "g"}},
+        {"input_item_id": "c", "dosage": {"amount": 7, "per": None}},
+        {"input_item_id": "d", "dosage": {"amount": 0.1, "per": "LITER_WATER"}},
+        {"input_item_id": "e", "quantity": 3, "calculation_basis": "per_acre", "quantity_unit_id": "kg"},
+        {"input_item_id": "f", "quantity": 0.7, "calculation_basis": "per_plant", "quantity_unit_id": "g"},
+        {"input_item_id": "g", "quantity": 11, "calculation_basis": "fixed", "quantity_unit_id": "l"}
+    ]},
+    {
+        "labor": {"estimated_hours": 4, "calculation_basis": "per_acre", "worker_count": 3},
+        "machinery": {"equipment_type": "TRACTOR", "estimated_hours": 1.5, "calculation_basis": "fixed"},
+        "concentration": {
+            "solution_volume": 200.0, "calculation_basis": "per_acre", "solution_volume_unit_id": "ml",
+            "ingredients": [{"input_item_id": "h", "concentration_per_liter": 2.2, "concentration_unit_id": "ml"}]
+        }
+    },
+    {"dosage_amount": 1.3, "dosage_per": "ACRE", "dosage_unit": "kg", "input_item_id": "i",
+     "application_method_id": "spray", "input_items": [
+         {"input_item_id": "j", "dosage": {"amount": 1, "per": "ACRE"}}
+     ]},
+    {"activity_type": "PLOUGHING", "equipment_type": "TRACTOR"}
+]
+
+PARAMETERS = [
+    {"start_date": "2026-06-01", "total_acres": 2.5, "area": 3, "total_plants": 400, "plant_count": 350, "water_liters": 120},
+    {"start_date": "2026-06-01", "area": 1.75, "plant_count": 90, "water_liters": 0.5},
+    {"start_date": "2026-06-01", "total_acres": 0, "area": 0.3, "total_plants": 12, "water_liters": 33}
+]
+
+
+class TestCompiledCalculation:
+    """Test compiled calculations against the per-call calculation."""
+
+    @pytest.mark.parametrize("template", TEMPLATES)
+    def test_matches_calculate_task_quantities(self, template):
+        """Test compiled templates evaluate to exactly what calculate_task_quantities returns."""
+        service = ScheduleCalculationService()
+        compiled = service.compile_task_calculation(template)
+
+        for params in PARAMETERS:
+            factors = service.resolve_scaling_factors(compiled.kinds, params)
+            assert compiled.calculate(factors) == service.calculate_task_quantities(template, params)
+
+    def test_missing_factor_reported_like_calculation(self):
+        """Test resolving factors raises the error calculate_task_quantities raises."""
+        service = ScheduleCalculationService()
+        template = {"labor": {"estimated_hours": 4, "calculation_basis": "per_plant"}}
+        compiled = service.compile_task_calculation(template)
+
+        with pytest.raises(ValidationError) as compiled_error:
+            service.resolve_scaling_factors(compiled.kinds, {"area": 2})
+        with pytest.raises(ValidationError) as direct_error:
+            service.calculate_task_quantities(template, {"area": 2})
+
+        assert compiled_error.value.error_code == direct_error.value.error_code == "MISSING_PLANT_COUNT_PARAMETER"
+        assert compiled.required_parameters == {"plant_count"}
+
+
+metadata = MetaData()
+organizations = Table("organizations", metadata, Column("id", Uuid, primary_key=True), Column("organization_type", String))
+farms = Table("farms", metadata, Column("id", Uuid, primary_key=True), Column("organization_id", Uuid))
+plots = Table("plots", metadata, Column("id", Uuid, primary_key=True), Column("farm_id", Uuid))
+crops = Table("crops", metadata, Column("id", Uuid, primary_key=True), Column("plot_id", Uuid))
+work_orders = Table(
+    "work_orders", metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("farming_organization_id", Uuid),
+    Column("fsp_organization_id", Uuid),
+    Column("status", String),
+    Column("access_granted", Boolean)
+)
+work_order_scope = Table(
+    "work_order_scope", metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("work_order_id", Uuid),
+    Column("scope", String),
+    Column("scope_id", Uuid)
+)
+schedule_templates = Table(
+    "schedule_templates", metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("code", String),
+    Column("crop_type_id", Uuid),
+    Column("crop_variety_id", Uuid),
+    Column("is_system_defined", Boolean),
+    Column("owner_org_id", Uuid),
+    Column("version", Integer),
+    Column("is_active", Boolean),
+    Column("notes", Text),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+    Column("created_by", Uuid),
+    Column("updated_by", Uuid)
+)
+schedule_template_tasks = Table(
+    "schedule_template_tasks", metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("schedule_template_id", Uuid),
+    Column("task_id", Uuid),
+    Column("day_offset", Integer),
+    Column("task_details_template", JSON),
+    Column("sort_order", Integer),
+    Column("notes", Text),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+    Column("created_by", Uuid),
+    Column("updated_by", Uuid)
+)
+schedules = Table(
+    "schedules", metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("crop_id", Uuid),
+    Column("template_id", Uuid),
+    Column("name", String),
+    Column("description", Text),
+    Column("template_parameters", JSON),
+    Column("is_active", Boolean),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+    Column("created_by", Uuid),
+    Column("updated_by", Uuid)
+)
+schedule_tasks = Table(
+    "schedule_tasks", metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("schedule_id", Uuid),
+    Column("task_id", Uuid),
+    Column("due_date", Date),
+    Column("status", String),
+    Column("completed_date", Date),
+    Column("task_name", String),
+    Column("task_details", JSON),
+    Column("notes", Text),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+    Column("created_by", Uuid),
+    Column("updated_by", Uuid)
+)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def _organization(db, organization_type, crop_count):
+    """Insert an organization with one farm and plot holding crop_count crops."""
+    org_id, farm_id, plot_id = uuid4(), uuid4(), uuid4()
+    db.execute(insert(organizations).values(id=org_id, organization_type=organization_type))
+    db.execute(insert(farms).values(id=farm_id, organization_id=org_id))
+    db.execute(insert(plots).values(id=plot_id, farm_id=farm_id))
+    crop_ids = [uuid4() for _ in range(crop_count)]
+    for crop_id in crop_ids:
+        db.execute(insert(crops).values(id=crop_id, plot_id=plot_id))
+    return org_id, crop_ids
+
+
+def _template(db, tasks):
+    template_id = uuid4()
+    db.execute(insert(schedule_templates).values(id=template_id, code="TOMATO", is_active=True))
+    for sort_order, (day_offset, details) in enumerate(tasks):
+        db.execute(insert(schedule_template_tasks).values(
+            id=uuid4(), schedule_template_id=template_id, day_offset=day_offset,
+            task_details_template=details, sort_order=sort_order
+        ))
+    return template_id
+
+
+def _user(org_id, system=False):
+    return SimpleNamespace(id=uuid4(), current_organization_id=org_id, is_system_user=lambda: system)
+
+
+TASKS = [
+    (0, {"activity_type": "BASAL_DOSE", "input_items": [
+        {"input_item_id": "urea", "dosage": {"amount": 50, "per": "ACRE", "unit_id": "kg"}}
+    ]}),
+    (14, {"task_name": "Weeding round", "labor": {"estimated_hours": 6, "calculation_basis": "per_acre"}}),
+    (30, {"activity_type": "HARVESTING", "equipment_type": "SICKLE"})
+]
+
+
+class TestDeployTemplate:
+    """Test ScheduleService.deploy_template."""
+
+    def test_deploys_and_reports_failures(self, db):
+        """Test valid crops get schedules and tasks while failing crops are reported and skipped."""
+        fsp_id, _ = _organization(db, "FSP", 0)
+        client_id, client_crops = _organization(db, "FARMING", 4)
+        _, other_crops = _organization(db, "FARMING", 1)
+        db.execute(insert(work_orders).values(
+            id=uuid4(), farming_organization_id=client_id, fsp_organization_id=fsp_id,
+            status="ACTIVE", access_granted=True
+        ))
+        template_id = _template(db, TASKS)
+        missing_crop = uuid4()
+        targets = [
+            ScheduleDeploymentTarget(crop_id=client_crops[0], template_parameters={"start_date": "2026-06-01", "total_acres": 2, "area": 2, "area_unit_id": "acre"}),
+            ScheduleDeploymentTarget(crop_id=client_crops[1], name="North field", template_parameters={"start_date": "2026-06-10", "total_acres": 0.5, "area": 0.5, "area_unit_id": "acre"}),
+            ScheduleDeploymentTarget(crop_id=client_crops[2], template_parameters={"start_date": "2026-06-01"}),
+            ScheduleDeploymentTarget(crop_id=client_crops[3], template_parameters={"start_date": "June", "total_acres": 1, "area": 1, "area_unit_id": "acre"}),
+            ScheduleDeploymentTarget(crop_id=client_crops[0], template_parameters={"start_date": "2026-06-01", "total_acres": 2, "area": 2, "area_unit_id": "acre"}),
+            ScheduleDeploymentTarget(crop_id=other_crops[0], template_parameters={"start_date": "2026-06-01", "total_acres": 2, "area": 2, "area_unit_id": "acre"}),
+            ScheduleDeploymentTarget(crop_id=missing_crop, template_parameters={"start_date": "2026-06-01", "total_acres": 2, "area": 2, "area_unit_id": "acre"})
+        ]
+
+        results = ScheduleService(db).deploy_template(template_id, "Kharif", targets, _user(fsp_id))
+
+        assert [result.get("error_code") for result in results] == [
+            None, None, "INCOMPLETE_TEMPLATE_PARAMETERS", "INVALID_TEMPLATE_PARAMETERS",
+            "DUPLICATE_CROP", "FSP_NO_WRITE_ACCESS", "CROP_NOT_FOUND"
+        ]
+        assert results[0]["tasks_count"] == 3
+
+        rows = db.execute(select(schedules.c.crop_id, schedules.c.name, schedules.c.template_parameters)).all()
+        assert {(row.crop_id, row.name) for row in rows} == {(client_crops[0], "Kharif"), (client_crops[1], "North field")}
+        assert all(row.template_parameters["creator_organization_id"] == str(fsp_id) for row in rows)
+
+        tasks = db.execute(
+            select(schedule_tasks.c.due_date, schedule_tasks.c.task_name, schedule_tasks.c.task_details, schedule_tasks.c.status)
+            .where(schedule_tasks.c.schedule_id == results[1]["schedule_id"])
+            .order_by(schedule_tasks.c.due_date)
+        ).all()
+        assert [(t.due_date, t.task_name, t.status) for t in tasks] == [
+            (date(2026, 6, 10), "Basal Dose Application", "NOT_STARTED"),
+            (date(2026, 6, 24), "Weeding round", "NOT_STARTED"),
+            (date(2026, 7, 10), "Harvesting", "NOT_STARTED")
+        ]
+        assert tasks[0].task_details["input_items"][0]["quantity"] == 25.0
+        assert tasks[1].task_details == {"labor": {"estimated_hours": 3.0}}
+        # Nothing to calculate: raw template details are kept
+        assert tasks[2].task_details == TASKS[2][1]
+
+    def test_statements_independent_of_batch_size(self, db):
+        """Test a batch runs a fixed number of statements however many crops it holds."""
+        _, crop_ids = _organization(db, "FARMING", 60)
+        template_id = _template(db, TASKS)
+        system_user = _user(uuid4(), system=True)
+
+        def deploy(crop_ids):
+            statements = []
+            listener = lambda *args: statements.append(args[2])
+            event.listen(db.get_bind(), "before_cursor_execute", listener)
+            try:
+                ScheduleService(db).deploy_template(template_id, "Kharif", [
+                    ScheduleDeploymentTarget(crop_id=crop_id, template_parameters={"start_date": "2026-06-01", "total_acres": 1, "area": 1, "area_unit_id": "acre"})
+                    for crop_id in crop_ids
+                ], system_user)
+            finally:
+                event.remove(db.get_bind(), "before_cursor_execute", listener)
+            return statements
+
+        small, large = deploy(crop_ids[:2]), deploy(crop_ids[2:])
+
+        assert len(small) == len(large)
+        assert len(db.execute(select(schedule_tasks.c.id)).all()) == 60 * len(TASKS)
+
+    def test_dashboard_snapshots_invalidated(self, db, monkeypatch):
+        """Test the client and FSP dashboards drop their schedule fields after a deployment."""
+        invalidated = []
+        monkeypatch.setattr(schedule_service.dashboard_snapshot_service, "invalidate", invalidated.append)
+        fsp_id, _ = _organization(db, "FSP", 0)
+        client_id, client_crops = _organization(db, "FARMING", 2)
+        db.execute(insert(work_orders).values(
+            id=uuid4(), farming_organization_id=client_id, fsp_organization_id=fsp_id,
+            status="ACTIVE", access_granted=True
+        ))
+        template_id = _template(db, TASKS)
+
+        ScheduleService(db).deploy_template(template_id, "Kharif", [
+            ScheduleDeploymentTarget(crop_id=crop_id, template_parameters={"start_date": "2026-06-01", "total_acres": 1, "area": 1, "area_unit_id": "acre"})
+            for crop_id in client_crops
+        ], _user(fsp_id))
+
+        fields = {"activeSchedules", "overdueTasks"}
+        assert invalidated == [{client_id: fields, fsp_id: fields}]
+
+    def test_farming_organization_rejected(self, db):
+        """Test farming organizations cannot deploy templates at all."""
+        org_id, crop_ids = _organization(db, "FARMING", 1)
+        template_id = _template(db, TASKS)
+
+        with pytest.raises(PermissionError) as exc_info:
+            ScheduleService(db).deploy_template(template_id, "Kharif", [
+                ScheduleDeploymentTarget(crop_id=crop_ids[0], template_parameters={"start_date": "2026-06-01"})
+            ], _user(org_id))
+
+        assert exc_info.value.error_code == "TEMPLATE_ACCESS_DENIED"
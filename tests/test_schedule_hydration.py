@@ -0,0 +1,128 @@
+"""
+Tests for ScheduleHydrationService.
+
+Tests translated-name resolution through the per-language name cache and the
+in-process LRU cache backing it.
+"""
+import time
+from uuid import uuid4
+
+from app.core.cache import LocalLRUCache
+from app.services.schedule_hydration_service import (
+    ScheduleHydrationService,
+    TranslationNameCache
+)
+
+
+class TestLocalLRUCache:
+    """Test the bounded in-process LRU cache."""
+
+    def test_evicts_least_recently_used(self):
+        """Test the oldest untouched entry is evicted when full."""
+        cache = LocalLRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1  # touch "a"
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_ttl_expiry(self):
+        """Test entries expire after their TTL."""
+        cache = LocalLRUCache(maxsize=10, ttl=1)
+        cache.set("a", 1)
+        cache._data["a"] = (time.monotonic() - 1, 1)
+
+        assert cache.get("a", "missing") == "missing"
+        assert len(cache) == 0
+
+    def test_delete_where(self):
+        """Test predicate-based deletion."""
+        cache = LocalLRUCache()
+        cache.set(("task", "1"), "x")
+        cache.set(("input_item", "1"), "y")
+
+        assert cache.delete_where(lambda key: key[0] == "task") == 1
+        assert cache.get(("input_item", "1")) == "y"
+
+
+class TestNameResolution:
+    """Test translated-name resolution with the name cache."""
+
+    def _service(self):
+        return ScheduleHydrationService(db=None, name_cache=TranslationNameCache())
+
+    def test_language_preference_and_fallbacks(self):
+        """Test requested language, then English, then first translation, then code."""
+        service = self._service()
+        ta_id, en_id, other_id, code_id = (str(uuid4()) for _ in range(4))
+        rows = [
+            (ta_id, "UREA", "en", "Urea"),
+            (ta_id, "UREA", "ta", "யூரியா"),
+            (en_id, "NPK", "en", "NPK"),
+            (other_id, "DAP", "ml", "ഡിഎപി"),
+            (code_id, "POTASH", None, None),
+        ]
+
+        names = service._resolve_names(
+            "input_item", [ta_id, en_id, other_id, code_id], "ta", lambda ids: rows
+        )
+
+        assert names == {
+            ta_id: "யூரியா",
+            en_id: "NPK",
+            other_id: "ഡിഎപി",
+            code_id: "POTASH",
+        }
+
+    def test_cache_hits_skip_fetch(self):
+        """Test a second resolution for the same ids does not query again."""
+        service = self._service()
+        item_id = str(uuid4())
+        calls = []
+
+        def fetch(ids):
+            calls.append(list(ids))
+            return [(item_id, "UREA", "en", "Urea")]
+
+        assert service._resolve_names("input_item", [item_id], "en", fetch) == {item_id: "Urea"}
+        assert service._resolve_names("input_item", [item_id], "en", fetch) == {item_id: "Urea"}
+        assert len(calls) == 1
+
+    def test_misses_fetched_in_single_call(self):
+        """Test all cache misses are resolved in one fetch call."""
+        service = self._service()
+        ids = [str(uuid4()) for _ in range(50)]
+        calls = []
+
+        def fetch(missing):
+            calls.append(set(missing))
+            return [(i, f"CODE_{n}", "en", f"Name {n}") for n, i in enumerate(missing)]
+
+        names = service._resolve_names("task", ids, "en", fetch)
+
+        assert len(calls) == 1
+        assert calls[0] == set(ids)
+        assert len(names) == 50
+
+    def test_invalid_ids_ignored(self):
+        """Test non-UUID identifiers (e.g. unit codes) never reach the database."""
+        service = self._service()
+
+        def fetch(ids):
+            raise AssertionError("should not query")
+
+        assert service._resolve_names("task", ["kg", None, ""], "en", fetch) == {}
+
+    def test_invalidate_entity(self):
+        """Test invalidation drops the entity in every language."""
+        name_cache = TranslationNameCache()
+        name_cache.set_many("input_item", "en", {"1": "Urea"})
+        name_cache.set_many("input_item", "ta", {"1": "யூரியா"})
+
+        name_cache.invalidate("input_item", "1")
+
+        assert name_cache.get_many("input_item", "en", ["1"]) == ({}, ["1"])
+        assert name_cache.get_many("input_item", "ta", ["1"]) == ({}, ["1"])
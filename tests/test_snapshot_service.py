@@ -0,0 +1,193 @@
+"""
+Tests for template snapshot building in SnapshotService.
+
+Covers the fixed query count of the set-based builder, equality with the
+per-parameter snapshots, memoization per template version and rebuilds
+after structural template changes.
+"""
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core.query_profiler import count_queries
+from app.models.audit import ParameterSnapshotBlob
+from app.models.option_set import Option, OptionSet, OptionTranslation
+from app.models.parameter import Parameter, ParameterOptionSetMap, ParameterTranslation, ParameterType
+from app.models.section import Section, SectionTranslation
+from app.models.template import Template, TemplateParameter, TemplateSection, TemplateTranslation
+from app.models.user import User
+from app.schemas.template import TemplateParameterAdd
+from app.services import snapshot_service
+from app.services.audit_service import AuditService
+from app.services.snapshot_service import SnapshotService, snapshot_content, snapshot_content_hash
+from app.services.template_service import TemplateService
+
+# template, template translations, sections, section translations, template
+# parameters, parameters, parameter translations, option set maps, options,
+# option translations
+MAX_BUILD_QUERIES = 10
+
+
+def _parameter(db: Session, user: User, parameter_type: ParameterType, option_set: OptionSet = None) -> Parameter:
+    parameter = Parameter(
+        code=f"SNAP_PARAM_{uuid4().hex[:8]}",
+        parameter_type=parameter_type,
+        is_system_defined=True,
+        is_active=True,
+        parameter_metadata={"unit": "cm"},
+        created_by=user.id
+    )
+    db.add(parameter)
+    db.flush()
+    for language in ("en", "ta"):
+        db.add(ParameterTranslation(
+            parameter_id=parameter.id,
+            language_code=language,
+            name=f"{parameter.code} {language}",
+            help_text="Measured at the plot centre"
+        ))
+    if option_set is not None:
+        db.add(ParameterOptionSetMap(parameter_id=parameter.id, option_set_id=option_set.id))
+    return parameter
+
+
+def _template(db: Session, user: User, sections: int, parameters_per_section: int) -> Template:
+    option_set = OptionSet(code=f"SNAP_SET_{uuid4().hex[:8]}", is_system_defined=True, created_by=user.id)
+    db.add(option_set)
+    db.flush()
+    for i in range(3):
+        option = Option(option_set_id=option_set.id, code=f"OPT_{i}", sort_order=i)
+        db.add(option)
+        db.flush()
+        db.add(OptionTranslation(option_id=option.id, language_code="en", display_text=f"Option {i}"))
+    db.add(Option(option_set_id=option_set.id, code="RETIRED", sort_order=9, is_active=False))
+
+    template = Template(code=f"SNAP_TPL_{uuid4().hex[:8]}", is_system_defined=True, created_by=user.id)
+    db.add(template)
+    db.flush()
+    db.add(TemplateTranslation(template_id=template.id, language_code="en", name="Snapshot template"))
+
+    for s in range(sections):
+        section = Section(code=f"SNAP_SEC_{uuid4().hex[:8]}", is_system_defined=True, created_by=user.id)
+        db.add(section)
+        db.flush()
+        db.add(SectionTranslation(section_id=section.id, language_code="en", name=f"Section {s}"))
+        template_section = TemplateSection(template_id=template.id, section_id=section.id, sort_order=s)
+        db.add(template_section)
+        db.flush()
+        for p in range(parameters_per_section):
+            if p % 2:
+                parameter = _parameter(db, user, ParameterType.SINGLE_SELECT, option_set)
+            else:
+                parameter = _parameter(db, user, ParameterType.NUMERIC)
+            db.add(TemplateParameter(
+                template_section_id=template_section.id,
+                parameter_id=parameter.id,
+                is_required=p == 0,
+                sort_order=p
+            ))
+    db.commit()
+    return template
+
+
+def _without_dates(snapshot):
+    if isinstance(snapshot, dict):
+        return {k: _without_dates(v) for k, v in snapshot.items() if k != "snapshot_date"}
+    if isinstance(snapshot, list):
+        return [_without_dates(v) for v in snapshot]
+    return snapshot
+
+
+@pytest.mark.parametrize("sections,parameters_per_section", [(1, 2), (4, 10)])
+def test_query_count_independent_of_template_size(db: Session, test_user: User, sections, parameters_per_section):
+    """Test the template tree is loaded in a fixed number of queries."""
+    template = _template(db, test_user, sections, parameters_per_section)
+
+    with count_queries() as stats:
+        snapshot = SnapshotService(db).create_template_snapshot(template.id)
+
+    assert stats.count <= MAX_BUILD_QUERIES
+    assert len(snapshot["sections"]) == sections
+    assert sum(len(s["parameters"]) for s in snapshot["sections"]) == sections * parameters_per_section
+
+
+def test_snapshot_matches_parameter_snapshots(db: Session, test_user: User):
+    """Test embedded parameter snapshots equal the standalone per-parameter snapshots."""
+    template = _template(db, test_user, 2, 3)
+    service = SnapshotService(db)
+
+    snapshot = service.create_template_snapshot(template.id)
+
+    assert [s["sort_order"] for s in snapshot["sections"]] == [0, 1]
+    assert snapshot["translations"]["en"]["name"] == "Snapshot template"
+    for section in snapshot["sections"]:
+        assert [p["sort_order"] for p in section["parameters"]] == [0, 1, 2]
+        for parameter in section["parameters"]:
+            expected = service.create_parameter_snapshot(parameter["parameter_id"])
+            assert _without_dates(parameter["parameter_snapshot"]) == _without_dates(expected)
+
+    select = snapshot["sections"][0]["parameters"][1]["parameter_snapshot"]
+    assert [o["code"] for o in select["options"]] == ["OPT_0", "OPT_1", "OPT_2"]
+    assert select["options"][0]["translations"] == {"en": "Option 0"}
+
+
+def test_repeated_snapshots_are_memoized(db: Session, test_user: User):
+    """Test a second snapshot of the same template version costs one query and is an independent copy."""
+    template = _template(db, test_user, 2, 4)
+    service = SnapshotService(db)
+    first = service.create_template_snapshot(template.id)
+    first["sections"][0]["parameters"].clear()
+
+    with count_queries() as stats:
+        second = service.create_template_snapshot(template.id)
+
+    assert stats.count == 1
+    assert len(second["sections"][0]["parameters"]) == 4
+
+
+def test_structural_change_rebuilds_snapshot(db: Session, test_user: User):
+    """Test adding a parameter to a template invalidates its memoized snapshot."""
+    template = _template(db, test_user, 1, 2)
+    section = db.query(TemplateSection).filter(TemplateSection.template_id == template.id).one()
+    service = SnapshotService(db)
+    service.create_template_snapshot(template.id)
+
+    parameter = _parameter(db, test_user, ParameterType.TEXT)
+    db.commit()
+    TemplateService(db).add_parameter_to_template_section(
+        template.id, section.section_id, TemplateParameterAdd(parameter_id=parameter.id, sort_order=5)
+    )
+
+    snapshot = service.create_template_snapshot(template.id)
+    assert [p["parameter_id"] for p in snapshot["sections"][0]["parameters"]][-1] == str(parameter.id)
+
+
+def test_snapshots_taken_at_different_times_share_blobs(db: Session, test_user: User, monkeypatch):
+    """Test audits snapshotting a template at different times reuse its stored parameter snapshots."""
+    template = _template(db, test_user, 2, 3)
+    service = SnapshotService(db)
+    audits = AuditService(db)
+    hashes, stored = [], []
+
+    for taken_at in (datetime(2026, 5, 1, 8), datetime(2026, 5, 1, 9)):
+        monkeypatch.setattr(snapshot_service, "datetime", type("FrozenDatetime", (datetime,), {
+            "utcnow": classmethod(lambda cls, taken_at=taken_at: taken_at)
+        }))
+        # As once the memoized snapshot has expired
+        snapshot_service._template_snapshots.clear()
+        snapshot = service.create_template_snapshot(template.id)
+        parameter_snapshots = {
+            snapshot_content_hash(p["parameter_snapshot"]): snapshot_content(p["parameter_snapshot"])
+            for section in snapshot["sections"] for p in section["parameters"]
+        }
+        hashes.append(set(parameter_snapshots))
+        stored.append(audits._store_parameter_snapshots(parameter_snapshots))
+        db.flush()
+
+    assert hashes[0] == hashes[1]
+    assert stored == [6, 0]
+    blobs = db.query(ParameterSnapshotBlob).filter(ParameterSnapshotBlob.hash.in_(hashes[0])).all()
+    assert len(blobs) == 6
+    assert all("snapshot_date" not in blob.snapshot for blob in blobs)
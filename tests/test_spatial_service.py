@@ -7,9 +7,13 @@ plot containment checks, and area calculations.
 Requirements: 13.1, 13.2, 13.3, 13.4, 13.5, 13.6, 13.7
 """
 import pytest
+import struct
 from decimal import Decimal
 from sqlalchemy.orm import Session
 
+from geoalchemy2.elements import WKBElement
+
+from app.core.query_profiler import count_queries
 from app.services.spatial_service import SpatialService
 from app.core.exceptions import ValidationError
 
@@ -623,3 +627,149 @@ class TestGetCentroid:
         assert "lon" in centroid
         assert isinstance(centroid["lat"], float)
         assert isinstance(centroid["lon"], float)
+
+
+class TestToGeoJSON:
+    """Test in-process geometry decoding."""
+    
+    def test_ewkb_point_with_srid(self):
+        """Test EWKB points (as loaded by GeoAlchemy2) decode to GeoJSON."""
+        data = struct.pack("<BII2d", 1, 1 | 0x20000000, 4326, 77.59, 12.97)
+        
+        assert SpatialService.to_geojson(WKBElement(data, srid=4326, extended=True)) == {
+            "type": "Point",
+            "coordinates": [77.59, 12.97]
+        }
+    
+    def test_wkb_polygon_big_endian_hex(self):
+        """Test big-endian WKB polygons given as hex decode ring by ring."""
+        ring = [(0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 0.0)]
+        data = struct.pack(">BIII", 0, 3, 1, len(ring)) + b"".join(struct.pack(">2d", *p) for p in ring)
+        
+        assert SpatialService.to_geojson(data.hex()) == {
+            "type": "Polygon",
+            "coordinates": [[list(p) for p in ring]]
+        }
+    
+    def test_unflushed_wkt(self):
+        """Test WKT assigned before a flush is parsed as well."""
+        assert SpatialService.to_geojson("POINT(80.1 13.2)")["coordinates"] == [80.1, 13.2]
+        assert SpatialService.to_geojson("SRID=4326;POLYGON((0 0, 1 0, 1 1, 0 0))")["coordinates"] == [
+            [[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 0.0]]
+        ]
+    
+    def test_empty_value(self):
+        """Test missing geometries stay None."""
+        assert SpatialService.to_geojson(None) is None
+
+
+def _square(lon, lat, size):
+    return {
+        "type": "Polygon",
+        "coordinates": [[
+            [lon, lat],
+            [lon + size, lat],
+            [lon + size, lat + size],
+            [lon, lat + size],
+            [lon, lat]
+        ]]
+    }
+
+
+class TestEvaluatePlots:
+    """Test batch evaluation of plots against a farm."""
+    
+    def test_containment_area_and_centroid(self, db: Session):
+        """Test each plot gets containment, area and centroid matching the single-plot methods."""
+        service = SpatialService(db)
+        farm = _square(77.0, 12.0, 0.1)
+        plots = [_square(77.01, 12.01, 0.01), _square(77.09, 12.09, 0.05)]
+        
+        result = service.evaluate_plots(plots, farm)
+        
+        assert [p["index"] for p in result["plots"]] == [0, 1]
+        assert [p["within_farm"] for p in result["plots"]] == [True, False]
+        for plot, evaluated in zip(plots, result["plots"]):
+            assert evaluated["area_sq_meters"] == service.calculate_area(plot)
+            assert evaluated["centroid"] == pytest.approx(service.get_centroid(plot))
+    
+    def test_overlapping_pairs(self, db: Session):
+        """Test overlapping pairs are reported and plots sharing an edge are not."""
+        service = SpatialService(db)
+        plots = [
+            _square(77.0, 12.0, 0.01),
+            _square(77.005, 12.0, 0.01),   # overlaps plot 0 by half
+            _square(76.99, 12.0, 0.01),    # shares an edge with plot 0
+        ]
+        
+        result = service.evaluate_plots(plots)
+        
+        assert [o["plots"] for o in result["overlaps"]] == [(0, 1)]
+        half = result["plots"][0]["area_sq_meters"] / 2
+        assert abs(result["overlaps"][0]["area_sq_meters"] - half) / half < Decimal("0.01")
+        assert all(p["within_farm"] is None for p in result["plots"])
+    
+    def test_single_statement(self, db: Session):
+        """Test the whole batch is evaluated in one database round trip."""
+        service = SpatialService(db)
+        plots = [_square(77.0 + i * 0.01, 12.0, 0.005) for i in range(20)]
+        
+        with count_queries() as stats:
+            service.evaluate_plots(plots, _square(77.0, 12.0, 1))
+        
+        assert stats.summary()["db_queries"] == 1
+    
+    def test_empty_batch(self, db: Session):
+        """Test an empty batch does not touch the database."""
+        assert SpatialService(db).evaluate_plots([]) == {"plots": [], "overlaps": []}
+
+
+class TestGeodesicFallback:
+    """Test the in-process area and centroid against reference values and PostGIS."""
+    
+    def test_area_one_degree_square_at_equator(self):
+        """Test the 1 x 1 degree equatorial square matches the WGS84 geodesic area."""
+        # Reference value from GeographicLib's geodesic polygon area
+        area = SpatialService.geodesic_area(_square(0, 0, 1))
+        
+        assert abs(area - Decimal("12308778361.47")) / area < Decimal("1e-6")
+    
+    def test_area_ignores_ring_orientation(self):
+        """Test clockwise and counter-clockwise rings give the same area and centroid."""
+        boundary = _square(77.5, 12.9, 0.02)
+        reversed_boundary = {"type": "Polygon", "coordinates": [boundary["coordinates"][0][::-1]]}
+        
+        assert SpatialService.geodesic_area(boundary) == SpatialService.geodesic_area(reversed_boundary)
+        assert SpatialService.geodesic_centroid(reversed_boundary) == pytest.approx(
+            SpatialService.geodesic_centroid(boundary)
+        )
+    
+    def test_area_subtracts_holes(self):
+        """Test interior rings are subtracted from the outer ring."""
+        outer = _square(77.0, 12.0, 0.02)
+        hole = _square(77.005, 12.005, 0.01)
+        with_hole = {"type": "Polygon", "coordinates": [outer["coordinates"][0], hole["coordinates"][0]]}
+        
+        expected = SpatialService.geodesic_area(outer) - SpatialService.geodesic_area(hole)
+        assert SpatialService.geodesic_area(with_hole) == pytest.approx(expected)
+    
+    @pytest.mark.parametrize("boundary", [
+        _square(77.59, 12.97, 0.001),
+        _square(-122.6, 45.5, 0.05),
+        _square(10.0, 60.0, 0.5),
+        {"type": "Polygon", "coordinates": [[[0, 0], [0, 10], [10, 10], [10, 0], [0, 0]]]},
+        {"type": "Polygon", "coordinates": [[
+            [78.0, 11.0], [78.02, 11.0], [78.02, 11.01], [78.01, 11.005], [78.0, 11.02], [78.0, 11.0]
+        ]]},
+    ])
+    def test_matches_postgis(self, db: Session, boundary):
+        """Test fallback area and centroid agree with PostGIS geography results."""
+        service = SpatialService(db)
+        
+        postgis_area = service.calculate_area(boundary)
+        postgis_centroid = service.get_centroid(boundary)
+        
+        assert abs(SpatialService.geodesic_area(boundary) - postgis_area) / postgis_area < Decimal("0.001")
+        centroid = SpatialService.geodesic_centroid(boundary)
+        assert centroid["lat"] == pytest.approx(postgis_centroid["lat"], abs=1e-3)
+        assert centroid["lon"] == pytest.approx(postgis_centroid["lon"], abs=1e-3)
@@ -0,0 +1,111 @@
+"""
+Tests for the two-tier cache (app/core/tiered_cache.py).
+
+Covers the local tier, single-flight recompute, the cross-worker lock,
+invalidation and the @cached decorator against the in-memory Redis
+stand-in from conftest.
+"""
+import threading
+import time
+from typing import List
+
+import pytest
+from pydantic import BaseModel
+
+from app.core.cache import CacheService
+from app.core.tiered_cache import _RELEASE_LOCK_SCRIPT, TieredCache, cached
+
+
+def _release_lock(redis_client, keys, args):
+    if redis_client.get(keys[0]) == args[0]:
+        return redis_client.delete(keys[0])
+    return 0
+
+
+@pytest.fixture
+def tiered(fake_redis):
+    fake_redis.scripts[_RELEASE_LOCK_SCRIPT] = _release_lock
+    redis_cache = CacheService.__new__(CacheService)
+    redis_cache._namespace_stats = {}
+    redis_cache._stats_lock = threading.Lock()
+    redis_cache.redis_client = fake_redis
+    cache = TieredCache(redis_cache, lock_wait=1.0, poll_interval=0.01)
+    yield cache
+    cache.stop()
+
+
+def test_local_tier_serves_repeat_lookups(tiered):
+    """Test a second lookup is answered in process without recomputing."""
+    calls = []
+    compute = lambda: calls.append(1) or "value"
+
+    assert tiered.get_or_compute("units", ["a"], compute, ttl=60) == "value"
+    assert tiered.get_or_compute("units", ["a"], compute, ttl=60) == "value"
+    assert len(calls) == 1
+    assert tiered.local.hits == 1
+
+
+def test_single_flight_within_process(tiered):
+    """Test concurrent misses for one key trigger a single recompute."""
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return 42
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(tiered.get_or_compute("units", ["b"], compute, ttl=60)))
+        for _ in range(10)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [42] * 10
+    assert len(calls) == 1
+
+
+def test_waits_for_other_worker_holding_lock(tiered):
+    """Test a worker that loses the lock waits for the holder's result."""
+    redis_cache = tiered.redis_cache
+    key = redis_cache.namespaced_key("units", "c")
+    redis_cache.redis_client.set(f"{key}:lock", "other-worker")
+
+    threading.Timer(0.05, lambda: redis_cache.set(key, "from-other-worker", 60)).start()
+    value = tiered.get_or_compute(
+        "units", ["c"], lambda: pytest.fail("should not recompute"), ttl=60
+    )
+
+    assert value == "from-other-worker"
+
+
+def test_invalidate_drops_local_and_publishes(tiered):
+    """Test invalidation clears the local tier, bumps the generation and fans out."""
+    tiered.get_or_compute("units", ["d"], lambda: "old", ttl=60)
+    tiered.invalidate("units")
+
+    assert tiered.get_or_compute("units", ["d"], lambda: "new", ttl=60) == "new"
+    assert tiered.redis_cache.redis_client.published == [(tiered.channel, "units")]
+
+
+def test_cached_decorator_round_trips_models(tiered):
+    """Test values read back from Redis are rebuilt as the annotated models."""
+
+    class Unit(BaseModel):
+        code: str
+
+    class UnitService:
+        @cached("units", ttl=60, cache=tiered)
+        def get_units(self, category: str) -> List[Unit]:
+            return [Unit(code=f"{category}-1")]
+
+    service = UnitService()
+    assert service.get_units("AREA") == [Unit(code="AREA-1")]
+
+    tiered.local.clear()
+    result = service.get_units("AREA")
+    assert isinstance(result[0], Unit)
+    assert result == [Unit(code="AREA-1")]